@@ -0,0 +1,70 @@
+"""ノート一覧の保持方法ごとのメモリ使用量を計測する
+
+    uv run python benchmarks/catalog_memory.py [ノート数]
+
+zkの出力を解析したNoteをそのまま文書IDごとに保持する場合と、NoteTableで
+列ごとに保持する場合について、tracemallocで計測した確保量を1万件あたりに
+換算して表示する。
+"""
+
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from zk_utils.infrastructure.zk.catalog.note_table import NoteTable
+from zk_utils.infrastructure.zk.dao.note import Note
+
+PER_NOTES = 10_000
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_note(i: int) -> Note:
+    # 解析結果と同様に、ノートごとに新しい文字列を持たせる
+    return Note(
+        title=f"ノート {i} の タイトル",
+        path=Path(f"journal/{i // 1000:03d}/{i:06d}-note.md"),
+        tags=[f"tag{i % 50}", f"project/{i % 7}", "inbox"][: i % 4],
+        created=BASE + timedelta(minutes=i),
+        modified=BASE + timedelta(minutes=2 * i),
+    )
+
+
+def build_models(count: int) -> object:
+    return {i: parse_note(i) for i in range(count)}
+
+
+def build_table(count: int) -> object:
+    table = NoteTable()
+    for i in range(count):
+        table.set(i, parse_note(i))
+    return table
+
+
+def measure(build: Callable[[int], object], count: int) -> None:
+    # tracemallocは処理を遅くするため、時間は計測を止めた状態で測る
+    started = time.perf_counter()
+    build(count)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    built = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+
+    per_notes = current / count * PER_NOTES / 1024 / 1024
+    print(f"{build.__name__:<13} {per_notes:8.2f} MiB / 10k notes  {elapsed:6.2f} s")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"notes: {count}")
+    measure(build_models, count)
+    measure(build_table, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""streamable-HTTPで起動したサーバーのクライアント数ごとのスループットを計測する
+
+    ZK_DIR=<ノートブック> uv run python benchmarks/http_concurrency.py \\
+        [--clients 1,2,4,8,16] [--duration 5] [--workers 8] \\
+        [--tool get_notes] [--arguments '{"per_page": 20}']
+
+サーバーを別プロセスで起動し、指定した数のクライアントがそれぞれセッションを
+張って同じツールを繰り返し呼び出す。クライアント数ごとに1秒あたりの呼び出し数と
+応答時間の中央値・95パーセンタイルを表示する。
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import anyio
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+
+def wait_for_port(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+
+    raise TimeoutError(f"server did not start on port {port}")
+
+
+async def run_client(
+    url: str,
+    tool: str,
+    arguments: dict[str, object],
+    deadline: float,
+    latencies: list[float],
+) -> None:
+    async with (
+        streamable_http_client(url) as (read, write, _),
+        ClientSession(read, write) as session,
+    ):
+        await session.initialize()
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            result = await session.call_tool(tool, arguments)
+            if result.isError:
+                raise RuntimeError(f"{tool} failed: {result.content}")
+            latencies.append(time.perf_counter() - started)
+
+
+async def measure(
+    url: str, clients: int, tool: str, arguments: dict[str, object], duration: float
+) -> None:
+    latencies: list[float] = []
+    started = time.monotonic()
+    async with anyio.create_task_group() as group:
+        for _ in range(clients):
+            group.start_soon(
+                run_client, url, tool, arguments, started + duration, latencies
+            )
+    elapsed = time.monotonic() - started
+
+    quantiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else []
+    p50 = statistics.median(latencies) * 1000 if latencies else 0.0
+    p95 = quantiles[-1] * 1000 if quantiles else p50
+    print(
+        f"{clients:7d} {len(latencies) / elapsed:10.1f} {p50:10.1f} {p95:10.1f}",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", default="1,2,4,8,16")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tool", default="get_notes")
+    parser.add_argument("--arguments", default="{}")
+    args = parser.parse_args()
+
+    if "ZK_DIR" not in os.environ:
+        sys.exit("ZK_DIR must point to a zk notebook")
+
+    env = os.environ | {
+        "TRANSPORT": "streamable-http",
+        "HTTP_PORT": str(args.port),
+        "WORKERS": str(args.workers),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "zk_utils.presentation.mcp.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(args.port, timeout=30)
+        url = f"http://127.0.0.1:{args.port}/mcp"
+        arguments = json.loads(args.arguments)
+        print(f"tool: {args.tool}  workers: {args.workers}")
+        print(f"{'clients':>7} {'calls/s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+        for clients in (int(c) for c in args.clients.split(",")):
+            anyio.run(measure, url, clients, args.tool, arguments, args.duration)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""MCPサーバーモジュールの読み込み時間を計測する
+
+    uv run python benchmarks/import_time.py [--runs N] [--threshold-ms MS]
+
+`python -X importtime`の出力を解析し、FastMCPだけを読み込んだ場合との差
+（このパッケージが起動時に追加で読み込む分）の中央値を表示する。
+差が閾値を超えた場合は、追加で読み込まれたモジュールを自己時間の順に
+表示して終了コード1で終わる。
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import NamedTuple
+
+TARGET = "zk_utils.presentation.mcp.server"
+BASELINE = "mcp.server.fastmcp"
+# サーバーの起動時に読み込まれてはいけないモジュール
+DEFERRED = (
+    "markdown_it",
+    "zk_utils.application",
+    "zk_utils.infrastructure",
+    "zk_utils.presentation.injector.note_module",
+    "zk_utils.presentation.mcp.tools",
+)
+
+
+class ImportRecord(NamedTuple):
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def import_times(module: str) -> list[ImportRecord]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    records: list[ImportRecord] = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        # モジュール名は読み込みの入れ子の深さに応じて2文字ずつ字下げされる
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        records.append(
+            ImportRecord(name.strip(), depth, int(self_us), int(cumulative_us))
+        )
+
+    return records
+
+
+def total_ms(records: list[ImportRecord]) -> float:
+    # 最上位の読み込みの合計（インタプリタの起動時に読み込む分を含む）
+    return sum(r.cumulative_us for r in records if r.depth == 0) / 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--threshold-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    overheads: list[float] = []
+    target: list[ImportRecord] = []
+    baseline: list[ImportRecord] = []
+    for _ in range(args.runs):
+        target = import_times(TARGET)
+        baseline = import_times(BASELINE)
+        overheads.append(total_ms(target) - total_ms(baseline))
+
+    overhead = statistics.median(overheads)
+    print(f"{TARGET}: {total_ms(target):8.1f} ms")
+    print(f"{BASELINE}: {total_ms(baseline):8.1f} ms")
+    print(f"overhead (median of {args.runs}): {overhead:8.1f} ms")
+
+    baseline_modules = {r.module for r in baseline}
+    added = sorted(
+        (r for r in target if r.module not in baseline_modules),
+        key=lambda r: r.self_us,
+        reverse=True,
+    )
+    print("\nslowest modules added by the server:")
+    for record in added[:15]:
+        print(f"{record.self_us / 1000:8.1f} ms  {record.module}")
+
+    failures = [r.module for r in target if r.module.startswith(DEFERRED)]
+    if failures:
+        print(f"\nFAIL: modules loaded at startup: {', '.join(failures)}")
+    if overhead > args.threshold_ms:
+        print(f"\nFAIL: overhead exceeds {args.threshold_ms:.0f} ms")
+    if failures or overhead > args.threshold_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+def frontmatter_lines(lines: list[str]) -> int:
+    """先頭のフロントマターの行数（無い場合は0）"""
+    if not lines or lines[0].rstrip("\r\n") != "---":
+        return 0
+
+    for i in range(1, len(lines)):
+        if lines[i].rstrip("\r\n") in ("---", "..."):
+            return i + 1
+
+    return 0
@@ -0,0 +1,114 @@
+import subprocess
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class ProcessScope:
+    """1回の処理（ツールの呼び出しなど）で起動した子プロセスをまとめて止める
+
+    スコープの中で`run_process`を呼ぶと子プロセスを登録しながら実行し、
+    `cancel`で実行中の子プロセスを終了させる。取り消し後に起動しようとした
+    場合はエラーになる。
+    """
+
+    __slots__ = ("_cancelled", "_lock", "_processes")
+
+    def __init__(self) -> None:
+        self._cancelled = False
+        self._lock = threading.Lock()
+        self._processes: set[subprocess.Popen[str]] = set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def call(self, fn: Callable[..., T], /, **kwargs: object) -> T:
+        """スコープの中で関数を実行する（ワーカースレッドから呼ぶ）"""
+        token = _current.set(self)
+        try:
+            return fn(**kwargs)
+        finally:
+            _current.reset(token)
+
+    def cancel(self) -> None:
+        """実行中の子プロセスを終了させる（どのスレッドからも呼べ、待たない）"""
+        with self._lock:
+            self._cancelled = True
+            processes = list(self._processes)
+
+        for process in processes:
+            # 終了済みのプロセスへのシグナルは無視される
+            process.kill()
+
+    def run(
+        self, command: list[str], cwd: Path, input: str | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        with self._lock:
+            if self._cancelled:
+                raise RuntimeError(f"Cancelled: {' '.join(command)}")
+            process = subprocess.Popen(
+                command,
+                stdin=None if input is None else subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                cwd=cwd,
+            )
+            self._processes.add(process)
+
+        try:
+            stdout, stderr = process.communicate(input)
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+
+        if self._cancelled:
+            raise RuntimeError(f"Cancelled: {' '.join(command)}")
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, command, stdout, stderr
+            )
+
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+_current: ContextVar[ProcessScope | None] = ContextVar("process_scope", default=None)
+
+
+def run_process(
+    command: list[str], cwd: Path, input: str | None = None
+) -> subprocess.CompletedProcess[str]:
+    """コマンドを実行し、終了コードが0以外の場合はCalledProcessErrorを送出する
+
+    入出力はロケールによらずUTF-8として扱う。
+    inputを指定した場合は標準入力に渡す（指定しない場合は親の標準入力を引き継ぐ）。
+    ProcessScopeの中では取り消せるように実行する。
+    """
+    scope = _current.get()
+    if scope is not None:
+        return scope.run(command, cwd, input)
+
+    if input is not None:
+        return subprocess.run(
+            command,
+            input=input,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            cwd=cwd,
+            check=True,
+        )
+
+    return subprocess.run(
+        command,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        cwd=cwd,
+        check=True,
+    )
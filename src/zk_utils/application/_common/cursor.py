@@ -0,0 +1,27 @@
+import base64
+import binascii
+import json
+
+CursorKey = tuple[str, str]
+
+
+def encode_cursor(key: CursorKey) -> str:
+    """ページ送り用のキーを不透明な文字列に変換する"""
+    data = json.dumps(list(key), ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if (
+        not isinstance(key, list)
+        or len(key) != 2
+        or not all(isinstance(value, str) for value in key)
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    return key[0], key[1]
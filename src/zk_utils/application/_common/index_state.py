@@ -0,0 +1,10 @@
+from .._abc import ABCOutput
+
+
+class IndexedOutput(ABCOutput):
+    """ノートブックのインデックスを使って応答する出力"""
+
+    # 応答に使ったメモリ上のインデックスの世代（カタログが無効な場合はNone）
+    index_generation: int | None = None
+    # インデックスの作り直し中で、ノートブックの最新の変更を含まない可能性がある
+    stale: bool = False
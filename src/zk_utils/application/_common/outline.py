@@ -0,0 +1,11 @@
+from ..._base_models import BaseFrozenModel
+
+
+class OutlineHeading(BaseFrozenModel):
+    level: int
+    text: str
+    # 見出しの行と、セクションの最後の行（1始まり）
+    line: int
+    end_line: int
+    # 親の見出し（最上位から順）
+    parents: list[str]
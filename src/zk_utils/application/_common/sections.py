@@ -0,0 +1,143 @@
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Final, NamedTuple
+
+from ..._markdown import frontmatter_lines
+from .._abc import ABCOutput
+
+# 見出しの索引を保持しておくノートの数
+SECTION_CACHE_SIZE: Final[int] = 64
+
+
+class Section(NamedTuple):
+    """h2見出しのセクションの行の範囲（0始まり、endは含まない）"""
+
+    heading: str
+    # 見出しの行
+    start: int
+    # 本文の最初の行（見出しの次の行）
+    body: int
+    # 次のh1・h2見出しの行、または末尾
+    end: int
+
+
+class SectionEditOutput(ABCOutput):
+    path: Path
+    heading: str
+    # 編集後の内容のハッシュ（続けて編集する時のexpected_hashに使う）
+    content_hash: str
+    headings: list[str]
+
+
+def content_hash(content: str) -> str:
+    """ノートの内容のハッシュ（zkが返す本文と揃えるため、前後の空白は除く）"""
+    return hashlib.sha256(content.strip().encode()).hexdigest()
+
+
+def verify_hash(content: str, expected_hash: str | None) -> None:
+    """編集の元にした内容から変わっていればValueErrorを送出する"""
+    if expected_hash is None:
+        return
+
+    actual = content_hash(content)
+    if actual != expected_hash:
+        raise ValueError(
+            f"Note was modified: expected content hash {expected_hash}, found {actual}"
+        )
+
+
+@lru_cache(maxsize=SECTION_CACHE_SIZE)
+def h2_sections(content: str) -> tuple[Section, ...]:
+    """h2見出しのセクションの行の範囲を、見出しの順に返す
+
+    先頭のフロントマターは見出しとして解釈しないよう除いて解析する。
+    引用やリストの中の見出しは対象外とする。
+    """
+    # パーサーの読み込みは重いため、サーバー起動時ではなく初回呼び出し時に行う
+    from markdown_it import MarkdownIt
+
+    lines = content.splitlines(keepends=True)
+    offset = frontmatter_lines(lines)
+    tokens = MarkdownIt().parse("".join(lines[offset:]))
+
+    # セクションの終わりになるh1・h2見出し（h1の場合は見出しの文字列をNoneとする）
+    headings: list[tuple[str | None, int, int]] = []
+    for i, token in enumerate(tokens):
+        if (
+            token.type != "heading_open"
+            or token.tag not in ("h1", "h2")
+            or token.level != 0
+            or token.map is None
+        ):
+            continue
+
+        heading = None
+        if token.tag == "h2" and i + 1 < len(tokens):
+            heading = tokens[i + 1].content
+        start, body = token.map
+        headings.append((heading, start + offset, body + offset))
+
+    sections: list[Section] = []
+    for k, (heading, start, body) in enumerate(headings):
+        if heading is None:
+            continue
+        end = headings[k + 1][1] if k + 1 < len(headings) else len(lines)
+        sections.append(Section(heading, start, body, end))
+
+    return tuple(sections)
+
+
+def find_section(content: str, heading: str) -> Section | None:
+    """見出しが一致する最初のセクションを返す"""
+    return next((s for s in h2_sections(content) if s.heading == heading), None)
+
+
+def replace_section(content: str, heading: str, text: str) -> str:
+    """セクションの本文（見出しの行を除く）をtextに置き換える"""
+    section = find_section(content, heading)
+    if section is None:
+        raise ValueError(f"Section not found: {heading}")
+
+    lines = content.splitlines(keepends=True)
+    _terminate(lines, section.body)
+    body = _text_lines(text)
+    after = lines[section.end :]
+    patch = (["\n", *body] if body else []) + (["\n"] if after else [])
+
+    return "".join(lines[: section.body] + patch + after)
+
+
+def append_to_section(content: str, heading: str, text: str) -> str:
+    """セクションの本文の末尾にtextを追加する（無い場合は末尾にセクションを作る）"""
+    body = _text_lines(text)
+    section = find_section(content, heading)
+    if section is None:
+        head = content.rstrip()
+        prefix = f"{head}\n\n" if head else ""
+        return f"{prefix}## {heading}\n\n{''.join(body)}"
+
+    lines = content.splitlines(keepends=True)
+    # 本文の末尾の空行の前に追加する
+    end = section.end
+    while end > section.body and not lines[end - 1].strip():
+        end -= 1
+    _terminate(lines, end)
+    after = lines[end:]
+    patch = ["\n", *body]
+    if after and after[0].strip():
+        patch.append("\n")
+
+    return "".join(lines[:end] + patch + after)
+
+
+def _text_lines(text: str) -> list[str]:
+    lines = text.strip("\n").splitlines(keepends=True)
+    _terminate(lines, len(lines))
+    return lines
+
+
+def _terminate(lines: list[str], end: int) -> None:
+    """lines[end - 1]が改行で終わるようにする"""
+    if end > 0 and not lines[end - 1].endswith("\n"):
+        lines[end - 1] += "\n"
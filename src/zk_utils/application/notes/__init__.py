@@ -1,25 +1,43 @@
 from . import (
+    append_to_section,
     create_note,
+    create_notes,
+    find_notes_by_title,
+    get_federated_notes,
     get_last_modified_note,
     get_link_to_notes,
     get_linked_by_notes,
     get_note_content,
     get_notes,
+    get_outlines,
     get_random_note,
+    get_random_notes,
+    get_recently_modified_notes,
     get_related_notes,
     get_tagless_notes,
+    replace_section,
+    search_headings,
 )
 from .if_note_query_service import IFNoteQueryService
 
 __all__ = [
     "IFNoteQueryService",
+    "append_to_section",
     "create_note",
+    "create_notes",
+    "find_notes_by_title",
+    "get_federated_notes",
     "get_last_modified_note",
     "get_link_to_notes",
     "get_linked_by_notes",
     "get_note_content",
     "get_notes",
+    "get_outlines",
     "get_random_note",
+    "get_random_notes",
+    "get_recently_modified_notes",
     "get_related_notes",
     "get_tagless_notes",
+    "replace_section",
+    "search_headings",
 ]
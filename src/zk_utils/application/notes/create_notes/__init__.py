@@ -0,0 +1,74 @@
+from pathlib import Path
+
+from injector import inject, singleton
+
+from ...._base_models import BaseFrozenModel
+from ....domain.models.notes import IFNoteRepository, NoteDraft
+from ..._abc import ABCInput, ABCOutput, ABCService
+from ..._common.note import Note
+
+
+class NewNote(BaseFrozenModel):
+    title: str
+    path: Path
+    body: str | None = None
+
+
+class CreateNotesInput(ABCInput):
+    notes: list[NewNote]
+
+
+class CreatedNote(BaseFrozenModel):
+    # 指定されたタイトルと作成先
+    title: str
+    path: Path
+    # 作成したノート（失敗した場合はNoneで、errorに理由が入る）
+    note: Note | None = None
+    error: str | None = None
+
+
+class CreateNotesOutput(ABCOutput):
+    # 入力と同じ順の作成結果
+    results: list[CreatedNote]
+    created: int
+    failed: int
+
+
+@singleton
+class CreateNotesService(ABCService[CreateNotesInput, CreateNotesOutput]):
+    _repository: IFNoteRepository
+
+    @inject
+    def __init__(self, repository: IFNoteRepository) -> None:
+        super().__init__()
+        self._repository = repository
+
+    def handle(self, input_data: CreateNotesInput) -> CreateNotesOutput:
+        drafts = [
+            NoteDraft(title=note.title, path=note.path, body=note.body)
+            for note in input_data.notes
+        ]
+        creations = self._repository.create_notes(drafts)
+
+        results = [
+            CreatedNote(
+                title=creation.draft.title,
+                path=creation.draft.path,
+                note=(
+                    Note(
+                        title=creation.note.title,
+                        path=creation.note.path,
+                        tags=creation.note.tags,
+                    )
+                    if creation.note is not None
+                    else None
+                ),
+                error=creation.error,
+            )
+            for creation in creations
+        ]
+        created = sum(1 for result in results if result.note is not None)
+
+        return CreateNotesOutput(
+            results=results, created=created, failed=len(results) - created
+        )
@@ -0,0 +1,30 @@
+from injector import inject, singleton
+
+from ..._abc import ABCInput, ABCService
+from ..._common.index_state import IndexedOutput
+from ..._common.note import Note
+from ..if_note_query_service import IFNoteQueryService
+
+
+class FindNotesByTitleInput(ABCInput):
+    query: str
+    limit: int = 10
+
+
+class FindNotesByTitleOutput(IndexedOutput):
+    notes: list[Note]
+
+
+@singleton
+class FindNotesByTitleService(
+    ABCService[FindNotesByTitleInput, FindNotesByTitleOutput]
+):
+    _query_service: IFNoteQueryService
+
+    @inject
+    def __init__(self, query_service: IFNoteQueryService) -> None:
+        super().__init__()
+        self._query_service = query_service
+
+    def handle(self, input_data: FindNotesByTitleInput) -> FindNotesByTitleOutput:
+        return self._query_service.find_notes_by_title(input_data)
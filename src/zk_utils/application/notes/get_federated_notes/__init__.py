@@ -0,0 +1,96 @@
+import contextvars
+import itertools
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Mapping
+
+from ..._abc import ABCOutput, ABCService
+from ..._common.note import Note
+from ..._common.pagination import Pagination
+from ..get_notes import GetNotesInput, GetNotesService
+
+
+class NotebookNote(Note):
+    notebook: str
+
+
+class GetFederatedNotesInput(GetNotesInput):
+    # 検索するノートブック（Noneの場合はすべて）
+    notebooks: list[str] | None = None
+
+
+class GetFederatedNotesOutput(ABCOutput):
+    pagination: Pagination
+    notes: list[NotebookNote]
+
+
+class GetFederatedNotesService(
+    ABCService[GetFederatedNotesInput, GetFederatedNotesOutput]
+):
+    """複数のノートブックを並行して検索し、各ノートブックでの順位で併合する
+
+    各ノートブックの1位、2位…の順に、同じ順位は指定（省略時は設定）された
+    ノートブックの順に交互に並べる。並び順の基準がノートブックごとに
+    異なっても、それぞれの上位が先頭のページに含まれるようにするため。
+    全体でn件目までに入るのは各ノートブックのn位までなので、指定された
+    ページまでの件数だけをそれぞれから取り出せば、ページを切り出せる。
+    """
+
+    _services: Mapping[str, GetNotesService]
+
+    def __init__(self, services: Mapping[str, GetNotesService]) -> None:
+        super().__init__()
+        self._services = services
+
+    def handle(self, input_data: GetFederatedNotesInput) -> GetFederatedNotesOutput:
+        notebooks = list(
+            dict.fromkeys(
+                self._services if input_data.notebooks is None else input_data.notebooks
+            )
+        )
+        unknown = [name for name in notebooks if name not in self._services]
+        if unknown:
+            raise ValueError(f"Unknown notebook: {', '.join(unknown)}")
+
+        query = GetNotesInput.model_validate(
+            input_data.model_dump(exclude={"notebooks"})
+            | {"page": 1, "per_page": max(input_data.page, 1) * input_data.per_page}
+        )
+        with ThreadPoolExecutor(max_workers=max(len(notebooks), 1)) as executor:
+            # 呼び出し元の取り消しやレーンを引き継ぐため、コンテキストを複製して実行する
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, self._services[name].handle, query
+                )
+                for name in notebooks
+            ]
+            outputs = [future.result() for future in futures]
+
+        total = sum(output.pagination.total for output in outputs)
+        per_page = input_data.per_page
+        total_pages = math.ceil(total / per_page) if per_page > 0 else 1
+        page = max(1, min(input_data.page, total_pages))
+
+        ranked = itertools.zip_longest(
+            *(
+                [
+                    NotebookNote(
+                        title=note.title, path=note.path, tags=note.tags, notebook=name
+                    )
+                    for note in output.notes
+                ]
+                for name, output in zip(notebooks, outputs, strict=True)
+            )
+        )
+        merged = [note for rank in ranked for note in rank if note is not None]
+        notes = merged[(page - 1) * per_page : page * per_page]
+
+        pagination = Pagination(
+            page=page,
+            per_page=per_page,
+            total=total,
+            total_pages=total_pages,
+            has_next=page < total_pages,
+            has_prev=page > 1,
+        )
+        return GetFederatedNotesOutput(pagination=pagination, notes=notes)
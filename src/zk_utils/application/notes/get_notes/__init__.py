@@ -2,7 +2,8 @@ from typing import Literal
 
 from injector import inject, singleton
 
-from ..._abc import ABCInput, ABCOutput, ABCService
+from ..._abc import ABCInput, ABCService
+from ..._common.index_state import IndexedOutput
 from ..._common.note import Note
 from ..._common.pagination import Pagination
 from ..if_note_query_service import IFNoteQueryService
@@ -18,10 +19,12 @@ class GetNotesInput(ABCInput):
     tags: list[str]
     tags_match_mode: Literal["AND", "OR"] = "AND"
     created_after: str | None = None
+    created_before: str | None = None
     modified_after: str | None = None
+    modified_before: str | None = None
 
 
-class GetNotesOutput(ABCOutput):
+class GetNotesOutput(IndexedOutput):
     pagination: Pagination
     notes: list[Note]
 
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from injector import inject, singleton
+
+from ...._base_models import BaseFrozenModel
+from ..._abc import ABCInput, ABCService
+from ..._common.index_state import IndexedOutput
+from ..._common.note import Note
+from ..._common.outline import OutlineHeading
+from ..if_note_query_service import IFNoteQueryService
+
+
+class GetOutlinesInput(ABCInput):
+    paths: list[Path]
+
+
+class NoteOutline(BaseFrozenModel):
+    note: Note
+    headings: list[OutlineHeading]
+
+
+class GetOutlinesOutput(IndexedOutput):
+    # 入力と同じ順のアウトライン（見つからないノートは除く）
+    outlines: list[NoteOutline]
+    # 見つからなかったノートの指定
+    missing: list[Path]
+
+
+@singleton
+class GetOutlinesService(ABCService[GetOutlinesInput, GetOutlinesOutput]):
+    _query_service: IFNoteQueryService
+
+    @inject
+    def __init__(self, query_service: IFNoteQueryService) -> None:
+        super().__init__()
+        self._query_service = query_service
+
+    def handle(self, input_data: GetOutlinesInput) -> GetOutlinesOutput:
+        return self._query_service.get_outlines(input_data)
@@ -0,0 +1,49 @@
+from pathlib import Path
+from typing import Final
+
+from injector import inject, singleton
+from pydantic import Field
+
+from ....domain.models.notes.if_note_repository import IFNoteRepository
+from ..._abc import ABCInput, ABCOutput, ABCService
+from ..._common.note import Note
+
+# ランダム取得で返したノートを覚えておく件数（exclude_recentの上限）
+SAMPLE_HISTORY_SIZE: Final[int] = 1000
+
+
+class GetRandomNotesInput(ABCInput):
+    count: int = 1
+    seed: int | None = None
+    tags: list[str] = Field(default_factory=list)
+    directory: Path | None = None
+    exclude_recent: int = Field(default=0, ge=0, le=SAMPLE_HISTORY_SIZE)
+
+
+class GetRandomNotesOutput(ABCOutput):
+    notes: list[Note]
+
+
+@singleton
+class GetRandomNotesService(ABCService[GetRandomNotesInput, GetRandomNotesOutput]):
+    _repository: IFNoteRepository
+
+    @inject
+    def __init__(self, repository: IFNoteRepository) -> None:
+        super().__init__()
+        self._repository = repository
+
+    def handle(self, input_data: GetRandomNotesInput) -> GetRandomNotesOutput:
+        notes = self._repository.find_random_notes(
+            count=input_data.count,
+            seed=input_data.seed,
+            tags=input_data.tags,
+            directory=input_data.directory,
+            exclude_recent=input_data.exclude_recent,
+        )
+
+        return GetRandomNotesOutput(
+            notes=[
+                Note(title=note.title, path=note.path, tags=note.tags) for note in notes
+            ]
+        )
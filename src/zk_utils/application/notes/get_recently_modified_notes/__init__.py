@@ -0,0 +1,36 @@
+from injector import inject, singleton
+
+from ....domain.models.notes.if_note_repository import IFNoteRepository
+from ..._abc import ABCInput, ABCOutput, ABCService
+from ..._common.note import Note
+
+
+class GetRecentlyModifiedNotesInput(ABCInput):
+    limit: int = 10
+
+
+class GetRecentlyModifiedNotesOutput(ABCOutput):
+    notes: list[Note]
+
+
+@singleton
+class GetRecentlyModifiedNotesService(
+    ABCService[GetRecentlyModifiedNotesInput, GetRecentlyModifiedNotesOutput]
+):
+    _repository: IFNoteRepository
+
+    @inject
+    def __init__(self, repository: IFNoteRepository) -> None:
+        super().__init__()
+        self._repository = repository
+
+    def handle(
+        self, input_data: GetRecentlyModifiedNotesInput
+    ) -> GetRecentlyModifiedNotesOutput:
+        notes = self._repository.find_recently_modified_notes(input_data.limit)
+
+        return GetRecentlyModifiedNotesOutput(
+            notes=[
+                Note(title=note.title, path=note.path, tags=note.tags) for note in notes
+            ]
+        )
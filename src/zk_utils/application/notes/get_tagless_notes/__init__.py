@@ -1,15 +1,24 @@
+import math
+
 from injector import inject, singleton
 
 from ....domain.models.notes.if_note_repository import IFNoteRepository
 from ..._abc import ABCInput, ABCOutput, ABCService
+from ..._common.cursor import decode_cursor, encode_cursor
 from ..._common.note import Note
+from ..._common.pagination import Pagination
 
 
-class GetTaglessNotesInput(ABCInput): ...
+class GetTaglessNotesInput(ABCInput):
+    page: int = 1
+    per_page: int = 10
+    cursor: str | None = None
 
 
 class GetTaglessNotesOutput(ABCOutput):
+    pagination: Pagination
     notes: list[Note]
+    next_cursor: str | None = None
 
 
 @singleton
@@ -22,11 +31,34 @@ class GetTaglessNotesService(ABCService[GetTaglessNotesInput, GetTaglessNotesOut
         self._repository = repository
 
     def handle(self, input_data: GetTaglessNotesInput) -> GetTaglessNotesOutput:
-        results = self._repository.find_tagless_notes()
+        per_page = max(1, input_data.per_page)
+        # カーソルのノートが削除・タグ付けされていても続きから返せる
+        after = None if input_data.cursor is None else decode_cursor(input_data.cursor)
+        result = self._repository.find_tagless_notes(per_page, input_data.page, after)
+
+        notes = [
+            Note(title=note.title, path=note.path, tags=note.tags)
+            for note in result.notes
+        ]
+        total = result.total
+        start = result.start
+        end = start + len(notes)
+
+        pagination = Pagination(
+            page=start // per_page + 1,
+            per_page=per_page,
+            total=total,
+            total_pages=max(1, math.ceil(total / per_page)),
+            has_next=end < total,
+            has_prev=start > 0,
+        )
 
-        notes: list[Note] = []
-        for result in results:
-            note = Note(title=result.title, path=result.path, tags=result.tags)
-            notes.append(note)
+        next_cursor = None
+        if end < total:
+            next_cursor = encode_cursor((notes[-1].title, str(notes[-1].path)))
 
-        return GetTaglessNotesOutput(notes=notes)
+        return GetTaglessNotesOutput(
+            pagination=pagination,
+            notes=notes,
+            next_cursor=next_cursor,
+        )
@@ -4,10 +4,13 @@ from typing import TYPE_CHECKING
 from .._abc import IFQueryService
 
 if TYPE_CHECKING:
+    from .find_notes_by_title import FindNotesByTitleInput, FindNotesByTitleOutput
     from .get_link_to_notes import GetLinkToNotesInput, GetLinkToNotesOutput
     from .get_linked_by_notes import GetLinkedByNotesInput, GetLinkedByNotesOutput
     from .get_notes import GetNotesInput, GetNotesOutput
+    from .get_outlines import GetOutlinesInput, GetOutlinesOutput
     from .get_related_notes import GetRelatedNotesInput, GetRelatedNotesOutput
+    from .search_headings import SearchHeadingsInput, SearchHeadingsOutput
 
 
 class IFNoteQueryService(IFQueryService):
@@ -28,3 +31,16 @@ class IFNoteQueryService(IFQueryService):
     def get_related_notes(
         self, input_data: "GetRelatedNotesInput"
     ) -> "GetRelatedNotesOutput": ...
+
+    @abc.abstractmethod
+    def find_notes_by_title(
+        self, input_data: "FindNotesByTitleInput"
+    ) -> "FindNotesByTitleOutput": ...
+
+    @abc.abstractmethod
+    def search_headings(
+        self, input_data: "SearchHeadingsInput"
+    ) -> "SearchHeadingsOutput": ...
+
+    @abc.abstractmethod
+    def get_outlines(self, input_data: "GetOutlinesInput") -> "GetOutlinesOutput": ...
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+from injector import inject, singleton
+
+from ....domain.models.notes import IFNoteRepository
+from ..._abc import ABCInput, ABCService
+from ..._common import sections
+from ..._common.sections import SectionEditOutput
+
+
+class ReplaceSectionInput(ABCInput):
+    path: Path
+    heading: str
+    text: str
+    # 編集の元にした内容のハッシュ（異なれば編集せずにエラーにする）
+    expected_hash: str | None = None
+
+
+class ReplaceSectionOutput(SectionEditOutput): ...
+
+
+@singleton
+class ReplaceSectionService(ABCService[ReplaceSectionInput, ReplaceSectionOutput]):
+    """見出しのセクションの本文を置き換える"""
+
+    _repository: IFNoteRepository
+
+    @inject
+    def __init__(self, repository: IFNoteRepository) -> None:
+        super().__init__()
+        self._repository = repository
+
+    def handle(self, input_data: ReplaceSectionInput) -> ReplaceSectionOutput:
+        source = self._repository.find_note_source(input_data.path)
+        sections.verify_hash(source.content, input_data.expected_hash)
+
+        content = sections.replace_section(
+            source.content, input_data.heading, input_data.text
+        )
+        saved = self._repository.save_note_source(source, content)
+
+        return ReplaceSectionOutput(
+            path=saved.path,
+            heading=input_data.heading,
+            content_hash=sections.content_hash(saved.content),
+            headings=[s.heading for s in sections.h2_sections(saved.content)],
+        )
@@ -0,0 +1,39 @@
+from injector import inject, singleton
+
+from ...._base_models import BaseFrozenModel
+from ..._abc import ABCInput, ABCService
+from ..._common.index_state import IndexedOutput
+from ..._common.note import Note
+from ..._common.outline import OutlineHeading
+from ..if_note_query_service import IFNoteQueryService
+
+
+class SearchHeadingsInput(ABCInput):
+    query: str
+    # 対象の見出しのレベル（空の場合は全レベル）
+    levels: list[int]
+    limit: int = 20
+
+
+class HeadingMatch(BaseFrozenModel):
+    note: Note
+    heading: OutlineHeading
+
+
+class SearchHeadingsOutput(IndexedOutput):
+    matches: list[HeadingMatch]
+    # limitで切り詰める前の一致件数
+    total: int
+
+
+@singleton
+class SearchHeadingsService(ABCService[SearchHeadingsInput, SearchHeadingsOutput]):
+    _query_service: IFNoteQueryService
+
+    @inject
+    def __init__(self, query_service: IFNoteQueryService) -> None:
+        super().__init__()
+        self._query_service = query_service
+
+    def handle(self, input_data: SearchHeadingsInput) -> SearchHeadingsOutput:
+        return self._query_service.search_headings(input_data)
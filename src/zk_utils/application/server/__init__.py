@@ -0,0 +1,8 @@
+from . import get_server_stats, warm_up
+from .if_server_query_service import IFServerQueryService
+
+__all__ = [
+    "IFServerQueryService",
+    "get_server_stats",
+    "warm_up",
+]
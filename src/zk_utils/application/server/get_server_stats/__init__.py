@@ -0,0 +1,59 @@
+from typing import Literal
+
+from injector import inject, singleton
+
+from ...._base_models import BaseFrozenModel
+from ..._abc import ABCInput, ABCService
+from ..._common.index_state import IndexedOutput
+from ..if_server_query_service import IFServerQueryService
+
+WarmUpStatus = Literal["idle", "running", "done", "failed"]
+WarmUpStepStatus = Literal["pending", "running", "done", "skipped", "failed"]
+
+
+class WarmUpStep(BaseFrozenModel):
+    name: str
+    status: WarmUpStepStatus
+    elapsed_seconds: float | None = None
+
+
+class PrefetchStats(BaseFrozenModel):
+    # 対話的な呼び出しのうち、先読みした結果で応答できた割合（呼び出しが無い場合はNone）
+    page_requests: int
+    page_hits: int
+    page_hit_rate: float | None
+    content_requests: int
+    content_hits: int
+    content_hit_rate: float | None
+    prefetched_pages: int
+    prefetched_contents: int
+    # 予算の超過や待ちの多さで先読みしなかった回数
+    skipped: int
+
+
+class GetServerStatsInput(ABCInput): ...
+
+
+class GetServerStatsOutput(IndexedOutput):
+    # ウォームアップ中でなければ、問い合わせを待たせずに処理できる
+    ready: bool
+    warm_up: WarmUpStatus
+    steps: list[WarmUpStep]
+    error: str | None = None
+    # メモリ上のカタログに読み込まれたノート数（未読み込みの場合はNone）
+    catalog_notes: int | None = None
+    # 先読みの効果（先読みが無効の場合はNone）
+    prefetch: PrefetchStats | None = None
+
+
+@singleton
+class GetServerStatsService(ABCService[GetServerStatsInput, GetServerStatsOutput]):
+    _query_service: IFServerQueryService
+
+    @inject
+    def __init__(self, query_service: IFServerQueryService) -> None:
+        super().__init__()
+        self._query_service = query_service
+
+    def handle(self, input_data: GetServerStatsInput) -> GetServerStatsOutput:
+        return self._query_service.get_server_stats(input_data)
@@ -0,0 +1,18 @@
+import abc
+from typing import TYPE_CHECKING
+
+from .._abc import IFQueryService
+
+if TYPE_CHECKING:
+    from .get_server_stats import GetServerStatsInput, GetServerStatsOutput
+    from .warm_up import WarmUpInput, WarmUpOutput
+
+
+class IFServerQueryService(IFQueryService):
+    @abc.abstractmethod
+    def warm_up(self, input_data: "WarmUpInput") -> "WarmUpOutput": ...
+
+    @abc.abstractmethod
+    def get_server_stats(
+        self, input_data: "GetServerStatsInput"
+    ) -> "GetServerStatsOutput": ...
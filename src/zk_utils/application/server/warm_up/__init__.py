@@ -0,0 +1,25 @@
+from injector import inject, singleton
+
+from ..._abc import ABCInput, ABCOutput, ABCService
+from ..get_server_stats import WarmUpStatus
+from ..if_server_query_service import IFServerQueryService
+
+
+class WarmUpInput(ABCInput): ...
+
+
+class WarmUpOutput(ABCOutput):
+    status: WarmUpStatus
+
+
+@singleton
+class WarmUpService(ABCService[WarmUpInput, WarmUpOutput]):
+    _query_service: IFServerQueryService
+
+    @inject
+    def __init__(self, query_service: IFServerQueryService) -> None:
+        super().__init__()
+        self._query_service = query_service
+
+    def handle(self, input_data: WarmUpInput) -> WarmUpOutput:
+        return self._query_service.warm_up(input_data)
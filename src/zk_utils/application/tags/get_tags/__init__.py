@@ -1,6 +1,7 @@
 from injector import inject, singleton
 
-from ..._abc import ABCInput, ABCOutput, ABCService
+from ..._abc import ABCInput, ABCService
+from ..._common.index_state import IndexedOutput
 from ..._common.tag import Tag
 from ..if_tag_query_service import IFTagQueryService
 
@@ -8,7 +9,7 @@ from ..if_tag_query_service import IFTagQueryService
 class GetTagsInput(ABCInput): ...
 
 
-class GetTagsOutput(ABCOutput):
+class GetTagsOutput(IndexedOutput):
     tags: list[Tag]
 
 
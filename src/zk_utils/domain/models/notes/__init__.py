@@ -1,5 +1,12 @@
 from .if_note_repository import IFNoteRepository
+from .note_draft import NoteCreation, NoteDraft
+from .note_page import NotePage
+from .note_source import NoteSource
 
 __all__ = [
     "IFNoteRepository",
+    "NoteCreation",
+    "NoteDraft",
+    "NotePage",
+    "NoteSource",
 ]
@@ -3,6 +3,9 @@ from pathlib import Path
 
 from .._abc import IFRepository
 from .note import Note
+from .note_draft import NoteCreation, NoteDraft
+from .note_page import NotePage
+from .note_source import NoteSource
 
 
 class IFNoteRepository(IFRepository):
@@ -12,11 +15,35 @@ class IFNoteRepository(IFRepository):
     @abc.abstractmethod
     def create_note(self, title: str, path: Path) -> Note: ...
 
+    @abc.abstractmethod
+    def create_notes(self, drafts: list[NoteDraft]) -> list[NoteCreation]: ...
+
+    @abc.abstractmethod
+    def find_note_source(self, path: Path) -> NoteSource: ...
+
+    @abc.abstractmethod
+    def save_note_source(self, source: NoteSource, content: str) -> NoteSource: ...
+
     @abc.abstractmethod
     def find_last_modified_note(self) -> Note: ...
 
     @abc.abstractmethod
-    def find_tagless_notes(self) -> list[Note]: ...
+    def find_recently_modified_notes(self, limit: int) -> list[Note]: ...
+
+    @abc.abstractmethod
+    def find_tagless_notes(
+        self, limit: int, page: int, after: tuple[str, str] | None
+    ) -> NotePage: ...
 
     @abc.abstractmethod
     def find_random_note(self) -> Note: ...
+
+    @abc.abstractmethod
+    def find_random_notes(
+        self,
+        count: int,
+        seed: int | None,
+        tags: list[str],
+        directory: Path | None,
+        exclude_recent: int,
+    ) -> list[Note]: ...
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from .._abc import ValueObject
+from .note import Note
+
+
+class NoteDraft(ValueObject):
+    title: str
+    path: Path
+    # テンプレートの{{content}}に渡す本文
+    body: str | None = None
+
+
+class NoteCreation(ValueObject):
+    """ノートの作成結果（作成したノートか、失敗した理由のどちらか）"""
+
+    draft: NoteDraft
+    note: Note | None = None
+    error: str | None = None
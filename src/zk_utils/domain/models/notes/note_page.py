@@ -0,0 +1,11 @@
+from .._abc import ValueObject
+from .note import Note
+
+
+class NotePage(ValueObject):
+    """並べたノートから取り出した範囲と、全体の件数"""
+
+    notes: list[Note]
+    # 取り出した範囲の先頭の位置（0始まり）
+    start: int
+    total: int
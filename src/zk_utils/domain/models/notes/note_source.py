@@ -0,0 +1,10 @@
+from pathlib import Path
+
+from .._abc import ValueObject
+
+
+class NoteSource(ValueObject):
+    """編集の元にするノートのファイルの内容"""
+
+    path: Path
+    content: str
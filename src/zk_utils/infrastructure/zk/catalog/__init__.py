@@ -0,0 +1,17 @@
+from .heading_index import Heading
+from .note_catalog import (
+    CatalogConfig,
+    HeadingMatch,
+    IndexState,
+    NoteCatalog,
+    NoteOutline,
+)
+
+__all__ = [
+    "CatalogConfig",
+    "Heading",
+    "HeadingMatch",
+    "IndexState",
+    "NoteCatalog",
+    "NoteOutline",
+]
@@ -0,0 +1,253 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Final, NamedTuple
+
+from .change_detector import DIGEST_SIZE, Digests, GitState, Snapshot
+
+CACHE_VERSION: Final[int] = 3
+_MAGIC: Final[bytes] = b"ZKUC"
+_HEADER = struct.Struct("<4sII")
+_LENGTH = struct.Struct("<Q")
+
+
+class CachedTexts:
+    """キャッシュのノートの本文（UTF-8の連結と各行の終端位置）
+
+    読み込み時は全体をデコードせず、取り出す時に1件ずつデコードする。
+    区切り文字を使わないため、本文中のNULもそのまま保存できる。
+    """
+
+    __slots__ = ("_data", "_ends")
+
+    def __init__(
+        self, data: bytes | None = None, ends: array[int] | None = None
+    ) -> None:
+        self._data: bytes | bytearray = bytearray() if data is None else data
+        self._ends = array("Q") if ends is None else ends
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, row: int) -> str:
+        return self.raw(row).decode()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CachedTexts):
+            return NotImplemented
+        return self._data == other._data and self._ends == other._ends
+
+    def raw(self, row: int) -> bytes:
+        """デコードせずにUTF-8のまま返す（保存し直す時に使う）"""
+        start = self._ends[row - 1] if row > 0 else 0
+        return bytes(self._data[start : self._ends[row]])
+
+    def append(self, text: str | bytes) -> None:
+        self._data += text.encode() if isinstance(text, str) else text
+        self._ends.append(len(self._data))
+
+
+class CachedRows(NamedTuple):
+    """キャッシュから読み込んだノートの列（行番号が文書IDになる）"""
+
+    paths: list[str]
+    titles: list[str]
+    texts: CachedTexts
+    created: array[float]
+    modified: array[float]
+    tag_names: list[str]
+    tag_counts: array[int]
+    tag_data: array[int]
+
+
+class CachedCatalog(NamedTuple):
+    snapshot: Snapshot
+    rows: CachedRows
+    digests: Digests
+    git: GitState | None
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "zk-utils"
+
+
+class CatalogCache:
+    """カタログの内容をノートブックごとのバイナリファイルに保存する
+
+    ファイルは`<cache_dir>/v<バージョン>/<ノートブックのハッシュ>.bin`に置き、
+    長さ付きのセクション（文字列は件数とNUL区切りのUTF-8、数値はarray）を
+    順に並べる。読み込みはmmap上のスライスから列をまとめて復元する。
+    本文は終端位置の列とUTF-8の連結で保存し、使う時にデコードする。
+    本文以外の文字列にNULを含めることはできない（保存時にValueError）。
+    """
+
+    __slots__ = ("_path",)
+
+    def __init__(self, cache_dir: Path, cwd: Path) -> None:
+        key = hashlib.sha256(str(cwd.resolve()).encode()).hexdigest()[:16]
+        self._path = cache_dir / f"v{CACHE_VERSION}" / f"{key}.bin"
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self) -> CachedCatalog | None:
+        """キャッシュを読み込む（存在しないか壊れている場合はNone）"""
+        try:
+            with (
+                open(self._path, "rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+            ):
+                return _Reader(mm).read()
+        except (OSError, ValueError, struct.error, UnicodeDecodeError):
+            return None
+
+    def save(self, catalog: CachedCatalog) -> None:
+        """キャッシュを書き込む（一時ファイルから置き換えるため途中の状態は残らない）"""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+        try:
+            snapshot, rows, digests, git = catalog
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, CACHE_VERSION, len(rows.paths)))
+                _write_strings(f, list(snapshot))
+                _write_array(f, array("q", (stat[0] for stat in snapshot.values())))
+                _write_array(f, array("q", (stat[1] for stat in snapshot.values())))
+                _write_strings(f, list(digests))
+                _write_section(f, b"".join(digests.values()))
+                _write_strings(f, [] if git is None else [git.head])
+                _write_strings(f, [] if git is None else sorted(git.dirty))
+                _write_strings(f, rows.paths)
+                _write_strings(f, rows.titles)
+                _write_texts(f, rows.texts)
+                _write_array(f, rows.created)
+                _write_array(f, rows.modified)
+                _write_strings(f, rows.tag_names)
+                _write_array(f, rows.tag_counts)
+                _write_array(f, rows.tag_data)
+            os.replace(tmp, self._path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def _write_section(f: BinaryIO, data: bytes | bytearray) -> None:
+    f.write(_LENGTH.pack(len(data)))
+    f.write(data)
+
+
+def _write_array(f: BinaryIO, values: array[int] | array[float]) -> None:
+    _write_section(f, bytes([ord(values.typecode)]) + values.tobytes())
+
+
+def _write_texts(f: BinaryIO, texts: CachedTexts) -> None:
+    _write_array(f, texts._ends)
+    _write_section(f, texts._data)
+
+
+def _write_strings(f: BinaryIO, values: list[str]) -> None:
+    # 件数とNUL区切りのUTF-8で保存し、読み込み時に一度でデコードできるようにする
+    if any("\0" in value for value in values):
+        raise ValueError("Cached strings cannot contain NUL")
+    f.write(_LENGTH.pack(len(values)))
+    _write_section(f, "\0".join(values).encode())
+
+
+class _Reader:
+    __slots__ = ("_buffer", "_position")
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        self._buffer = buffer
+        self._position = 0
+
+    def read(self) -> CachedCatalog:
+        magic, version, count = _HEADER.unpack_from(self._buffer, 0)
+        if magic != _MAGIC or version != CACHE_VERSION:
+            raise ValueError("Unsupported cache file")
+        self._position = _HEADER.size
+
+        snapshot_paths = self._strings()
+        mtimes = self._array("q")
+        sizes = self._array("q")
+        snapshot = dict(
+            zip(snapshot_paths, zip(mtimes, sizes, strict=True), strict=True)
+        )
+
+        digest_paths = self._strings()
+        blob = self._section()
+        if len(blob) != DIGEST_SIZE * len(digest_paths):
+            raise ValueError("Corrupted cache file")
+        digests = {
+            path: blob[i * DIGEST_SIZE : (i + 1) * DIGEST_SIZE]
+            for i, path in enumerate(digest_paths)
+        }
+
+        head = self._strings()
+        dirty = self._strings()
+        git = GitState(head=head[0], dirty=frozenset(dirty)) if head else None
+
+        rows = CachedRows(
+            paths=self._strings(),
+            titles=self._strings(),
+            texts=self._texts(),
+            created=self._array("d"),
+            modified=self._array("d"),
+            tag_names=self._strings(),
+            tag_counts=self._array("H"),
+            tag_data=self._array("I"),
+        )
+        columns = (
+            rows.paths,
+            rows.titles,
+            rows.texts,
+            rows.created,
+            rows.modified,
+            rows.tag_counts,
+        )
+        if any(len(column) != count for column in columns):
+            raise ValueError("Corrupted cache file")
+
+        return CachedCatalog(snapshot=snapshot, rows=rows, digests=digests, git=git)
+
+    def _section(self) -> bytes:
+        (length,) = _LENGTH.unpack_from(self._buffer, self._position)
+        start = self._position + _LENGTH.size
+        end = start + length
+        if end > len(self._buffer):
+            raise ValueError("Truncated cache file")
+
+        self._position = end
+        # mmapのスライスはbytesとして複製されるため、閉じた後も参照できる
+        return self._buffer[start:end]
+
+    def _array(self, typecode: str) -> array[Any]:
+        section = self._section()
+        if len(section) == 0 or section[0] != ord(typecode):
+            raise ValueError("Corrupted cache file")
+
+        values = array(typecode)
+        values.frombytes(memoryview(section)[1:])
+        return values
+
+    def _texts(self) -> CachedTexts:
+        ends = self._array("Q")
+        data = self._section()
+        if ends and ends[-1] != len(data):
+            raise ValueError("Corrupted cache file")
+
+        return CachedTexts(data, ends)
+
+    def _strings(self) -> list[str]:
+        (count,) = _LENGTH.unpack_from(self._buffer, self._position)
+        self._position += _LENGTH.size
+        blob = str(self._section(), "utf-8")
+        values = blob.split("\0") if count else []
+        if len(values) != count:
+            raise ValueError("Corrupted cache file")
+
+        return values
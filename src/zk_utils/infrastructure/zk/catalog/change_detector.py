@@ -0,0 +1,207 @@
+import hashlib
+import os
+import subprocess
+from pathlib import Path
+from typing import Final, Iterable, NamedTuple
+
+from ..scheduler import scheduler
+from ..zk_client import NOTE_SUFFIX
+
+DIGEST_SIZE: Final[int] = 16
+
+# ノートブックからの相対パス（文字列）ごとの(mtime_ns, size)
+Snapshot = dict[str, tuple[int, int]]
+# ノートブックからの相対パス（文字列）ごとの内容のBLAKE2ダイジェスト
+Digests = dict[str, bytes]
+
+
+class Changes(NamedTuple):
+    changed: set[str]
+    removed: set[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.changed or self.removed)
+
+
+class GitState(NamedTuple):
+    head: str
+    # 未コミットの変更があるノート（ノートブックからの相対パス）
+    dirty: frozenset[str]
+
+
+def is_note(path: str) -> bool:
+    """.zkや.gitなどの隠しディレクトリ配下を除くノートのファイルか"""
+    parts = path.split("/")
+    return path.endswith(NOTE_SUFFIX) and not any(
+        part.startswith(".") for part in parts
+    )
+
+
+class ChangeDetector:
+    """ノートブック配下のファイルのstat情報から変更を検出する
+
+    git checkoutなどで内容を変えずにmtimeだけが更新された場合に備え、
+    内容のハッシュでの確認と、gitの差分から変更候補を得る手段も提供する。
+    """
+
+    __slots__ = ("_cwd", "_prefix")
+
+    def __init__(self, cwd: Path) -> None:
+        self._cwd = cwd
+        self._prefix: str | None = None
+
+    def scan(self) -> Snapshot:
+        snapshot: Snapshot = {}
+        for root, dirs, files in os.walk(self._cwd):
+            # .zkや.gitなどの隠しディレクトリは対象外
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                if name.startswith(".") or not name.endswith(NOTE_SUFFIX):
+                    continue
+
+                full_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(full_path)
+                except FileNotFoundError:
+                    continue
+
+                path = os.path.relpath(full_path, self._cwd)
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+    def rescan(self, old: Snapshot, paths: Iterable[str]) -> Snapshot:
+        """指定されたファイルだけのstat情報を取り直したスナップショットを返す"""
+        snapshot = dict(old)
+        for path in paths:
+            try:
+                stat = os.stat(self._cwd / path)
+            except FileNotFoundError:
+                snapshot.pop(path, None)
+                continue
+
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+    def relative(self, path: Path) -> str | None:
+        """ノートブックからの相対パスを返す（ノートブックの外の場合はNone）"""
+        root = os.path.realpath(self._cwd)
+        relative = os.path.relpath(os.path.realpath(self._cwd / path), root)
+        if relative.startswith(os.pardir) or not is_note(relative):
+            return None
+
+        return relative
+
+    def read(self, path: str) -> str | None:
+        """ファイルの内容を返す（読めない場合はNone）"""
+        try:
+            return (self._cwd / path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def diff(self, old: Snapshot, new: Snapshot) -> Changes:
+        changed = {path for path, stat in new.items() if old.get(path) != stat}
+        removed = old.keys() - new.keys()
+
+        return Changes(changed=changed, removed=set(removed))
+
+    def digest(self, path: str) -> bytes | None:
+        """ファイルの内容のBLAKE2ダイジェストを返す（読めない場合はNone）"""
+        try:
+            with open(self._cwd / path, "rb") as f:
+                return hashlib.file_digest(
+                    f, lambda: hashlib.blake2b(digest_size=DIGEST_SIZE)
+                ).digest()
+        except OSError:
+            return None
+
+    def digests(self, paths: Iterable[str]) -> Digests:
+        return {
+            path: digest for path in paths if (digest := self.digest(path)) is not None
+        }
+
+    def verify(self, changes: Changes, digests: Digests) -> tuple[Changes, Digests]:
+        """stat情報だけが変わり内容が同じファイルを変更から除く
+
+        変更候補のファイルについて計算したダイジェストも合わせて返す。
+        """
+        computed = self.digests(changes.changed)
+        changed = {
+            path
+            for path in changes.changed
+            if path not in computed or digests.get(path) != computed[path]
+        }
+
+        return Changes(changed=changed, removed=changes.removed), computed
+
+    def git_state(self) -> GitState | None:
+        """HEADと未コミットの変更を返す（gitで管理されていない場合はNone）"""
+        prefix = self._git_prefix()
+        stdout = self._git(
+            "status", "--porcelain=v2", "-z", "--branch", "--untracked-files=all"
+        )
+        if prefix is None or stdout is None:
+            return None
+
+        head = ""
+        dirty: set[str] = set()
+        records = iter(stdout.split("\0"))
+        for record in records:
+            paths: list[str] = []
+            if record.startswith("# branch.oid "):
+                head = record.removeprefix("# branch.oid ")
+            elif record.startswith("1 "):
+                paths.append(record.split(" ", 8)[8])
+            elif record.startswith("2 "):
+                # 名前の変更は変更前のパスが次のレコードに続く
+                paths.extend([record.split(" ", 9)[9], next(records, "")])
+            elif record.startswith("u "):
+                paths.append(record.split(" ", 10)[10])
+            elif record.startswith("? "):
+                paths.append(record[2:])
+
+            for path in paths:
+                if path.startswith(prefix):
+                    relative = path.removeprefix(prefix)
+                    if is_note(relative):
+                        dirty.add(relative)
+
+        # コミットが無いリポジトリでは差分の基準にできない
+        if not head or head == "(initial)":
+            return None
+
+        return GitState(head=head, dirty=frozenset(dirty))
+
+    def git_changes(self, old: GitState, new: GitState) -> set[str] | None:
+        """2つの状態の間に変更された可能性のあるノートを返す
+
+        コミット間の差分に、前後どちらかで未コミットだったファイルを加える。
+        差分を取れない場合（履歴の書き換えなど）はNoneを返す。
+        """
+        paths = set(old.dirty | new.dirty)
+        if old.head != new.head:
+            stdout = self._git(
+                "diff", "--name-only", "-z", "--relative", old.head, new.head
+            )
+            if stdout is None:
+                return None
+            paths.update(path for path in stdout.split("\0") if is_note(path))
+
+        return paths
+
+    def _git_prefix(self) -> str | None:
+        # git statusのパスはリポジトリのルートからの相対パスになる
+        if self._prefix is None:
+            stdout = self._git("rev-parse", "--show-prefix")
+            if stdout is not None:
+                self._prefix = stdout.strip()
+
+        return self._prefix
+
+    def _git(self, *args: str) -> str | None:
+        # zkと同じく、呼び出し元のレーンで実行して取り消せるようにする
+        try:
+            return scheduler.run(["git", *args], cwd=self._cwd).stdout
+        except (subprocess.CalledProcessError, OSError):
+            return None
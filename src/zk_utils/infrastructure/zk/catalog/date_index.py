@@ -0,0 +1,65 @@
+import bisect
+from datetime import datetime
+
+
+class DateIndex:
+    """タイムスタンプ順に並べたノートIDの配列
+
+    範囲検索はbisectで境界を求めるため、O(log n)で対象の区間が決まる。
+    """
+
+    __slots__ = ("_doc_ids", "_timestamps", "_values")
+
+    def __init__(self) -> None:
+        self._timestamps: list[float] = []
+        self._doc_ids: list[int] = []
+        self._values: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def add(self, doc_id: int, value: datetime) -> None:
+        self.add_timestamp(doc_id, value.timestamp())
+
+    def add_timestamp(self, doc_id: int, timestamp: float) -> None:
+        if doc_id in self._values:
+            self.remove(doc_id)
+
+        i = bisect.bisect_right(self._timestamps, timestamp)
+        self._timestamps.insert(i, timestamp)
+        self._doc_ids.insert(i, doc_id)
+        self._values[doc_id] = timestamp
+
+    def remove(self, doc_id: int) -> None:
+        timestamp = self._values.pop(doc_id, None)
+        if timestamp is None:
+            return
+
+        # 同じ時刻のノートが並ぶ区間からIDを探す
+        i = bisect.bisect_left(self._timestamps, timestamp)
+        while self._doc_ids[i] != doc_id:
+            i += 1
+        del self._timestamps[i]
+        del self._doc_ids[i]
+
+    def range(self, start: datetime | None, end: datetime | None) -> list[int]:
+        """start以降、end未満のノートIDを時刻順に返す"""
+        lo = (
+            0
+            if start is None
+            else bisect.bisect_left(self._timestamps, start.timestamp())
+        )
+        hi = (
+            len(self._timestamps)
+            if end is None
+            else bisect.bisect_left(self._timestamps, end.timestamp())
+        )
+
+        return self._doc_ids[lo:hi]
+
+    def latest(self, limit: int) -> list[int]:
+        """新しい順に最大limit件のノートIDを返す"""
+        if limit <= 0:
+            return []
+
+        return self._doc_ids[: -limit - 1 : -1]
@@ -0,0 +1,147 @@
+import calendar
+import re
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Final
+
+_NUMBERS: Final[dict[str, int]] = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+    "eleven": 11,
+    "twelve": 12,
+}
+
+# 相対表現で受け付ける数の上限（日付の範囲を超える計算をしないため）
+_MAX_AMOUNT: Final[int] = 99999
+
+_WEEKDAYS: Final[dict[str, int]] = {
+    name: i
+    for i, names in enumerate(
+        [
+            ("monday", "mon"),
+            ("tuesday", "tue", "tues"),
+            ("wednesday", "wed"),
+            ("thursday", "thu", "thur", "thurs"),
+            ("friday", "fri"),
+            ("saturday", "sat"),
+            ("sunday", "sun"),
+        ]
+    )
+    for name in names
+}
+
+_MONTHS: Final[dict[str, int]] = {
+    name: i
+    for i in range(1, 13)
+    for name in (calendar.month_name[i].lower(), calendar.month_abbr[i].lower())
+} | {"sept": 9}
+
+_UNIT = r"(day|week|month|year)s?"
+_DAY = r"(\d{1,2})(?:st|nd|rd|th)?"
+_YEAR = r"(\d{4})"
+
+_AGO = re.compile(rf"^(\w+) {_UNIT} ago$")
+_LAST_N = re.compile(rf"^(?:last|past) (\w+) {_UNIT}$")
+_LAST = re.compile(rf"^(?:last|past) {_UNIT}$")
+_WEEKDAY = re.compile(r"^(?:last )?(\w+)$")
+_MONTH_DAY = re.compile(rf"^(\w+) {_DAY}(?: {_YEAR})?$")
+_DAY_MONTH = re.compile(rf"^{_DAY} (\w+)(?: {_YEAR})?$")
+_MONTH_YEAR = re.compile(rf"^(\w+)(?: {_YEAR})?$")
+_YEAR_ONLY = re.compile(rf"^{_YEAR}$")
+
+
+def parse_date(value: str, today: date | None = None) -> datetime | None:
+    """zkが受け付ける日付表現を解釈する（解釈できない場合はNone）
+
+    ISO 8601形式に加え、'yesterday'、'last monday'、'last two weeks'、
+    '3 days ago'、'2021'、'Feb 3'などを受け付ける。相対表現は当日0時
+    （ローカル時刻）を基準にするため、結果は表現ごとに当日中キャッシュする。
+    """
+    return _parse(value.strip(), today or date.today())
+
+
+@lru_cache(maxsize=256)
+def _parse(value: str, today: date) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+
+    phrase = " ".join(value.replace(",", " ").lower().split())
+    try:
+        day = _parse_phrase(phrase, today)
+    except (ValueError, OverflowError):
+        # 2月30日のように存在しない日付や、日付の範囲を超える相対表現
+        return None
+
+    return None if day is None else datetime.combine(day, time.min)
+
+
+def _parse_phrase(phrase: str, today: date) -> date | None:
+    if phrase == "today":
+        return today
+    if phrase == "yesterday":
+        return today - timedelta(days=1)
+    if phrase == "tomorrow":
+        return today + timedelta(days=1)
+
+    if match := _AGO.match(phrase) or _LAST_N.match(phrase):
+        amount = _number(match.group(1))
+        return None if amount is None else _shift(today, amount, match.group(2))
+
+    if match := _LAST.match(phrase):
+        return _shift(today, 1, match.group(1))
+
+    if match := _YEAR_ONLY.match(phrase):
+        return date(int(match.group(1)), 1, 1)
+
+    if (match := _WEEKDAY.match(phrase)) and match.group(1) in _WEEKDAYS:
+        # 当日を含まない直近の同じ曜日
+        days = (today.weekday() - _WEEKDAYS[match.group(1)] - 1) % 7 + 1
+        return today - timedelta(days=days)
+
+    if (match := _MONTH_DAY.match(phrase)) and match.group(1) in _MONTHS:
+        year = int(match.group(3)) if match.group(3) else today.year
+        return date(year, _MONTHS[match.group(1)], int(match.group(2)))
+
+    if (match := _DAY_MONTH.match(phrase)) and match.group(2) in _MONTHS:
+        year = int(match.group(3)) if match.group(3) else today.year
+        return date(year, _MONTHS[match.group(2)], int(match.group(1)))
+
+    if (match := _MONTH_YEAR.match(phrase)) and match.group(1) in _MONTHS:
+        year = int(match.group(2)) if match.group(2) else today.year
+        return date(year, _MONTHS[match.group(1)], 1)
+
+    return None
+
+
+def _number(word: str) -> int | None:
+    if word.isdigit():
+        amount = int(word)
+        return amount if amount <= _MAX_AMOUNT else None
+
+    return _NUMBERS.get(word)
+
+
+def _shift(day: date, amount: int, unit: str) -> date:
+    """dayからamount単位だけ遡った日付を返す"""
+    if unit == "day":
+        return day - timedelta(days=amount)
+    if unit == "week":
+        return day - timedelta(weeks=amount)
+
+    months = amount * 12 if unit == "year" else amount
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    # 遡った月に同じ日が無い場合は月末にする
+    last_day = calendar.monthrange(year, month + 1)[1]
+    return date(year, month + 1, min(day.day, last_day))
@@ -0,0 +1,118 @@
+import os
+from collections import defaultdict
+from typing import NamedTuple
+
+from ...._markdown import frontmatter_lines
+from .ngram_index import normalize
+
+
+class Heading(NamedTuple):
+    level: int
+    text: str
+    # 見出しの行と、同じか上位の次の見出しの行（0始まり、endは含まない）
+    start: int
+    end: int
+    # 親の見出しのノート内での位置（最上位の場合は-1）
+    parent: int
+
+
+def parse_headings(content: str) -> tuple[Heading, ...]:
+    """h1〜h6の見出しを、ノート内の順に親の位置と行の範囲つきで返す
+
+    先頭のフロントマターは見出しとして解釈しないよう除いて解析する。
+    引用やリストの中の見出しは対象外とする。
+    """
+    # パーサーの読み込みは重いため、最初に解析する時に行う
+    from markdown_it import MarkdownIt
+
+    lines = content.splitlines(keepends=True)
+    offset = frontmatter_lines(lines)
+    tokens = MarkdownIt().parse("".join(lines[offset:]))
+
+    found: list[tuple[int, str, int]] = []
+    for i, token in enumerate(tokens):
+        if token.type != "heading_open" or token.level != 0 or token.map is None:
+            continue
+        text = tokens[i + 1].content if i + 1 < len(tokens) else ""
+        found.append((int(token.tag[1]), text, token.map[0] + offset))
+
+    headings: list[Heading] = []
+    # 親の候補（見出しの位置の、レベルが浅い順のスタック）
+    stack: list[int] = []
+    for position, (level, text, start) in enumerate(found):
+        while stack and found[stack[-1]][0] >= level:
+            stack.pop()
+        end = next((s for lv, _, s in found[position + 1 :] if lv <= level), len(lines))
+        headings.append(Heading(level, text, start, end, stack[-1] if stack else -1))
+        stack.append(position)
+
+    return tuple(headings)
+
+
+def read_headings(root: str, path: str) -> tuple[Heading, ...]:
+    """ファイルの見出しを返す（読めない場合は空。プロセスプールから呼ばれる）"""
+    try:
+        with open(os.path.join(root, path), encoding="utf-8") as f:
+            return parse_headings(f.read())
+    except (OSError, UnicodeDecodeError):
+        return ()
+
+
+class HeadingIndex:
+    """ノートブック全体の見出しの索引
+
+    ノートごとのアウトラインと、正規化した見出しの文字列ごとの
+    (文書ID, 見出しの位置)を保持する。同じ見出し（「TODO」など）は
+    多くのノートで繰り返されるため、部分一致は異なる文字列だけを走査する。
+    """
+
+    __slots__ = ("_outlines", "_texts")
+
+    def __init__(self) -> None:
+        self._outlines: dict[int, tuple[Heading, ...]] = {}
+        self._texts: defaultdict[str, set[tuple[int, int]]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._outlines)
+
+    def add(self, doc_id: int, headings: tuple[Heading, ...]) -> None:
+        self.remove(doc_id)
+        self._outlines[doc_id] = headings
+        for position, heading in enumerate(headings):
+            self._texts[normalize(heading.text)].add((doc_id, position))
+
+    def remove(self, doc_id: int) -> None:
+        headings = self._outlines.pop(doc_id, None)
+        if headings is None:
+            return
+
+        for position, heading in enumerate(headings):
+            text = normalize(heading.text)
+            entries = self._texts[text]
+            entries.discard((doc_id, position))
+            if not entries:
+                del self._texts[text]
+
+    def outline(self, doc_id: int) -> tuple[Heading, ...]:
+        return self._outlines.get(doc_id, ())
+
+    def search(self, query: str, levels: set[int]) -> list[tuple[int, int, int]]:
+        """見出しが部分一致する(順位, 文書ID, 見出しの位置)を返す
+
+        順位は完全一致が0、前方一致が1、それ以外が2。
+        levelsが空でない場合は、そのレベルの見出しに絞り込む。
+        """
+        normalized = normalize(query.strip())
+        matches: list[tuple[int, int, int]] = []
+        for text, entries in self._texts.items():
+            if normalized not in text:
+                continue
+
+            rank = 0 if text == normalized else 1 if text.startswith(normalized) else 2
+            matches.extend(
+                (rank, doc_id, position)
+                for doc_id, position in entries
+                if not levels or self._outlines[doc_id][position].level in levels
+            )
+
+        return matches
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+from .ngram_index import normalize
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(normalize(title).split())
+
+
+def zk_id(stem: str) -> str | None:
+    """ファイル名からzkのIDらしき先頭部分を取り出す
+
+    zkのIDは英数字のランダム文字列や日時のため、数字を含む先頭の区切りまでをIDとみなす。
+    """
+    for separator in ("-", "_", " "):
+        stem = stem.split(separator, 1)[0]
+
+    if stem and any(char.isdigit() for char in stem):
+        return stem
+
+    return None
+
+
+class IdentifierIndex:
+    """パス・タイトル・ファイル名・zkのIDからノートを引くハッシュ索引
+
+    解決は優先度の高い種類から順に行い、複数のノートに一致する識別子は
+    次の種類で再度解決を試みる。
+    """
+
+    __slots__ = ("_keys", "_tables")
+
+    def __init__(self) -> None:
+        # パス、タイトル、ファイル名、ID、正規化タイトルの順
+        self._tables: tuple[dict[str, set[int]], ...] = tuple({} for _ in range(5))
+        self._keys: dict[int, tuple[tuple[str, ...], ...]] = {}
+
+    def _make_keys(self, path: Path, title: str) -> tuple[tuple[str, ...], ...]:
+        note_id = zk_id(path.stem)
+        return (
+            (str(path), str(path.with_suffix(""))),
+            (title,),
+            (path.stem,),
+            (note_id,) if note_id is not None else (),
+            (normalize_title(title),),
+        )
+
+    def add(self, doc_id: int, path: Path, title: str) -> None:
+        if doc_id in self._keys:
+            self.remove(doc_id)
+
+        keys = self._make_keys(path, title)
+        self._keys[doc_id] = keys
+        for table, table_keys in zip(self._tables, keys):
+            for key in table_keys:
+                table.setdefault(key, set()).add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        keys = self._keys.pop(doc_id, None)
+        if keys is None:
+            return
+
+        for table, table_keys in zip(self._tables, keys):
+            for key in table_keys:
+                doc_ids = table.get(key)
+                if doc_ids is None:
+                    continue
+                doc_ids.discard(doc_id)
+                if not doc_ids:
+                    del table[key]
+
+    def resolve(self, identifier: str) -> int | None:
+        lookups = (identifier,) * 4 + (normalize_title(identifier),)
+        for table, key in zip(self._tables, lookups):
+            doc_ids = table.get(key)
+            if doc_ids is not None and len(doc_ids) == 1:
+                return next(iter(doc_ids))
+
+        return None
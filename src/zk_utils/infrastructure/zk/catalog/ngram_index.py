@@ -0,0 +1,129 @@
+import unicodedata
+from collections import Counter
+from typing import Callable, Iterable, Literal
+
+
+def normalize(text: str) -> str:
+    """全角/半角と大文字/小文字の揺れを吸収した検索用文字列を返す"""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def has_non_ascii(text: str) -> bool:
+    return not text.isascii()
+
+
+class NgramIndex:
+    """文字n-gramの転置インデックス
+
+    ポスティングリストの積集合で候補を絞り込み、正規化済みテキストに対する
+    部分文字列照合で確定させる。パターンがn文字未満の場合は全件照合になる。
+    """
+
+    __slots__ = ("_gram_counts", "_gram_filter", "_n", "_postings", "_texts")
+
+    def __init__(
+        self, n: int, gram_filter: Callable[[str], bool] | None = None
+    ) -> None:
+        if n < 1:
+            raise ValueError(f"n must be positive: {n}")
+
+        self._n = n
+        self._gram_filter = gram_filter
+        self._postings: dict[str, set[int]] = {}
+        self._texts: dict[int, str] = {}
+        self._gram_counts: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    @property
+    def n(self) -> int:
+        return self._n
+
+    def grams(self, text: str) -> set[str]:
+        n = self._n
+        grams = {text[i : i + n] for i in range(len(text) - n + 1)}
+        if self._gram_filter is not None:
+            grams = {gram for gram in grams if self._gram_filter(gram)}
+
+        return grams
+
+    def add(self, doc_id: int, text: str, normalized: bool = False) -> None:
+        """文書を追加する（normalizedがTrueの場合はtextを正規化済みとみなす）"""
+        if doc_id in self._texts:
+            self.remove(doc_id)
+
+        normalized_text = text if normalized else normalize(text)
+        grams = self.grams(normalized_text)
+        self._texts[doc_id] = normalized_text
+        self._gram_counts[doc_id] = len(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: int) -> None:
+        normalized = self._texts.pop(doc_id, None)
+        if normalized is None:
+            return
+
+        del self._gram_counts[doc_id]
+        for gram in self.grams(normalized):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(doc_id)
+            if not posting:
+                del self._postings[gram]
+
+    def candidates(self, pattern: str) -> set[int] | None:
+        """パターンの全n-gramを含む文書IDを返す（絞り込めない場合はNone）"""
+        grams = self.grams(normalize(pattern))
+        if not grams:
+            return None
+
+        # 件数の少ないポスティングリストから順に積集合を取る
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            if not result:
+                break
+            result &= posting
+
+        return result
+
+    def overlap(self, text: str) -> dict[int, int]:
+        """テキストと共通するn-gramの数を文書IDごとに返す"""
+        counts: Counter[int] = Counter()
+        for gram in self.grams(normalize(text)):
+            counts.update(self._postings.get(gram, ()))
+
+        return counts
+
+    def text(self, doc_id: int) -> str:
+        """正規化済みのテキストを返す"""
+        return self._texts[doc_id]
+
+    def gram_count(self, doc_id: int) -> int:
+        return self._gram_counts[doc_id]
+
+    def search(self, pattern: str) -> set[int]:
+        normalized = normalize(pattern)
+        candidates = self.candidates(pattern)
+        targets: Iterable[int] = self._texts if candidates is None else candidates
+
+        return {doc_id for doc_id in targets if normalized in self._texts[doc_id]}
+
+    def search_all(
+        self, patterns: list[str], match_mode: Literal["AND", "OR"]
+    ) -> set[int]:
+        """複数パターンをAND/ORで結合して検索する"""
+        result: set[int] | None = None
+        for pattern in patterns:
+            matched = self.search(pattern)
+            if result is None:
+                result = matched
+            elif match_mode == "AND":
+                result &= matched
+            else:
+                result |= matched
+
+        return result if result is not None else set()
@@ -0,0 +1,980 @@
+import bisect
+import itertools
+import logging
+import math
+import multiprocessing
+import random
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Final, Iterable, Literal, NamedTuple
+
+from injector import inject, singleton
+
+from ...._base_models import BaseFrozenModel
+from ....application.notes.get_random_notes import SAMPLE_HISTORY_SIZE
+from ..dao.note import Note
+from ..scheduler import Lane, scheduler
+from ..zk_client import NOTE_SUFFIX, ZkClient
+from .catalog_cache import CachedCatalog, CachedRows, CachedTexts, CatalogCache
+from .change_detector import (
+    ChangeDetector,
+    Changes,
+    Digests,
+    GitState,
+    Snapshot,
+)
+from .date_index import DateIndex
+from .heading_index import Heading, HeadingIndex, parse_headings, read_headings
+from .identifier_index import IdentifierIndex
+from .ngram_index import NgramIndex, has_non_ascii, normalize
+from .note_metadata import parse_metadata
+from .note_table import NoteTable
+from .tag_index import TagIndex, iter_bits
+from .title_index import TitleIndex
+
+logger = logging.getLogger(__name__)
+
+# zk listに一度に渡すパスの数
+BATCH_SIZE: Final[int] = 500
+# 見出しの索引をプロセスプールで組み立てるノート数の下限
+PARALLEL_OUTLINE_THRESHOLD: Final[int] = 200
+# プロセスプールの1回のタスクで解析するノート数
+OUTLINE_CHUNK_SIZE: Final[int] = 64
+# 見出しの索引をロックの外で組み立て直す回数（書き込みが続いて公開できない場合）
+OUTLINE_BUILD_ATTEMPTS: Final[int] = 3
+# 作り直しで新しい世代に入れ替える属性（インデックスの元になる列と各インデックス）
+GENERATION_FIELDS: Final[tuple[str, ...]] = (
+    "_generation",
+    "_snapshot",
+    "_digests",
+    "_git",
+    "_ids",
+    "_table",
+    "_next_id",
+    "_free_ids",
+    "_order",
+    "_positions",
+    "_texts",
+    "_cached_texts",
+    "_title_index",
+    "_content_index",
+    "_identifier_index",
+    "_tag_index",
+    "_created_index",
+    "_modified_index",
+    "_heading_index",
+)
+
+
+class CatalogConfig(BaseFrozenModel):
+    enabled: bool = False
+    # インデックスの元になる列を保存するディレクトリ（Noneの場合は保存しない）
+    cache_dir: Path | None = None
+    # 変更の検出方法（stat: stat情報、hash: stat情報と内容のハッシュ、
+    # git: コミット間の差分と未コミットのファイル）
+    change_detection: Literal["stat", "hash", "git"] = "stat"
+    # 変更の反映中の応答（strict: 反映を待つ、stale: 前の世代のインデックスで応答する）
+    consistency: Literal["strict", "stale"] = "strict"
+    # staleの場合に、バックグラウンドで作り直す変更ファイル数の下限
+    rebuild_threshold: int = 100
+    # 頻繁に呼ばれる検索で、ノートブックの変更の検出を省く間隔（秒）
+    refresh_interval: float = 1.0
+
+
+class HeadingMatch(NamedTuple):
+    note: Note
+    heading: Heading
+    # 親の見出しの文字列（最上位から順）
+    parents: list[str]
+
+
+class NoteOutline(NamedTuple):
+    note: Note
+    headings: tuple[Heading, ...]
+
+
+class IndexState(NamedTuple):
+    # 公開中のインデックスの世代（変更を反映するたびに増える。無効な場合はNone）
+    generation: int | None
+    # 作り直し中で、ノートブックの変更がまだ反映されていない
+    stale: bool
+
+
+@singleton
+class NoteCatalog(BaseFrozenModel):
+    """zkのノート一覧をメモリ上に保持し、検索用インデックスを提供する
+
+    ノートブックのstat情報が変わった場合のみzkに問い合わせ、
+    変更のあったファイルだけを再読み込みする。
+
+    キャッシュが有効な場合は一覧の列と本文をstat情報とともにファイルへ保存し、
+    起動時はそこから復元して変更のあったファイルだけをzkで読み直す。
+    各インデックスは最初に使われた時に列から組み立てる。
+
+    git checkoutなどでmtimeだけが変わるファイルを読み直さないよう、
+    内容のハッシュで確認する方法と、gitの差分から変更候補を得る方法を選べる。
+
+    consistencyがstaleの場合、多数のファイルの変更は列を複製したカタログで
+    バックグラウンドで反映し、インデックスまで組み立ててからロックの下で
+    入れ替える。その間の問い合わせは前の世代のインデックスで応答する。
+    """
+
+    _client: ZkClient
+    _config: CatalogConfig
+    _root: str
+    _detector: ChangeDetector
+    _cache: CatalogCache | None
+    _lock: threading.RLock
+    # 変更の反映（作り直しを含む）を1つに限るロック
+    _updating: threading.Lock
+    _generation: int
+    _stale: bool
+    # 作り直し中に公開中の世代へ書き込んだノート（入れ替え前に再適用する）
+    _pending: list[Note] | None
+    # 最後に変更を検出した時刻（time.monotonic）
+    _checked: float
+    _snapshot: Snapshot | None
+    _digests: Digests
+    _git: GitState | None
+    _ids: dict[str, int]
+    _table: NoteTable
+    _next_id: int
+    _free_ids: list[int]
+    _order: list[int]
+    _positions: dict[int, int]
+    _sampled: deque[str]
+    _texts: dict[int, str]
+    # キャッシュから復元した本文（_textsに無い文書IDは、ここから取り出す）
+    _cached_texts: CachedTexts | None
+    _title_index: TitleIndex | None
+    _content_index: NgramIndex | None
+    _identifier_index: IdentifierIndex | None
+    _tag_index: TagIndex | None
+    _created_index: DateIndex | None
+    _modified_index: DateIndex | None
+    _heading_index: HeadingIndex | None
+
+    @inject
+    def __init__(self, client: ZkClient, cwd: Path, config: CatalogConfig) -> None:
+        super().__init__()
+        self._client = client
+        self._config = config
+        self._root = str(cwd)
+        self._detector = ChangeDetector(cwd)
+        # 無効なカタログはキャッシュを読み書きしない
+        self._cache = None
+        if config.enabled and config.cache_dir is not None:
+            self._cache = CatalogCache(config.cache_dir, cwd)
+        self._lock = threading.RLock()
+        self._updating = threading.Lock()
+        self._generation = 0
+        self._stale = False
+        self._pending = None
+        self._checked = -math.inf
+        self._snapshot = None
+        self._sampled = deque(maxlen=SAMPLE_HISTORY_SIZE)
+        self._clear()
+
+    @property
+    def enabled(self) -> bool:
+        return self._config.enabled
+
+    def refresh(self) -> None:
+        # 作り直し中は待たずに、公開中の前の世代で応答する
+        wait = self._config.consistency == "strict" or self._snapshot is None
+        if not self._updating.acquire(blocking=wait):
+            return
+
+        rebuilding = False
+        try:
+            self._checked = time.monotonic()
+            # ロックを待つ問い合わせを遅らせないよう、ロックを持ったまま実行するzkは
+            # 呼び出し元（ウォームアップなど）のレーンによらず、対話的な処理として
+            # 中断させずに実行する
+            with scheduler.lane(Lane.INTERACTIVE):
+                rebuilding = self._refresh()
+        finally:
+            # 作り直しを始めた場合は、作り直しのスレッドが解放する
+            if not rebuilding:
+                self._updating.release()
+
+    def refresh_throttled(self) -> None:
+        """直近の変更の検出からrefresh_interval秒以内なら、走査を省いて済ませる
+
+        作成・編集したノートはadd_writtenで反映済みのため、遅れて見えるのは
+        サーバーの外での変更だけになる。
+        """
+        elapsed = time.monotonic() - self._checked
+        if self._snapshot is not None and elapsed < self._config.refresh_interval:
+            return
+
+        self.refresh()
+
+    def add_written(self, notes: list[Note]) -> None:
+        """作成・編集したノートを、ノートブックを走査せずにカタログへ反映する
+
+        zk indexはノートブック全体を走査するため使わず、タイトルやタグ、
+        作成日時もファイルの内容から読み取って、すぐに検索できるようにする。
+        スナップショット（hashの場合はダイジェストも）は書き込み前のまま残し、
+        次の更新でzkが解釈した値に置き換える。
+        """
+        if not self.enabled or self._snapshot is None:
+            # 未読み込みの場合は、最初の更新で全件を読み込む
+            return
+
+        contents: dict[str, tuple[Note, str]] = {}
+        for note in notes:
+            path = self._detector.relative(note.path)
+            content = self._detector.read(path) if path is not None else None
+            if path is not None and content is not None:
+                contents[path] = (note, content)
+        if not contents:
+            return
+
+        with self._lock:
+            stats = self._detector.rescan({}, contents)
+            for path, (note, content) in contents.items():
+                stat = stats.get(path)
+                if stat is None:
+                    continue
+
+                metadata = parse_metadata(content)
+                # タイトルや日時の無いノートは、渡された値か索引済みの値を引き継ぐ
+                doc_id = self._ids.get(path)
+                indexed = self._table.note(doc_id) if doc_id is not None else None
+                created = metadata.created or (indexed.created if indexed else None)
+                self._write(
+                    Note(
+                        title=(
+                            metadata.title
+                            or note.title
+                            or (indexed.title if indexed else "")
+                        ),
+                        path=Path(path),
+                        tags=metadata.tags,
+                        content=content,
+                        created=created or datetime.now(timezone.utc),
+                        modified=datetime.fromtimestamp(stat[0] / 1e9, timezone.utc),
+                    )
+                )
+            self._generation += 1
+
+    def index_state(self) -> IndexState:
+        if not self.enabled:
+            return IndexState(generation=None, stale=False)
+
+        with self._lock:
+            return IndexState(generation=self._generation, stale=self._stale)
+
+    def warm_up(self) -> None:
+        """ノート一覧を読み込み、全てのインデックスを組み立てておく"""
+        self.refresh()
+        for build in (
+            self._titles,
+            self._contents,
+            self._identifiers,
+            self._tags,
+            self._created_dates,
+            self._modified_dates,
+        ):
+            # 組み立ての合間に他の問い合わせを処理できるよう、1つずつロックを取る
+            with self._lock:
+                build()
+
+    def warm_up_headings(self) -> None:
+        """見出しの索引を組み立てておく（全ファイルを読むため、warm_upとは分ける）"""
+        self._prepare_headings()
+
+    def note_count(self) -> int | None:
+        """読み込み済みのノート数を返す（未読み込みの場合はNone）"""
+        with self._lock:
+            return None if self._snapshot is None else len(self._ids)
+
+    def match_titles(
+        self, patterns: list[str], match_mode: Literal["AND", "OR"]
+    ) -> set[Path]:
+        with self._lock:
+            return self._paths(self._titles().search_all(patterns, match_mode))
+
+    def match_contents(
+        self, patterns: list[str], match_mode: Literal["AND", "OR"]
+    ) -> set[Path]:
+        with self._lock:
+            return self._paths(self._contents().search_all(patterns, match_mode))
+
+    def match_tags(
+        self, tags: list[str], match_mode: Literal["AND", "OR"]
+    ) -> set[Path]:
+        with self._lock:
+            return self._paths(iter_bits(self._tags().match(tags, match_mode)))
+
+    def match_created(self, start: datetime | None, end: datetime | None) -> set[Path]:
+        """作成日時がstart以降、end未満のノートを返す"""
+        with self._lock:
+            return self._paths(self._created_dates().range(start, end))
+
+    def match_modified(self, start: datetime | None, end: datetime | None) -> set[Path]:
+        """更新日時がstart以降、end未満のノートを返す"""
+        with self._lock:
+            return self._paths(self._modified_dates().range(start, end))
+
+    def recent_notes(self, limit: int) -> list[Note]:
+        """更新日時の新しい順に最大limit件のノートを返す"""
+        with self._lock:
+            doc_ids = self._modified_dates().latest(limit)
+            return [self._table.note(doc_id) for doc_id in doc_ids]
+
+    def sample(
+        self,
+        count: int,
+        rng: random.Random,
+        tags: list[str],
+        directory: Path | None,
+        exclude_recent: int,
+    ) -> list[Note]:
+        """ノートを重複なくランダムに最大count件返す
+
+        直近exclude_recent件のランダム取得で返したノートは除外する。
+        絞り込みが無く候補が十分多い場合は、ID配列からの棄却サンプリングで
+        ノート数によらず取得件数に比例した時間で返す。
+        """
+        with self._lock:
+            pool = self._order
+            if tags:
+                pool = list(iter_bits(self._tags().match(tags, "AND")))
+            prefix = "" if directory is None else directory.as_posix().strip("/")
+            if prefix not in ("", "."):
+                prefix += "/"
+                pool = [
+                    doc_id
+                    for doc_id in pool
+                    if self._table.path(doc_id).startswith(prefix)
+                ]
+
+            excluded: set[int] = set()
+            if exclude_recent > 0:
+                recent = itertools.islice(reversed(self._sampled), exclude_recent)
+                excluded = {self._ids[path] for path in recent if path in self._ids}
+
+            chosen: list[int] = []
+            if len(pool) >= 2 * (len(excluded) + count):
+                seen = set(excluded)
+                while len(chosen) < count:
+                    doc_id = pool[rng.randrange(len(pool))]
+                    if doc_id not in seen:
+                        seen.add(doc_id)
+                        chosen.append(doc_id)
+            else:
+                candidates = [doc_id for doc_id in pool if doc_id not in excluded]
+                chosen = rng.sample(candidates, min(count, len(candidates)))
+
+            self._sampled.extend(self._table.path(doc_id) for doc_id in chosen)
+            return [self._table.note(doc_id) for doc_id in chosen]
+
+    def tagless_notes(
+        self, limit: int, page: int, after: tuple[str, str] | None
+    ) -> tuple[list[Note], int, int]:
+        """タグの無いノートをタイトルとパスの順に並べ、最大limit件と開始位置、総数を返す
+
+        afterを指定した場合はその（タイトル, パス）より後ろから、それ以外は
+        page番目（範囲外の場合は最初か最後）のページを返す。
+        ノートのモデルは返す範囲の分だけ生成する。
+        """
+        with self._lock:
+            table = self._table
+
+            def key(doc_id: int) -> tuple[str, str]:
+                return table.title(doc_id), table.path(doc_id)
+
+            doc_ids = sorted(iter_bits(self._tags().tagless), key=key)
+            total = len(doc_ids)
+            if after is not None:
+                start = bisect.bisect_right(doc_ids, after, key=key)
+            else:
+                start = (max(1, min(page, math.ceil(total / limit))) - 1) * limit
+            selected = doc_ids[start : start + limit]
+
+            return [table.note(doc_id) for doc_id in selected], start, total
+
+    def tag_counts(self) -> dict[str, int]:
+        """タグ名ごとのノート数をタグ名順で返す"""
+        with self._lock:
+            return self._tags().counts()
+
+    def find_titles(self, query: str, limit: int) -> list[Note]:
+        """タイトルがクエリに近いノートを順位順で返す"""
+        with self._lock:
+            doc_ids = self._titles().find(query, limit)
+            return [self._table.note(doc_id) for doc_id in doc_ids]
+
+    def resolve_path(self, path: Path) -> Path:
+        """タイトル・ファイル名・zkのIDで指定されたノートをパスに解決する
+
+        ノートの拡張子を持つ場合はパスとみなしてそのまま返す。
+        カタログが無効な場合や解決できない場合も、zkに判断を委ねるためそのまま返す。
+        """
+        if path.suffix == NOTE_SUFFIX or not self.enabled:
+            return path
+
+        self.refresh_throttled()
+        with self._lock:
+            doc_id = self._identifiers().resolve(str(path))
+            if doc_id is None:
+                return path
+
+            return Path(self._table.path(doc_id))
+
+    def search_headings(
+        self, query: str, levels: set[int], limit: int
+    ) -> tuple[list[HeadingMatch], int]:
+        """見出しが部分一致するノートの見出しを、最大limit件と総数で返す
+
+        完全一致・前方一致・部分一致の順に、同じ順位はタイトル順で並べる。
+        """
+        self._prepare_headings()
+        with self._lock:
+            index = self._headings()
+            table = self._table
+            matches = sorted(
+                index.search(query, levels),
+                key=lambda m: (
+                    m[0],
+                    table.title(m[1]),
+                    table.path(m[1]),
+                    index.outline(m[1])[m[2]].start,
+                ),
+            )
+
+            results: list[HeadingMatch] = []
+            for _, doc_id, position in matches[:limit]:
+                outline = index.outline(doc_id)
+                parents: list[str] = []
+                parent = outline[position].parent
+                while parent >= 0:
+                    parents.append(outline[parent].text)
+                    parent = outline[parent].parent
+                results.append(
+                    HeadingMatch(
+                        note=table.note(doc_id),
+                        heading=outline[position],
+                        parents=parents[::-1],
+                    )
+                )
+
+            return results, len(matches)
+
+    def outlines(self, paths: list[Path]) -> list[NoteOutline | None]:
+        """指定パスのノートの見出しを返す（カタログに無いノートはNone）"""
+        self._prepare_headings()
+        with self._lock:
+            index = self._headings()
+            results: list[NoteOutline | None] = []
+            for path in paths:
+                doc_id = self._ids.get(str(path))
+                results.append(
+                    None
+                    if doc_id is None
+                    else NoteOutline(self._table.note(doc_id), index.outline(doc_id))
+                )
+
+            return results
+
+    def get_notes(
+        self,
+        paths: Iterable[Path],
+        window: Callable[[int], slice] = lambda total: slice(None),
+    ) -> tuple[list[Note], int]:
+        """指定パスのノートをzk listと同じくタイトル順に並べ、一部と総数を返す
+
+        windowは総数から取り出す範囲（ページ）を求める。ノートのモデルは
+        その範囲の分だけ、更新で文書IDが消えたり再利用されたりしないよう
+        ロックを持ったまま生成する。
+        """
+        with self._lock:
+            doc_ids = [
+                doc_id
+                for doc_id in (self._ids.get(str(path)) for path in paths)
+                if doc_id is not None
+            ]
+            doc_ids.sort(key=self._table.title)
+            selected = doc_ids[window(len(doc_ids))]
+
+            return [self._table.note(doc_id) for doc_id in selected], len(doc_ids)
+
+    def _paths(self, doc_ids: Iterable[int]) -> set[Path]:
+        return {Path(self._table.path(doc_id)) for doc_id in doc_ids}
+
+    def _titles(self) -> TitleIndex:
+        if self._title_index is None:
+            index = TitleIndex()
+            for doc_id in self._order:
+                index.add(doc_id, self._table.title(doc_id))
+            self._title_index = index
+
+        return self._title_index
+
+    def _contents(self) -> NgramIndex:
+        if self._content_index is None:
+            # CJKテキストのみbigramで索引し、ASCIIのみのn-gramは対象外とする
+            index = NgramIndex(2, gram_filter=has_non_ascii)
+            for doc_id in self._order:
+                index.add(doc_id, self._text(doc_id), normalized=True)
+            # 以降の本文は索引側にのみ保持する
+            self._texts = {}
+            self._cached_texts = None
+            self._content_index = index
+
+        return self._content_index
+
+    def _identifiers(self) -> IdentifierIndex:
+        if self._identifier_index is None:
+            index = IdentifierIndex()
+            for doc_id in self._order:
+                path = Path(self._table.path(doc_id))
+                index.add(doc_id, path, self._table.title(doc_id))
+            self._identifier_index = index
+
+        return self._identifier_index
+
+    def _tags(self) -> TagIndex:
+        if self._tag_index is None:
+            index = TagIndex()
+            for doc_id in self._order:
+                index.add(doc_id, self._table.tags(doc_id))
+            self._tag_index = index
+
+        return self._tag_index
+
+    def _created_dates(self) -> DateIndex:
+        if self._created_index is None:
+            self._created_index = self._build_dates(self._table.created)
+
+        return self._created_index
+
+    def _modified_dates(self) -> DateIndex:
+        if self._modified_index is None:
+            self._modified_index = self._build_dates(self._table.modified)
+
+        return self._modified_index
+
+    def _headings(self) -> HeadingIndex:
+        if self._heading_index is None:
+            doc_ids = list(self._order)
+            paths = [self._table.path(doc_id) for doc_id in doc_ids]
+            self._heading_index = self._index_headings(
+                doc_ids, self._read_outlines(paths)
+            )
+
+        return self._heading_index
+
+    def _prepare_headings(self) -> None:
+        """見出しの索引をロックの外で組み立て、その間に変更が無ければ公開する
+
+        全ファイルの読み込みと解析の間も、他の問い合わせを処理できるようにする。
+        書き込みが続いて公開できない場合は、使う時にロックの下で組み立てる。
+        """
+        for _ in range(OUTLINE_BUILD_ATTEMPTS):
+            with self._lock:
+                if self._heading_index is not None:
+                    return
+                generation = self._generation
+                doc_ids = list(self._order)
+                paths = [self._table.path(doc_id) for doc_id in doc_ids]
+
+            outlines = self._read_outlines(paths)
+            with self._lock:
+                # 組み立ての間に書き込まれた場合は、読み込みからやり直す
+                if self._generation == generation and self._heading_index is None:
+                    self._heading_index = self._index_headings(doc_ids, outlines)
+
+    def _read_outlines(self, paths: list[str]) -> list[tuple[Heading, ...]]:
+        # 一覧の列に本文の書式は残らないため、ファイルを読んで解析する
+        if len(paths) < PARALLEL_OUTLINE_THRESHOLD:
+            return [read_headings(self._root, path) for path in paths]
+
+        # マークダウンの解析はGILを手放さないため、プロセスに分散する
+        # （スレッドのあるプロセスをforkしないよう、forkserverから起動する）
+        with ProcessPoolExecutor(
+            mp_context=multiprocessing.get_context("forkserver")
+        ) as executor:
+            return list(
+                executor.map(
+                    read_headings,
+                    itertools.repeat(self._root),
+                    paths,
+                    chunksize=OUTLINE_CHUNK_SIZE,
+                )
+            )
+
+    @staticmethod
+    def _index_headings(
+        doc_ids: list[int], outlines: list[tuple[Heading, ...]]
+    ) -> HeadingIndex:
+        index = HeadingIndex()
+        for doc_id, headings in zip(doc_ids, outlines, strict=True):
+            index.add(doc_id, headings)
+
+        return index
+
+    def _build_dates(self, column: Callable[[int], float]) -> DateIndex:
+        index = DateIndex()
+        for doc_id in self._order:
+            timestamp = column(doc_id)
+            if not math.isnan(timestamp):
+                index.add_timestamp(doc_id, timestamp)
+
+        return index
+
+    def _text(self, doc_id: int) -> str:
+        if self._content_index is not None:
+            return self._content_index.text(doc_id)
+        if doc_id in self._texts or self._cached_texts is None:
+            return self._texts[doc_id]
+
+        return self._cached_texts[doc_id]
+
+    def _raw_text(self, doc_id: int) -> str | bytes:
+        """保存用の本文（キャッシュから復元したままの本文はデコードしない）"""
+        if (
+            self._content_index is None
+            and doc_id not in self._texts
+            and self._cached_texts is not None
+        ):
+            return self._cached_texts.raw(doc_id)
+
+        return self._text(doc_id)
+
+    def _refresh(self) -> bool:
+        """変更を反映する（バックグラウンドで作り直しを始めた場合はTrue）"""
+        previous = self._snapshot
+        if previous is None:
+            with self._lock:
+                cached = self._cache.load() if self._cache is not None else None
+                if cached is None:
+                    self._load_all()
+                    return False
+
+                # 保存後に変更されたファイルだけを読み直す
+                self._restore(cached)
+                previous = cached.snapshot
+
+        snapshot, git = self._scan(previous)
+        changes = self._detector.diff(previous, snapshot)
+        digests: Digests = {}
+        if changes and self._config.change_detection == "hash":
+            # 内容が同じファイルはstat情報だけを更新し、zkでは読み直さない
+            changes, digests = self._detector.verify(changes, self._digests)
+        if snapshot == previous and git == self._git:
+            return False
+
+        if (
+            self._config.consistency == "stale"
+            and len(changes.changed) + len(changes.removed)
+            > self._config.rebuild_threshold
+        ):
+            with self._lock:
+                shadow = self._fork()
+                self._stale = True
+                self._pending = []
+            # 作り直しは全ての呼び出しで共有するため、始めた呼び出しのコンテキスト
+            # （取り消しやレーン）は引き継がない
+            threading.Thread(
+                target=self._rebuild,
+                args=(shadow, snapshot, git, changes, digests),
+                name="catalog-rebuild",
+                daemon=True,
+            ).start()
+            return True
+
+        with self._lock:
+            self._apply(snapshot, git, changes, digests)
+            self._save()
+        return False
+
+    def _apply(
+        self,
+        snapshot: Snapshot,
+        git: GitState | None,
+        changes: Changes,
+        digests: Digests,
+    ) -> None:
+        self._digests.update(digests)
+        for path in changes.removed:
+            self._remove(path)
+            self._digests.pop(path, None)
+
+        changed = [Path(path) for path in sorted(changes.changed)]
+        listed: set[str] = set()
+        for i in range(0, len(changed), BATCH_SIZE):
+            for note in self._client.get_documents(changed[i : i + BATCH_SIZE]):
+                self._upsert(note)
+                listed.add(str(note.path))
+
+        # zkの管理対象外になったファイルは取り除く
+        for path in changes.changed - listed:
+            self._remove(path)
+
+        self._snapshot = snapshot
+        self._git = git
+        self._generation += 1
+
+    def _write(self, note: Note) -> None:
+        """書き込んだノートを反映し、作り直し中なら入れ替え後の世代にも残す"""
+        self._upsert(note)
+        # 内容のハッシュが一致して、次の更新で読み直しが省かれないようにする
+        self._digests.pop(str(note.path), None)
+        if self._pending is not None:
+            self._pending.append(note)
+
+    def _fork(self) -> "NoteCatalog":
+        """作り直し用に、現在の世代の列を複製したカタログを返す
+
+        インデックスは複製せず、作り直した後に組み立てる。
+        """
+        shadow = self.model_copy()
+        shadow._lock = threading.RLock()
+        shadow._table = self._table.copy()
+        shadow._ids = dict(self._ids)
+        shadow._free_ids = list(self._free_ids)
+        shadow._order = list(self._order)
+        shadow._positions = dict(self._positions)
+        shadow._digests = dict(self._digests)
+        shadow._texts = {doc_id: self._text(doc_id) for doc_id in self._order}
+        shadow._cached_texts = None
+        shadow._title_index = None
+        shadow._content_index = None
+        shadow._identifier_index = None
+        shadow._tag_index = None
+        shadow._created_index = None
+        shadow._modified_index = None
+        shadow._heading_index = None
+        shadow._pending = None
+        return shadow
+
+    def _rebuild(
+        self,
+        shadow: "NoteCatalog",
+        snapshot: Snapshot,
+        git: GitState | None,
+        changes: Changes,
+        digests: Digests,
+    ) -> None:
+        try:
+            # zk listは対話的なツールの呼び出しに譲る
+            with scheduler.lane(Lane.BACKGROUND):
+                shadow._apply(snapshot, git, changes, digests)
+            # 公開中の世代で組み立て済みのインデックスは、入れ替える前に組み立てる
+            for build, index in (
+                (shadow._titles, self._title_index),
+                (shadow._contents, self._content_index),
+                (shadow._identifiers, self._identifier_index),
+                (shadow._tags, self._tag_index),
+                (shadow._created_dates, self._created_index),
+                (shadow._modified_dates, self._modified_index),
+                (shadow._headings, self._heading_index),
+            ):
+                if index is not None:
+                    build()
+            shadow._save()
+
+            with self._lock:
+                # 複製した後に書き込んだノートを、作り直した世代にも適用する
+                for note in self._pending or []:
+                    shadow._write(note)
+                generation = max(self._generation, shadow._generation) + 1
+                for name in GENERATION_FIELDS:
+                    setattr(self, name, getattr(shadow, name))
+                self._generation = generation
+        except Exception:
+            # 失敗した場合は前の世代のまま、次の問い合わせで改めて反映する
+            logger.exception("Failed to rebuild the note catalog")
+        finally:
+            with self._lock:
+                self._stale = False
+                self._pending = None
+            self._updating.release()
+
+    def _scan(self, previous: Snapshot | None) -> tuple[Snapshot, GitState | None]:
+        if self._config.change_detection != "git":
+            return self._detector.scan(), None
+
+        git = self._detector.git_state()
+        if previous is not None and git is not None and self._git is not None:
+            paths = self._detector.git_changes(self._git, git)
+            if paths is not None:
+                return self._detector.rescan(previous, paths), git
+
+        # 初回やgitの差分を取れない場合は全ファイルを走査する
+        return self._detector.scan(), git
+
+    def _load_all(self) -> None:
+        snapshot, git = self._scan(None)
+        self._clear()
+        for note in self._client.get_documents():
+            self._upsert(note)
+        if self._config.change_detection == "hash":
+            self._digests = self._detector.digests(snapshot)
+        self._snapshot = snapshot
+        self._git = git
+        self._generation += 1
+        self._save()
+
+    def _clear(self) -> None:
+        self._digests = {}
+        self._git = None
+        self._ids = {}
+        self._table = NoteTable()
+        self._next_id = 0
+        self._free_ids = []
+        self._order = []
+        self._positions = {}
+        self._texts = {}
+        self._cached_texts = None
+        self._title_index = None
+        self._content_index = None
+        self._identifier_index = None
+        self._tag_index = None
+        self._created_index = None
+        self._modified_index = None
+        self._heading_index = None
+
+    def _restore(self, cached: CachedCatalog) -> None:
+        """キャッシュの列をテーブルに戻す（インデックスは使われた時に組み立てる）"""
+        self._clear()
+        rows = cached.rows
+        self._table = NoteTable.from_columns(
+            rows.paths,
+            rows.titles,
+            rows.created,
+            rows.modified,
+            rows.tag_names,
+            rows.tag_counts,
+            rows.tag_data,
+        )
+        count = len(rows.paths)
+        self._ids = dict(zip(rows.paths, range(count)))
+        self._order = list(range(count))
+        self._positions = dict(zip(self._order, self._order))
+        # 本文は索引を組み立てる時や保存し直す時まで、デコードせずに持つ
+        self._cached_texts = rows.texts
+        self._next_id = count
+        self._snapshot = cached.snapshot
+        self._digests = dict(cached.digests)
+        self._git = cached.git
+        self._generation += 1
+
+    def _save(self) -> None:
+        if self._cache is None or self._snapshot is None:
+            return
+
+        table = self._table
+        tag_ids: dict[str, int] = {}
+        rows = CachedRows(
+            paths=[],
+            titles=[],
+            texts=CachedTexts(),
+            created=array("d"),
+            modified=array("d"),
+            tag_names=[],
+            tag_counts=array("H"),
+            tag_data=array("I"),
+        )
+        # 削除で空いたIDを詰めて保存するため、復元時は行番号がそのまま文書IDになる
+        for doc_id in sorted(self._order):
+            tags = table.tags(doc_id)
+            rows.paths.append(table.path(doc_id))
+            rows.titles.append(table.title(doc_id))
+            rows.texts.append(self._raw_text(doc_id))
+            rows.created.append(table.created(doc_id))
+            rows.modified.append(table.modified(doc_id))
+            rows.tag_counts.append(len(tags))
+            rows.tag_data.extend(tag_ids.setdefault(tag, len(tag_ids)) for tag in tags)
+        rows.tag_names.extend(tag_ids)
+
+        try:
+            self._cache.save(
+                CachedCatalog(
+                    snapshot=self._snapshot,
+                    rows=rows,
+                    digests=self._digests,
+                    git=self._git,
+                )
+            )
+        except (OSError, ValueError):
+            # キャッシュは高速化のためのものなので、書き込めなくても処理は続ける
+            # （NULを含むタイトルなど、保存できない文字列がある場合も含む）
+            pass
+
+    def _upsert(self, note: Note) -> None:
+        path = str(note.path)
+        doc_id = self._ids.get(path)
+        if doc_id is None:
+            # ビットセットを密に保つため、削除されたノートのIDを再利用する
+            if self._free_ids:
+                doc_id = self._free_ids.pop()
+            else:
+                doc_id = self._next_id
+                self._next_id += 1
+            self._ids[path] = doc_id
+            self._positions[doc_id] = len(self._order)
+            self._order.append(doc_id)
+
+        # 本文は索引（未構築の場合は_texts）にのみ保持し、一覧用の列には含めない
+        self._table.set(doc_id, note)
+        text = normalize(f"{note.title}\n{note.content or ''}")
+        if self._content_index is None:
+            self._texts[doc_id] = text
+        else:
+            self._content_index.add(doc_id, text, normalized=True)
+
+        # 構築済みのインデックスだけを更新する
+        if self._title_index is not None:
+            self._title_index.add(doc_id, note.title)
+        if self._identifier_index is not None:
+            self._identifier_index.add(doc_id, note.path, note.title)
+        if self._tag_index is not None:
+            self._tag_index.add(doc_id, note.tags)
+        if self._heading_index is not None:
+            # 変更されたノートだけを解析し直す
+            self._heading_index.add(doc_id, parse_headings(note.content or ""))
+        for index, value in (
+            (self._created_index, note.created),
+            (self._modified_index, note.modified),
+        ):
+            if index is None:
+                continue
+            if value is None:
+                index.remove(doc_id)
+            else:
+                index.add(doc_id, value)
+
+    def _remove(self, path: str) -> None:
+        doc_id = self._ids.pop(path, None)
+        if doc_id is None:
+            return
+
+        self._table.delete(doc_id)
+        self._texts.pop(doc_id, None)
+        # 末尾の要素と入れ替えてO(1)で取り除く
+        position = self._positions.pop(doc_id)
+        last = self._order.pop()
+        if last != doc_id:
+            self._order[position] = last
+            self._positions[last] = position
+        for index in (
+            self._title_index,
+            self._content_index,
+            self._identifier_index,
+            self._tag_index,
+            self._created_index,
+            self._modified_index,
+            self._heading_index,
+        ):
+            if index is not None:
+                index.remove(doc_id)
+        self._free_ids.append(doc_id)
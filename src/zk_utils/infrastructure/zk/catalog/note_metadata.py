@@ -0,0 +1,101 @@
+import re
+from datetime import datetime
+from typing import Final, NamedTuple
+
+from ...._markdown import frontmatter_lines
+
+# zkの既定の設定で、フロントマターからタグと作成日時を読むキー
+_TAG_KEYS: Final[tuple[str, ...]] = ("tags", "keywords")
+_DATE_KEYS: Final[tuple[str, ...]] = ("date", "created")
+
+_KEY = re.compile(r"^([A-Za-z_][\w-]*):\s*(.*)$")
+_ITEM = re.compile(r"^\s+-\s+(.*)$")
+# 空白の直後の#で始まる語（数字のみの語は除く）
+_HASHTAG = re.compile(r"(?<!\S)#([\w/-]*[^\W\d][\w/-]*)")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_H1 = re.compile(r"^#\s+(.*?)(?:\s+#+)?\s*$")
+
+
+class NoteMetadata(NamedTuple):
+    # フロントマターのtitle、無い場合は最初のh1見出し（どちらも無い場合はNone）
+    title: str | None
+    tags: list[str]
+    created: datetime | None
+
+
+def parse_metadata(content: str) -> NoteMetadata:
+    """ノートのタイトル、フロントマターのタグと作成日時、本文の#タグを読み取る
+
+    書き込んだノートをzkで読み直さずにカタログへ反映するため、
+    zkの既定の設定（フロントマターのtitle・tags・keywords・date・created、
+    最初のh1見出しと本文の#タグ）と同じ範囲を解釈する。
+    コードブロックの中は対象外とする。
+    """
+    lines = content.splitlines()
+    offset = frontmatter_lines(lines)
+    fields = _frontmatter(lines[1 : offset - 1] if offset else [])
+
+    tags: dict[str, None] = {}
+    for key in _TAG_KEYS:
+        for value in fields.get(key, []):
+            tags.update(dict.fromkeys(t for t in re.split(r"[\s,]+", value) if t))
+
+    title = next(iter(fields.get("title", [])), None) or None
+    fenced = False
+    for line in lines[offset:]:
+        if _FENCE.match(line):
+            fenced = not fenced
+        elif not fenced:
+            if title is None and (heading := _H1.match(line)):
+                title = heading.group(1) or None
+            tags.update(dict.fromkeys(_HASHTAG.findall(line)))
+
+    created = next(
+        (
+            parsed
+            for key in _DATE_KEYS
+            for value in fields.get(key, [])[:1]
+            if (parsed := _parse_datetime(value)) is not None
+        ),
+        None,
+    )
+
+    return NoteMetadata(title=title, tags=list(tags), created=created)
+
+
+def _frontmatter(lines: list[str]) -> dict[str, list[str]]:
+    """キーごとの値（インラインのリストやブロックのリストは要素ごと）を返す"""
+    fields: dict[str, list[str]] = {}
+    key: str | None = None
+    for line in lines:
+        if key is not None and (item := _ITEM.match(line)):
+            fields[key].append(_unquote(item.group(1)))
+            continue
+
+        match = _KEY.match(line)
+        if match is None:
+            key = None
+            continue
+
+        key, value = match.group(1).lower(), match.group(2).strip()
+        if value.startswith("[") and value.endswith("]"):
+            fields[key] = [_unquote(v) for v in value[1:-1].split(",") if v.strip()]
+        else:
+            fields[key] = [_unquote(value)] if value else []
+
+    return fields
+
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+
+    return value
+
+
+def _parse_datetime(value: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
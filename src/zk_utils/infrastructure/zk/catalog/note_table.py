@@ -0,0 +1,213 @@
+import itertools
+import math
+import sys
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+from ..dao.note import Note
+
+
+def _timestamp(value: datetime | None) -> float:
+    return math.nan if value is None else value.timestamp()
+
+
+def _datetime(value: float) -> datetime | None:
+    return None if math.isnan(value) else datetime.fromtimestamp(value, timezone.utc)
+
+
+class NoteTable:
+    """ノートの一覧情報を列ごとに保持するテーブル
+
+    パスとタイトルはインターンした文字列の配列、タグはタグIDの`array('I')`、
+    日時はUNIXタイムスタンプの`array('d')`で持ち、Noteモデルは取り出す時だけ
+    生成する。行番号にはカタログの文書IDをそのまま使う。
+    """
+
+    __slots__ = (
+        "_created",
+        "_garbage",
+        "_modified",
+        "_paths",
+        "_size",
+        "_tag_counts",
+        "_tag_data",
+        "_tag_ids",
+        "_tag_names",
+        "_tag_offsets",
+        "_titles",
+    )
+
+    def __init__(self) -> None:
+        self._paths: list[str | None] = []
+        self._titles: list[str] = []
+        self._created = array("d")
+        self._modified = array("d")
+        # 各行のタグは_tag_dataの[offset, offset + count)に並ぶ
+        self._tag_offsets = array("I")
+        self._tag_counts = array("H")
+        self._tag_data = array("I")
+        self._tag_names: list[str] = []
+        self._tag_ids: dict[str, int] = {}
+        self._garbage = 0
+        self._size = 0
+
+    @classmethod
+    def from_columns(
+        cls,
+        paths: list[str],
+        titles: list[str],
+        created: array[float],
+        modified: array[float],
+        tag_names: list[str],
+        tag_counts: array[int],
+        tag_data: array[int],
+    ) -> "NoteTable":
+        """行番号を文書IDとする列からテーブルをまとめて組み立てる
+
+        tag_dataは各行のタグIDを行順に連結したもので、tag_namesの添字を指す。
+        """
+        table = cls()
+        table._paths = list(paths)
+        table._titles = [sys.intern(title) for title in titles]
+        table._created = array("d", created)
+        table._modified = array("d", modified)
+        table._tag_counts = array("H", tag_counts)
+        table._tag_offsets = array("I", itertools.accumulate(tag_counts, initial=0))
+        table._tag_offsets.pop()
+        table._tag_data = array("I", tag_data)
+        table._tag_names = [sys.intern(name) for name in tag_names]
+        table._tag_ids = {name: i for i, name in enumerate(table._tag_names)}
+        table._size = len(paths)
+        return table
+
+    def copy(self) -> "NoteTable":
+        """列を複製したテーブルを返す（複製の更新は元のテーブルに影響しない）"""
+        table = NoteTable()
+        table._paths = list(self._paths)
+        table._titles = list(self._titles)
+        table._created = array("d", self._created)
+        table._modified = array("d", self._modified)
+        table._tag_offsets = array("I", self._tag_offsets)
+        table._tag_counts = array("H", self._tag_counts)
+        table._tag_data = array("I", self._tag_data)
+        table._tag_names = list(self._tag_names)
+        table._tag_ids = dict(self._tag_ids)
+        table._garbage = self._garbage
+        table._size = self._size
+        return table
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, doc_id: int) -> bool:
+        return 0 <= doc_id < len(self._paths) and self._paths[doc_id] is not None
+
+    def set(self, doc_id: int, note: Note) -> None:
+        self.set_row(
+            doc_id,
+            str(note.path),
+            note.title,
+            note.tags,
+            _timestamp(note.created),
+            _timestamp(note.modified),
+        )
+
+    def set_row(
+        self,
+        doc_id: int,
+        path: str,
+        title: str,
+        tags: Iterable[str],
+        created: float,
+        modified: float,
+    ) -> None:
+        """列の値を直接格納する（日時はUNIXタイムスタンプ、無い場合はNaN）"""
+        while len(self._paths) <= doc_id:
+            self._paths.append(None)
+            self._titles.append("")
+            self._created.append(math.nan)
+            self._modified.append(math.nan)
+            self._tag_offsets.append(0)
+            self._tag_counts.append(0)
+
+        if doc_id in self:
+            self._garbage += self._tag_counts[doc_id]
+        else:
+            self._size += 1
+
+        offset = len(self._tag_data)
+        self._tag_data.extend(self._tag_id(tag) for tag in tags)
+
+        self._paths[doc_id] = sys.intern(path)
+        self._titles[doc_id] = sys.intern(title)
+        self._created[doc_id] = created
+        self._modified[doc_id] = modified
+        self._tag_offsets[doc_id] = offset
+        self._tag_counts[doc_id] = len(self._tag_data) - offset
+
+        # 更新で使われなくなったタグIDが半分を超えたら詰め直す
+        if self._garbage > len(self._tag_data) // 2:
+            self._compact()
+
+    def delete(self, doc_id: int) -> None:
+        if doc_id not in self:
+            return
+
+        self._paths[doc_id] = None
+        self._titles[doc_id] = ""
+        self._garbage += self._tag_counts[doc_id]
+        self._tag_counts[doc_id] = 0
+        self._size -= 1
+
+    def path(self, doc_id: int) -> str:
+        path = self._paths[doc_id]
+        if path is None:
+            raise KeyError(doc_id)
+
+        return path
+
+    def title(self, doc_id: int) -> str:
+        return self._titles[doc_id]
+
+    def created(self, doc_id: int) -> float:
+        return self._created[doc_id]
+
+    def modified(self, doc_id: int) -> float:
+        return self._modified[doc_id]
+
+    def tags(self, doc_id: int) -> list[str]:
+        offset = self._tag_offsets[doc_id]
+        ids = self._tag_data[offset : offset + self._tag_counts[doc_id]]
+        return [self._tag_names[tag_id] for tag_id in ids]
+
+    def note(self, doc_id: int) -> Note:
+        # 列から組み立てた値のため、検証を省略して生成する
+        return Note.model_construct(
+            title=self._titles[doc_id],
+            path=Path(self.path(doc_id)),
+            tags=self.tags(doc_id),
+            created=_datetime(self._created[doc_id]),
+            modified=_datetime(self._modified[doc_id]),
+        )
+
+    def _tag_id(self, tag: str) -> int:
+        tag_id = self._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = len(self._tag_names)
+            self._tag_names.append(sys.intern(tag))
+            self._tag_ids[tag] = tag_id
+
+        return tag_id
+
+    def _compact(self) -> None:
+        data = array("I")
+        for doc_id in range(len(self._paths)):
+            offset = self._tag_offsets[doc_id]
+            count = self._tag_counts[doc_id]
+            self._tag_offsets[doc_id] = len(data)
+            data.extend(self._tag_data[offset : offset + count])
+
+        self._tag_data = data
+        self._garbage = 0
@@ -0,0 +1,61 @@
+class _TrieNode:
+    __slots__ = ("children", "doc_ids")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.doc_ids: set[int] = set()
+
+
+class PrefixTrie:
+    """文字列の前方一致で文書IDを引くためのトライ木"""
+
+    __slots__ = ("_keys", "_root")
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        self._keys: dict[int, str] = {}
+
+    def add(self, doc_id: int, key: str) -> None:
+        if doc_id in self._keys:
+            self.remove(doc_id)
+
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+        node.doc_ids.add(doc_id)
+        self._keys[doc_id] = key
+
+    def remove(self, doc_id: int) -> None:
+        key = self._keys.pop(doc_id, None)
+        if key is None:
+            return
+
+        # 葉から順に空になったノードを刈り込む
+        path = [self._root]
+        for char in key:
+            path.append(path[-1].children[char])
+        path[-1].doc_ids.discard(doc_id)
+
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if node.doc_ids or node.children:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+
+    def search(self, prefix: str, limit: int) -> list[int]:
+        """前方一致する文書IDを短いキーから順に最大limit件返す"""
+        node = self._root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                return []
+            node = child
+
+        results: list[int] = []
+        level = [node]
+        while level and len(results) < limit:
+            for current in level:
+                results.extend(sorted(current.doc_ids))
+            level = [child for current in level for child in current.children.values()]
+
+        return results[:limit]
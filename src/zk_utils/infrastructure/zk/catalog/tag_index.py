@@ -0,0 +1,100 @@
+import fnmatch
+from typing import Iterator, Literal
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """ビットセットで立っているビットの位置を昇順に返す"""
+    for i, bit in enumerate(reversed(bin(bits)[2:])):
+        if bit == "1":
+            yield i
+
+
+def _negation(tag: str) -> str | None:
+    if tag.startswith("-"):
+        return tag[1:]
+    if tag.startswith("NOT "):
+        return tag[4:]
+    return None
+
+
+class TagIndex:
+    """タグごとのノート集合をビットセット（int）で保持する索引
+
+    AND/ORはビット演算、ノート数はビットの個数で求める。
+    zkと同様に`*`のグロブと`-`/`NOT `による否定を受け付ける。
+    タグの無いノートの集合も追加・削除のたびに更新する。
+    """
+
+    __slots__ = ("_all", "_bitsets", "_tagless", "_tags")
+
+    def __init__(self) -> None:
+        self._all = 0
+        self._tagless = 0
+        self._bitsets: dict[str, int] = {}
+        self._tags: dict[int, tuple[str, ...]] = {}
+
+    @property
+    def all(self) -> int:
+        return self._all
+
+    @property
+    def tagless(self) -> int:
+        return self._tagless
+
+    def add(self, doc_id: int, tags: list[str]) -> None:
+        if doc_id in self._tags:
+            self.remove(doc_id)
+
+        bit = 1 << doc_id
+        self._all |= bit
+        self._tags[doc_id] = tuple(tags)
+        if not tags:
+            self._tagless |= bit
+        for tag in tags:
+            self._bitsets[tag] = self._bitsets.get(tag, 0) | bit
+
+    def remove(self, doc_id: int) -> None:
+        tags = self._tags.pop(doc_id, None)
+        if tags is None:
+            return
+
+        mask = ~(1 << doc_id)
+        self._all &= mask
+        self._tagless &= mask
+        for tag in tags:
+            bits = self._bitsets[tag] & mask
+            if bits:
+                self._bitsets[tag] = bits
+            else:
+                del self._bitsets[tag]
+
+    def _lookup(self, tag: str) -> int:
+        negated = _negation(tag)
+        if negated is not None:
+            return self._all & ~self._lookup(negated)
+
+        if "*" not in tag:
+            return self._bitsets.get(tag, 0)
+
+        bits = 0
+        for name in fnmatch.filter(self._bitsets, tag):
+            bits |= self._bitsets[name]
+        return bits
+
+    def match(self, tags: list[str], match_mode: Literal["AND", "OR"]) -> int:
+        if not tags:
+            return 0
+
+        result = self._lookup(tags[0])
+        for tag in tags[1:]:
+            if match_mode == "AND":
+                if not result:
+                    break
+                result &= self._lookup(tag)
+            else:
+                result |= self._lookup(tag)
+
+        return result
+
+    def counts(self) -> dict[str, int]:
+        return {tag: bits.bit_count() for tag, bits in sorted(self._bitsets.items())}
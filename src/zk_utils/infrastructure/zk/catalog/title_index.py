@@ -0,0 +1,131 @@
+import heapq
+import math
+from typing import Final, Literal
+
+from .ngram_index import NgramIndex, has_non_ascii, normalize
+from .prefix_trie import PrefixTrie
+
+# 前方一致・部分一致しないタイトルを候補に残すtrigram類似度の下限
+MIN_SIMILARITY: Final[float] = 0.3
+# 編集距離を計算する候補数（limitに対する倍率）
+CANDIDATE_FACTOR: Final[int] = 4
+
+
+def edit_distance(source: str, target: str) -> int:
+    """レーベンシュタイン距離"""
+    if len(source) < len(target):
+        source, target = target, source
+
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, start=1):
+        current = [i]
+        for j, target_char in enumerate(target, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (source_char != target_char),
+                )
+            )
+        previous = current
+
+    return previous[-1]
+
+
+def _pad(text: str) -> str:
+    return f"  {text} "
+
+
+class TitleIndex:
+    """タイトルの部分一致・前方一致・あいまい検索用インデックス
+
+    部分一致はCJK向けのbigram、あいまい検索は前後を空白で埋めたtrigram、
+    前方一致はトライ木で候補を絞り込む。
+    """
+
+    __slots__ = ("_bigrams", "_titles", "_trie", "_trigrams")
+
+    def __init__(self) -> None:
+        self._titles: dict[int, str] = {}
+        self._bigrams = NgramIndex(2, gram_filter=has_non_ascii)
+        self._trigrams = NgramIndex(3)
+        self._trie = PrefixTrie()
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def add(self, doc_id: int, title: str) -> None:
+        normalized = normalize(title)
+        self._titles[doc_id] = normalized
+        self._bigrams.add(doc_id, title)
+        self._trigrams.add(doc_id, _pad(title))
+        self._trie.add(doc_id, normalized)
+
+    def remove(self, doc_id: int) -> None:
+        if self._titles.pop(doc_id, None) is None:
+            return
+
+        self._bigrams.remove(doc_id)
+        self._trigrams.remove(doc_id)
+        self._trie.remove(doc_id)
+
+    def search_all(
+        self, patterns: list[str], match_mode: Literal["AND", "OR"]
+    ) -> set[int]:
+        return self._bigrams.search_all(patterns, match_mode)
+
+    def find(self, query: str, limit: int) -> list[int]:
+        """クエリに近いタイトルの文書IDを順位付けして返す
+
+        完全一致、前方一致、部分一致、trigram類似度の順に並べ、
+        同順位は編集距離の小さいものを優先する。
+        """
+        normalized = normalize(query)
+        if not normalized or limit <= 0:
+            return []
+
+        overlap = self._trigrams.overlap(_pad(query))
+        query_gram_count = len(self._trigrams.grams(_pad(normalized)))
+        candidate_limit = limit * CANDIDATE_FACTOR
+
+        # 類似度が下限に届かない共通trigram数の候補は先に除外する
+        min_shared = math.ceil(query_gram_count * MIN_SIMILARITY)
+        candidates = {
+            doc_id for doc_id, shared in overlap.items() if shared >= min_shared
+        }
+        candidates.update(self._trie.search(normalized, candidate_limit))
+        if has_non_ascii(normalized):
+            candidates.update(self._bigrams.search(normalized))
+
+        ranked: list[tuple[int, float, int]] = []
+        for doc_id in candidates:
+            title = self._titles[doc_id]
+            shared = overlap.get(doc_id, 0)
+            similarity = shared / (
+                query_gram_count + self._trigrams.gram_count(doc_id) - shared
+            )
+
+            if title == normalized:
+                rank = 0
+            elif title.startswith(normalized):
+                rank = 1
+            elif normalized in title:
+                rank = 2
+            elif similarity >= MIN_SIMILARITY:
+                rank = 3
+            else:
+                continue
+
+            ranked.append((rank, -similarity, doc_id))
+
+        top = heapq.nsmallest(candidate_limit, ranked)
+        top.sort(
+            key=lambda item: (
+                item[0],
+                item[1],
+                edit_distance(normalized, self._titles[item[2]]),
+                self._titles[item[2]],
+            )
+        )
+
+        return [doc_id for _, _, doc_id in top[:limit]]
@@ -1,3 +1,4 @@
+from datetime import datetime
 from pathlib import Path
 
 from ...._base_models import BaseModel
@@ -8,3 +9,5 @@ class Note(BaseModel):
     path: Path
     tags: list[str]
     content: str | None = None
+    created: datetime | None = None
+    modified: datetime | None = None
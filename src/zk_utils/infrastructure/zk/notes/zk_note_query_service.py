@@ -1,11 +1,18 @@
 import math
-from typing import TypeVar
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Sequence, TypeVar
 
 from injector import inject, singleton
 
 from ....application._common.note import Note
+from ....application._common.outline import OutlineHeading
 from ....application._common.pagination import Pagination
 from ....application.notes import IFNoteQueryService
+from ....application.notes.find_notes_by_title import (
+    FindNotesByTitleInput,
+    FindNotesByTitleOutput,
+)
 from ....application.notes.get_link_to_notes import (
     GetLinkToNotesInput,
     GetLinkToNotesOutput,
@@ -15,10 +22,26 @@ from ....application.notes.get_linked_by_notes import (
     GetLinkedByNotesOutput,
 )
 from ....application.notes.get_notes import GetNotesInput, GetNotesOutput
+from ....application.notes.get_outlines import (
+    GetOutlinesInput,
+    GetOutlinesOutput,
+    NoteOutline,
+)
 from ....application.notes.get_related_notes import (
     GetRelatedNotesInput,
     GetRelatedNotesOutput,
 )
+from ....application.notes.search_headings import (
+    HeadingMatch,
+    SearchHeadingsInput,
+    SearchHeadingsOutput,
+)
+from ..catalog import Heading, NoteCatalog
+from ..catalog.date_parser import parse_date
+from ..catalog.ngram_index import has_non_ascii
+from ..catalog.title_index import TitleIndex
+from ..dao.note import Note as DaoNote
+from ..prefetch import Prefetcher
 from ..zk_client import ZkClient
 
 T = TypeVar("T")
@@ -27,16 +50,73 @@ T = TypeVar("T")
 @singleton
 class ZkNoteQueryService(IFNoteQueryService):
     _client: ZkClient
+    _catalog: NoteCatalog
+    _prefetcher: Prefetcher | None
 
     @inject
-    def __init__(self, client: ZkClient) -> None:
+    def __init__(
+        self,
+        client: ZkClient,
+        catalog: NoteCatalog,
+        prefetcher: Prefetcher | None = None,
+    ) -> None:
         super().__init__()
         self._client = client
+        self._catalog = catalog
+        self._prefetcher = prefetcher
+
+    def _use_ngram(self, patterns: list[str]) -> bool:
+        # zkのFTSは日本語の部分一致が苦手なため、非ASCIIを含む場合はn-gramで検索する
+        return self._catalog.enabled and any(has_non_ascii(p) for p in patterns)
+
+    def _date_range(
+        self, after: str | None, before: str | None
+    ) -> tuple[datetime | None, datetime | None] | None:
+        """カタログで評価できる日付条件の場合は日時の範囲を返す"""
+        if not self._catalog.enabled or (after is None and before is None):
+            return None
+
+        start = parse_date(after) if after is not None else None
+        end = parse_date(before) if before is not None else None
+        if (after is not None and start is None) or (
+            before is not None and end is None
+        ):
+            return None
+
+        return start, end
+
+    @staticmethod
+    def _intersect(paths: set[Path] | None, matched: set[Path]) -> set[Path]:
+        return matched if paths is None else paths & matched
+
+    @staticmethod
+    def _to_notes(results: Iterable[DaoNote]) -> list[Note]:
+        return [
+            Note(title=result.title, path=result.path, tags=result.tags)
+            for result in results
+        ]
+
+    @staticmethod
+    def _to_heading(heading: Heading, parents: list[str]) -> OutlineHeading:
+        # 行番号は0始まりの半開区間から、1始まりの閉区間にする
+        return OutlineHeading(
+            level=heading.level,
+            text=heading.text,
+            line=heading.start + 1,
+            end_line=max(heading.start + 1, heading.end),
+            parents=parents,
+        )
 
     def _paginate(
-        self, items: list[T], page: int, per_page: int
+        self, items: Sequence[T], page: int, per_page: int
     ) -> tuple[list[T], Pagination]:
-        total = len(items)
+        window, pagination = self._page_window(len(items), page, per_page)
+
+        return list(items[window]), pagination
+
+    @staticmethod
+    def _page_window(total: int, page: int, per_page: int) -> tuple[slice, Pagination]:
+        """総数からページの範囲とページ情報を求める"""
         total_pages = math.ceil(total / per_page) if per_page > 0 else 1
 
         # ページ番号の正規化
@@ -45,7 +125,6 @@ class ZkNoteQueryService(IFNoteQueryService):
         # スライス計算
         start_idx = (page - 1) * per_page
         end_idx = start_idx + per_page
-        paginated_items = items[start_idx:end_idx]
 
         pagination = Pagination(
             page=page,
@@ -56,12 +135,43 @@ class ZkNoteQueryService(IFNoteQueryService):
             has_prev=page > 1,
         )
 
-        return paginated_items, pagination
+        return slice(start_idx, end_idx), pagination
 
     def get_notes(self, input_data: GetNotesInput) -> GetNotesOutput:
+        if self._prefetcher is not None and self._prefetcher.enabled:
+            return self._prefetcher.get_notes(input_data, self._get_notes)
+
+        return self._get_notes(input_data)
+
+    def _get_notes(self, input_data: GetNotesInput) -> GetNotesOutput:
+        # カタログで絞り込んだパス（Noneの場合は絞り込みなし）
+        catalog_paths: set[Path] | None = None
+        use_title_index = self._use_ngram(input_data.title_patterns)
+        use_content_index = self._use_ngram(input_data.search_patterns)
+        use_tag_index = self._catalog.enabled and len(input_data.tags) > 0
+        created_range = self._date_range(
+            input_data.created_after, input_data.created_before
+        )
+        modified_range = self._date_range(
+            input_data.modified_after, input_data.modified_before
+        )
+        if (
+            use_title_index
+            or use_content_index
+            or use_tag_index
+            or created_range is not None
+            or modified_range is not None
+        ):
+            self._catalog.refresh()
+
         # title の検索条件を追加
         title_conditions: list[str] = []
-        if len(input_data.title_patterns) > 0:
+        if use_title_index:
+            matched = self._catalog.match_titles(
+                input_data.title_patterns, input_data.title_match_mode
+            )
+            catalog_paths = self._intersect(catalog_paths, matched)
+        elif len(input_data.title_patterns) > 0:
             title_filters = [f"title: {t}" for t in input_data.title_patterns]
             title_conditions = [
                 "--match",
@@ -70,7 +180,12 @@ class ZkNoteQueryService(IFNoteQueryService):
 
         # 全文検索の検索条件を追加
         search_conditions: list[str] = []
-        if len(input_data.search_patterns) > 0:
+        if use_content_index:
+            matched = self._catalog.match_contents(
+                input_data.search_patterns, input_data.search_match_mode
+            )
+            catalog_paths = self._intersect(catalog_paths, matched)
+        elif len(input_data.search_patterns) > 0:
             search_filters = input_data.search_patterns
             search_conditions = [
                 "--match",
@@ -79,83 +194,207 @@ class ZkNoteQueryService(IFNoteQueryService):
 
         # tag
         tag_conditions: list[str] = []
-        if len(input_data.tags) > 0:
+        if use_tag_index:
+            matched = self._catalog.match_tags(
+                input_data.tags, input_data.tags_match_mode
+            )
+            catalog_paths = self._intersect(catalog_paths, matched)
+        elif len(input_data.tags) > 0:
             tag_delimiter = ", " if input_data.tags_match_mode == "AND" else "OR"
             tag_conditions = ["--tag", f"{tag_delimiter}".join(input_data.tags)]
 
-        # created after
-        created_after_conditions = []
-        if input_data.created_after is not None:
-            created_after_conditions = ["--created-after", input_data.created_after]
-
-        # modified after
-        modified_after_conditions = []
-        if input_data.modified_after is not None:
-            modified_after_conditions = ["--modified-after", input_data.modified_after]
-
-        results = self._client.get_notes(
+        # created
+        created_conditions: list[str] = []
+        if created_range is not None:
+            matched = self._catalog.match_created(*created_range)
+            catalog_paths = self._intersect(catalog_paths, matched)
+        else:
+            if input_data.created_after is not None:
+                created_conditions += ["--created-after", input_data.created_after]
+            if input_data.created_before is not None:
+                created_conditions += ["--created-before", input_data.created_before]
+
+        # modified
+        modified_conditions: list[str] = []
+        if modified_range is not None:
+            matched = self._catalog.match_modified(*modified_range)
+            catalog_paths = self._intersect(catalog_paths, matched)
+        else:
+            if input_data.modified_after is not None:
+                modified_conditions += ["--modified-after", input_data.modified_after]
+            if input_data.modified_before is not None:
+                modified_conditions += [
+                    "--modified-before",
+                    input_data.modified_before,
+                ]
+
+        conditions = (
             title_conditions
             + search_conditions
             + tag_conditions
-            + created_after_conditions
-            + modified_after_conditions
+            + created_conditions
+            + modified_conditions
         )
 
-        notes: list[Note] = []
-        for result in results:
-            note = Note(title=result.title, path=result.path, tags=result.tags)
-            notes.append(note)
-
-        paginated_notes, pagination = self._paginate(
-            notes, input_data.page, input_data.per_page
+        page, per_page = input_data.page, input_data.per_page
+        if catalog_paths is not None and len(conditions) == 0:
+            # 表示するページ分だけ、カタログのロックを持ったままノートを取り出す
+            paginated_results, total = self._catalog.get_notes(
+                catalog_paths,
+                lambda total: self._page_window(total, page, per_page)[0],
+            )
+            _, pagination = self._page_window(total, page, per_page)
+        else:
+            if catalog_paths is None:
+                results = self._client.get_notes(conditions)
+            else:
+                # 残りの条件はzkで評価し、カタログの結果と突き合わせる
+                results = [
+                    result
+                    for result in self._client.get_notes(conditions)
+                    if result.path in catalog_paths
+                ]
+
+            # 表示するページ分だけ出力用のモデルに変換する
+            paginated_results, pagination = self._paginate(results, page, per_page)
+        paginated_notes = self._to_notes(paginated_results)
+        state = self._catalog.index_state()
+
+        return GetNotesOutput(
+            pagination=pagination,
+            notes=paginated_notes,
+            index_generation=state.generation,
+            stale=state.stale,
         )
 
-        return GetNotesOutput(pagination=pagination, notes=paginated_notes)
-
     def get_link_to_notes(
         self, input_data: GetLinkToNotesInput
     ) -> GetLinkToNotesOutput:
-        results = self._client.get_notes(["--link-to", str(input_data.path)])
+        path = self._catalog.resolve_path(input_data.path)
+        results = self._client.get_notes(["--link-to", str(path)])
 
-        notes: list[Note] = []
-        for result in results:
-            note = Note(title=result.title, path=result.path, tags=result.tags)
-            notes.append(note)
-
-        paginated_notes, pagination = self._paginate(
-            notes, input_data.page, input_data.per_page
+        # 表示するページ分だけ出力用のモデルに変換する
+        paginated_results, pagination = self._paginate(
+            results, input_data.page, input_data.per_page
         )
+        paginated_notes = self._to_notes(paginated_results)
 
         return GetLinkToNotesOutput(pagination=pagination, notes=paginated_notes)
 
     def get_linked_by_notes(
         self, input_data: GetLinkedByNotesInput
     ) -> GetLinkedByNotesOutput:
-        results = self._client.get_notes(["--linked-by", str(input_data.path)])
-
-        notes: list[Note] = []
-        for result in results:
-            note = Note(title=result.title, path=result.path, tags=result.tags)
-            notes.append(note)
+        path = self._catalog.resolve_path(input_data.path)
+        results = self._client.get_notes(["--linked-by", str(path)])
 
-        paginated_notes, pagination = self._paginate(
-            notes, input_data.page, input_data.per_page
+        # 表示するページ分だけ出力用のモデルに変換する
+        paginated_results, pagination = self._paginate(
+            results, input_data.page, input_data.per_page
         )
+        paginated_notes = self._to_notes(paginated_results)
 
         return GetLinkedByNotesOutput(pagination=pagination, notes=paginated_notes)
 
     def get_related_notes(
         self, input_data: GetRelatedNotesInput
     ) -> GetRelatedNotesOutput:
-        results = self._client.get_notes(["--related", str(input_data.path)])
+        path = self._catalog.resolve_path(input_data.path)
+        results = self._client.get_notes(["--related", str(path)])
 
-        notes: list[Note] = []
-        for result in results:
-            note = Note(title=result.title, path=result.path, tags=result.tags)
-            notes.append(note)
-
-        paginated_notes, pagination = self._paginate(
-            notes, input_data.page, input_data.per_page
+        # 表示するページ分だけ出力用のモデルに変換する
+        paginated_results, pagination = self._paginate(
+            results, input_data.page, input_data.per_page
         )
+        paginated_notes = self._to_notes(paginated_results)
 
         return GetRelatedNotesOutput(pagination=pagination, notes=paginated_notes)
+
+    def find_notes_by_title(
+        self, input_data: FindNotesByTitleInput
+    ) -> FindNotesByTitleOutput:
+        if self._catalog.enabled:
+            self._catalog.refresh_throttled()
+            results = self._catalog.find_titles(input_data.query, input_data.limit)
+        else:
+            # カタログ（本文を含む全件）は読み込まず、zkのタイトル一覧に順位を付ける
+            notes = self._client.get_notes()
+            index = TitleIndex()
+            for doc_id, note in enumerate(notes):
+                index.add(doc_id, note.title)
+            results = [
+                notes[doc_id]
+                for doc_id in index.find(input_data.query, input_data.limit)
+            ]
+        state = self._catalog.index_state()
+
+        return FindNotesByTitleOutput(
+            notes=self._to_notes(results),
+            index_generation=state.generation,
+            stale=state.stale,
+        )
+
+    def search_headings(self, input_data: SearchHeadingsInput) -> SearchHeadingsOutput:
+        self._catalog.refresh_throttled()
+        results, total = self._catalog.search_headings(
+            input_data.query, set(input_data.levels), input_data.limit
+        )
+        state = self._catalog.index_state()
+
+        return SearchHeadingsOutput(
+            matches=[
+                HeadingMatch(
+                    note=Note(
+                        title=result.note.title,
+                        path=result.note.path,
+                        tags=result.note.tags,
+                    ),
+                    heading=self._to_heading(result.heading, result.parents),
+                )
+                for result in results
+            ],
+            total=total,
+            index_generation=state.generation,
+            stale=state.stale,
+        )
+
+    def get_outlines(self, input_data: GetOutlinesInput) -> GetOutlinesOutput:
+        paths = [self._catalog.resolve_path(path) for path in input_data.paths]
+        self._catalog.refresh_throttled()
+        results = self._catalog.outlines(paths)
+        state = self._catalog.index_state()
+
+        outlines: list[NoteOutline] = []
+        missing: list[Path] = []
+        for path, result in zip(input_data.paths, results, strict=True):
+            if result is None:
+                missing.append(path)
+                continue
+
+            # 親の見出しはノート内の位置で参照されるため、先頭から順に組み立てる
+            chains: list[list[str]] = []
+            headings: list[OutlineHeading] = []
+            for heading in result.headings:
+                parents = (
+                    []
+                    if heading.parent < 0
+                    else [*chains[heading.parent], result.headings[heading.parent].text]
+                )
+                chains.append(parents)
+                headings.append(self._to_heading(heading, parents))
+            outlines.append(
+                NoteOutline(
+                    note=Note(
+                        title=result.note.title,
+                        path=result.note.path,
+                        tags=result.note.tags,
+                    ),
+                    headings=headings,
+                )
+            )
+
+        return GetOutlinesOutput(
+            outlines=outlines,
+            missing=missing,
+            index_generation=state.generation,
+            stale=state.stale,
+        )
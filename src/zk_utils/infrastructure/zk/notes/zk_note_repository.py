@@ -1,23 +1,59 @@
+import bisect
+import contextvars
+import itertools
+import math
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Final
 
 from injector import inject, singleton
 
+from ....application.notes.get_random_notes import SAMPLE_HISTORY_SIZE
 from ....domain.models.notes.if_note_repository import IFNoteRepository
 from ....domain.models.notes.note import Note
+from ....domain.models.notes.note_draft import NoteCreation, NoteDraft
+from ....domain.models.notes.note_page import NotePage
+from ....domain.models.notes.note_source import NoteSource
+from ..catalog import NoteCatalog
+from ..dao.note import Note as DaoNote
+from ..prefetch import Prefetcher
 from ..zk_client import ZkClient
 
+# まとめて作成する時に同時に実行するzk newの数
+CREATE_CONCURRENCY: Final[int] = 4
+
 
 @singleton
 class ZkNoteRepository(IFNoteRepository):
     _client: ZkClient
+    _catalog: NoteCatalog
+    _prefetcher: Prefetcher | None
+    _rng: random.Random
+    # カタログが無効な場合に、ランダム取得で返したノートのパス
+    _sampled: deque[str]
 
     @inject
-    def __init__(self, client: ZkClient) -> None:
+    def __init__(
+        self,
+        client: ZkClient,
+        catalog: NoteCatalog,
+        prefetcher: Prefetcher | None = None,
+    ) -> None:
         super().__init__()
         self._client = client
+        self._catalog = catalog
+        self._prefetcher = prefetcher
+        self._rng = random.Random()
+        self._sampled = deque(maxlen=SAMPLE_HISTORY_SIZE)
 
     def find_note_content(self, path: Path) -> Note:
-        result = self._client.get_note(path)
+        path = self._catalog.resolve_path(path)
+        if self._prefetcher is not None and self._prefetcher.enabled:
+            result = self._prefetcher.get_note(path)
+        else:
+            result = self._client.get_note(path)
 
         if result is None:
             raise ValueError(f"Note not found at path: {path}")
@@ -31,11 +67,93 @@ class ZkNoteRepository(IFNoteRepository):
 
     def create_note(self, title: str, path: Path) -> Note:
         result = self._client.create_note(title, path)
+        # 次の検索でzk indexやノートブックの走査を待たずに見つかるようにする
+        self._catalog.add_written([result])
+        if self._prefetcher is not None:
+            # 先読みした検索結果には作成したノートが含まれない
+            self._prefetcher.invalidate()
 
         return Note(title=result.title, path=result.path, tags=[])
 
+    def create_notes(self, drafts: list[NoteDraft]) -> list[NoteCreation]:
+        """ノートを並行して作成し、最後に1回だけインデックスに反映する
+
+        失敗したノートは理由を返し、残りのノートの作成は続ける。
+        """
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(CREATE_CONCURRENCY, len(drafts))),
+            thread_name_prefix="create-notes",
+        ) as executor:
+            # 呼び出し元の取り消しやレーンを引き継ぐため、コンテキストを複製して実行する
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._client.create_note,
+                    draft.title,
+                    draft.path,
+                    draft.body or "",
+                )
+                for draft in drafts
+            ]
+
+        creations: list[NoteCreation] = []
+        created: list[DaoNote] = []
+        for draft, future in zip(drafts, futures, strict=True):
+            try:
+                result = future.result()
+            except (RuntimeError, OSError) as e:
+                creations.append(NoteCreation(draft=draft, error=str(e)))
+                continue
+
+            created.append(result)
+            creations.append(
+                NoteCreation(
+                    draft=draft,
+                    note=Note(title=result.title, path=result.path, tags=[]),
+                )
+            )
+
+        if created:
+            if self._catalog.enabled:
+                # zk indexを実行せず、作成したファイルからカタログに反映する
+                self._catalog.add_written(created)
+            else:
+                self._client.index()
+            if self._prefetcher is not None:
+                self._prefetcher.invalidate()
+
+        return creations
+
+    def find_note_source(self, path: Path) -> NoteSource:
+        path = self._catalog.resolve_path(path)
+        try:
+            content = self._client.read_note_file(path)
+        except FileNotFoundError as e:
+            raise ValueError(f"Note not found at path: {path}") from e
+
+        return NoteSource(path=path, content=content)
+
+    def save_note_source(self, source: NoteSource, content: str) -> NoteSource:
+        """編集した内容で置き換え、そのノートだけをインデックスに反映する"""
+        self._client.replace_note_file(source.path, content, source.content)
+
+        if self._catalog.enabled:
+            # zk indexでノートブック全体を走査せず、編集したファイルだけを読み直す
+            # （タイトルは編集後の内容から、無い場合は索引済みの値を使う）
+            self._catalog.add_written([DaoNote(title="", path=source.path, tags=[])])
+        if self._prefetcher is not None:
+            # 先読みした本文や検索結果は編集前の内容になっている
+            self._prefetcher.invalidate()
+
+        return NoteSource(path=source.path, content=content)
+
     def find_last_modified_note(self) -> Note:
-        result = self._client.get_last_modified_note()
+        if self._catalog.enabled:
+            self._catalog.refresh()
+            recent = self._catalog.recent_notes(1)
+            result = recent[0] if recent else None
+        else:
+            result = self._client.get_last_modified_note()
 
         if result is None:
             raise ValueError("Last modified note not found")
@@ -46,8 +164,12 @@ class ZkNoteRepository(IFNoteRepository):
             tags=result.tags,
         )
 
-    def find_tagless_notes(self) -> list[Note]:
-        results = self._client.get_tagless_notes()
+    def find_recently_modified_notes(self, limit: int) -> list[Note]:
+        if self._catalog.enabled:
+            self._catalog.refresh()
+            results = self._catalog.recent_notes(limit)
+        else:
+            results = self._client.get_recently_modified_notes(limit)
 
         return [
             Note(
@@ -58,14 +180,82 @@ class ZkNoteRepository(IFNoteRepository):
             for result in results
         ]
 
+    def find_tagless_notes(
+        self, limit: int, page: int, after: tuple[str, str] | None
+    ) -> NotePage:
+        if self._catalog.enabled:
+            self._catalog.refresh()
+            results, start, total = self._catalog.tagless_notes(limit, page, after)
+        else:
+            # カタログと同じく、タイトルとパスの順に並べてから範囲を切り出す
+            found = self._client.get_tagless_notes()
+            keys = sorted((result.title, str(result.path)) for result in found)
+            by_key = {(result.title, str(result.path)): result for result in found}
+            total = len(keys)
+            if after is not None:
+                start = bisect.bisect_right(keys, after)
+            else:
+                start = (max(1, min(page, math.ceil(total / limit))) - 1) * limit
+            results = [by_key[key] for key in keys[start : start + limit]]
+
+        notes = [
+            Note(
+                title=result.title,
+                path=result.path,
+                tags=result.tags,
+            )
+            for result in results
+        ]
+        return NotePage(notes=notes, start=start, total=total)
+
     def find_random_note(self) -> Note:
-        result = self._client.get_random_note()
+        if self._catalog.enabled:
+            self._catalog.refresh_throttled()
+            sampled = self._catalog.sample(1, self._rng, [], None, 0)
+            result = sampled[0] if sampled else None
+        else:
+            result = self._client.get_random_note()
 
         if result is None:
-            raise ValueError("Last modified note not found")
+            raise ValueError("Random note not found")
 
         return Note(
             title=result.title,
             path=result.path,
             tags=result.tags,
         )
+
+    def find_random_notes(
+        self,
+        count: int,
+        seed: int | None,
+        tags: list[str],
+        directory: Path | None,
+        exclude_recent: int,
+    ) -> list[Note]:
+        rng = self._rng if seed is None else random.Random(seed)
+        if self._catalog.enabled:
+            self._catalog.refresh_throttled()
+            results = self._catalog.sample(count, rng, tags, directory, exclude_recent)
+        else:
+            # 条件に合うノートの一覧をzkで取得し、その中から選ぶ
+            conditions = ["--tag", ", ".join(tags)] if tags else []
+            if directory is not None:
+                conditions.append(str(directory))
+            recent = set(itertools.islice(reversed(self._sampled), exclude_recent))
+            candidates = [
+                result
+                for result in self._client.get_notes(conditions)
+                if str(result.path) not in recent
+            ]
+            results = rng.sample(candidates, min(count, len(candidates)))
+            self._sampled.extend(str(result.path) for result in results)
+
+        return [
+            Note(
+                title=result.title,
+                path=result.path,
+                tags=result.tags,
+            )
+            for result in results
+        ]
@@ -0,0 +1,10 @@
+from .content_cache import ContentCache
+from .page_cache import PageCache
+from .prefetcher import PrefetchConfig, Prefetcher
+
+__all__ = [
+    "ContentCache",
+    "PageCache",
+    "PrefetchConfig",
+    "Prefetcher",
+]
@@ -0,0 +1,85 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from ..dao.note import Note
+
+# 読み込み前のファイルの(mtime_ns, size)
+Stat = tuple[int, int]
+
+
+class ContentCache:
+    """本文を含むノートをファイルのstat情報とともに保持するLRUキャッシュ
+
+    取り出す時にファイルのstat情報を比べ、変わっていれば破棄する。
+    本文の合計の大きさがmax_bytesを超えたら古いものから捨てる。
+    """
+
+    __slots__ = ("_cwd", "_entries", "_lock", "_max_bytes", "_size")
+
+    def __init__(self, cwd: Path, max_bytes: int) -> None:
+        self._cwd = cwd
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Path, tuple[Stat, Note]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stat(self, path: Path) -> Stat | None:
+        """キャッシュの検証に使うstat情報（ファイルが無い場合はNone）"""
+        try:
+            stat = os.stat(self._cwd / path)
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: Path) -> Note | None:
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None:
+            return None
+
+        stat, note = entry
+        if self.stat(path) != stat:
+            self._discard(path)
+            return None
+
+        with self._lock:
+            if path in self._entries:
+                self._entries.move_to_end(path)
+
+        return note.model_copy()
+
+    def put(self, path: Path, stat: Stat, note: Note) -> None:
+        """読み込む前に取ったstat情報とともに格納する
+
+        読み込み中にファイルが変わった場合は、次に取り出す時にstat情報が
+        合わずに破棄される。
+        """
+        size = len(note.content or "")
+        if size > self._max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._size -= len(previous[1].content or "")
+            self._entries[path] = (stat, note.model_copy())
+            self._size += size
+            while self._size > self._max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted.content or "")
+
+    def __contains__(self, path: Path) -> bool:
+        with self._lock:
+            return path in self._entries
+
+    def _discard(self, path: Path) -> None:
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._size -= len(entry[1].content or "")
@@ -0,0 +1,58 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Final
+
+from ....application.notes.get_notes import GetNotesInput, GetNotesOutput
+
+MAX_PAGES: Final[int] = 64
+
+
+class PageCache:
+    """get_notesの結果を検索条件ごとに一定時間だけ保持するLRUキャッシュ
+
+    ノートの作成など、結果が変わる操作の後はclearで破棄する。
+    """
+
+    __slots__ = ("_entries", "_lock", "_ttl_seconds")
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, GetNotesOutput]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(input_data: GetNotesInput) -> str:
+        return input_data.model_dump_json()
+
+    def get(self, input_data: GetNotesInput) -> GetNotesOutput | None:
+        key = self.key(input_data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires, output = entry
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return output
+
+    def __contains__(self, input_data: GetNotesInput) -> bool:
+        return self.get(input_data) is not None
+
+    def put(self, input_data: GetNotesInput, output: GetNotesOutput) -> None:
+        with self._lock:
+            self._entries[self.key(input_data)] = (
+                time.monotonic() + self._ttl_seconds,
+                output,
+            )
+            self._entries.move_to_end(self.key(input_data))
+            while len(self._entries) > MAX_PAGES:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
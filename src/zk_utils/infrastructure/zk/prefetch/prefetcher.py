@@ -0,0 +1,199 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Final
+
+from injector import inject, singleton
+
+from ...._base_models import BaseFrozenModel
+from ....application.notes.get_notes import GetNotesInput, GetNotesOutput
+from ....application.server.get_server_stats import PrefetchStats
+from ..dao.note import Note
+from ..scheduler import Lane, scheduler
+from ..zk_client import ZkClient
+from .content_cache import ContentCache
+from .page_cache import PageCache
+
+# 同時に待たせておく先読みの数（超えた分は捨てる）
+MAX_PENDING: Final[int] = 2
+# 予算を貯めておける時間（秒）。この間に使える時間はbudget倍になる
+BUDGET_WINDOW_SECONDS: Final[float] = 60.0
+
+
+class PrefetchConfig(BaseFrozenModel):
+    enabled: bool = False
+    # ページの結果から本文を先読みするノート数
+    top_k: int = 3
+    # 先読みに使ってよい時間の割合（0.25なら経過時間の1/4まで）
+    budget: float = 0.25
+    # 先読みした次のページを使う期限（秒）
+    page_ttl_seconds: float = 30.0
+    # 本文のキャッシュの上限（文字数）
+    max_content_bytes: int = 16 * 1024 * 1024
+
+
+@singleton
+class Prefetcher(BaseFrozenModel):
+    """get_notesの後に、次のページと上位のノートの本文を先読みする
+
+    先読みはノートブックごとに1つのスレッドで、スケジューラーの先読みの
+    レーンで実行する。実行にかかった時間をトークンバケットで数え、
+    予算を使い切っている間や待ちが多い間は先読みしない。
+    """
+
+    _client: ZkClient
+    _config: PrefetchConfig
+    _contents: ContentCache
+    _pages: PageCache
+    _executor: ThreadPoolExecutor | None
+    _lock: threading.Lock
+    _pending: int
+    _tokens: float
+    _refilled: float
+    _counts: dict[str, int]
+
+    @inject
+    def __init__(self, client: ZkClient, cwd: Path, config: PrefetchConfig) -> None:
+        super().__init__()
+        self._client = client
+        self._config = config
+        self._contents = ContentCache(cwd, config.max_content_bytes)
+        self._pages = PageCache(config.page_ttl_seconds)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._tokens = config.budget * BUDGET_WINDOW_SECONDS
+        self._refilled = time.monotonic()
+        self._counts = dict.fromkeys(
+            (
+                "page_requests",
+                "page_hits",
+                "content_requests",
+                "content_hits",
+                "prefetched_pages",
+                "prefetched_contents",
+                "skipped",
+            ),
+            0,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._config.enabled
+
+    def get_notes(
+        self,
+        input_data: GetNotesInput,
+        query: Callable[[GetNotesInput], GetNotesOutput],
+    ) -> GetNotesOutput:
+        """先読みした結果があれば返し、無ければ問い合わせた後に先読みを予約する"""
+        output = self._pages.get(input_data)
+        self._count("page_requests", "page_hits" if output is not None else None)
+        if output is None:
+            output = query(input_data)
+
+        self._schedule(lambda: self._prefetch_page(input_data, output, query))
+        return output
+
+    def get_note(self, path: Path) -> Note | None:
+        """本文を含むノートを返す（先読みや前回の読み込みの結果があれば使う）"""
+        note = self._contents.get(path)
+        self._count("content_requests", "content_hits" if note is not None else None)
+        if note is None:
+            note = self._read(path)
+
+        return note
+
+    def invalidate(self) -> None:
+        """ノートの作成などで検索結果が変わる時に先読みしたページを捨てる"""
+        self._pages.clear()
+
+    def stats(self) -> PrefetchStats | None:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            counts = dict(self._counts)
+
+        return PrefetchStats(
+            **counts,
+            page_hit_rate=_rate(counts["page_hits"], counts["page_requests"]),
+            content_hit_rate=_rate(counts["content_hits"], counts["content_requests"]),
+        )
+
+    def _prefetch_page(
+        self,
+        input_data: GetNotesInput,
+        output: GetNotesOutput,
+        query: Callable[[GetNotesInput], GetNotesOutput],
+    ) -> None:
+        # 表示したページの上位のノートを先に読む（次に開かれる可能性が高い）
+        for note in output.notes[: self._config.top_k]:
+            if note.path not in self._contents and self._read(note.path) is not None:
+                self._count("prefetched_contents")
+
+        if output.pagination.has_next:
+            next_input = input_data.model_copy(
+                update={"page": output.pagination.page + 1}
+            )
+            if next_input not in self._pages:
+                self._pages.put(next_input, query(next_input))
+                self._count("prefetched_pages")
+
+    def _read(self, path: Path) -> Note | None:
+        stat = self._contents.stat(path)
+        note = self._client.get_note(path)
+        if note is not None and stat is not None:
+            self._contents.put(path, stat, note)
+
+        return note
+
+    def _schedule(self, task: Callable[[], None]) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._refill()
+            if self._pending >= MAX_PENDING or self._tokens <= 0:
+                self._counts["skipped"] += 1
+                return
+
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="prefetch"
+                )
+
+        self._executor.submit(self._run, task)
+
+    def _run(self, task: Callable[[], None]) -> None:
+        started = time.monotonic()
+        try:
+            with scheduler.lane(Lane.PREFETCH):
+                task()
+        except Exception:
+            # 先読みの失敗は対話的な呼び出しで改めて読み込めばよい
+            pass
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._tokens -= time.monotonic() - started
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        capacity = self._config.budget * BUDGET_WINDOW_SECONDS
+        self._tokens = min(
+            self._tokens + (now - self._refilled) * self._config.budget, capacity
+        )
+        self._refilled = now
+
+    def _count(self, *names: str | None) -> None:
+        with self._lock:
+            for name in names:
+                if name is not None:
+                    self._counts[name] += 1
+
+
+def _rate(hits: int, requests: int) -> float | None:
+    return hits / requests if requests else None
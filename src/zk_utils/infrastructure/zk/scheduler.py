@@ -0,0 +1,164 @@
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from pathlib import Path
+from typing import Final, Iterator, Mapping
+
+from ..._process import ProcessScope, run_process
+
+
+class Lane(IntEnum):
+    """zkのプロセスを実行する優先度（値が小さいほど優先）"""
+
+    INTERACTIVE = 0
+    PREFETCH = 1
+    BACKGROUND = 2
+
+
+DEFAULT_LIMITS: Final[Mapping[Lane, int]] = {
+    Lane.INTERACTIVE: 8,
+    Lane.PREFETCH: 2,
+    Lane.BACKGROUND: 1,
+}
+# 対話的な処理が終わってからバックグラウンドの処理を再開するまでの時間
+DEFAULT_QUIET_SECONDS: Final[float] = 0.5
+
+_lane: ContextVar[Lane] = ContextVar("lane", default=Lane.INTERACTIVE)
+
+
+class Scheduler:
+    """zkのプロセスを優先度ごとのレーンに分けて実行する
+
+    レーンごとに同時に実行するプロセス数を制限し、優先度の高いレーンに待ちが
+    ある間は低いレーンのプロセスを起動しない。バックグラウンドのプロセスは
+    対話的な処理が無い間だけ実行し、対話的な処理が来たら終了させて、
+    落ち着いた後に実行し直す（zkのDBのロックを対話的な処理に譲るため）。
+    """
+
+    __slots__ = (
+        "_background",
+        "_condition",
+        "_last_interactive",
+        "_limits",
+        "_quiet_seconds",
+        "_running",
+        "_waiting",
+    )
+
+    def __init__(
+        self,
+        limits: Mapping[Lane, int] = DEFAULT_LIMITS,
+        quiet_seconds: float = DEFAULT_QUIET_SECONDS,
+    ) -> None:
+        self._condition = threading.Condition()
+        self._limits = dict(DEFAULT_LIMITS) | dict(limits)
+        self._quiet_seconds = quiet_seconds
+        self._running = dict.fromkeys(Lane, 0)
+        self._waiting = dict.fromkeys(Lane, 0)
+        self._last_interactive = -float("inf")
+        # 実行中のバックグラウンドのプロセス（対話的な処理が来たら終了させる）
+        self._background: set[ProcessScope] = set()
+
+    def configure(self, limits: Mapping[Lane, int]) -> None:
+        with self._condition:
+            self._limits.update(limits)
+            self._condition.notify_all()
+
+    @staticmethod
+    @contextmanager
+    def lane(lane: Lane) -> Iterator[None]:
+        """このスレッドで実行するzkのプロセスのレーンを指定する"""
+        token = _lane.set(lane)
+        try:
+            yield
+        finally:
+            _lane.reset(token)
+
+    def run(
+        self, command: list[str], cwd: Path, input: str | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        """現在のレーンでコマンドを実行する（run_processと同じ結果を返す）"""
+        lane = _lane.get()
+        if lane is not Lane.BACKGROUND:
+            # 対話的な処理の取り消しは呼び出し元のProcessScopeに任せる
+            with self._slot(lane):
+                return run_process(command, cwd=cwd, input=input)
+
+        while True:
+            scope = ProcessScope()
+            with self._slot(lane, scope):
+                try:
+                    return scope.call(
+                        run_process, command=command, cwd=cwd, input=input
+                    )
+                except RuntimeError:
+                    if not scope.cancelled:
+                        raise
+            # 対話的な処理に譲って終了させられたため、落ち着いてから実行し直す
+
+    def checkpoint(self) -> None:
+        """バックグラウンドのレーンでは、対話的な処理が落ち着くまで待つ
+
+        zkのプロセス以外の時間のかかる処理の区切りで呼ぶ。
+        """
+        if _lane.get() is not Lane.BACKGROUND:
+            return
+
+        with self._condition:
+            self._wait_until_startable(Lane.BACKGROUND)
+
+    @contextmanager
+    def _slot(self, lane: Lane, scope: ProcessScope | None = None) -> Iterator[None]:
+        with self._condition:
+            self._waiting[lane] += 1
+            try:
+                self._wait_until_startable(lane)
+            finally:
+                self._waiting[lane] -= 1
+
+            self._running[lane] += 1
+            if lane is Lane.INTERACTIVE:
+                self._last_interactive = time.monotonic()
+                for background in self._background:
+                    background.cancel()
+            if scope is not None:
+                self._background.add(scope)
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._running[lane] -= 1
+                if lane is Lane.INTERACTIVE:
+                    self._last_interactive = time.monotonic()
+                if scope is not None:
+                    self._background.discard(scope)
+                self._condition.notify_all()
+
+    def _wait_until_startable(self, lane: Lane) -> None:
+        while True:
+            delay = self._delay(lane)
+            if delay == 0:
+                return
+            self._condition.wait(delay)
+
+    def _delay(self, lane: Lane) -> float | None:
+        """実行を始められるまで待つ時間（0は今すぐ、Noneは通知まで）"""
+        if self._running[lane] >= self._limits[lane]:
+            return None
+        if any(self._waiting[higher] for higher in Lane if higher < lane):
+            return None
+        if lane is Lane.BACKGROUND:
+            if self._running[Lane.INTERACTIVE]:
+                return None
+            quiet_until = self._last_interactive + self._quiet_seconds
+            return max(quiet_until - time.monotonic(), 0)
+
+        return 0
+
+
+# プロセス全体で共有するスケジューラー（CPUはノートブックの間で共有されるため）
+scheduler = Scheduler()
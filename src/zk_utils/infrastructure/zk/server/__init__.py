@@ -0,0 +1,5 @@
+from .zk_server_query_service import ZkServerQueryService
+
+__all__ = [
+    "ZkServerQueryService",
+]
@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Callable
+
+from injector import inject, singleton
+
+from ....application.server import IFServerQueryService
+from ....application.server.get_server_stats import (
+    GetServerStatsInput,
+    GetServerStatsOutput,
+    WarmUpStatus,
+    WarmUpStep,
+    WarmUpStepStatus,
+)
+from ....application.server.warm_up import WarmUpInput, WarmUpOutput
+from ..catalog import NoteCatalog
+from ..prefetch import Prefetcher
+from ..scheduler import Lane, scheduler
+from ..zk_client import ZkClient
+
+
+def _prime_parser() -> None:
+    # 本文取得時のマークダウンパーサーの読み込みと初期化を済ませておく
+    from markdown_it import MarkdownIt
+
+    MarkdownIt().parse("## warm-up\n\ntext")
+
+
+@singleton
+class ZkServerQueryService(IFServerQueryService):
+    """起動時のウォームアップを実行し、その進捗を返す
+
+    zkのインデックス更新、カタログ（キャッシュの読み込みとインデックスの構築）、
+    マークダウンパーサーの初期化を順に行う。
+    """
+
+    _client: ZkClient
+    _catalog: NoteCatalog
+    _prefetcher: Prefetcher | None
+    _lock: threading.Lock
+    _status: WarmUpStatus
+    _steps: dict[str, WarmUpStep]
+    _error: str | None
+
+    @inject
+    def __init__(
+        self,
+        client: ZkClient,
+        catalog: NoteCatalog,
+        prefetcher: Prefetcher | None = None,
+    ) -> None:
+        super().__init__()
+        self._client = client
+        self._catalog = catalog
+        self._prefetcher = prefetcher
+        self._lock = threading.Lock()
+        self._status = "idle"
+        self._steps = {}
+        self._error = None
+
+    def warm_up(self, input_data: WarmUpInput) -> WarmUpOutput:
+        steps: list[tuple[str, Callable[[], None] | None]] = [
+            ("zk_index", self._client.index),
+            ("catalog", self._catalog.warm_up if self._catalog.enabled else None),
+            ("markdown_parser", _prime_parser),
+            (
+                "headings",
+                self._catalog.warm_up_headings if self._catalog.enabled else None,
+            ),
+        ]
+        with self._lock:
+            # 実行中または実行済みの場合は繰り返さない
+            if self._status != "idle":
+                return WarmUpOutput(status=self._status)
+
+            self._status = "running"
+            self._steps = {
+                name: WarmUpStep(
+                    name=name, status="pending" if run is not None else "skipped"
+                )
+                for name, run in steps
+            }
+
+        # 対話的なツールの呼び出しを優先し、その間は手順の区切りで待つ
+        with scheduler.lane(Lane.BACKGROUND):
+            for name, run in steps:
+                if run is not None:
+                    scheduler.checkpoint()
+                    self._run_step(name, run)
+
+        with self._lock:
+            self._status = "failed" if self._error is not None else "done"
+            return WarmUpOutput(status=self._status)
+
+    def get_server_stats(self, input_data: GetServerStatsInput) -> GetServerStatsOutput:
+        with self._lock:
+            status = self._status
+            steps = list(self._steps.values())
+            error = self._error
+        state = self._catalog.index_state()
+
+        return GetServerStatsOutput(
+            ready=status != "running",
+            warm_up=status,
+            steps=steps,
+            error=error,
+            catalog_notes=self._catalog.note_count(),
+            index_generation=state.generation,
+            stale=state.stale,
+            prefetch=self._prefetcher.stats() if self._prefetcher else None,
+        )
+
+    def _run_step(self, name: str, run: Callable[[], None]) -> None:
+        self._set_step(name, "running")
+        started = time.perf_counter()
+        try:
+            run()
+        except Exception as e:
+            # 失敗しても残りの手順は続け、問い合わせ時に改めて構築させる
+            self._set_step(name, "failed", time.perf_counter() - started)
+            with self._lock:
+                if self._error is None:
+                    self._error = f"{name}: {e}"
+            return
+
+        self._set_step(name, "done", time.perf_counter() - started)
+
+    def _set_step(
+        self,
+        name: str,
+        status: WarmUpStepStatus,
+        elapsed: float | None = None,
+    ) -> None:
+        with self._lock:
+            self._steps[name] = WarmUpStep(
+                name=name, status=status, elapsed_seconds=elapsed
+            )
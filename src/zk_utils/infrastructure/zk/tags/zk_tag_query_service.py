@@ -3,19 +3,35 @@ from injector import inject, singleton
 from ....application._common.tag import Tag
 from ....application.tags import IFTagQueryService
 from ....application.tags.get_tags import GetTagsInput, GetTagsOutput
+from ..catalog import NoteCatalog
 from ..zk_client import ZkClient
 
 
 @singleton
 class ZkTagQueryService(IFTagQueryService):
     _client: ZkClient
+    _catalog: NoteCatalog
 
     @inject
-    def __init__(self, client: ZkClient) -> None:
+    def __init__(self, client: ZkClient, catalog: NoteCatalog) -> None:
         super().__init__()
         self._client = client
+        self._catalog = catalog
 
     def get_tags(self, input_data: GetTagsInput) -> GetTagsOutput:
+        if self._catalog.enabled:
+            self._catalog.refresh()
+            counts = self._catalog.tag_counts()
+            state = self._catalog.index_state()
+            return GetTagsOutput(
+                tags=[
+                    Tag(name=name, note_count=note_count)
+                    for name, note_count in counts.items()
+                ],
+                index_generation=state.generation,
+                stale=state.stale,
+            )
+
         results = self._client.get_tags()
 
         tags: list[Tag] = []
@@ -1,4 +1,9 @@
+import json
+import os
 import subprocess
+import tempfile
+import threading
+from datetime import datetime
 from functools import wraps
 from pathlib import Path
 from typing import Callable, Final, TypeVar
@@ -8,6 +13,7 @@ from injector import inject, singleton
 from ..._base_models import BaseFrozenModel
 from .dao.note import Note
 from .dao.tag import Tag
+from .scheduler import scheduler
 
 F = TypeVar("F", bound=Callable[..., object])
 
@@ -21,31 +27,34 @@ def with_index(func: F) -> F:
     return wrapper  # type: ignore[return-value]
 
 
+NOTE_SUFFIX: Final[str] = ".md"
 FORMAT_NOTE: Final[str] = '{{path}}|{{title}}|{{join tags ","}}'
 FORMAT_CONTENT: Final[str] = "{{raw-content}}"
 FORMAT_TAG: Final[str] = "{{name}}|{{note-count}}"
+FORMAT_DOCUMENT: Final[str] = "jsonl"
 
 
 @singleton
 class ZkClient(BaseFrozenModel):
     _cwd: Path
+    # ノートのファイルの読み直しから置き換えまでを直列にする
+    _write_lock: threading.Lock
 
     @inject
     def __init__(self, cwd: Path) -> None:
         super().__init__()
         self._cwd = cwd
+        self._write_lock = threading.Lock()
+
+    def index(self) -> None:
+        """zkのインデックスを更新する"""
+        self._execute_index()
 
     def _execute_index(self) -> None:
         command = ["zk", "index", "--quiet"]
 
         try:
-            subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=self._cwd,
-                check=True,
-            )
+            scheduler.run(command, cwd=self._cwd)
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Error: {e.stderr}") from e
 
@@ -67,13 +76,7 @@ class ZkClient(BaseFrozenModel):
         ]
 
         try:
-            stdout = subprocess.run(
-                command + conditions,
-                capture_output=True,
-                text=True,
-                cwd=self._cwd,
-                check=True,
-            )
+            stdout = scheduler.run(command + conditions, cwd=self._cwd)
 
             return stdout.stdout.strip()
 
@@ -98,13 +101,7 @@ class ZkClient(BaseFrozenModel):
         ]
 
         try:
-            stdout = subprocess.run(
-                command + conditions,
-                capture_output=True,
-                text=True,
-                cwd=self._cwd,
-                check=True,
-            )
+            stdout = scheduler.run(command + conditions, cwd=self._cwd)
             return stdout.stdout.strip().splitlines()
 
         except subprocess.CalledProcessError as e:
@@ -126,13 +123,7 @@ class ZkClient(BaseFrozenModel):
         ]
 
         try:
-            stdout = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=self._cwd,
-                check=True,
-            )
+            stdout = scheduler.run(command, cwd=self._cwd)
             return stdout.stdout.strip().splitlines()
 
         except subprocess.CalledProcessError as e:
@@ -160,7 +151,35 @@ class ZkClient(BaseFrozenModel):
         else:
             tags = tags_part.split(",")
 
-        return Note(title=title, path=Path(path), tags=tags)
+        # 自前で組み立てた値のため、検証を省略して生成する
+        return Note.model_construct(title=title, path=Path(path), tags=tags)
+
+    def _parse_document(self, target: str) -> Note | None:
+        try:
+            document = json.loads(target)
+        except json.JSONDecodeError:
+            return None
+
+        if not isinstance(document, dict) or "path" not in document:
+            return None
+
+        return Note(
+            title=document.get("title", ""),
+            path=Path(document["path"]),
+            tags=document.get("tags") or [],
+            content=document.get("rawContent"),
+            created=self._parse_datetime(document.get("created")),
+            modified=self._parse_datetime(document.get("modified")),
+        )
+
+    def _parse_datetime(self, target: object) -> datetime | None:
+        if not isinstance(target, str):
+            return None
+
+        try:
+            return datetime.fromisoformat(target)
+        except ValueError:
+            return None
 
     def _parse_tag(self, target: str) -> Tag | None:
         pipe_idx = target.rfind("|")
@@ -196,6 +215,21 @@ class ZkClient(BaseFrozenModel):
 
         return notes
 
+    def get_documents(self, paths: list[Path] = []) -> list[Note]:
+        """本文を含むノートを取得する（pathsを省略した場合は全件）"""
+        results = self._execute_zk_list_multilines(
+            FORMAT_DOCUMENT, [str(path) for path in paths]
+        )
+
+        notes: list[Note] = []
+        for result in results:
+            note = self._parse_document(result)
+            if note is None:
+                continue
+            notes.append(note)
+
+        return notes
+
     def get_note(self, path: Path) -> Note | None:
         result = self._execute_zk_list_single(FORMAT_NOTE, [str(path)])
         note = self._parse_note(result)
@@ -223,26 +257,72 @@ class ZkClient(BaseFrozenModel):
 
         return tags
 
-    @with_index
-    def create_note(self, title: str, path: Path) -> Note:
+    def create_note(self, title: str, path: Path, body: str = "") -> Note:
+        """ノートを作成する
+
+        本文は標準入力からzk newに渡され、テンプレートの{{content}}になる。
+        作成にはインデックスを使わないため、zk indexは実行しない。
+        """
         command = ["zk", "new", "--print-path", "--title", title, str(path)]
 
         try:
-            stdout = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=self._cwd,
-                check=True,
-            )
+            # 本文が無い場合も、サーバーの標準入力をzkに読ませないよう空の入力を渡す
+            stdout = scheduler.run(command, cwd=self._cwd, input=body)
 
-            path = Path(stdout.stdout)
+            path = Path(stdout.stdout.strip())
 
             return Note(title=title, path=path, tags=[])
 
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Error: {e.stderr}") from e
 
+    def read_note_file(self, path: Path) -> str:
+        """ノートのファイルの内容を改行コードを変えずに読み込む"""
+        with open(self._note_file(path), encoding="utf-8", newline="") as f:
+            return f.read()
+
+    def replace_note_file(self, path: Path, content: str, expected: str) -> None:
+        """ノートのファイルを置き換える
+
+        読み込んだ時から内容が変わっていればValueErrorを送出する。
+        一時ファイルに書き込んでから置き換えるため、途中の状態は残らない。
+        """
+        target = self._note_file(path)
+        with self._write_lock:
+            with open(target, encoding="utf-8", newline="") as f:
+                if f.read() != expected:
+                    raise ValueError(f"Note was modified during the edit: {path}")
+
+            mode = os.stat(target).st_mode
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                    f.write(content)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.chmod(tmp, mode)
+                os.replace(tmp, target)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+
+    def _note_file(self, path: Path) -> Path:
+        """ノートブック内のノートのファイルの実際のパスを返す
+
+        シンボリックリンクを解決した上で、ノートブックの外のファイル、
+        隠しディレクトリ配下のファイル、ノート以外のファイルはValueErrorとする。
+        """
+        root = Path(os.path.realpath(self._cwd))
+        target = Path(os.path.realpath(self._cwd / path))
+        if (
+            not target.is_relative_to(root)
+            or target.suffix != NOTE_SUFFIX
+            or any(part.startswith(".") for part in target.relative_to(root).parts)
+        ):
+            raise ValueError(f"Not a note in the notebook: {path}")
+
+        return target
+
     @with_index
     def get_last_modified_note(self) -> Note | None:
         command = [
@@ -259,13 +339,7 @@ class ZkClient(BaseFrozenModel):
         ]
 
         try:
-            stdout = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=self._cwd,
-                check=True,
-            )
+            stdout = scheduler.run(command, cwd=self._cwd)
 
             return self._parse_note(stdout.stdout.strip())
 
@@ -288,15 +362,39 @@ class ZkClient(BaseFrozenModel):
         ]
 
         try:
-            stdout = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=self._cwd,
-                check=True,
-            )
+            stdout = scheduler.run(command, cwd=self._cwd)
 
             return self._parse_note(stdout.stdout.strip())
 
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Error: {e.stderr}") from e
+
+    @with_index
+    def get_recently_modified_notes(self, limit: int) -> list[Note]:
+        command = [
+            "zk",
+            "list",
+            "--quiet",
+            "--no-pager",
+            "--limit",
+            str(limit),
+            "--sort",
+            "modified-",
+            "--format",
+            FORMAT_NOTE,
+        ]
+
+        try:
+            stdout = scheduler.run(command, cwd=self._cwd)
+
+            notes: list[Note] = []
+            for result in stdout.stdout.strip().splitlines():
+                note = self._parse_note(result)
+                if note is None:
+                    continue
+                notes.append(note)
+
+            return notes
+
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Error: {e.stderr}") from e
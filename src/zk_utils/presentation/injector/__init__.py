@@ -1,13 +1,67 @@
+import threading
+from typing import TypeVar
+
 from injector import Injector
 
-from .note_module import NoteModule
-from .tag_module import TagModule
-from .zk_module import ZkModule
-
-injector = Injector(
-    [
-        NoteModule,
-        TagModule,
-        ZkModule,
-    ]
-)
+T = TypeVar("T")
+
+# ノートブック名（NoneはZK_DIRのノートブック）ごとのDIコンテナ
+_injectors: dict[str | None, Injector] = {}
+_lock = threading.Lock()
+
+
+def create_injector(notebook: str | None = None) -> Injector:
+    # 各モジュールはインフラ層を読み込むため、DIコンテナを作る時に読み込む
+    from .note_module import NoteModule
+    from .server_module import ServerModule
+    from .tag_module import TagModule
+    from .zk_module import ZkModule
+
+    return Injector(
+        [
+            NoteModule,
+            ServerModule,
+            TagModule,
+            ZkModule(notebook),
+        ]
+    )
+
+
+def get_injector(notebook: str | None = None) -> Injector:
+    """ノートブックのDIコンテナを返す（初回呼び出し時に作る）
+
+    ノートブックごとに別のDIコンテナを持つため、zkのクライアントやカタログ、
+    キャッシュなどのシングルトンはノートブックの間で共有されない。
+    """
+    from ..settings import DEFAULT_NOTEBOOK, Settings
+
+    # ZK_DIRのノートブックは名前で指定されてもNoneと同じDIコンテナを使う
+    if notebook == DEFAULT_NOTEBOOK:
+        notebook = None
+    with _lock:
+        injector = _injectors.get(notebook)
+        if injector is None:
+            if notebook is not None:
+                # 存在しないノートブックのDIコンテナを作らないよう、先に確かめる
+                Settings().notebook(notebook)  # type: ignore[call-arg]
+            injector = _injectors[notebook] = create_injector(notebook)
+
+    return injector
+
+
+class DeferredInjector:
+    """最初に依存を解決する時にDIコンテナを作るプロキシ"""
+
+    def get(self, interface: type[T]) -> T:
+        return get_injector().get(interface)
+
+
+deferred_injector = DeferredInjector()
+
+
+def __getattr__(name: str) -> Injector:
+    # `from zk_utils.presentation.injector import injector`で参照された時に作る
+    if name == "injector":
+        return get_injector()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
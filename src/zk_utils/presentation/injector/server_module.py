@@ -0,0 +1,9 @@
+from injector import Binder, Module
+
+from ...application.server import IFServerQueryService
+from ...infrastructure.zk.server import ZkServerQueryService
+
+
+class ServerModule(Module):
+    def configure(self, binder: Binder) -> None:
+        binder.bind(IFServerQueryService, ZkServerQueryService)  # type: ignore[type-abstract]
@@ -2,11 +2,39 @@ from pathlib import Path
 
 from injector import Module, provider
 
+from ...infrastructure.zk.catalog import CatalogConfig
+from ...infrastructure.zk.catalog.catalog_cache import default_cache_dir
+from ...infrastructure.zk.prefetch import PrefetchConfig
 from ..settings import Settings
 
 
 class ZkModule(Module):
+    def __init__(self, notebook: str | None = None) -> None:
+        # Noneの場合はZK_DIRのノートブック
+        self._notebook = notebook
+
     @provider
     def cwd(self) -> Path:
         settings = Settings()  # type: ignore[call-arg]
-        return settings.zk_dir
+        return settings.notebook(self._notebook).zk_dir
+
+    @provider
+    def catalog_config(self) -> CatalogConfig:
+        settings = Settings()  # type: ignore[call-arg]
+        notebook = settings.notebook(self._notebook)
+        return CatalogConfig(
+            enabled=notebook.index_backend == "memory",
+            cache_dir=settings.cache_dir or default_cache_dir(),
+            change_detection=notebook.change_detection or settings.change_detection,
+            consistency=settings.consistency,
+            refresh_interval=settings.refresh_interval,
+        )
+
+    @provider
+    def prefetch_config(self) -> PrefetchConfig:
+        settings = Settings()  # type: ignore[call-arg]
+        return PrefetchConfig(
+            enabled=settings.prefetch,
+            top_k=settings.prefetch_top_k,
+            budget=settings.prefetch_budget,
+        )
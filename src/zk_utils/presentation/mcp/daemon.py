@@ -0,0 +1,121 @@
+import fcntl
+import functools
+import logging
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Final
+
+import anyio
+import anyio.abc
+from anyio.streams.buffered import BufferedByteReceiveStream
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.message import SessionMessage
+
+from zk_utils.presentation.mcp.socket_path import ensure_socket_dir
+
+# 1行（1メッセージ）の上限。ノートの本文を含む応答もこれに収まる
+MAX_FRAME_BYTES: Final[int] = 64 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def socket_transport(
+    stream: anyio.abc.ByteStream,
+) -> AsyncIterator[
+    tuple[
+        MemoryObjectReceiveStream[SessionMessage | Exception],
+        MemoryObjectSendStream[SessionMessage],
+    ]
+]:
+    """ソケットの接続をMCPのセッションの読み書きのストリームにする
+
+    stdioトランスポートと同じく、改行区切りのJSON-RPCメッセージをやり取りする。
+    """
+    read_stream_writer, read_stream = anyio.create_memory_object_stream[
+        SessionMessage | Exception
+    ](0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream[
+        SessionMessage
+    ](0)
+    buffered = BufferedByteReceiveStream(stream)
+
+    async def reader() -> None:
+        async with read_stream_writer:
+            while True:
+                try:
+                    line = await buffered.receive_until(b"\n", MAX_FRAME_BYTES)
+                except (
+                    anyio.EndOfStream,
+                    anyio.IncompleteRead,
+                    anyio.BrokenResourceError,
+                    anyio.ClosedResourceError,
+                ):
+                    return
+                if not line.strip():
+                    continue
+
+                try:
+                    message = types.JSONRPCMessage.model_validate_json(line)
+                except Exception as exc:
+                    await read_stream_writer.send(exc)
+                    continue
+
+                await read_stream_writer.send(SessionMessage(message))
+
+    async def writer() -> None:
+        async with write_stream_reader:
+            async for session_message in write_stream_reader:
+                json = session_message.message.model_dump_json(
+                    by_alias=True, exclude_none=True
+                )
+                await stream.send(json.encode() + b"\n")
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(reader)
+        tg.start_soon(writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            tg.cancel_scope.cancel()
+
+
+async def serve_unix_socket(server: FastMCP, path: Path) -> None:
+    """Unixソケットで待ち受け、接続ごとにMCPのセッションを処理する
+
+    すべてのセッションが同じプロセスのカタログやキャッシュを共有する。
+    同じソケットを使うデーモンが既に動いている場合はRuntimeErrorを送出する。
+    """
+    ensure_socket_dir(path.parent)
+    # ソケットのファイルは異常終了で残ることがあるため、ロックで稼働中か判定する
+    with open(path.with_suffix(".lock"), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise RuntimeError(f"Another daemon is already serving {path}") from None
+
+        path.unlink(missing_ok=True)
+        listener = await anyio.create_unix_listener(path)
+        os.chmod(path, 0o600)
+        try:
+            async with listener:
+                await listener.serve(functools.partial(_handle, server))
+        finally:
+            path.unlink(missing_ok=True)
+
+
+async def _handle(server: FastMCP, stream: anyio.abc.ByteStream) -> None:
+    async with stream:
+        try:
+            async with socket_transport(stream) as (read_stream, write_stream):
+                await server._mcp_server.run(
+                    read_stream,
+                    write_stream,
+                    server._mcp_server.create_initialization_options(),
+                )
+        except Exception:
+            # 1つのセッションの失敗で他のセッションを止めない
+            logger.exception("MCP session over the Unix socket failed")
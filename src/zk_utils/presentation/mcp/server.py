@@ -1,193 +1,154 @@
-from pathlib import Path
-from typing import Annotated, Literal
+import functools
+import importlib
+import threading
+from typing import Any, Callable, TypeVar
 
+import anyio
+from injector import Injector
 from mcp.server.fastmcp import FastMCP
-from pydantic import Field
 
-from zk_utils.application.notes import create_note as app_create_note
-from zk_utils.application.notes import (
-    get_last_modified_note as app_get_last_modified_note,
+from zk_utils._process import ProcessScope
+from zk_utils.presentation.injector import (
+    DeferredInjector,
+    deferred_injector,
+    get_injector,
 )
-from zk_utils.application.notes import get_link_to_notes as app_get_link_to_notes
-from zk_utils.application.notes import get_linked_by_notes as app_get_linked_by_notes
-from zk_utils.application.notes import get_note_content as app_get_note_content
-from zk_utils.application.notes import get_notes as app_get_notes
-from zk_utils.application.notes import get_random_note as app_get_random_note
-from zk_utils.application.notes import get_related_notes as app_get_related_notes
-from zk_utils.application.notes import get_tagless_notes as app_get_tagless_notes
-from zk_utils.application.tags import get_tags as app_get_tags
-from zk_utils.presentation.injector import injector
-
-mcp = FastMCP("zk-mcp")
-
-
-@mcp.tool()
-def get_notes(
-    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
-    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
-    title_patterns: Annotated[
-        list[str], Field(description="Patterns to search in note titles")
-    ] = [],
-    title_match_mode: Annotated[
-        Literal["AND", "OR"], Field(description="Title pattern matching mode (AND/OR)")
-    ] = "AND",
-    search_patterns: Annotated[
-        list[str], Field(description="Patterns to search in note content")
-    ] = [],
-    search_match_mode: Annotated[
-        Literal["AND", "OR"],
-        Field(description="Content pattern matching mode (AND/OR)"),
-    ] = "AND",
-    tags: Annotated[list[str], Field(description="Tags to filter notes by")] = [],
-    tags_match_mode: Annotated[
-        Literal["AND", "OR"], Field(description="Tag matching mode (AND/OR)")
-    ] = "AND",
-    created_after: Annotated[
-        str | None,
-        Field(
-            description=(
-                "Filter by creation date "
-                "(e.g., 'yesterday', 'last monday', 'last two weeks', '2021', 'Feb 3')"
-            )
-        ),
-    ] = None,
-    modified_after: Annotated[
-        str | None,
-        Field(
-            description=(
-                "Filter by modification date "
-                "(e.g., 'yesterday', 'last monday', 'last two weeks', '2021', 'Feb 3')"
-            )
-        ),
-    ] = None,
-) -> app_get_notes.GetNotesOutput:
-    """Search and retrieve zk notes with filtering and pagination."""
-    service = injector.get(app_get_notes.GetNotesService)
-
-    input = app_get_notes.GetNotesInput(
-        page=page,
-        per_page=per_page,
-        title_patterns=title_patterns,
-        title_match_mode=title_match_mode,
-        search_patterns=search_patterns,
-        search_match_mode=search_match_mode,
-        tags=tags,
-        tags_match_mode=tags_match_mode,
-        created_after=created_after,
-        modified_after=modified_after,
-    )
-    return service.handle(input)
-
-
-@mcp.tool()
-def get_note_content(
-    path: Annotated[Path, Field(description="File path to the note")],
-    headings: Annotated[
-        list[str] | None,
-        Field(description="List of h2 headings to extract (optional)"),
-    ] = None,
-) -> app_get_note_content.GetNoteContentOutput:
-    """Retrieve the full content of a specific zk note."""
-    service = injector.get(app_get_note_content.GetNoteContentService)
-    input_data = app_get_note_content.GetNoteContentInput(path=path, headings=headings)
-    return service.handle(input_data)
-
-
-@mcp.tool()
-def get_link_to_notes(
-    path: Annotated[Path, Field(description="File path to the source note")],
-    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
-    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
-) -> app_get_link_to_notes.GetLinkToNotesOutput:
-    """Get all notes that are linked FROM the specified note (outbound links)."""
-    service = injector.get(app_get_link_to_notes.GetLinkToNotesService)
-    input_data = app_get_link_to_notes.GetLinkToNotesInput(
-        page=page, per_page=per_page, path=path
-    )
-    return service.handle(input_data)
 
+# DIコンテナ（インフラ層を含む）は最初のツール呼び出しで作る
+injector = deferred_injector
 
-@mcp.tool()
-def get_linked_by_notes(
-    path: Annotated[Path, Field(description="File path to the target note")],
-    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
-    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
-) -> app_get_linked_by_notes.GetLinkedByNotesOutput:
-    """Get all notes that link TO the specified note (inbound links)."""
-    service = injector.get(app_get_linked_by_notes.GetLinkedByNotesService)
+# ツールはtoolsモジュールを読み込んだ時に登録する（参照はmcp属性から）
+_mcp = FastMCP("zk-mcp")
 
-    input_data = app_get_linked_by_notes.GetLinkedByNotesInput(
-        page=page, per_page=per_page, path=path
-    )
-    return service.handle(input_data)
-
-
-@mcp.tool()
-def get_related_notes(
-    path: Annotated[Path, Field(description="File path to the note")],
-    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
-    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
-) -> app_get_related_notes.GetRelatedNotesOutput:
-    """Find notes that could be good candidates for linking."""
-    service = injector.get(app_get_related_notes.GetRelatedNotesService)
-    input_data = app_get_related_notes.GetRelatedNotesInput(
-        page=page, per_page=per_page, path=path
-    )
-    return service.handle(input_data)
+F = TypeVar("F", bound=Callable[..., Any])
 
+# ツールを実行するワーカースレッドの上限（main()で設定の値に変更する）
+workers = anyio.CapacityLimiter(8)
+# 名前付きのノートブックごとの上限（main()で設定する。無い場合はworkersを使う）
+notebook_workers: dict[str, anyio.CapacityLimiter] = {}
+# ツールの実行時間の上限（秒。main()で設定する。Noneの場合は無制限）
+tool_timeout: float | None = None
+tool_timeouts: dict[str, float] = {}
 
-@mcp.tool()
-def get_tags() -> app_get_tags.GetTagsOutput:
-    """Retrieve all available tags from the zk note collection."""
-    service = injector.get(app_get_tags.GetTagsService)
 
-    input_data = app_get_tags.GetTagsInput()
-    return service.handle(input_data)
+def notebook_injector(notebook: str | None) -> DeferredInjector | Injector:
+    """ノートブックのDIコンテナを返す（NoneはZK_DIRのノートブック）"""
+    return injector if notebook is None else get_injector(notebook)
 
 
-@mcp.tool()
-def create_note(
-    title: Annotated[str, Field(description="Title of the new note")],
-    path: Annotated[
-        Path, Field(description="File path where the note should be created")
-    ],
-) -> app_create_note.CreateNoteOutput:
-    """Create a new zk note with the specified title and path."""
-    service = injector.get(app_create_note.CreateNoteService)
+def tool(fn: F) -> F:
+    """ツールとして登録する
 
-    input_data = app_create_note.CreateNoteInput(title=title, path=path)
-    return service.handle(input_data)
+    ツールはzkの実行などで待つ同期関数のため、イベントループを止めないよう
+    ワーカースレッドで実行し、複数のクライアントからの要求を並行して処理する。
+    要求が取り消されるかタイムアウトした場合は、起動したzkのプロセスを終了させる。
+    関数はそのまま返すため、直接呼び出すこともできる。
+    """
 
+    @functools.wraps(fn)
+    async def run_in_worker(**kwargs: object) -> object:
+        # 遅いノートブックへの呼び出しが他のノートブックの分を使い切らないようにする
+        notebook = kwargs.get("notebook")
+        limiter = (
+            notebook_workers.get(notebook, workers)
+            if isinstance(notebook, str)
+            else workers
+        )
+        timeout = tool_timeouts.get(fn.__name__, tool_timeout)
+        scope = ProcessScope()
+        try:
+            with anyio.fail_after(timeout):
+                try:
+                    return await anyio.to_thread.run_sync(
+                        functools.partial(scope.call, fn, **kwargs),
+                        abandon_on_cancel=True,
+                        limiter=limiter,
+                    )
+                except anyio.get_cancelled_exc_class():
+                    # 取り消しやタイムアウトの後もzkがDBのロックを持ち続けないよう、
+                    # 実行中の子プロセスを終了させる（スレッドはその後すぐに終わる）
+                    scope.cancel()
+                    raise
+        except TimeoutError:
+            raise TimeoutError(
+                f"{fn.__name__} timed out after {timeout} seconds"
+            ) from None
 
-@mcp.tool()
-def get_last_modified_note() -> app_get_last_modified_note.GetLastModifiedNoteOutput:
-    """Retrieve the most recently modified note."""
-    service = injector.get(app_get_last_modified_note.GetLastModifiedNoteService)
+    _mcp.tool()(run_in_worker)
+    return fn
 
-    input_data = app_get_last_modified_note.GetLastModifiedNoteInput()
-    return service.handle(input_data)
 
+def warm_up(notebook: str | None = None) -> None:
+    from zk_utils.application.server import warm_up as app_warm_up
 
-@mcp.tool()
-def get_tagless_notes() -> app_get_tagless_notes.GetTaglessNotesOutput:
-    """Retrieve all notes that have no tags assigned."""
-    service = injector.get(app_get_tagless_notes.GetTaglessNotesService)
+    service = notebook_injector(notebook).get(app_warm_up.WarmUpService)
 
-    input_data = app_get_tagless_notes.GetTaglessNotesInput()
-    return service.handle(input_data)
+    input_data = app_warm_up.WarmUpInput()
+    service.handle(input_data)
 
 
-@mcp.tool()
-def get_random_note() -> app_get_random_note.GetRandomNoteOutput:
-    """Retrieve a randomly selected note from the zk collection."""
-    service = injector.get(app_get_random_note.GetRandomNoteService)
+def registered_server() -> FastMCP:
+    """ツールを登録したサーバーを返す"""
+    # ツールの登録（アプリケーション層の読み込みとスキーマの生成）は重いため、
+    # モジュールの読み込み時ではなく、サーバーを使う時に行う
+    importlib.import_module("zk_utils.presentation.mcp.tools")
+    return _mcp
 
-    input_data = app_get_random_note.GetRandomNoteInput()
-    return service.handle(input_data)
+
+def __getattr__(name: str) -> FastMCP:
+    # `server.mcp`で参照された時にツールを登録する
+    if name == "mcp":
+        return registered_server()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main() -> None:
-    mcp.run(transport="stdio")
+    # 設定の読み込みは重いため、モジュールの読み込み時ではなく起動時に行う
+    from zk_utils.infrastructure.zk.scheduler import Lane, scheduler
+    from zk_utils.presentation.settings import Settings
+
+    global tool_timeout, tool_timeouts
+
+    mcp = registered_server()
+    settings = Settings()  # type: ignore[call-arg]
+    workers.total_tokens = settings.workers
+    tool_timeout = settings.tool_timeout
+    tool_timeouts = settings.tool_timeouts
+    scheduler.configure(
+        {
+            Lane.INTERACTIVE: settings.interactive_processes,
+            Lane.PREFETCH: settings.prefetch_processes,
+            Lane.BACKGROUND: settings.background_processes,
+        }
+    )
+    mcp.settings.host = settings.http_host
+    mcp.settings.port = settings.http_port
+    if settings.http_host not in ("127.0.0.1", "localhost", "::1"):
+        # ループバック以外で待ち受ける場合は、Hostヘッダーによる制限を外す
+        mcp.settings.transport_security = None
+
+    for name, notebook in settings.notebooks.items():
+        notebook_workers[name] = anyio.CapacityLimiter(
+            notebook.workers or settings.workers
+        )
+
+    if settings.warm_up:
+        # MCPのハンドシェイクを待たせないよう、別スレッドで実行する
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+        for name in settings.notebooks:
+            threading.Thread(
+                target=warm_up, args=(name,), name=f"warm-up-{name}", daemon=True
+            ).start()
+
+    if settings.transport == "unix":
+        from zk_utils.presentation.mcp.daemon import serve_unix_socket
+        from zk_utils.presentation.mcp.socket_path import default_socket_path
+
+        path = settings.socket_path or default_socket_path(settings.zk_dir)
+        anyio.run(serve_unix_socket, mcp, path)
+    else:
+        mcp.run(transport=settings.transport)
 
 
 if __name__ == "__main__":
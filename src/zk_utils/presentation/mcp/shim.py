@@ -0,0 +1,107 @@
+"""共有デーモンにstdioのMCPメッセージを中継するエントリーポイント
+
+エディタなどのセッションごとに起動される軽いプロセスで、標準入出力と
+デーモンのUnixソケットの間でバイト列をそのまま中継する。デーモンが
+動いていなければ起動してから接続する。起動を速くするため標準ライブラリ
+以外は読み込まない。
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Final
+
+from zk_utils.presentation.mcp.socket_path import (
+    default_socket_path,
+    ensure_socket_dir,
+)
+
+CONNECT_TIMEOUT_SECONDS: Final[float] = 30.0
+_CHUNK_SIZE: Final[int] = 64 * 1024
+
+
+def socket_path() -> Path:
+    if path := os.environ.get("SOCKET_PATH"):
+        return Path(path)
+
+    zk_dir = os.environ.get("ZK_DIR")
+    if not zk_dir:
+        sys.exit("ZK_DIR or SOCKET_PATH must be set")
+
+    return default_socket_path(Path(zk_dir))
+
+
+def connect(path: Path, timeout: float = CONNECT_TIMEOUT_SECONDS) -> socket.socket:
+    """デーモンに接続する（動いていなければ起動して待つ）"""
+    deadline = time.monotonic() + timeout
+    started = False
+    while True:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(path))
+            return sock
+        except (FileNotFoundError, ConnectionRefusedError):
+            sock.close()
+            if time.monotonic() >= deadline:
+                raise
+
+        if not started:
+            start_daemon(path)
+            started = True
+        time.sleep(0.05)
+
+
+def start_daemon(path: Path) -> None:
+    """セッションから切り離したプロセスとしてデーモンを起動する
+
+    デーモンのログはソケットと同じ場所の`.log`に書く。同時に複数のシムが
+    起動しても、ソケットのロックを取れた1つだけが待ち受ける。
+    """
+    ensure_socket_dir(path.parent)
+    env = os.environ | {"TRANSPORT": "unix", "SOCKET_PATH": str(path)}
+    with open(path.with_suffix(".log"), "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "zk_utils.presentation.mcp.server"],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+            start_new_session=True,
+        )
+
+
+def _forward_stdin(sock: socket.socket) -> None:
+    try:
+        while chunk := os.read(sys.stdin.fileno(), _CHUNK_SIZE):
+            sock.sendall(chunk)
+        # クライアントの終了をデーモンに伝える
+        sock.shutdown(socket.SHUT_WR)
+    except OSError:
+        pass
+
+
+def _forward_socket(sock: socket.socket) -> None:
+    stdout = sys.stdout.fileno()
+    try:
+        while chunk := sock.recv(_CHUNK_SIZE):
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(stdout, view) :]
+    except OSError:
+        pass
+
+
+def main() -> None:
+    sock = connect(socket_path())
+    # 標準入力の読み込みは終了を待たずに打ち切れるようデーモンスレッドで行う
+    threading.Thread(target=_forward_stdin, args=(sock,), daemon=True).start()
+    _forward_socket(sock)
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()
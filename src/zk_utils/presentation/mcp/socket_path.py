@@ -0,0 +1,42 @@
+import hashlib
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+
+def default_socket_path(zk_dir: Path) -> Path:
+    """ノートブックごとのデーモンのUnixソケットのパスを返す
+
+    `$XDG_RUNTIME_DIR/zk-utils/`（無い場合は一時ディレクトリ配下の
+    ユーザーごとのディレクトリ）に、ノートブックのパスのハッシュで置く。
+    ソケットのパスは100バイト程度に制限されるため短く保つ。
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        base = Path(runtime_dir) / "zk-utils"
+    else:
+        base = Path(tempfile.gettempdir()) / f"zk-utils-{os.getuid()}"
+
+    key = hashlib.sha256(str(zk_dir.resolve()).encode()).hexdigest()[:16]
+    return base / f"{key}.sock"
+
+
+def ensure_socket_dir(path: Path) -> None:
+    """ソケットを置くディレクトリを作り、自分だけが使えることを確かめる
+
+    共有の一時ディレクトリでは他のユーザーが先に同じ名前で作れるため、
+    シンボリックリンクをたどらずに調べ、現在のユーザーが所有する
+    パーミッション0700のディレクトリでなければRuntimeErrorを送出する。
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = os.lstat(path)
+    if (
+        not stat.S_ISDIR(st.st_mode)
+        or st.st_uid != os.getuid()
+        or stat.S_IMODE(st.st_mode) != 0o700
+    ):
+        raise RuntimeError(
+            f"Refusing to use {path}: "
+            "it must be a directory owned by the current user with mode 0700"
+        )
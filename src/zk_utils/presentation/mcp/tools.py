@@ -0,0 +1,575 @@
+from pathlib import Path
+from typing import Annotated, Literal
+
+from pydantic import Field
+
+from zk_utils.application.notes import append_to_section as app_append_to_section
+from zk_utils.application.notes import create_note as app_create_note
+from zk_utils.application.notes import create_notes as app_create_notes
+from zk_utils.application.notes import find_notes_by_title as app_find_notes_by_title
+from zk_utils.application.notes import get_federated_notes as app_get_federated_notes
+from zk_utils.application.notes import (
+    get_last_modified_note as app_get_last_modified_note,
+)
+from zk_utils.application.notes import get_link_to_notes as app_get_link_to_notes
+from zk_utils.application.notes import get_linked_by_notes as app_get_linked_by_notes
+from zk_utils.application.notes import get_note_content as app_get_note_content
+from zk_utils.application.notes import get_notes as app_get_notes
+from zk_utils.application.notes import get_outlines as app_get_outlines
+from zk_utils.application.notes import get_random_note as app_get_random_note
+from zk_utils.application.notes import get_random_notes as app_get_random_notes
+from zk_utils.application.notes import (
+    get_recently_modified_notes as app_get_recently_modified_notes,
+)
+from zk_utils.application.notes import get_related_notes as app_get_related_notes
+from zk_utils.application.notes import get_tagless_notes as app_get_tagless_notes
+from zk_utils.application.notes import replace_section as app_replace_section
+from zk_utils.application.notes import search_headings as app_search_headings
+from zk_utils.application.server import get_server_stats as app_get_server_stats
+from zk_utils.application.tags import get_tags as app_get_tags
+from zk_utils.presentation.injector import get_injector
+from zk_utils.presentation.mcp.server import notebook_injector, tool
+
+NOTE_IDENTIFIER_DESCRIPTION = (
+    "File path to the note, or (with INDEX_BACKEND=memory) its title, "
+    "filename stem or zk id"
+)
+NOTEBOOK_DESCRIPTION = "Name of the notebook to use (default: the ZK_DIR notebook)"
+HEADING_DESCRIPTION = "Text of the h2 heading (without the leading ##)"
+EXPECTED_HASH_DESCRIPTION = (
+    "content_hash returned by get_note_content or a previous edit. "
+    "The edit fails if the note has changed since (optional)"
+)
+
+
+@tool
+def get_notes(
+    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
+    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
+    title_patterns: Annotated[
+        list[str], Field(description="Patterns to search in note titles")
+    ] = [],
+    title_match_mode: Annotated[
+        Literal["AND", "OR"], Field(description="Title pattern matching mode (AND/OR)")
+    ] = "AND",
+    search_patterns: Annotated[
+        list[str], Field(description="Patterns to search in note content")
+    ] = [],
+    search_match_mode: Annotated[
+        Literal["AND", "OR"],
+        Field(description="Content pattern matching mode (AND/OR)"),
+    ] = "AND",
+    tags: Annotated[list[str], Field(description="Tags to filter notes by")] = [],
+    tags_match_mode: Annotated[
+        Literal["AND", "OR"], Field(description="Tag matching mode (AND/OR)")
+    ] = "AND",
+    created_after: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Filter by creation date "
+                "(e.g., 'yesterday', 'last monday', 'last two weeks', '2021', 'Feb 3')"
+            )
+        ),
+    ] = None,
+    created_before: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Filter by creation date, exclusive upper bound "
+                "(e.g., 'today', 'last monday', '2021-06-01')"
+            )
+        ),
+    ] = None,
+    modified_after: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Filter by modification date "
+                "(e.g., 'yesterday', 'last monday', 'last two weeks', '2021', 'Feb 3')"
+            )
+        ),
+    ] = None,
+    modified_before: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Filter by modification date, exclusive upper bound "
+                "(e.g., 'today', 'last monday', '2021-06-01')"
+            )
+        ),
+    ] = None,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_notes.GetNotesOutput:
+    """Search and retrieve zk notes with filtering and pagination."""
+    service = notebook_injector(notebook).get(app_get_notes.GetNotesService)
+
+    input = app_get_notes.GetNotesInput(
+        page=page,
+        per_page=per_page,
+        title_patterns=title_patterns,
+        title_match_mode=title_match_mode,
+        search_patterns=search_patterns,
+        search_match_mode=search_match_mode,
+        tags=tags,
+        tags_match_mode=tags_match_mode,
+        created_after=created_after,
+        created_before=created_before,
+        modified_after=modified_after,
+        modified_before=modified_before,
+    )
+    return service.handle(input)
+
+
+@tool
+def get_federated_notes(
+    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
+    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
+    title_patterns: Annotated[
+        list[str], Field(description="Patterns to search in note titles")
+    ] = [],
+    title_match_mode: Annotated[
+        Literal["AND", "OR"], Field(description="Title pattern matching mode (AND/OR)")
+    ] = "AND",
+    search_patterns: Annotated[
+        list[str], Field(description="Patterns to search in note content")
+    ] = [],
+    search_match_mode: Annotated[
+        Literal["AND", "OR"],
+        Field(description="Content pattern matching mode (AND/OR)"),
+    ] = "AND",
+    tags: Annotated[list[str], Field(description="Tags to filter notes by")] = [],
+    tags_match_mode: Annotated[
+        Literal["AND", "OR"], Field(description="Tag matching mode (AND/OR)")
+    ] = "AND",
+    created_after: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Filter by creation date "
+                "(e.g., 'yesterday', 'last monday', 'last two weeks', '2021', 'Feb 3')"
+            )
+        ),
+    ] = None,
+    created_before: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Filter by creation date, exclusive upper bound "
+                "(e.g., 'today', 'last monday', '2021-06-01')"
+            )
+        ),
+    ] = None,
+    modified_after: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Filter by modification date "
+                "(e.g., 'yesterday', 'last monday', 'last two weeks', '2021', 'Feb 3')"
+            )
+        ),
+    ] = None,
+    modified_before: Annotated[
+        str | None,
+        Field(
+            description=(
+                "Filter by modification date, exclusive upper bound "
+                "(e.g., 'today', 'last monday', '2021-06-01')"
+            )
+        ),
+    ] = None,
+    notebooks: Annotated[
+        list[str] | None,
+        Field(description="Notebooks to search (default: all notebooks)"),
+    ] = None,
+) -> app_get_federated_notes.GetFederatedNotesOutput:
+    """Search all notebooks in parallel and interleave the results by rank.
+
+    The first result of each notebook comes first, then the second ones, and so
+    on; results of the same rank follow the order of the notebooks.
+    """
+    service = federated_notes_service()
+
+    input_data = app_get_federated_notes.GetFederatedNotesInput(
+        page=page,
+        per_page=per_page,
+        title_patterns=title_patterns,
+        title_match_mode=title_match_mode,
+        search_patterns=search_patterns,
+        search_match_mode=search_match_mode,
+        tags=tags,
+        tags_match_mode=tags_match_mode,
+        created_after=created_after,
+        created_before=created_before,
+        modified_after=modified_after,
+        modified_before=modified_before,
+        notebooks=notebooks,
+    )
+    return service.handle(input_data)
+
+
+@tool
+def find_notes_by_title(
+    query: Annotated[
+        str, Field(description="Approximate title or title prefix to look up")
+    ],
+    limit: Annotated[int, Field(description="Maximum number of notes to return")] = 10,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_find_notes_by_title.FindNotesByTitleOutput:
+    """Find notes whose titles best match the query, ranked by fuzzy similarity."""
+    service = notebook_injector(notebook).get(
+        app_find_notes_by_title.FindNotesByTitleService
+    )
+
+    input_data = app_find_notes_by_title.FindNotesByTitleInput(query=query, limit=limit)
+    return service.handle(input_data)
+
+
+@tool
+def search_headings(
+    query: Annotated[
+        str, Field(description="Text to look up in headings (case-insensitive)")
+    ],
+    levels: Annotated[
+        list[Annotated[int, Field(ge=1, le=6)]],
+        Field(description="Heading levels to search, e.g. [2] for ## (all if empty)"),
+    ] = [],
+    limit: Annotated[
+        int, Field(description="Maximum number of headings to return")
+    ] = 20,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_search_headings.SearchHeadingsOutput:
+    """Find headings across all notes, e.g. every note with a `## TODO` section.
+
+    Exact matches come first, then prefix and substring matches. Each heading
+    has its line range and parent headings.
+    """
+    service = notebook_injector(notebook).get(app_search_headings.SearchHeadingsService)
+
+    input_data = app_search_headings.SearchHeadingsInput(
+        query=query, levels=levels, limit=limit
+    )
+    return service.handle(input_data)
+
+
+@tool
+def get_outlines(
+    paths: Annotated[
+        list[Path],
+        Field(
+            description=f"Notes to outline. {NOTE_IDENTIFIER_DESCRIPTION}",
+            min_length=1,
+        ),
+    ],
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_outlines.GetOutlinesOutput:
+    """Get the heading outline (levels 1-6) of several notes in one call."""
+    service = notebook_injector(notebook).get(app_get_outlines.GetOutlinesService)
+
+    input_data = app_get_outlines.GetOutlinesInput(paths=paths)
+    return service.handle(input_data)
+
+
+@tool
+def get_note_content(
+    path: Annotated[Path, Field(description=NOTE_IDENTIFIER_DESCRIPTION)],
+    headings: Annotated[
+        list[str] | None,
+        Field(description="List of h2 headings to extract (optional)"),
+    ] = None,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_note_content.GetNoteContentOutput:
+    """Retrieve the full content of a specific zk note."""
+    service = notebook_injector(notebook).get(
+        app_get_note_content.GetNoteContentService
+    )
+    input_data = app_get_note_content.GetNoteContentInput(path=path, headings=headings)
+    return service.handle(input_data)
+
+
+@tool
+def get_link_to_notes(
+    path: Annotated[
+        Path, Field(description=f"Source note. {NOTE_IDENTIFIER_DESCRIPTION}")
+    ],
+    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
+    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_link_to_notes.GetLinkToNotesOutput:
+    """Get all notes that are linked FROM the specified note (outbound links)."""
+    service = notebook_injector(notebook).get(
+        app_get_link_to_notes.GetLinkToNotesService
+    )
+    input_data = app_get_link_to_notes.GetLinkToNotesInput(
+        page=page, per_page=per_page, path=path
+    )
+    return service.handle(input_data)
+
+
+@tool
+def get_linked_by_notes(
+    path: Annotated[
+        Path, Field(description=f"Target note. {NOTE_IDENTIFIER_DESCRIPTION}")
+    ],
+    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
+    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_linked_by_notes.GetLinkedByNotesOutput:
+    """Get all notes that link TO the specified note (inbound links)."""
+    service = notebook_injector(notebook).get(
+        app_get_linked_by_notes.GetLinkedByNotesService
+    )
+
+    input_data = app_get_linked_by_notes.GetLinkedByNotesInput(
+        page=page, per_page=per_page, path=path
+    )
+    return service.handle(input_data)
+
+
+@tool
+def get_related_notes(
+    path: Annotated[Path, Field(description=NOTE_IDENTIFIER_DESCRIPTION)],
+    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
+    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_related_notes.GetRelatedNotesOutput:
+    """Find notes that could be good candidates for linking."""
+    service = notebook_injector(notebook).get(
+        app_get_related_notes.GetRelatedNotesService
+    )
+    input_data = app_get_related_notes.GetRelatedNotesInput(
+        page=page, per_page=per_page, path=path
+    )
+    return service.handle(input_data)
+
+
+@tool
+def get_tags(
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_tags.GetTagsOutput:
+    """Retrieve all available tags from the zk note collection."""
+    service = notebook_injector(notebook).get(app_get_tags.GetTagsService)
+
+    input_data = app_get_tags.GetTagsInput()
+    return service.handle(input_data)
+
+
+@tool
+def create_note(
+    title: Annotated[str, Field(description="Title of the new note")],
+    path: Annotated[
+        Path, Field(description="File path where the note should be created")
+    ],
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_create_note.CreateNoteOutput:
+    """Create a new zk note with the specified title and path."""
+    service = notebook_injector(notebook).get(app_create_note.CreateNoteService)
+
+    input_data = app_create_note.CreateNoteInput(title=title, path=path)
+    return service.handle(input_data)
+
+
+@tool
+def create_notes(
+    notes: Annotated[
+        list[app_create_notes.NewNote],
+        Field(
+            description=(
+                "Notes to create, each with a title, a path and an optional body "
+                "passed to the note template as {{content}}"
+            ),
+            min_length=1,
+        ),
+    ],
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_create_notes.CreateNotesOutput:
+    """Create many zk notes at once.
+
+    Notes are created in parallel and indexed once at the end. Returns one
+    result per note in input order, with the created note or the error.
+    """
+    service = notebook_injector(notebook).get(app_create_notes.CreateNotesService)
+
+    input_data = app_create_notes.CreateNotesInput(notes=notes)
+    return service.handle(input_data)
+
+
+@tool
+def append_to_section(
+    path: Annotated[Path, Field(description=NOTE_IDENTIFIER_DESCRIPTION)],
+    heading: Annotated[str, Field(description=HEADING_DESCRIPTION)],
+    text: Annotated[str, Field(description="Markdown to append")],
+    expected_hash: Annotated[
+        str | None, Field(description=EXPECTED_HASH_DESCRIPTION)
+    ] = None,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_append_to_section.AppendToSectionOutput:
+    """Append text to the end of an h2 section of a note.
+
+    The section is created at the end of the note if it does not exist.
+    Only the edited note is re-indexed.
+    """
+    service = notebook_injector(notebook).get(
+        app_append_to_section.AppendToSectionService
+    )
+
+    input_data = app_append_to_section.AppendToSectionInput(
+        path=path, heading=heading, text=text, expected_hash=expected_hash
+    )
+    return service.handle(input_data)
+
+
+@tool
+def replace_section(
+    path: Annotated[Path, Field(description=NOTE_IDENTIFIER_DESCRIPTION)],
+    heading: Annotated[str, Field(description=HEADING_DESCRIPTION)],
+    text: Annotated[str, Field(description="Markdown replacing the section body")],
+    expected_hash: Annotated[
+        str | None, Field(description=EXPECTED_HASH_DESCRIPTION)
+    ] = None,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_replace_section.ReplaceSectionOutput:
+    """Replace the body of an h2 section of a note, keeping the heading.
+
+    Only the edited note is re-indexed.
+    """
+    service = notebook_injector(notebook).get(app_replace_section.ReplaceSectionService)
+
+    input_data = app_replace_section.ReplaceSectionInput(
+        path=path, heading=heading, text=text, expected_hash=expected_hash
+    )
+    return service.handle(input_data)
+
+
+@tool
+def get_last_modified_note(
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_last_modified_note.GetLastModifiedNoteOutput:
+    """Retrieve the most recently modified note."""
+    service = notebook_injector(notebook).get(
+        app_get_last_modified_note.GetLastModifiedNoteService
+    )
+
+    input_data = app_get_last_modified_note.GetLastModifiedNoteInput()
+    return service.handle(input_data)
+
+
+@tool
+def get_recently_modified_notes(
+    limit: Annotated[
+        int, Field(description="Maximum number of notes to return", ge=1)
+    ] = 10,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_recently_modified_notes.GetRecentlyModifiedNotesOutput:
+    """Retrieve the most recently modified notes, newest first."""
+    service = notebook_injector(notebook).get(
+        app_get_recently_modified_notes.GetRecentlyModifiedNotesService
+    )
+
+    input_data = app_get_recently_modified_notes.GetRecentlyModifiedNotesInput(
+        limit=limit
+    )
+    return service.handle(input_data)
+
+
+@tool
+def get_tagless_notes(
+    page: Annotated[int, Field(description="Page number (starting from 1)")] = 1,
+    per_page: Annotated[int, Field(description="Number of notes per page")] = 10,
+    cursor: Annotated[
+        str | None,
+        Field(
+            description=(
+                "next_cursor from the previous call; continues after the last "
+                "returned note even if notes were tagged in between "
+                "(page is ignored)"
+            )
+        ),
+    ] = None,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_tagless_notes.GetTaglessNotesOutput:
+    """Retrieve notes that have no tags assigned, sorted by title, with pagination."""
+    service = notebook_injector(notebook).get(
+        app_get_tagless_notes.GetTaglessNotesService
+    )
+
+    input_data = app_get_tagless_notes.GetTaglessNotesInput(
+        page=page, per_page=per_page, cursor=cursor
+    )
+    return service.handle(input_data)
+
+
+@tool
+def get_random_note(
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_random_note.GetRandomNoteOutput:
+    """Retrieve a randomly selected note from the zk collection."""
+    service = notebook_injector(notebook).get(app_get_random_note.GetRandomNoteService)
+
+    input_data = app_get_random_note.GetRandomNoteInput()
+    return service.handle(input_data)
+
+
+@tool
+def get_random_notes(
+    count: Annotated[
+        int, Field(description="Number of distinct notes to return", ge=1)
+    ] = 1,
+    seed: Annotated[
+        int | None, Field(description="Seed for a reproducible selection")
+    ] = None,
+    tags: Annotated[list[str], Field(description="Tags the notes must all have")] = [],
+    directory: Annotated[
+        Path | None, Field(description="Only pick notes under this directory")
+    ] = None,
+    exclude_recent: Annotated[
+        int,
+        Field(
+            description=(
+                "Skip notes among the last N notes returned by random selection "
+                f"(at most {app_get_random_notes.SAMPLE_HISTORY_SIZE})"
+            ),
+            ge=0,
+            le=app_get_random_notes.SAMPLE_HISTORY_SIZE,
+        ),
+    ] = 0,
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_random_notes.GetRandomNotesOutput:
+    """Retrieve several distinct randomly selected notes in one call."""
+    service = notebook_injector(notebook).get(
+        app_get_random_notes.GetRandomNotesService
+    )
+
+    input_data = app_get_random_notes.GetRandomNotesInput(
+        count=count,
+        seed=seed,
+        tags=tags,
+        directory=directory,
+        exclude_recent=exclude_recent,
+    )
+    return service.handle(input_data)
+
+
+@tool
+def get_server_stats(
+    notebook: Annotated[str | None, Field(description=NOTEBOOK_DESCRIPTION)] = None,
+) -> app_get_server_stats.GetServerStatsOutput:
+    """Report server readiness and the progress of the startup warm-up."""
+    service = notebook_injector(notebook).get(
+        app_get_server_stats.GetServerStatsService
+    )
+
+    input_data = app_get_server_stats.GetServerStatsInput()
+    return service.handle(input_data)
+
+
+def federated_notes_service() -> app_get_federated_notes.GetFederatedNotesService:
+    from zk_utils.presentation.settings import Settings
+
+    settings = Settings()  # type: ignore[call-arg]
+    return app_get_federated_notes.GetFederatedNotesService(
+        {
+            name: get_injector(name).get(app_get_notes.GetNotesService)
+            for name in settings.notebook_names()
+        }
+    )
@@ -1,7 +1,82 @@
 from pathlib import Path
+from typing import Final, Literal
 
+from pydantic import BaseModel, field_validator
 from pydantic_settings import BaseSettings
 
+# ZK_DIRのノートブックの名前
+DEFAULT_NOTEBOOK: Final[str] = "default"
+
+IndexBackend = Literal["zk", "memory"]
+ChangeDetection = Literal["stat", "hash", "git"]
+
+
+class NotebookSettings(BaseModel):
+    """ノートブックごとの設定（未指定の項目は全体の設定を使う）"""
+
+    zk_dir: Path
+    index_backend: IndexBackend | None = None
+    change_detection: ChangeDetection | None = None
+    workers: int | None = None
+
 
 class Settings(BaseSettings):
     zk_dir: Path
+    # 名前付きのノートブック（例: NOTEBOOKS='{"work": {"zk_dir": "/path/to/work"}}'）
+    notebooks: dict[str, NotebookSettings] = {}
+    index_backend: IndexBackend = "zk"
+    cache_dir: Path | None = None
+    change_detection: ChangeDetection = "stat"
+    # 変更の反映中の応答（strict: 反映を待つ、stale: 前の世代のインデックスで応答する）
+    consistency: Literal["strict", "stale"] = "strict"
+    # find_notes_by_titleなどで、ノートブックの変更の検出を省く間隔（秒）
+    refresh_interval: float = 1.0
+    warm_up: bool = False
+    transport: Literal["stdio", "streamable-http", "sse", "unix"] = "stdio"
+    http_host: str = "127.0.0.1"
+    http_port: int = 8000
+    # unixトランスポートのソケット（未指定の場合はノートブックごとの既定のパス）
+    socket_path: Path | None = None
+    # ツールを並行して実行するワーカースレッド数
+    workers: int = 8
+    # 優先度ごとに同時に実行するzkのプロセス数（対話的な処理、先読み、バックグラウンド）
+    interactive_processes: int = 8
+    prefetch_processes: int = 2
+    background_processes: int = 1
+    # get_notesの後に次のページと上位のノートの本文を先読みする
+    prefetch: bool = False
+    prefetch_top_k: int = 3
+    # 先読みに使ってよい時間の割合
+    prefetch_budget: float = 0.25
+    # ツールの実行時間の上限（秒）。ツール名ごとの上限はtool_timeoutsで指定する
+    tool_timeout: float | None = None
+    tool_timeouts: dict[str, float] = {}
+
+    @field_validator("notebooks")
+    @classmethod
+    def _validate_notebooks(
+        cls, notebooks: dict[str, NotebookSettings]
+    ) -> dict[str, NotebookSettings]:
+        if DEFAULT_NOTEBOOK in notebooks:
+            raise ValueError(f"'{DEFAULT_NOTEBOOK}' is reserved for ZK_DIR")
+
+        return notebooks
+
+    def notebook_names(self) -> list[str]:
+        return [DEFAULT_NOTEBOOK, *self.notebooks]
+
+    def notebook(self, name: str | None = None) -> NotebookSettings:
+        """ノートブックの設定を全体の設定で補って返す（Noneの場合はZK_DIR）"""
+        if name is None or name == DEFAULT_NOTEBOOK:
+            notebook = NotebookSettings(zk_dir=self.zk_dir)
+        elif name in self.notebooks:
+            notebook = self.notebooks[name]
+        else:
+            raise ValueError(f"Unknown notebook: {name}")
+
+        return NotebookSettings(
+            zk_dir=notebook.zk_dir,
+            index_backend=notebook.index_backend or self.index_backend,
+            change_detection=notebook.change_detection or self.change_detection,
+            workers=notebook.workers or self.workers,
+        )
@@ -36,10 +36,10 @@ class TestCreateNoteIntegration:
         assert result.note.path == Path(sample_zk_create_note_output)
         assert result.note.tags == []
 
-        # @with_indexデコレータにより_execute_index()とcreate_noteで計2回の呼び出し
-        assert mock_subprocess_run.call_count == 2
+        # zk indexは実行せず、zk newだけが呼ばれること
+        assert mock_subprocess_run.call_count == 1
 
-        # 最後の呼び出し（create_note）が正しい引数で呼ばれること
+        # 呼び出し（create_note）が正しい引数で呼ばれること
         call_args = mock_subprocess_run.call_args[0][0]
         assert "zk" in call_args
         assert "new" in call_args
@@ -72,8 +72,8 @@ class TestCreateNoteIntegration:
         assert "日本語のタイトル" in result.note.title
         assert "📝" in result.note.title
 
-        # @with_indexデコレータにより2回の呼び出し
-        assert mock_subprocess_run.call_count == 2
+        # zk indexは実行せず、zk newだけが呼ばれること
+        assert mock_subprocess_run.call_count == 1
 
         # zkコマンドに日本語タイトルが渡されること
         call_args = mock_subprocess_run.call_args[0][0]
@@ -168,8 +168,8 @@ class TestCreateNoteIntegration:
         # Then: 複雑なパスが正しく処理されること
         assert result.note.path == Path(sample_zk_create_note_output)
 
-        # @with_indexデコレータにより2回の呼び出し
-        assert mock_subprocess_run.call_count == 2
+        # zk indexは実行せず、zk newだけが呼ばれること
+        assert mock_subprocess_run.call_count == 1
 
         # zkコマンドに複雑なパスが渡されること
         call_args = mock_subprocess_run.call_args[0][0]
@@ -0,0 +1,98 @@
+import subprocess
+import threading
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from injector import Injector
+
+from zk_utils.application.notes.create_notes import (
+    CreateNotesInput,
+    CreateNotesService,
+    NewNote,
+)
+
+
+@pytest.mark.integration
+class TestCreateNotesIntegration:
+    """CreateNotesServiceとZkNoteRepositoryの結合テスト"""
+
+    @pytest.fixture
+    def zk_new(self, mock_subprocess_run: Mock) -> list[list[str]]:
+        """タイトルが"fail"の場合だけ失敗するzkの実行をモックし、実行順を記録する"""
+        commands: list[list[str]] = []
+        lock = threading.Lock()
+
+        def run(command: list[str], **kwargs: object) -> Mock:
+            with lock:
+                commands.append(command)
+            if command[:2] == ["zk", "new"] and "fail" in command:
+                raise subprocess.CalledProcessError(
+                    1, command, stderr="Error: template failed"
+                )
+
+            result = Mock()
+            result.stdout = f"/notebook/{command[-2]}.md\n" if "new" in command else ""
+            return result
+
+        mock_subprocess_run.side_effect = run
+        return commands
+
+    def test_create_notes_should_return_results_in_input_order(
+        self,
+        test_injector: Injector,
+        mock_subprocess_run: Mock,
+        zk_new: list[list[str]],
+    ) -> None:
+        # Given: 1件だけ失敗する3件のノート
+        service = test_injector.get(CreateNotesService)
+        input_data = CreateNotesInput(
+            notes=[
+                NewNote(title=f"note{i}", path=Path("meetings"), body=f"body {i}")
+                for i in range(2)
+            ]
+            + [NewNote(title="fail", path=Path("meetings"))]
+        )
+
+        # When: まとめて作成する
+        result = service.handle(input_data)
+
+        # Then: 入力と同じ順で結果が返され、失敗したノートには理由が入ること
+        assert [r.title for r in result.results] == ["note0", "note1", "fail"]
+        assert [r.note.path if r.note else None for r in result.results] == [
+            Path("/notebook/note0.md"),
+            Path("/notebook/note1.md"),
+            None,
+        ]
+        assert result.results[2].error == "Error: Error: template failed"
+        assert (result.created, result.failed) == (2, 1)
+
+        # 本文は標準入力からzk newに渡され、zk indexは最後に1回だけ実行されること
+        bodies = {
+            call.args[0][-2]: call.kwargs["input"]
+            for call in mock_subprocess_run.call_args_list
+            if call.args[0][:2] == ["zk", "new"]
+        }
+        assert bodies == {"note0": "body 0", "note1": "body 1", "fail": ""}
+        assert [c for c in zk_new if c[:2] == ["zk", "index"]] == [
+            ["zk", "index", "--quiet"]
+        ]
+        assert zk_new[-1] == ["zk", "index", "--quiet"]
+
+    def test_create_notes_should_not_index_when_all_failed(
+        self,
+        test_injector: Injector,
+        zk_new: list[list[str]],
+    ) -> None:
+        # Given: すべて失敗するノート
+        service = test_injector.get(CreateNotesService)
+        input_data = CreateNotesInput(
+            notes=[NewNote(title="fail", path=Path("meetings"))]
+        )
+
+        # When: まとめて作成する
+        result = service.handle(input_data)
+
+        # Then: 失敗が返され、zk indexは実行されないこと
+        assert (result.created, result.failed) == (0, 1)
+        assert all(c[:2] != ["zk", "index"] for c in zk_new)
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from injector import Injector
+
+from zk_utils.application.notes.find_notes_by_title import (
+    FindNotesByTitleInput,
+    FindNotesByTitleService,
+)
+
+
+@pytest.mark.integration
+class TestFindNotesByTitleIntegration:
+    """FindNotesByTitleServiceとNoteCatalogの結合テスト"""
+
+    def test_find_notes_by_title_should_return_ranked_notes(
+        self, memory_injector: Injector, mock_subprocess_run: Mock
+    ) -> None:
+        # Given: カタログ構築用のjsonl出力
+        mock_subprocess_run.return_value.stdout = "\n".join(
+            json.dumps(d, ensure_ascii=False)
+            for d in [
+                {"path": "a.md", "title": "Zettelkasten Method", "tags": ["zk"]},
+                {"path": "b.md", "title": "Zettelkasten", "tags": []},
+                {"path": "c.md", "title": "日記", "tags": []},
+            ]
+        )
+        service = memory_injector.get(FindNotesByTitleService)
+
+        # When: タイトルの一部で検索する
+        result = service.handle(FindNotesByTitleInput(query="zettel", limit=5))
+
+        # Then: 前方一致するノートが短いタイトル順に返されること
+        assert [note.path for note in result.notes] == [Path("b.md"), Path("a.md")]
+        assert result.notes[1].tags == ["zk"]
+
+    def test_repeated_lookup_should_not_call_zk_again(
+        self, memory_injector: Injector, mock_subprocess_run: Mock
+    ) -> None:
+        # Given: 一度検索してカタログを構築済み
+        mock_subprocess_run.return_value.stdout = json.dumps(
+            {"path": "a.md", "title": "Note", "tags": []}
+        )
+        service = memory_injector.get(FindNotesByTitleService)
+        service.handle(FindNotesByTitleInput(query="Note"))
+        call_count = mock_subprocess_run.call_count
+
+        # When: 再度検索する
+        result = service.handle(FindNotesByTitleInput(query="Not"))
+
+        # Then: zkは実行されずにメモリ上で検索されること
+        assert mock_subprocess_run.call_count == call_count
+        assert len(result.notes) == 1
+
+    def test_zk_backend_should_rank_titles_without_loading_catalog(
+        self, test_injector: Injector, mock_subprocess_run: Mock
+    ) -> None:
+        # Given: zkのタイトル一覧の出力
+        mock_subprocess_run.return_value.stdout = (
+            "a.md|Zettelkasten Method|zk\nb.md|Zettelkasten|\nc.md|日記|\n"
+        )
+        service = test_injector.get(FindNotesByTitleService)
+
+        # When: タイトルの一部で検索する
+        result = service.handle(FindNotesByTitleInput(query="zettel", limit=5))
+
+        # Then: 本文を含む全件（jsonl）は読み込まず、タイトル一覧から順位が付くこと
+        assert [note.path for note in result.notes] == [Path("b.md"), Path("a.md")]
+        commands = [call.args[0] for call in mock_subprocess_run.call_args_list]
+        assert all("jsonl" not in command for command in commands)
+        assert result.index_generation is None
@@ -0,0 +1,220 @@
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from injector import Injector
+
+from zk_utils.application.notes.get_notes import GetNotesInput, GetNotesService
+
+DOCUMENTS = [
+    {
+        "path": "a.md",
+        "title": "形態素解析入門",
+        "tags": ["nlp"],
+        "rawContent": "本文A",
+        "created": "2024-01-10T09:00:00Z",
+        "modified": "2024-03-01T09:00:00Z",
+    },
+    {
+        "path": "b.md",
+        "title": "機械学習",
+        "tags": [],
+        "rawContent": "形態素を使う",
+        "created": "2024-02-10T09:00:00Z",
+        "modified": "2024-02-11T09:00:00Z",
+    },
+    {
+        "path": "c.md",
+        "title": "English",
+        "tags": ["en"],
+        "rawContent": "text",
+        "created": "2024-03-10T09:00:00Z",
+        "modified": "2024-03-10T09:00:00Z",
+    },
+]
+
+
+def zk_output(command: list[str], **kwargs: object) -> Mock:
+    result = Mock()
+    if "jsonl" in command:
+        result.stdout = "\n".join(json.dumps(d, ensure_ascii=False) for d in DOCUMENTS)
+    else:
+        result.stdout = "a.md|形態素解析入門|nlp\nc.md|English|en\n"
+    return result
+
+
+@pytest.mark.integration
+class TestGetNotesCatalogIntegration:
+    """インメモリインデックスを使ったGetNotesServiceの結合テスト"""
+
+    def test_non_ascii_search_should_use_ngram_index(
+        self, memory_injector: Injector, mock_subprocess_run: Mock
+    ) -> None:
+        # Given: 日本語の全文検索パターン
+        mock_subprocess_run.side_effect = zk_output
+        service = memory_injector.get(GetNotesService)
+        input_data = GetNotesInput(
+            title_patterns=[], search_patterns=["形態素"], tags=[]
+        )
+
+        # When: ノート一覧を取得
+        result = service.handle(input_data)
+
+        # Then: 本文とタイトルの部分一致でタイトル順に返され、zk listは実行されないこと
+        assert [note.title for note in result.notes] == ["形態素解析入門", "機械学習"]
+        assert result.pagination.total == 2
+        commands = [call[0][0] for call in mock_subprocess_run.call_args_list]
+        assert all("--match" not in command for command in commands)
+
+    def test_non_ascii_title_with_ascii_search_should_combine_with_zk(
+        self, memory_injector: Injector, mock_subprocess_run: Mock
+    ) -> None:
+        # Given: 日本語タイトルとASCIIの全文検索の組み合わせ
+        mock_subprocess_run.side_effect = zk_output
+        service = memory_injector.get(GetNotesService)
+        input_data = GetNotesInput(
+            title_patterns=["解析"], search_patterns=["text"], tags=[]
+        )
+
+        # When: ノート一覧を取得
+        result = service.handle(input_data)
+
+        # Then: 全文検索はzkで評価され、タイトルの一致結果と突き合わされること
+        assert [note.path for note in result.notes] == [Path("a.md")]
+        last_command = mock_subprocess_run.call_args[0][0]
+        assert last_command[-2:] == ["--match", "text"]
+
+    def test_ascii_patterns_should_use_zk_match(
+        self, memory_injector: Injector, mock_subprocess_run: Mock
+    ) -> None:
+        # Given: ASCIIのみの検索パターン
+        mock_subprocess_run.side_effect = zk_output
+        service = memory_injector.get(GetNotesService)
+        input_data = GetNotesInput(
+            title_patterns=[], search_patterns=["English"], tags=[]
+        )
+
+        # When: ノート一覧を取得
+        service.handle(input_data)
+
+        # Then: 従来通りzkのFTSで検索されること
+        last_command = mock_subprocess_run.call_args[0][0]
+        assert last_command[-2:] == ["--match", "English"]
+
+    def test_disabled_catalog_should_not_build_index(
+        self, test_injector: Injector, mock_subprocess_run: Mock
+    ) -> None:
+        # Given: インメモリインデックスが無効な既定の設定
+        mock_subprocess_run.side_effect = zk_output
+        service = test_injector.get(GetNotesService)
+        input_data = GetNotesInput(
+            title_patterns=[], search_patterns=["形態素"], tags=[]
+        )
+
+        # When: ノート一覧を取得
+        service.handle(input_data)
+
+        # Then: jsonlでの全件取得は行われないこと
+        commands = [call[0][0] for call in mock_subprocess_run.call_args_list]
+        assert all("jsonl" not in command for command in commands)
+        assert commands[-1][-2:] == ["--match", "形態素"]
+
+    def test_tags_should_use_tag_index(
+        self, memory_injector: Injector, mock_subprocess_run: Mock
+    ) -> None:
+        # Given: タグのみの絞り込み
+        mock_subprocess_run.side_effect = zk_output
+        service = memory_injector.get(GetNotesService)
+        input_data = GetNotesInput(
+            title_patterns=[],
+            search_patterns=[],
+            tags=["nlp", "en"],
+            tags_match_mode="OR",
+        )
+
+        # When: ノート一覧を取得
+        result = service.handle(input_data)
+
+        # Then: zk listを使わずにタグ索引から返されること
+        assert [note.path for note in result.notes] == [Path("c.md"), Path("a.md")]
+        commands = [call[0][0] for call in mock_subprocess_run.call_args_list]
+        assert all("--tag" not in command for command in commands)
+
+    @pytest.mark.parametrize(
+        ("created_after", "created_before", "modified_after", "expected"),
+        [
+            pytest.param(
+                "2024-02-01",
+                None,
+                None,
+                [Path("c.md"), Path("b.md")],
+                id="created_after_should_filter",
+            ),
+            pytest.param(
+                "2024-01-01",
+                "2024-03-01",
+                None,
+                [Path("a.md"), Path("b.md")],
+                id="created_range_should_exclude_upper_bound",
+            ),
+            pytest.param(
+                None,
+                None,
+                "2024-02-20",
+                [Path("c.md"), Path("a.md")],
+                id="modified_after_should_filter",
+            ),
+        ],
+    )
+    def test_iso_dates_should_use_date_index(
+        self,
+        memory_injector: Injector,
+        mock_subprocess_run: Mock,
+        created_after: str | None,
+        created_before: str | None,
+        modified_after: str | None,
+        expected: list[Path],
+    ) -> None:
+        # Given: ISO 8601形式の日付による絞り込み
+        mock_subprocess_run.side_effect = zk_output
+        service = memory_injector.get(GetNotesService)
+        input_data = GetNotesInput(
+            title_patterns=[],
+            search_patterns=[],
+            tags=[],
+            created_after=created_after,
+            created_before=created_before,
+            modified_after=modified_after,
+        )
+
+        # When: ノート一覧を取得
+        result = service.handle(input_data)
+
+        # Then: zkに日付条件を渡さずに日付索引から返されること
+        assert [note.path for note in result.notes] == expected
+        commands = [call[0][0] for call in mock_subprocess_run.call_args_list]
+        assert all(
+            not any(arg.startswith(("--created", "--modified")) for arg in command)
+            for command in commands
+        )
+
+    def test_unknown_date_should_be_passed_to_zk(
+        self, memory_injector: Injector, mock_subprocess_run: Mock
+    ) -> None:
+        # Given: 解釈できない日付による絞り込み
+        mock_subprocess_run.side_effect = zk_output
+        service = memory_injector.get(GetNotesService)
+        input_data = GetNotesInput(
+            title_patterns=[],
+            search_patterns=[],
+            tags=[],
+            modified_before="someday",
+        )
+
+        # When: ノート一覧を取得
+        service.handle(input_data)
+
+        # Then: 従来通りzkで評価されること
+        last_command = mock_subprocess_run.call_args[0][0]
+        assert last_command[-2:] == ["--modified-before", "someday"]
@@ -47,7 +47,7 @@ class TestGetRandomNoteIntegration:
         input_data = GetRandomNoteInput()
 
         # When & Then: ValueErrorが発生すること
-        with pytest.raises(ValueError, match="Last modified note not found"):
+        with pytest.raises(ValueError, match="Random note not found"):
             service.handle(input_data)
 
     def test_get_random_note_with_japanese_title_should_handle_correctly(
@@ -157,5 +157,5 @@ class TestGetRandomNoteIntegration:
         input_data = GetRandomNoteInput()
 
         # When & Then: ValueErrorが発生すること
-        with pytest.raises(ValueError, match="Last modified note not found"):
+        with pytest.raises(ValueError, match="Random note not found"):
             service.handle(input_data)
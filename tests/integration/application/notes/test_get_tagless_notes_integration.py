@@ -31,13 +31,13 @@ class TestGetTaglessNotesIntegration:
         # When: タグなしノートを取得
         result = service.handle(input_data)
 
-        # Then: 期待する結果が返されること
+        # Then: タイトル順で期待する結果が返されること
         assert len(result.notes) == 3
-        assert result.notes[0].title == "タグなしノート1"
-        assert result.notes[0].path == Path("/path/to/note1.md")
+        assert result.notes[0].title == "Note without tags"
+        assert result.notes[0].path == Path("/path/to/note2.md")
         assert result.notes[0].tags == []
-        assert result.notes[1].title == "Note without tags"
-        assert result.notes[1].path == Path("/path/to/note2.md")
+        assert result.notes[1].title == "タグなしノート1"
+        assert result.notes[1].path == Path("/path/to/note1.md")
         assert result.notes[1].tags == []
         assert result.notes[2].title == "無タグノート"
         assert result.notes[2].path == Path("/path/to/note3.md")
@@ -95,11 +95,11 @@ class TestGetTaglessNotesIntegration:
         # When: タグなしノートを取得
         result = service.handle(input_data)
 
-        # Then: 特殊文字が正しく処理されること
+        # Then: 特殊文字が正しく処理され、タイトル順に並ぶこと
         assert len(result.notes) == 3
-        assert result.notes[0].title == "特殊文字 @#$% を含むノート"
-        assert result.notes[1].title == "📝 Emoji Note 🎯"
-        assert result.notes[2].title == "ユニコード文字 αβγ δεζ"
+        assert result.notes[0].title == "ユニコード文字 αβγ δεζ"
+        assert result.notes[1].title == "特殊文字 @#$% を含むノート"
+        assert result.notes[2].title == "📝 Emoji Note 🎯"
 
     def test_get_tagless_notes_with_zk_command_error_should_raise_runtime_error(
         self,
@@ -134,9 +134,9 @@ class TestGetTaglessNotesIntegration:
         # When: タグなしノートを取得
         result = service.handle(input_data)
 
-        # Then: 有効な行のみが処理されること
+        # Then: 有効な行のみが処理され、タイトル順に並ぶこと
         assert len(result.notes) == 4
-        assert result.notes[0].title == "有効なタグなしノート1"
-        assert result.notes[1].title == "有効なタグなしノート2"
-        assert result.notes[2].title == "invalid|format|line|with|too|many"
+        assert result.notes[0].title == "invalid|format|line|with|too|many"
+        assert result.notes[1].title == "有効なタグなしノート1"
+        assert result.notes[2].title == "有効なタグなしノート2"
         assert result.notes[3].title == "有効なタグなしノート3"
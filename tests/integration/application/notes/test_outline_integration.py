@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from injector import Injector
+
+from zk_utils.application.notes.get_outlines import (
+    GetOutlinesInput,
+    GetOutlinesService,
+)
+from zk_utils.application.notes.search_headings import (
+    SearchHeadingsInput,
+    SearchHeadingsService,
+)
+
+NOTES = {
+    "design.md": "# 設計\n\n## TODO\n\n- 調査\n\n## 決定事項\n",
+    "diary.md": "# 日記\n\n## todo\n",
+}
+
+
+@pytest.mark.integration
+class TestOutlineIntegration:
+    """SearchHeadingsService・GetOutlinesServiceとカタログの結合テスト"""
+
+    @pytest.fixture(autouse=True)
+    def notebook(self, tmp_path: Path, mock_subprocess_run: Mock) -> None:
+        documents = []
+        for name, content in NOTES.items():
+            (tmp_path / name).write_text(content)
+            title = content.splitlines()[0].lstrip("# ")
+            documents.append({"path": name, "title": title, "rawContent": content})
+
+        mock_subprocess_run.return_value.stdout = "\n".join(
+            json.dumps(d, ensure_ascii=False) for d in documents
+        )
+
+    def test_search_headings_should_find_sections_across_notes(
+        self, memory_injector: Injector
+    ) -> None:
+        # Given: 2件のノートにあるTODOの見出し
+        service = memory_injector.get(SearchHeadingsService)
+
+        # When: h2の見出しを検索する
+        result = service.handle(SearchHeadingsInput(query="TODO", levels=[2]))
+
+        # Then: 1回の呼び出しで両方のノートの見出しが1始まりの行番号で返されること
+        assert result.total == 2
+        assert [m.note.path for m in result.matches] == [
+            Path("diary.md"),
+            Path("design.md"),
+        ]
+        heading = result.matches[1].heading
+        assert (heading.line, heading.end_line, heading.parents) == (3, 6, ["設計"])
+        assert result.index_generation is not None
+
+    def test_get_outlines_should_resolve_titles_and_report_missing(
+        self, memory_injector: Injector
+    ) -> None:
+        # Given: タイトルとパスで指定したノートと、存在しないノート
+        service = memory_injector.get(GetOutlinesService)
+        input_data = GetOutlinesInput(
+            paths=[Path("設計"), Path("diary.md"), Path("missing.md")]
+        )
+
+        # When: アウトラインをまとめて取得する
+        result = service.handle(input_data)
+
+        # Then: 見つかったノートのアウトラインが入力順に返されること
+        assert [o.note.path for o in result.outlines] == [
+            Path("design.md"),
+            Path("diary.md"),
+        ]
+        assert [h.text for h in result.outlines[0].headings] == [
+            "設計",
+            "TODO",
+            "決定事項",
+        ]
+        assert result.missing == [Path("missing.md")]
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import Mock
 
 import pytest
@@ -139,3 +140,34 @@ class TestGetTagsIntegration:
         assert result.tags[2].name == "한국어태그"
         assert result.tags[3].name == "العربية"
         assert result.tags[4].name == "🏷️📋📝"
+
+
+@pytest.mark.integration
+class TestGetTagsCatalogIntegration:
+    """インメモリのタグ索引を使ったGetTagsServiceの結合テスト"""
+
+    def test_get_tags_should_count_from_tag_index(
+        self,
+        memory_injector: Injector,
+        mock_subprocess_run: Mock,
+    ) -> None:
+        # Given: カタログ構築用のjsonl出力
+        mock_subprocess_run.return_value.stdout = "\n".join(
+            json.dumps(d, ensure_ascii=False)
+            for d in [
+                {"path": "a.md", "title": "A", "tags": ["python", "日本語"]},
+                {"path": "b.md", "title": "B", "tags": ["python"]},
+            ]
+        )
+        service = memory_injector.get(GetTagsService)
+
+        # When: タグ一覧を取得
+        result = service.handle(GetTagsInput())
+
+        # Then: タグ索引のノート数が返され、zk tag listは実行されないこと
+        assert [(tag.name, tag.note_count) for tag in result.tags] == [
+            ("python", 2),
+            ("日本語", 1),
+        ]
+        commands = [call[0][0] for call in mock_subprocess_run.call_args_list]
+        assert all(command[:2] != ["zk", "tag"] for command in commands)
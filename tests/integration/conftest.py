@@ -6,7 +6,11 @@ import pytest
 from injector import Injector
 from pytest_mock import MockerFixture
 
+from zk_utils.infrastructure.zk.catalog import CatalogConfig
 from zk_utils.presentation.injector import injector as app_injector
+from zk_utils.presentation.injector.note_module import NoteModule
+from zk_utils.presentation.injector.tag_module import TagModule
+from zk_utils.presentation.injector.zk_module import ZkModule
 
 
 @pytest.fixture
@@ -83,6 +87,15 @@ def test_injector() -> Injector:
     return app_injector
 
 
+@pytest.fixture
+def memory_injector(tmp_path: Path) -> Injector:
+    """インメモリインデックスを有効にしたテスト用DIコンテナ"""
+    injector = Injector([NoteModule, TagModule, ZkModule])
+    injector.binder.bind(Path, to=tmp_path)
+    injector.binder.bind(CatalogConfig, to=CatalogConfig(enabled=True))
+    return injector
+
+
 @pytest.fixture
 def sample_note_path() -> Path:
     """テスト用ノートパス"""
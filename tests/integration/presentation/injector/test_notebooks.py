@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from zk_utils.application.notes.get_notes import GetNotesService
+from zk_utils.infrastructure.zk.catalog import CatalogConfig
+from zk_utils.infrastructure.zk.zk_client import ZkClient
+from zk_utils.presentation import injector as injector_package
+from zk_utils.presentation.injector import get_injector
+from zk_utils.presentation.mcp import tools
+from zk_utils.presentation.settings import NotebookSettings, Settings
+
+
+@pytest.fixture
+def notebooks(tmp_path: Path, monkeypatch: MonkeyPatch) -> dict[str, Path]:
+    """ZK_DIRと名前付きのノートブックを設定し、DIコンテナを作り直す"""
+    paths = {"default": tmp_path / "default", "work": tmp_path / "work"}
+    monkeypatch.setenv("ZK_DIR", str(paths["default"]))
+    monkeypatch.setenv(
+        "NOTEBOOKS",
+        f'{{"work": {{"zk_dir": "{paths["work"]}", "index_backend": "memory"}}}}',
+    )
+    monkeypatch.setattr(injector_package, "_injectors", {})
+    return paths
+
+
+@pytest.mark.integration
+class TestNotebookSettings:
+    """ノートブックごとの設定のテスト"""
+
+    def test_notebook_should_inherit_global_settings(self, tmp_path: Path) -> None:
+        # Given: 一部の項目だけを指定したノートブック
+        settings = Settings(
+            zk_dir=tmp_path,
+            change_detection="hash",
+            workers=4,
+            notebooks={"work": NotebookSettings(zk_dir=tmp_path / "work", workers=2)},
+        )
+
+        # When: ノートブックの設定を取得する
+        default = settings.notebook(None)
+        work = settings.notebook("work")
+
+        # Then: 未指定の項目は全体の設定で補われること
+        assert settings.notebook_names() == ["default", "work"]
+        assert default == NotebookSettings(
+            zk_dir=tmp_path, index_backend="zk", change_detection="hash", workers=4
+        )
+        assert work.zk_dir == tmp_path / "work"
+        assert work.change_detection == "hash"
+        assert work.workers == 2
+
+    def test_unknown_notebook_should_raise(self, tmp_path: Path) -> None:
+        # Given: 名前付きのノートブックが無い設定
+        settings = Settings(zk_dir=tmp_path)
+
+        # When/Then: 存在しない名前はエラーになること
+        with pytest.raises(ValueError, match="Unknown notebook: work"):
+            settings.notebook("work")
+
+    def test_default_name_should_be_reserved(self, tmp_path: Path) -> None:
+        # When/Then: ZK_DIRのノートブックの名前は使えないこと
+        with pytest.raises(ValueError, match="reserved"):
+            Settings(
+                zk_dir=tmp_path,
+                notebooks={"default": NotebookSettings(zk_dir=tmp_path)},
+            )
+
+
+@pytest.mark.integration
+class TestNotebookInjectors:
+    """ノートブックごとのDIコンテナのテスト"""
+
+    def test_notebooks_should_not_share_singletons(
+        self, notebooks: dict[str, Path]
+    ) -> None:
+        # When: それぞれのノートブックのDIコンテナから依存を解決する
+        default = get_injector()
+        work = get_injector("work")
+
+        # Then: クライアントとカタログの設定はノートブックごとに別になること
+        assert default is get_injector("default")
+        assert default is not work
+        assert default.get(ZkClient) is not work.get(ZkClient)
+        assert default.get(ZkClient)._cwd == notebooks["default"]
+        assert work.get(ZkClient)._cwd == notebooks["work"]
+        assert default.get(CatalogConfig).enabled is False
+        assert work.get(CatalogConfig).enabled is True
+
+    def test_unknown_notebook_should_not_create_injector(
+        self, notebooks: dict[str, Path]
+    ) -> None:
+        # When/Then: 存在しないノートブックはエラーになり、DIコンテナは作られないこと
+        with pytest.raises(ValueError, match="Unknown notebook: private"):
+            get_injector("private")
+        assert "private" not in injector_package._injectors
+
+    def test_federated_service_should_use_each_notebook(
+        self, notebooks: dict[str, Path]
+    ) -> None:
+        # When: 全ノートブックを検索するサービスを作る
+        service = tools.federated_notes_service()
+
+        # Then: 各ノートブックのDIコンテナのサービスを使うこと
+        assert service._services == {
+            "default": get_injector().get(GetNotesService),
+            "work": get_injector("work").get(GetNotesService),
+        }
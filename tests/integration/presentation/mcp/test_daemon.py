@@ -0,0 +1,266 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import anyio
+import pytest
+from pytest import MonkeyPatch
+
+from zk_utils.presentation.mcp import shim
+from zk_utils.presentation.mcp.daemon import serve_unix_socket
+from zk_utils.presentation.mcp.server import mcp
+from zk_utils.presentation.mcp.socket_path import (
+    default_socket_path,
+    ensure_socket_dir,
+)
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-03-26",
+        "capabilities": {},
+        "clientInfo": {"name": "test", "version": "0"},
+    },
+}
+
+
+@pytest.fixture
+def socket_dir() -> Iterator[Path]:
+    # Unixソケットのパスは長さに制限があるため、短い一時ディレクトリを使う
+    with tempfile.TemporaryDirectory(prefix="zk") as directory:
+        yield Path(directory)
+
+
+async def initialize(path: Path) -> dict[str, object]:
+    async with await anyio.connect_unix(path) as stream:
+        await stream.send(json.dumps(INITIALIZE).encode() + b"\n")
+        received = b""
+        while not received.endswith(b"\n"):
+            received += await stream.receive()
+
+    response: dict[str, object] = json.loads(received)
+    return response
+
+
+async def wait_for_socket(path: Path) -> None:
+    with anyio.fail_after(10):
+        while not path.exists():
+            await anyio.sleep(0.01)
+
+
+@pytest.mark.integration
+class TestDaemon:
+    """Unixソケットで待ち受けるデーモンのテスト"""
+
+    def test_sessions_should_share_one_daemon(self, socket_dir: Path) -> None:
+        # Given: Unixソケットで待ち受けるデーモン
+        path = socket_dir / "d.sock"
+        responses: list[dict[str, object]] = []
+
+        async def run() -> None:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(serve_unix_socket, mcp, path)
+                await wait_for_socket(path)
+
+                # When: 2つのセッションが同時に接続して初期化する
+                async def session() -> None:
+                    responses.append(await initialize(path))
+
+                async with anyio.create_task_group() as sessions:
+                    sessions.start_soon(session)
+                    sessions.start_soon(session)
+                tg.cancel_scope.cancel()
+
+        anyio.run(run)
+
+        # Then: どちらのセッションにも同じサーバーが応答し、終了後にソケットが消えること
+        assert len(responses) == 2
+        for response in responses:
+            assert response["id"] == 1
+            assert response["result"]["serverInfo"]["name"] == "zk-mcp"  # type: ignore[index]
+        assert not path.exists()
+
+    def test_second_daemon_should_fail_while_first_is_running(
+        self, socket_dir: Path
+    ) -> None:
+        # Given: 既に稼働中のデーモン
+        path = socket_dir / "d.sock"
+
+        async def run() -> None:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(serve_unix_socket, mcp, path)
+                await wait_for_socket(path)
+
+                # When/Then: 同じソケットでもう1つ起動するとエラーになること
+                with pytest.raises(RuntimeError, match="already serving"):
+                    await serve_unix_socket(mcp, path)
+                # 稼働中のデーモンのソケットは残ること
+                assert (await initialize(path))["id"] == 1
+                tg.cancel_scope.cancel()
+
+        anyio.run(run)
+
+    def test_stale_socket_should_be_replaced(self, socket_dir: Path) -> None:
+        # Given: 異常終了で残ったソケットのファイル
+        path = socket_dir / "d.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+
+        async def run() -> dict[str, object]:
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(serve_unix_socket, mcp, path)
+                # When: 新しいデーモンが待ち受けを始めた後に接続する
+                with anyio.fail_after(10):
+                    while True:
+                        try:
+                            response = await initialize(path)
+                            break
+                        except OSError:
+                            await anyio.sleep(0.01)
+                tg.cancel_scope.cancel()
+            return response
+
+        # Then: 新しいデーモンが応答すること
+        assert anyio.run(run)["id"] == 1
+
+
+@pytest.mark.integration
+class TestShim:
+    """stdioとデーモンを中継するシムのテスト"""
+
+    def test_shim_should_forward_stdio_to_daemon(self, socket_dir: Path) -> None:
+        # Given: 別プロセスで起動したデーモン
+        path = socket_dir / "d.sock"
+        env = os.environ | {"TRANSPORT": "unix", "SOCKET_PATH": str(path)}
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "zk_utils.presentation.mcp.server"],
+            env=env,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            anyio.run(wait_for_socket, path)
+
+            # When: シムの標準入力に初期化の要求を書き込む
+            result = subprocess.run(
+                [sys.executable, "-m", "zk_utils.presentation.mcp.shim"],
+                env=os.environ | {"SOCKET_PATH": str(path)},
+                input=json.dumps(INITIALIZE).encode() + b"\n",
+                capture_output=True,
+                timeout=30,
+                check=True,
+            )
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+        # Then: デーモンの応答が標準出力に中継されること
+        response = json.loads(result.stdout)
+        assert response["result"]["serverInfo"]["name"] == "zk-mcp"
+
+    def test_connect_should_start_daemon_when_not_running(
+        self, socket_dir: Path, monkeypatch: MonkeyPatch
+    ) -> None:
+        # Given: デーモンの起動の代わりにソケットで待ち受ける処理
+        path = socket_dir / "d.sock"
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        started: list[Path] = []
+
+        def start_daemon(target: Path) -> None:
+            started.append(target)
+            listener.bind(str(target))
+            listener.listen()
+
+        monkeypatch.setattr(shim, "start_daemon", start_daemon)
+
+        # When: デーモンが動いていない状態で接続する
+        with listener, shim.connect(path, timeout=5):
+            pass
+
+        # Then: デーモンを1回だけ起動して接続すること
+        assert started == [path]
+
+    def test_connect_should_fail_after_timeout(
+        self, socket_dir: Path, monkeypatch: MonkeyPatch
+    ) -> None:
+        # Given: 起動しても待ち受けないデーモン
+        monkeypatch.setattr(shim, "start_daemon", lambda _: None)
+
+        # When/Then: タイムアウト後に接続のエラーになること
+        with pytest.raises(FileNotFoundError):
+            shim.connect(socket_dir / "d.sock", timeout=0.1)
+
+    @pytest.mark.parametrize(
+        ("runtime_dir", "expected_parent"),
+        [
+            pytest.param(
+                "/run/user/1000",
+                Path("/run/user/1000/zk-utils"),
+                id="runtime_dir_should_be_preferred",
+            ),
+            pytest.param(
+                "",
+                Path(tempfile.gettempdir()) / f"zk-utils-{os.getuid()}",
+                id="temp_dir_should_be_used_without_runtime_dir",
+            ),
+        ],
+    )
+    def test_default_socket_path(
+        self,
+        monkeypatch: MonkeyPatch,
+        tmp_path: Path,
+        runtime_dir: str,
+        expected_parent: Path,
+    ) -> None:
+        # Given: 実行時ディレクトリの設定
+        monkeypatch.setenv("XDG_RUNTIME_DIR", runtime_dir)
+
+        # When: ノートブックのソケットのパスを求める
+        path = default_socket_path(tmp_path)
+
+        # Then: ノートブックごとに決まったパスになること
+        assert path.parent == expected_parent
+        assert path.suffix == ".sock"
+        assert path == default_socket_path(tmp_path / ".")
+
+    @pytest.mark.parametrize(
+        "prepare",
+        [
+            pytest.param(
+                lambda path: path.mkdir() or path.chmod(0o755),
+                id="shared_mode_should_be_refused",
+            ),
+            pytest.param(
+                lambda path: path.symlink_to(path.parent / "elsewhere"),
+                id="symlink_should_be_refused",
+            ),
+        ],
+    )
+    def test_unsafe_socket_dir_should_be_refused(
+        self, socket_dir: Path, prepare: Callable[[Path], None]
+    ) -> None:
+        # Given: 他のユーザーも使えるか、別の場所を指すディレクトリ
+        (socket_dir / "elsewhere").mkdir(mode=0o700)
+        path = socket_dir / "run"
+        prepare(path)
+
+        # When/Then: デーモンはソケットを作らずにエラーになること
+        with pytest.raises(RuntimeError, match="Refusing to use"):
+            anyio.run(serve_unix_socket, mcp, path / "d.sock")
+        assert not (path / "d.sock").exists()
+
+    def test_socket_dir_should_be_created_private(self, socket_dir: Path) -> None:
+        # When: 存在しないソケットのディレクトリを用意する
+        path = socket_dir / "run"
+        ensure_socket_dir(path)
+
+        # Then: 自分だけが使えるディレクトリとして作られること
+        assert path.stat().st_mode & 0o777 == 0o700
+        ensure_socket_dir(path)
@@ -6,7 +6,7 @@ from pytest import MonkeyPatch
 
 from zk_utils.application.notes.get_tagless_notes import GetTaglessNotesService
 from zk_utils.presentation.injector import injector as app_injector
-from zk_utils.presentation.mcp.server import get_tagless_notes
+from zk_utils.presentation.mcp.tools import get_tagless_notes
 
 
 @pytest.mark.integration
@@ -32,12 +32,12 @@ class TestGetTaglessNotesMCPEndpoint:
             mp.setattr("zk_utils.presentation.mcp.server.injector", app_injector)
             result = get_tagless_notes()
 
-        # Then: 期待する結果が返されること
+        # Then: タイトル順で期待する結果が返されること
         assert hasattr(result, "notes")
         assert len(result.notes) == 2
-        assert result.notes[0].title == "タグなしノート1"
+        assert result.notes[0].title == "Note without tags"
         assert result.notes[0].tags == []
-        assert result.notes[1].title == "Note without tags"
+        assert result.notes[1].title == "タグなしノート1"
         assert result.notes[1].tags == []
 
     def test_get_tagless_notes_endpoint_with_empty_result(
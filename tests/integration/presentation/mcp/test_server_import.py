@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import pytest
+
+from zk_utils.application.tags.get_tags import GetTagsService
+from zk_utils.presentation.injector import deferred_injector, get_injector
+
+
+@pytest.mark.integration
+class TestServerImport:
+    """MCPサーバーの起動時の読み込みテスト"""
+
+    def test_import_should_not_load_deferred_modules(self) -> None:
+        # Given: サーバーモジュールを読み込み、読み込まれたモジュールを出力するコード
+        code = (
+            "import sys\n"
+            "import zk_utils.presentation.mcp.server\n"
+            "print('\\n'.join(sys.modules))\n"
+        )
+
+        # When: 別プロセスで実行する
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        # Then: ツールの登録に使うアプリケーション層、インフラ層と
+        # マークダウンのパーサーは読み込まれないこと
+        modules = result.stdout.splitlines()
+        assert "zk_utils.presentation.mcp.server" in modules
+        assert not [
+            module
+            for module in modules
+            if module.startswith(
+                (
+                    "zk_utils.application",
+                    "zk_utils.infrastructure",
+                    "zk_utils.presentation.mcp.tools",
+                    "markdown_it",
+                )
+            )
+        ]
+
+    def test_deferred_injector_should_resolve_from_app_injector(self) -> None:
+        # When: 遅延したDIコンテナからサービスを取得する
+        service = deferred_injector.get(GetTagsService)
+
+        # Then: アプリケーションのDIコンテナのシングルトンが返されること
+        assert service is get_injector().get(GetTagsService)
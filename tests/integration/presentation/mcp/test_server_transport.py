@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import anyio
+import pytest
+from mcp import types
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+from pytest import MonkeyPatch
+
+from zk_utils._process import run_process
+from zk_utils.application.server import get_server_stats as app_get_server_stats
+from zk_utils.presentation.mcp import server, tools
+
+
+def assert_killed(pid: int) -> None:
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return
+        time.sleep(0.05)
+
+    pytest.fail(f"process {pid} was not killed")
+
+
+@pytest.mark.integration
+class TestServerTransport:
+    """MCPサーバーのトランスポートとツールの実行スレッドのテスト"""
+
+    def test_tool_should_run_in_worker_thread(self, monkeypatch: MonkeyPatch) -> None:
+        # Given: 実行されたスレッドを記録するサービス
+        threads: list[threading.Thread] = []
+
+        def handle(_: object) -> app_get_server_stats.GetServerStatsOutput:
+            threads.append(threading.current_thread())
+            return app_get_server_stats.GetServerStatsOutput(
+                ready=True, warm_up="idle", steps=[], error=None, catalog_notes=0
+            )
+
+        test_injector = Mock()
+        test_injector.get.return_value.handle.side_effect = handle
+        monkeypatch.setattr("zk_utils.presentation.mcp.server.injector", test_injector)
+
+        # When: MCP経由でツールを呼び出す
+        anyio.run(server.mcp.call_tool, "get_server_stats", {})
+
+        # Then: イベントループとは別のスレッドで実行されること
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+
+    def test_tool_decorator_should_keep_function_callable(self) -> None:
+        # Given/When: 登録済みのツール名
+        names = {t.name for t in server.mcp._tool_manager.list_tools()}
+
+        # Then: モジュールの関数は元の同期関数のまま、ツールとして登録されていること
+        assert "get_notes" in names
+        assert not tools.get_notes.__code__.co_flags & 0x80  # CO_COROUTINE
+
+    @pytest.mark.parametrize(
+        ("host", "keeps_security"),
+        [
+            pytest.param("127.0.0.1", True, id="loopback_should_keep_host_check"),
+            pytest.param("0.0.0.0", False, id="any_address_should_drop_host_check"),
+        ],
+    )
+    def test_main_should_apply_transport_settings(
+        self, monkeypatch: MonkeyPatch, host: str, keeps_security: bool
+    ) -> None:
+        # Given: HTTPで待ち受ける設定
+        monkeypatch.setenv("ZK_DIR", "/tmp")
+        monkeypatch.setenv("TRANSPORT", "streamable-http")
+        monkeypatch.setenv("HTTP_HOST", host)
+        monkeypatch.setenv("HTTP_PORT", "9123")
+        monkeypatch.setenv("WORKERS", "3")
+        monkeypatch.setattr(server.mcp.settings, "host", server.mcp.settings.host)
+        monkeypatch.setattr(server.mcp.settings, "port", server.mcp.settings.port)
+        monkeypatch.setattr(
+            server.mcp.settings,
+            "transport_security",
+            server.mcp.settings.transport_security,
+        )
+        monkeypatch.setattr(server, "workers", anyio.CapacityLimiter(8))
+        run = Mock()
+        monkeypatch.setattr(server.mcp, "run", run)
+
+        # When: サーバーを起動する
+        server.main()
+
+        # Then: 設定したトランスポート、待ち受け先、ワーカー数が反映されること
+        run.assert_called_once_with(transport="streamable-http")
+        assert server.mcp.settings.host == host
+        assert server.mcp.settings.port == 9123
+        assert server.workers.total_tokens == 3
+        assert (server.mcp.settings.transport_security is not None) == keeps_security
+
+    def test_main_should_limit_workers_per_notebook(
+        self, monkeypatch: MonkeyPatch
+    ) -> None:
+        # Given: ワーカー数を指定したノートブックと指定しないノートブック
+        monkeypatch.setenv("ZK_DIR", "/tmp")
+        monkeypatch.setenv("WORKERS", "6")
+        monkeypatch.setenv(
+            "NOTEBOOKS",
+            '{"work": {"zk_dir": "/tmp/work", "workers": 2},'
+            ' "archive": {"zk_dir": "/tmp/archive"}}',
+        )
+        monkeypatch.setattr(server, "notebook_workers", {})
+        monkeypatch.setattr(server, "workers", anyio.CapacityLimiter(8))
+        monkeypatch.setattr(server.mcp, "run", Mock())
+
+        # When: サーバーを起動する
+        server.main()
+
+        # Then: ノートブックごとに別の上限が設定されること
+        assert server.notebook_workers["work"].total_tokens == 2
+        assert server.notebook_workers["archive"].total_tokens == 6
+
+    def test_timeout_should_kill_zk_process(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        # Given: 終わらないコマンドを実行するサービスと短いタイムアウト
+        pid_file = tmp_path / "pid"
+
+        def handle(_: object) -> app_get_server_stats.GetServerStatsOutput:
+            run_process(
+                ["sh", "-c", f"echo $$ > {pid_file}; exec sleep 30"], cwd=tmp_path
+            )
+            raise AssertionError("unreachable")
+
+        test_injector = Mock()
+        test_injector.get.return_value.handle.side_effect = handle
+        monkeypatch.setattr("zk_utils.presentation.mcp.server.injector", test_injector)
+        monkeypatch.setattr(server, "tool_timeouts", {"get_server_stats": 0.5})
+
+        # When: MCP経由でツールを呼び出す
+        started = time.monotonic()
+        with pytest.raises(ToolError, match=r"timed out after 0\.5 seconds"):
+            anyio.run(server.mcp.call_tool, "get_server_stats", {})
+
+        # Then: コマンドの終了を待たずにエラーになり、子プロセスが終了させられること
+        assert time.monotonic() - started < 10
+        assert_killed(int(pid_file.read_text()))
+
+    def test_cancel_notification_should_kill_zk_process(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        # Given: 終わらないコマンドを実行するサービス
+        pid_file = tmp_path / "pid"
+
+        def handle(_: object) -> app_get_server_stats.GetServerStatsOutput:
+            run_process(
+                ["sh", "-c", f"echo $$ > {pid_file}; exec sleep 30"], cwd=tmp_path
+            )
+            raise AssertionError("unreachable")
+
+        test_injector = Mock()
+        test_injector.get.return_value.handle.side_effect = handle
+        monkeypatch.setattr("zk_utils.presentation.mcp.server.injector", test_injector)
+        errors: list[McpError] = []
+
+        async def run() -> None:
+            async with create_connected_server_and_client_session(
+                server.mcp._mcp_server
+            ) as client:
+                request_id = client._request_id
+
+                async def call() -> None:
+                    try:
+                        await client.call_tool("get_server_stats", {})
+                    except McpError as e:
+                        errors.append(e)
+
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(call)
+                    with anyio.fail_after(10):
+                        while not pid_file.exists():
+                            await anyio.sleep(0.01)
+
+                    # When: クライアントが要求の取り消しを通知する
+                    await client.send_notification(
+                        types.ClientNotification(
+                            types.CancelledNotification(
+                                params=types.CancelledNotificationParams(
+                                    requestId=request_id
+                                )
+                            )
+                        )
+                    )
+
+        anyio.run(run)
+
+        # Then: 要求が取り消され、子プロセスが終了させられること
+        assert len(errors) == 1
+        assert_killed(int(pid_file.read_text()))
@@ -0,0 +1,102 @@
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils._process import ProcessScope, run_process
+
+
+class TestRunProcess:
+    """run_processのテスト"""
+
+    def test_outside_scope_should_use_subprocess_run(
+        self, mocker: MockerFixture
+    ) -> None:
+        # Given: モックされたsubprocess.run
+        mock_run = mocker.patch("subprocess.run")
+
+        # When: スコープの外で実行する
+        result = run_process(["zk", "index"], cwd=Path("/test"))
+
+        # Then: subprocess.runでそのまま実行されること
+        mock_run.assert_called_once_with(
+            ["zk", "index"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            cwd=Path("/test"),
+            check=True,
+        )
+        assert result is mock_run.return_value
+
+    def test_inside_scope_should_return_output(self, tmp_path: Path) -> None:
+        # Given: プロセスのスコープ
+        scope = ProcessScope()
+
+        # When: スコープの中で実行する
+        result = scope.call(run_process, command=["pwd"], cwd=tmp_path)
+
+        # Then: 標準出力が返されること
+        assert result.returncode == 0
+        assert Path(result.stdout.strip()).resolve() == tmp_path.resolve()
+
+    def test_inside_scope_should_raise_on_failure(self, tmp_path: Path) -> None:
+        # Given: プロセスのスコープ
+        scope = ProcessScope()
+
+        # When/Then: 失敗したコマンドはCalledProcessErrorになること
+        with pytest.raises(subprocess.CalledProcessError) as e:
+            scope.call(
+                run_process, command=["sh", "-c", "echo ng >&2; exit 3"], cwd=tmp_path
+            )
+        assert e.value.returncode == 3
+        assert e.value.stderr == "ng\n"
+
+
+class TestProcessScope:
+    """ProcessScopeの取り消しのテスト"""
+
+    def test_cancel_should_kill_running_process(self, tmp_path: Path) -> None:
+        # Given: 別スレッドのスコープで実行中の長いコマンド
+        scope = ProcessScope()
+        errors: list[Exception] = []
+
+        def work() -> None:
+            try:
+                scope.call(run_process, command=["sleep", "30"], cwd=tmp_path)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=work)
+        started = time.monotonic()
+        thread.start()
+        while not scope._processes:
+            time.sleep(0.01)
+
+        # When: スコープを取り消す
+        scope.cancel()
+        thread.join(timeout=10)
+
+        # Then: コマンドの終了を待たずに取り消しのエラーで終わること
+        assert not thread.is_alive()
+        assert time.monotonic() - started < 10
+        assert len(errors) == 1
+        assert isinstance(errors[0], RuntimeError)
+        assert "Cancelled" in str(errors[0])
+
+    def test_run_after_cancel_should_not_start_process(
+        self, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        # Given: 取り消し済みのスコープ
+        scope = ProcessScope()
+        scope.cancel()
+        popen = mocker.spy(subprocess, "Popen")
+
+        # When/Then: 実行しようとするとエラーになり、プロセスは起動されないこと
+        with pytest.raises(RuntimeError, match="Cancelled"):
+            scope.call(run_process, command=["true"], cwd=tmp_path)
+        popen.assert_not_called()
+        assert scope.cancelled
@@ -0,0 +1,105 @@
+import pytest
+
+from zk_utils.application._common import sections
+from zk_utils.application._common.sections import Section
+
+NOTE = """---
+title: ノート
+---
+# ノート
+
+## 背景
+
+既存の本文
+
+
+## 作業
+- 項目1
+# 付録
+"""
+
+
+class TestH2Sections:
+    """h2見出しのセクションの行の範囲のテスト"""
+
+    def test_sections_should_end_at_next_h1_or_h2(self) -> None:
+        # Given: フロントマターとh1見出しを含むノート
+
+        # When: セクションの範囲を求める
+        result = sections.h2_sections(NOTE)
+
+        # Then: 行番号はファイル全体での位置になり、h1見出しでもセクションが終わること
+        assert result == (
+            Section(heading="背景", start=5, body=6, end=10),
+            Section(heading="作業", start=10, body=11, end=12),
+        )
+
+    def test_headings_in_frontmatter_and_code_should_be_ignored(self) -> None:
+        # Given: フロントマターとコードブロックの中に見出しのような行があるノート
+        content = "---\n## meta\n---\n## A\n```\n## code\n```\n"
+
+        # When: セクションの範囲を求める
+        result = sections.h2_sections(content)
+
+        # Then: 本文の見出しだけが対象になること
+        assert [s.heading for s in result] == ["A"]
+
+
+class TestReplaceSection:
+    """セクションの本文の置き換えのテスト"""
+
+    def test_replace_should_keep_heading_and_other_sections(self) -> None:
+        # When: 「背景」の本文を置き換える
+        result = sections.replace_section(NOTE, "背景", "新しい本文\n")
+
+        # Then: 見出しと他のセクションはそのまま残ること
+        assert result == NOTE.replace("既存の本文\n\n\n", "新しい本文\n\n")
+
+    def test_missing_heading_should_raise_value_error(self) -> None:
+        # When/Then: 存在しない見出しはエラーになること
+        with pytest.raises(ValueError, match="Section not found: 無い"):
+            sections.replace_section(NOTE, "無い", "本文")
+
+
+class TestAppendToSection:
+    """セクションへの追記のテスト"""
+
+    @pytest.mark.parametrize(
+        "heading,expected",
+        [
+            pytest.param(
+                "背景",
+                NOTE.replace("既存の本文\n", "既存の本文\n\n追記\n"),
+                id="append_should_insert_before_trailing_blank_lines",
+            ),
+            pytest.param(
+                "作業",
+                NOTE.replace("- 項目1\n", "- 項目1\n\n追記\n\n"),
+                id="append_should_separate_from_next_heading",
+            ),
+            pytest.param(
+                "新規",
+                NOTE + "\n## 新規\n\n追記\n",
+                id="missing_heading_should_create_section_at_end",
+            ),
+        ],
+    )
+    def test_append(self, heading: str, expected: str) -> None:
+        # When: セクションに追記する
+        result = sections.append_to_section(NOTE, heading, "追記")
+
+        # Then: 期待どおりの位置に追記されること
+        assert result == expected
+
+
+class TestVerifyHash:
+    """内容のハッシュによる変更の検出のテスト"""
+
+    def test_hash_should_ignore_surrounding_whitespace(self) -> None:
+        # Then: zkが前後の空白を除いて返した本文と同じハッシュになること
+        assert sections.content_hash(NOTE) == sections.content_hash(NOTE.strip())
+
+    def test_mismatched_hash_should_raise_value_error(self) -> None:
+        # When/Then: 異なるハッシュを指定するとエラーになること
+        with pytest.raises(ValueError, match="Note was modified"):
+            sections.verify_hash(NOTE, sections.content_hash("別の内容"))
@@ -0,0 +1,67 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.application.notes.append_to_section import (
+    AppendToSectionInput,
+    AppendToSectionService,
+)
+from zk_utils.domain.models.notes import IFNoteRepository, NoteSource
+
+CONTENT = "# Title\n\n## Log\n\n- first\n"
+
+
+class TestAppendToSectionService:
+    """AppendToSectionServiceの単体テスト"""
+
+    @pytest.fixture
+    def mock_repository(self, mocker: MockerFixture) -> Mock:
+        repository = mocker.create_autospec(IFNoteRepository)
+        repository.find_note_source.return_value = NoteSource(
+            path=Path("note.md"), content=CONTENT
+        )
+        repository.save_note_source.side_effect = lambda source, content: NoteSource(
+            path=source.path, content=content
+        )
+        return repository
+
+    @pytest.fixture
+    def service(self, mock_repository: Mock) -> AppendToSectionService:
+        return AppendToSectionService(repository=mock_repository)
+
+    @pytest.mark.parametrize(
+        "heading,expected,headings",
+        [
+            pytest.param(
+                "Log",
+                "# Title\n\n## Log\n\n- first\n\n- second\n",
+                ["Log"],
+                id="existing_section_should_be_appended",
+            ),
+            pytest.param(
+                "Ideas",
+                "# Title\n\n## Log\n\n- first\n\n## Ideas\n\n- second\n",
+                ["Log", "Ideas"],
+                id="missing_section_should_be_created",
+            ),
+        ],
+    )
+    def test_append_should_save_edited_content(
+        self,
+        service: AppendToSectionService,
+        mock_repository: Mock,
+        heading: str,
+        expected: str,
+        headings: list[str],
+    ) -> None:
+        # When: ハッシュを指定せずにセクションへ追記する
+        result = service.handle(
+            AppendToSectionInput(path=Path("note.md"), heading=heading, text="- second")
+        )
+
+        # Then: 追記した内容が保存されること
+        saved = mock_repository.save_note_source.call_args.args[1]
+        assert saved == expected
+        assert result.headings == headings
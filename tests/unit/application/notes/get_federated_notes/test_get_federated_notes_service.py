@@ -0,0 +1,182 @@
+# Unit tests for get federated notes service
+import contextvars
+import math
+from pathlib import Path
+from typing import Callable
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.application._common.note import Note
+from zk_utils.application._common.pagination import Pagination
+from zk_utils.application.notes.get_federated_notes import (
+    GetFederatedNotesInput,
+    GetFederatedNotesService,
+)
+from zk_utils.application.notes.get_notes import (
+    GetNotesInput,
+    GetNotesOutput,
+    GetNotesService,
+)
+
+_caller: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "caller", default=None
+)
+
+
+def notes_service(mocker: MockerFixture, titles: list[str]) -> Mock:
+    """タイトル順のノートをページ分だけ返すサービスのモック"""
+    service: Mock = mocker.create_autospec(GetNotesService, instance=True)
+
+    def handle(input_data: GetNotesInput) -> GetNotesOutput:
+        page = [
+            Note(title=title, path=Path(f"{title}.md"), tags=[])
+            for title in titles[: input_data.per_page]
+        ]
+        total_pages = max(math.ceil(len(titles) / input_data.per_page), 1)
+        return GetNotesOutput(
+            pagination=Pagination(
+                page=1,
+                per_page=input_data.per_page,
+                total=len(titles),
+                total_pages=total_pages,
+                has_next=total_pages > 1,
+                has_prev=False,
+            ),
+            notes=page,
+        )
+
+    service.handle.side_effect = handle
+    return service
+
+
+def federated_input(**kwargs: object) -> GetFederatedNotesInput:
+    return GetFederatedNotesInput.model_validate(
+        {"title_patterns": [], "search_patterns": [], "tags": []} | kwargs
+    )
+
+
+class TestGetFederatedNotesService:
+    """GetFederatedNotesServiceの単体テスト"""
+
+    @pytest.fixture
+    def services(self, mocker: MockerFixture) -> dict[str, Mock]:
+        return {
+            "default": notes_service(mocker, ["a", "c", "e"]),
+            "work": notes_service(mocker, ["b", "d"]),
+        }
+
+    @pytest.mark.parametrize(
+        ("page", "expected"),
+        [
+            pytest.param(
+                1,
+                [("a", "default"), ("b", "work")],
+                id="first_page_should_interleave_by_rank",
+            ),
+            pytest.param(
+                2,
+                [("c", "default"), ("d", "work")],
+                id="second_page_should_continue_merged_order",
+            ),
+            pytest.param(
+                9,
+                [("e", "default")],
+                id="page_after_last_should_be_clamped",
+            ),
+        ],
+    )
+    def test_handle_should_merge_notebooks(
+        self, services: dict[str, Mock], page: int, expected: list[tuple[str, str]]
+    ) -> None:
+        # Given: 2つのノートブックを検索するサービス
+        service = GetFederatedNotesService(services)
+
+        # When: 2件ずつのページを取得する
+        result = service.handle(federated_input(page=page, per_page=2, tags=["x"]))
+
+        # Then: 各ノートブックの順位ごとに交互に並び、ノートブック名が付くこと
+        assert [(note.title, note.notebook) for note in result.notes] == expected
+        assert result.pagination.total == 5
+        assert result.pagination.total_pages == 3
+        # 各ノートブックには指定ページまでの件数と同じ条件で問い合わせること
+        query = services["work"].handle.call_args.args[0]
+        assert query.page == 1
+        assert query.per_page == page * 2
+        assert query.tags == ["x"]
+
+    def test_handle_should_keep_each_notebook_ranking(
+        self, mocker: MockerFixture
+    ) -> None:
+        # Given: タイトル順ではない順位で結果を返すノートブック
+        service = GetFederatedNotesService(
+            {
+                "default": notes_service(mocker, ["z", "y", "x"]),
+                "work": notes_service(mocker, ["b"]),
+            }
+        )
+
+        # When: 全体を1ページで取得する
+        result = service.handle(federated_input(per_page=10))
+
+        # Then: タイトルではなく、各ノートブックの順位で交互に並ぶこと
+        assert [(note.title, note.notebook) for note in result.notes] == [
+            ("z", "default"),
+            ("b", "work"),
+            ("y", "default"),
+            ("x", "default"),
+        ]
+
+    def test_handle_should_query_selected_notebooks(
+        self, services: dict[str, Mock]
+    ) -> None:
+        # Given: 2つのノートブックを検索するサービス
+        service = GetFederatedNotesService(services)
+
+        # When: 1つのノートブックだけを指定する
+        result = service.handle(federated_input(notebooks=["work", "work"]))
+
+        # Then: 指定したノートブックだけを1回検索すること
+        assert [note.title for note in result.notes] == ["b", "d"]
+        services["work"].handle.assert_called_once()
+        services["default"].handle.assert_not_called()
+
+    def test_handle_should_reject_unknown_notebook(
+        self, services: dict[str, Mock]
+    ) -> None:
+        # Given: 2つのノートブックを検索するサービス
+        service = GetFederatedNotesService(services)
+
+        # When/Then: 存在しないノートブックを指定するとエラーになること
+        with pytest.raises(ValueError, match="Unknown notebook: private"):
+            service.handle(federated_input(notebooks=["private"]))
+
+    def test_handle_should_run_in_caller_context(
+        self, services: dict[str, Mock]
+    ) -> None:
+        # Given: 呼び出し元のコンテキストを記録するノートブック
+        seen: list[str | None] = []
+
+        Handle = Callable[[GetNotesInput], GetNotesOutput]
+
+        def record(handle: Handle) -> Handle:
+            def wrapper(query: GetNotesInput) -> GetNotesOutput:
+                seen.append(_caller.get())
+                return handle(query)
+
+            return wrapper
+
+        for mock in services.values():
+            mock.handle.side_effect = record(mock.handle.side_effect)
+        service = GetFederatedNotesService(services)
+
+        # When: コンテキスト変数を設定して検索する
+        token = _caller.set("request")
+        try:
+            service.handle(federated_input())
+        finally:
+            _caller.reset(token)
+
+        # Then: 各ノートブックの検索が呼び出し元のコンテキストで実行されること
+        assert seen == ["request", "request"]
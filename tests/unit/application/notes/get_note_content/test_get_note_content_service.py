@@ -256,3 +256,40 @@ This is h3 heading.
         assert "これはセクション1の内容です。" in result.content
         assert "セクション2" not in result.content
         assert result.headings == ["セクション1", "セクション2"]
+
+    def test_handle_should_match_section_editing_headings(
+        self, service: GetNoteContentService, mock_repository: Mock
+    ) -> None:
+        """セクションの編集と同じく、フロントマターやコードブロック、引用の中は見出しとしないこと"""
+        # Given: 見出しに見える行をフロントマター・コードブロック・引用に含むノート
+        content = """---
+title: x
+## not a heading
+---
+## 概要
+
+```markdown
+## コード内
+```
+
+> ## 引用内
+
+## 詳細
+
+詳細の本文
+"""
+        domain_note = DomainNote(
+            title="紛らわしいノート", path=Path("/tricky.md"), tags=[], content=content
+        )
+        mock_repository.find_note_content.return_value = domain_note
+
+        # When: セクションを指定して取得する
+        result = service.handle(
+            GetNoteContentInput(path=Path("/tricky.md"), headings=["概要"])
+        )
+
+        # Then: 本物のh2見出しだけが返され、セクションは元のマークダウンのまま返ること
+        assert result.headings == ["概要", "詳細"]
+        assert result.content == (
+            "## 概要\n\n```markdown\n## コード内\n```\n\n> ## 引用内"
+        )
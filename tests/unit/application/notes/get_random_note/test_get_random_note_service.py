@@ -52,12 +52,12 @@ class TestGetRandomNoteService:
     ) -> None:
         # Given: リポジトリで例外が発生する
         mock_repository.find_random_note.side_effect = ValueError(
-            "Last modified note not found"
+            "Random note not found"
         )
         input_data = GetRandomNoteInput()
 
         # When & Then: ValueErrorが伝播すること
-        with pytest.raises(ValueError, match="Last modified note not found"):
+        with pytest.raises(ValueError, match="Random note not found"):
             service.handle(input_data)
 
         mock_repository.find_random_note.assert_called_once()
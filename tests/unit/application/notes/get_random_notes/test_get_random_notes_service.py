@@ -0,0 +1,86 @@
+# Unit tests for get random notes service
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
+
+from zk_utils.application.notes.get_random_notes import (
+    SAMPLE_HISTORY_SIZE,
+    GetRandomNotesInput,
+    GetRandomNotesOutput,
+    GetRandomNotesService,
+)
+from zk_utils.domain.models.notes.if_note_repository import IFNoteRepository
+from zk_utils.domain.models.notes.note import Note as DomainNote
+
+
+class TestGetRandomNotesService:
+    """GetRandomNotesServiceの単体テスト"""
+
+    @pytest.fixture
+    def mock_repository(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(IFNoteRepository)
+
+    @pytest.fixture
+    def service(self, mock_repository: Mock) -> GetRandomNotesService:
+        return GetRandomNotesService(repository=mock_repository)
+
+    def test_handle_success(
+        self, service: GetRandomNotesService, mock_repository: Mock
+    ) -> None:
+        # Given: リポジトリからランダムなノートが取得できる
+        mock_repository.find_random_notes.return_value = [
+            DomainNote(title="A", path=Path("review/a.md"), tags=["review"]),
+            DomainNote(title="B", path=Path("review/b.md"), tags=["review"]),
+        ]
+        input_data = GetRandomNotesInput(
+            count=2,
+            seed=1,
+            tags=["review"],
+            directory=Path("review"),
+            exclude_recent=20,
+        )
+
+        # When: サービスを実行する
+        result = service.handle(input_data)
+
+        # Then: 入力がそのままリポジトリに渡され、ノートが返されること
+        mock_repository.find_random_notes.assert_called_once_with(
+            count=2,
+            seed=1,
+            tags=["review"],
+            directory=Path("review"),
+            exclude_recent=20,
+        )
+        assert isinstance(result, GetRandomNotesOutput)
+        assert [note.title for note in result.notes] == ["A", "B"]
+
+    def test_create_default_input(self) -> None:
+        # When: 引数なしで入力を作成する
+        input_data = GetRandomNotesInput()
+
+        # Then: 1件・絞り込みなしになること
+        assert input_data.count == 1
+        assert input_data.seed is None
+        assert input_data.tags == []
+        assert input_data.directory is None
+        assert input_data.exclude_recent == 0
+
+    @pytest.mark.parametrize(
+        "exclude_recent",
+        [
+            pytest.param(-1, id="negative_exclude_recent_should_be_rejected"),
+            pytest.param(
+                SAMPLE_HISTORY_SIZE + 1,
+                id="exclude_recent_over_history_should_be_rejected",
+            ),
+        ],
+    )
+    def test_input_should_reject_exclude_recent_out_of_range(
+        self, exclude_recent: int
+    ) -> None:
+        # When & Then: 覚えておく件数を超える除外件数は受け付けないこと
+        with pytest.raises(ValidationError):
+            GetRandomNotesInput(exclude_recent=exclude_recent)
@@ -0,0 +1,45 @@
+# Unit tests for get recently modified notes service
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.application.notes.get_recently_modified_notes import (
+    GetRecentlyModifiedNotesInput,
+    GetRecentlyModifiedNotesOutput,
+    GetRecentlyModifiedNotesService,
+)
+from zk_utils.domain.models.notes.if_note_repository import IFNoteRepository
+from zk_utils.domain.models.notes.note import Note as DomainNote
+
+
+class TestGetRecentlyModifiedNotesService:
+    """GetRecentlyModifiedNotesServiceの単体テスト"""
+
+    @pytest.fixture
+    def mock_repository(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(IFNoteRepository)
+
+    @pytest.fixture
+    def service(self, mock_repository: Mock) -> GetRecentlyModifiedNotesService:
+        return GetRecentlyModifiedNotesService(repository=mock_repository)
+
+    def test_handle_success(
+        self, service: GetRecentlyModifiedNotesService, mock_repository: Mock
+    ) -> None:
+        # Given: リポジトリから更新日時の新しい順にノートが取得できる
+        mock_repository.find_recently_modified_notes.return_value = [
+            DomainNote(title="New", path=Path("new.md"), tags=["a"]),
+            DomainNote(title="Old", path=Path("old.md"), tags=[]),
+        ]
+        input_data = GetRecentlyModifiedNotesInput(limit=2)
+
+        # When: サービスを実行する
+        result = service.handle(input_data)
+
+        # Then: 件数を指定してリポジトリが呼ばれ、順序が保たれること
+        mock_repository.find_recently_modified_notes.assert_called_once_with(2)
+        assert isinstance(result, GetRecentlyModifiedNotesOutput)
+        assert [note.title for note in result.notes] == ["New", "Old"]
+        assert result.notes[0].tags == ["a"]
@@ -5,6 +5,7 @@ import pytest
 from pytest_mock import MockerFixture
 
 from zk_utils.application._common.note import Note as AppNote
+from zk_utils.application._common.pagination import Pagination
 from zk_utils.application.notes.get_tagless_notes import (
     GetTaglessNotesInput,
     GetTaglessNotesOutput,
@@ -12,6 +13,7 @@ from zk_utils.application.notes.get_tagless_notes import (
 )
 from zk_utils.domain.models.notes.if_note_repository import IFNoteRepository
 from zk_utils.domain.models.notes.note import Note as DomainNote
+from zk_utils.domain.models.notes.note_page import NotePage
 
 
 class TestGetTaglessNotesService:
@@ -41,14 +43,16 @@ class TestGetTaglessNotesService:
                 tags=[],
             ),
         ]
-        mock_repository.find_tagless_notes.return_value = domain_notes
+        mock_repository.find_tagless_notes.return_value = NotePage(
+            notes=domain_notes, start=0, total=2
+        )
         input_data = GetTaglessNotesInput()
 
         # When: サービスを実行する
         result = service.handle(input_data)
 
-        # Then: リポジトリメソッドが呼ばれ、適切な出力が返されること
-        mock_repository.find_tagless_notes.assert_called_once()
+        # Then: 1ページ目の範囲でリポジトリが呼ばれ、適切な出力が返されること
+        mock_repository.find_tagless_notes.assert_called_once_with(10, 1, None)
         assert isinstance(result, GetTaglessNotesOutput)
         assert len(result.notes) == 2
         assert result.notes[0].title == "Note without tags 1"
@@ -62,7 +66,9 @@ class TestGetTaglessNotesService:
         self, service: GetTaglessNotesService, mock_repository: Mock
     ) -> None:
         # Given: リポジトリから空のリストが返される
-        mock_repository.find_tagless_notes.return_value = []
+        mock_repository.find_tagless_notes.return_value = NotePage(
+            notes=[], start=0, total=0
+        )
         input_data = GetTaglessNotesInput()
 
         # When: サービスを実行する
@@ -97,7 +103,9 @@ class TestGetTaglessNotesService:
             path=Path("/single.md"),
             tags=[],
         )
-        mock_repository.find_tagless_notes.return_value = [domain_note]
+        mock_repository.find_tagless_notes.return_value = NotePage(
+            notes=[domain_note], start=0, total=1
+        )
         input_data = GetTaglessNotesInput()
 
         # When: サービスを実行する
@@ -112,6 +120,89 @@ class TestGetTaglessNotesService:
         assert result.notes[0].tags == []
 
 
+class TestGetTaglessNotesServicePagination:
+    """GetTaglessNotesServiceのページ送りテスト"""
+
+    @pytest.fixture
+    def mock_repository(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(IFNoteRepository)
+
+    @pytest.fixture
+    def service(self, mock_repository: Mock) -> GetTaglessNotesService:
+        return GetTaglessNotesService(repository=mock_repository)
+
+    @staticmethod
+    def page(start: int, count: int, total: int) -> NotePage:
+        return NotePage(
+            notes=[
+                DomainNote(title=f"Note {i}", path=Path(f"{i}.md"), tags=[])
+                for i in range(start, start + count)
+            ],
+            start=start,
+            total=total,
+        )
+
+    def test_page_should_return_slice(
+        self, service: GetTaglessNotesService, mock_repository: Mock
+    ) -> None:
+        # Given: 5件のうち3件目と4件目を返すリポジトリ
+        mock_repository.find_tagless_notes.return_value = self.page(2, 2, 5)
+
+        # When: 2件ずつの2ページ目を取得する
+        result = service.handle(GetTaglessNotesInput(page=2, per_page=2))
+
+        # Then: ページの範囲だけを問い合わせ、ページ情報が設定されること
+        mock_repository.find_tagless_notes.assert_called_once_with(2, 2, None)
+        assert [note.title for note in result.notes] == ["Note 2", "Note 3"]
+        assert result.pagination.page == 2
+        assert result.pagination.total == 5
+        assert result.pagination.total_pages == 3
+        assert result.pagination.has_next
+        assert result.pagination.has_prev
+        assert result.next_cursor is not None
+
+    def test_cursor_should_be_passed_as_key(
+        self, service: GetTaglessNotesService, mock_repository: Mock
+    ) -> None:
+        # Given: 1ページ目を取得した
+        mock_repository.find_tagless_notes.return_value = self.page(0, 2, 5)
+        first = service.handle(GetTaglessNotesInput(per_page=2))
+        mock_repository.find_tagless_notes.return_value = self.page(2, 2, 5)
+
+        # When: カーソルを指定して続きを取得する
+        assert first.next_cursor is not None
+        second = service.handle(
+            GetTaglessNotesInput(per_page=2, cursor=first.next_cursor)
+        )
+
+        # Then: 1ページ目の最後のノートより後ろを問い合わせること
+        mock_repository.find_tagless_notes.assert_called_with(2, 1, ("Note 1", "1.md"))
+        assert [note.title for note in second.notes] == ["Note 2", "Note 3"]
+        assert second.pagination.has_next
+
+    def test_last_page_should_not_have_next_cursor(
+        self, service: GetTaglessNotesService, mock_repository: Mock
+    ) -> None:
+        # Given: 最後の1件を返すリポジトリ
+        mock_repository.find_tagless_notes.return_value = self.page(4, 1, 5)
+
+        # When: 最後のページを取得する
+        result = service.handle(GetTaglessNotesInput(page=3, per_page=2))
+
+        # Then: 次のカーソルは返されないこと
+        assert [note.title for note in result.notes] == ["Note 4"]
+        assert result.next_cursor is None
+        assert not result.pagination.has_next
+
+    def test_invalid_cursor_should_raise_error(
+        self, service: GetTaglessNotesService, mock_repository: Mock
+    ) -> None:
+        # When & Then: 不正なカーソルではValueErrorが発生し、問い合わせないこと
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            service.handle(GetTaglessNotesInput(cursor="not-a-cursor"))
+        mock_repository.find_tagless_notes.assert_not_called()
+
+
 class TestGetTaglessNotesInput:
     """GetTaglessNotesInputの単体テスト"""
 
@@ -121,15 +212,21 @@ class TestGetTaglessNotesInput:
         # When: インスタンスを作成する
         input_data = GetTaglessNotesInput()
 
-        # Then: 正常にインスタンスが作成されること
+        # Then: 1ページ目から取得する入力になること
         assert isinstance(input_data, GetTaglessNotesInput)
+        assert input_data.page == 1
+        assert input_data.per_page == 10
+        assert input_data.cursor is None
 
 
 class TestGetTaglessNotesOutput:
     """GetTaglessNotesOutputの単体テスト"""
 
     def test_create_output_with_notes_list(self) -> None:
-        # Given: ノートリスト
+        # Given: ページ情報とノートリスト
+        pagination = Pagination(
+            page=1, per_page=10, total=2, total_pages=1, has_next=False, has_prev=False
+        )
         notes = [
             AppNote(
                 title="Test Note 1",
@@ -144,7 +241,7 @@ class TestGetTaglessNotesOutput:
         ]
 
         # When: アウトプットインスタンスを作成する
-        output = GetTaglessNotesOutput(notes=notes)
+        output = GetTaglessNotesOutput(pagination=pagination, notes=notes)
 
         # Then: 正常にインスタンスが作成されること
         assert isinstance(output, GetTaglessNotesOutput)
@@ -154,11 +251,14 @@ class TestGetTaglessNotesOutput:
         assert output.notes[1].title == "Test Note 2"
 
     def test_create_output_with_empty_list(self) -> None:
-        # Given: 空のノートリスト
+        # Given: 空のページ情報とノートリスト
+        pagination = Pagination(
+            page=1, per_page=10, total=0, total_pages=1, has_next=False, has_prev=False
+        )
         notes: list[AppNote] = []
 
         # When: アウトプットインスタンスを作成する
-        output = GetTaglessNotesOutput(notes=notes)
+        output = GetTaglessNotesOutput(pagination=pagination, notes=notes)
 
         # Then: 正常にインスタンスが作成されること
         assert isinstance(output, GetTaglessNotesOutput)
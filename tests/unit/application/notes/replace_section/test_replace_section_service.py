@@ -0,0 +1,73 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.application._common.sections import content_hash
+from zk_utils.application.notes.replace_section import (
+    ReplaceSectionInput,
+    ReplaceSectionService,
+)
+from zk_utils.domain.models.notes import IFNoteRepository, NoteSource
+
+CONTENT = "# Title\n\n## Summary\n\nold\n\n## Links\n\n- a\n"
+
+
+class TestReplaceSectionService:
+    """ReplaceSectionServiceの単体テスト"""
+
+    @pytest.fixture
+    def mock_repository(self, mocker: MockerFixture) -> Mock:
+        repository = mocker.create_autospec(IFNoteRepository)
+        repository.find_note_source.return_value = NoteSource(
+            path=Path("note.md"), content=CONTENT
+        )
+        repository.save_note_source.side_effect = lambda source, content: NoteSource(
+            path=source.path, content=content
+        )
+        return repository
+
+    @pytest.fixture
+    def service(self, mock_repository: Mock) -> ReplaceSectionService:
+        return ReplaceSectionService(repository=mock_repository)
+
+    def test_replace_should_save_edited_content(
+        self, service: ReplaceSectionService, mock_repository: Mock
+    ) -> None:
+        # Given: 読み込んだ時のハッシュを指定した入力
+        input_data = ReplaceSectionInput(
+            path=Path("note"),
+            heading="Summary",
+            text="new",
+            expected_hash=content_hash(CONTENT),
+        )
+
+        # When: セクションを置き換える
+        result = service.handle(input_data)
+
+        # Then: 置き換えた内容が保存され、続けて編集するためのハッシュが返されること
+        expected = CONTENT.replace("old", "new")
+        mock_repository.find_note_source.assert_called_once_with(Path("note"))
+        mock_repository.save_note_source.assert_called_once_with(
+            NoteSource(path=Path("note.md"), content=CONTENT), expected
+        )
+        assert result.path == Path("note.md")
+        assert result.content_hash == content_hash(expected)
+        assert result.headings == ["Summary", "Links"]
+
+    def test_stale_hash_should_not_save(
+        self, service: ReplaceSectionService, mock_repository: Mock
+    ) -> None:
+        # Given: 読み込んだ後に変更された内容のハッシュ
+        input_data = ReplaceSectionInput(
+            path=Path("note.md"),
+            heading="Summary",
+            text="new",
+            expected_hash=content_hash("older content"),
+        )
+
+        # When/Then: 保存せずにエラーになること
+        with pytest.raises(ValueError, match="Note was modified"):
+            service.handle(input_data)
+        mock_repository.save_note_source.assert_not_called()
@@ -0,0 +1,40 @@
+# Unit tests for get server stats service
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.application.server import IFServerQueryService
+from zk_utils.application.server.get_server_stats import (
+    GetServerStatsInput,
+    GetServerStatsOutput,
+    GetServerStatsService,
+    WarmUpStep,
+)
+
+
+class TestGetServerStatsService:
+    """GetServerStatsServiceの単体テスト"""
+
+    @pytest.fixture
+    def mock_query_service(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(IFServerQueryService)
+
+    def test_handle_success(self, mock_query_service: Mock) -> None:
+        # Given: ウォームアップ中の状態を返すクエリサービス
+        expected = GetServerStatsOutput(
+            ready=False,
+            warm_up="running",
+            steps=[WarmUpStep(name="zk_index", status="running")],
+        )
+        mock_query_service.get_server_stats.return_value = expected
+        service = GetServerStatsService(query_service=mock_query_service)
+
+        # When: サービスを実行する
+        result = service.handle(GetServerStatsInput())
+
+        # Then: クエリサービスの結果がそのまま返されること
+        assert result == expected
+        mock_query_service.get_server_stats.assert_called_once_with(
+            GetServerStatsInput()
+        )
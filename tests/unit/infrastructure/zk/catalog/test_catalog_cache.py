@@ -0,0 +1,157 @@
+from array import array
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.catalog_cache import (
+    CACHE_VERSION,
+    CachedCatalog,
+    CachedRows,
+    CachedTexts,
+    CatalogCache,
+)
+from zk_utils.infrastructure.zk.catalog.change_detector import GitState
+
+
+def make_texts(*texts: str) -> CachedTexts:
+    cached = CachedTexts()
+    for text in texts:
+        cached.append(text)
+    return cached
+
+
+def make_rows() -> CachedRows:
+    return CachedRows(
+        paths=["a.md", "dir/b.md"],
+        titles=["形態素解析", "Note"],
+        texts=make_texts("形態素解析\n本文", "note\n"),
+        created=array("d", [1.5, float("nan")]),
+        modified=array("d", [2.5, 3.5]),
+        tag_names=["nlp", "ml"],
+        tag_counts=array("H", [2, 0]),
+        tag_data=array("I", [0, 1]),
+    )
+
+
+class TestCatalogCache:
+    """CatalogCacheのテスト"""
+
+    def test_saved_catalog_should_be_loaded(self, tmp_path: Path) -> None:
+        # Given: 保存したキャッシュ
+        cache = CatalogCache(tmp_path / "cache", tmp_path)
+        snapshot = {"a.md": (10, 20), "dir/b.md": (30, 40)}
+        rows = make_rows()
+        digests = {"a.md": bytes(range(16))}
+        git = GitState(head="abc123", dirty=frozenset({"dir/b.md"}))
+        cache.save(CachedCatalog(snapshot, rows, digests, git))
+
+        # When: 読み込む
+        cached = cache.load()
+
+        # Then: stat情報、ダイジェスト、gitの状態と列が復元されること
+        assert cached is not None
+        assert cached.snapshot == snapshot
+        assert cached.digests == digests
+        assert cached.git == git
+        assert cached.rows.paths == rows.paths
+        assert cached.rows.titles == rows.titles
+        assert cached.rows.texts == rows.texts
+        assert cached.rows.created[0] == 1.5
+        assert cached.rows.modified == rows.modified
+        assert cached.rows.tag_names == rows.tag_names
+        assert cached.rows.tag_counts == rows.tag_counts
+        assert cached.rows.tag_data == rows.tag_data
+
+    def test_cache_path_should_be_versioned_per_notebook(self, tmp_path: Path) -> None:
+        # When: 異なるノートブックのキャッシュを作る
+        first = CatalogCache(tmp_path, tmp_path / "first")
+        second = CatalogCache(tmp_path, tmp_path / "second")
+
+        # Then: バージョンごとのディレクトリに別々のファイルが置かれること
+        assert first.path.parent == tmp_path / f"v{CACHE_VERSION}"
+        assert first.path != second.path
+
+    @pytest.mark.parametrize(
+        "corrupt",
+        [
+            pytest.param(lambda data: b"", id="empty_file_should_be_ignored"),
+            pytest.param(lambda data: data[:-3], id="truncated_file_should_be_ignored"),
+            pytest.param(
+                lambda data: b"XXXX" + data[4:], id="wrong_magic_should_be_ignored"
+            ),
+            pytest.param(
+                lambda data: data[:4] + b"\xff" + data[5:],
+                id="other_version_should_be_ignored",
+            ),
+        ],
+    )
+    def test_invalid_cache_should_return_none(
+        self, corrupt: Callable[[bytes], bytes], tmp_path: Path
+    ) -> None:
+        # Given: 壊れたキャッシュファイル
+        cache = CatalogCache(tmp_path, tmp_path)
+        cache.save(CachedCatalog({}, make_rows(), {}, None))
+        cache.path.write_bytes(corrupt(cache.path.read_bytes()))
+
+        # When: 読み込む
+        cached = cache.load()
+
+        # Then: Noneが返されること
+        assert cached is None
+
+    def test_missing_cache_should_return_none(self, tmp_path: Path) -> None:
+        # When: 保存していないキャッシュを読み込む
+        cached = CatalogCache(tmp_path, tmp_path).load()
+
+        # Then: Noneが返されること
+        assert cached is None
+
+    def test_empty_columns_should_be_loaded(self, tmp_path: Path) -> None:
+        # Given: ノートの無いキャッシュ
+        cache = CatalogCache(tmp_path, tmp_path)
+        empty: list[str] = []
+        rows = CachedRows(
+            empty,
+            empty,
+            CachedTexts(),
+            array("d"),
+            array("d"),
+            empty,
+            array("H"),
+            array("I"),
+        )
+        cache.save(CachedCatalog({}, rows, {}, None))
+
+        # When: 読み込む
+        cached = cache.load()
+
+        # Then: 空の列が復元されること
+        assert cached is not None
+        assert cached.rows == rows
+        assert cached.git is None
+
+    def test_texts_should_keep_nul_and_decode_on_access(self, tmp_path: Path) -> None:
+        # Given: NULを含む本文を保存したキャッシュ
+        cache = CatalogCache(tmp_path, tmp_path)
+        rows = make_rows()._replace(texts=make_texts("前\0後", ""))
+        cache.save(CachedCatalog({}, rows, {}, None))
+
+        # When: 読み込む
+        cached = cache.load()
+
+        # Then: 本文はUTF-8のまま保持され、取り出す時にNULも含めて復元されること
+        assert cached is not None
+        assert cached.rows.texts.raw(0) == "前\0後".encode()
+        assert [cached.rows.texts[i] for i in range(2)] == ["前\0後", ""]
+
+    def test_nul_in_other_strings_should_be_rejected(self, tmp_path: Path) -> None:
+        # Given: NULを含むタイトル
+        cache = CatalogCache(tmp_path, tmp_path)
+        rows = make_rows()._replace(titles=["前\0後", "Note"])
+
+        # When & Then: 保存できず、前のキャッシュも残らないこと
+        with pytest.raises(ValueError, match="NUL"):
+            cache.save(CachedCatalog({}, rows, {}, None))
+        assert cache.load() is None
+        assert list(cache.path.parent.iterdir()) == []
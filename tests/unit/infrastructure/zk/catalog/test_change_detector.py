@@ -0,0 +1,147 @@
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.infrastructure.zk.catalog.change_detector import (
+    ChangeDetector,
+    Changes,
+    GitState,
+)
+from zk_utils.infrastructure.zk.scheduler import Scheduler
+
+
+def git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def touch(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestChangeDetector:
+    """ChangeDetectorのテスト"""
+
+    def test_scan_should_skip_hidden_and_non_note_files(self, tmp_path: Path) -> None:
+        # Given: ノート、隠しディレクトリのノート、ノート以外のファイル
+        (tmp_path / "dir").mkdir()
+        (tmp_path / ".zk").mkdir()
+        (tmp_path / "dir/a.md").write_text("a")
+        (tmp_path / ".zk/b.md").write_text("b")
+        (tmp_path / "c.txt").write_text("c")
+
+        # When: 走査する
+        snapshot = ChangeDetector(tmp_path).scan()
+
+        # Then: ノートのみが含まれること
+        assert list(snapshot) == ["dir/a.md"]
+
+    def test_verify_should_drop_files_with_same_content(self, tmp_path: Path) -> None:
+        # Given: mtimeだけが変わったファイルと、内容が変わったファイル
+        detector = ChangeDetector(tmp_path)
+        (tmp_path / "a.md").write_text("same")
+        (tmp_path / "b.md").write_text("before")
+        digests = detector.digests(["a.md", "b.md"])
+        touch(tmp_path / "a.md")
+        (tmp_path / "b.md").write_text("after!")
+
+        # When: 内容のハッシュで確認する
+        changes, computed = detector.verify(
+            Changes(changed={"a.md", "b.md"}, removed=set()), digests
+        )
+
+        # Then: 内容が変わったファイルだけが残り、新しいダイジェストが返されること
+        assert changes.changed == {"b.md"}
+        assert computed["a.md"] == digests["a.md"]
+        assert computed["b.md"] != digests["b.md"]
+
+    def test_git_state_should_be_none_outside_repository(self, tmp_path: Path) -> None:
+        # When: gitで管理されていないディレクトリの状態を取得する
+        state = ChangeDetector(tmp_path).git_state()
+
+        # Then: Noneが返されること
+        assert state is None
+
+
+class TestChangeDetectorGit:
+    """ChangeDetectorのgitを使った変更検出テスト"""
+
+    @pytest.fixture
+    def notebook(self, tmp_path: Path) -> Path:
+        # リポジトリのサブディレクトリをノートブックにする
+        notebook = tmp_path / "notes"
+        notebook.mkdir()
+        (notebook / "a.md").write_text("a")
+        (notebook / "b.md").write_text("b")
+        (tmp_path / "outside.md").write_text("outside")
+        git(tmp_path, "init", "-q")
+        git(tmp_path, "add", ".")
+        git(tmp_path, "commit", "-q", "-m", "initial")
+        return notebook
+
+    def test_git_state_should_list_uncommitted_notes(self, notebook: Path) -> None:
+        # Given: 変更、追加、削除されたノートとノートブック外の変更
+        (notebook / "a.md").write_text("changed")
+        (notebook / "new.md").write_text("new")
+        (notebook / "b.md").unlink()
+        (notebook.parent / "outside.md").write_text("changed")
+
+        # When: gitの状態を取得する
+        state = ChangeDetector(notebook).git_state()
+
+        # Then: ノートブックからの相対パスで未コミットのノートが返されること
+        assert state is not None
+        assert state.dirty == {"a.md", "new.md", "b.md"}
+
+    def test_git_changes_should_include_committed_changes(self, notebook: Path) -> None:
+        # Given: 変更をコミットし、別のノートのmtimeだけを更新する
+        detector = ChangeDetector(notebook)
+        before = detector.git_state()
+        (notebook / "a.md").write_text("changed")
+        git(notebook, "commit", "-q", "-am", "change")
+        touch(notebook / "b.md")
+        after = detector.git_state()
+
+        # When: 2つの状態の間の変更を取得する
+        assert before is not None and after is not None
+        changes = detector.git_changes(before, after)
+
+        # Then: 内容が変わったノートだけが返されること
+        assert changes == {"a.md"}
+
+    def test_unknown_commit_should_return_none(self, notebook: Path) -> None:
+        # Given: 存在しないコミットを基準にした状態
+        detector = ChangeDetector(notebook)
+        after = detector.git_state()
+        before = GitState(head="0" * 40, dirty=frozenset())
+
+        # When: 変更を取得する
+        assert after is not None
+        changes = detector.git_changes(before, after)
+
+        # Then: Noneが返されること
+        assert changes is None
+
+    def test_git_should_run_through_scheduler_as_utf8(
+        self, notebook: Path, mocker: MockerFixture
+    ) -> None:
+        # Given: 日本語のファイル名の未コミットのノート
+        (notebook / "日本語.md").write_text("新規", encoding="utf-8")
+        run = mocker.spy(Scheduler, "run")
+
+        # When: gitの状態を取得する
+        state = ChangeDetector(notebook).git_state()
+
+        # Then: スケジューラー経由で実行され、ファイル名がUTF-8で解釈されること
+        assert state is not None
+        assert state.dirty == {"日本語.md"}
+        assert all(call.args[1][0] == "git" for call in run.call_args_list)
+        assert run.call_count == 2
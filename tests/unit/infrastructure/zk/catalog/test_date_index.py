@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.date_index import DateIndex
+
+
+def at(day: int) -> datetime:
+    return datetime(2024, 1, day, tzinfo=timezone.utc)
+
+
+class TestDateIndex:
+    """DateIndexのテスト"""
+
+    @pytest.fixture
+    def index(self) -> DateIndex:
+        index = DateIndex()
+        index.add(0, at(3))
+        index.add(1, at(1))
+        index.add(2, at(2))
+        index.add(3, at(2))
+        return index
+
+    @pytest.mark.parametrize(
+        ("start", "end", "expected"),
+        [
+            pytest.param(None, None, [1, 2, 3, 0], id="unbounded_should_return_all"),
+            pytest.param(at(2), None, [2, 3, 0], id="start_should_be_inclusive"),
+            pytest.param(None, at(2), [1], id="end_should_be_exclusive"),
+            pytest.param(at(2), at(3), [2, 3], id="range_should_return_between"),
+            pytest.param(at(4), None, [], id="out_of_range_should_return_empty"),
+        ],
+    )
+    def test_range(
+        self,
+        index: DateIndex,
+        start: datetime | None,
+        end: datetime | None,
+        expected: list[int],
+    ) -> None:
+        # When: 範囲で検索する
+        result = index.range(start, end)
+
+        # Then: 時刻順にノートIDが返されること
+        assert result == expected
+
+    def test_latest_should_return_newest_first(self, index: DateIndex) -> None:
+        # When: 新しい順に2件取得する
+        result = index.latest(2)
+
+        # Then: 最新のノートから返されること
+        assert result == [0, 3]
+
+    def test_update_and_remove_should_reorder(self, index: DateIndex) -> None:
+        # Given: 同じ時刻のノートのうち1件を更新し、1件を削除する
+        index.add(2, at(5))
+        index.remove(3)
+
+        # When: 新しい順に全件取得する
+        result = index.latest(10)
+
+        # Then: 更新後の時刻で並び、削除したノートは含まれないこと
+        assert result == [2, 0, 1]
+        assert len(index) == 3
@@ -0,0 +1,100 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.date_parser import parse_date
+
+# 2024-03-13は水曜日
+TODAY = date(2024, 3, 13)
+
+
+class TestParseDate:
+    """parse_dateのテスト"""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            pytest.param(
+                "2024-01-02", datetime(2024, 1, 2), id="iso_date_should_parse"
+            ),
+            pytest.param(
+                "2024-01-02T03:04:05Z",
+                datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+                id="iso_datetime_should_parse",
+            ),
+            pytest.param("today", datetime(2024, 3, 13), id="today_should_parse"),
+            pytest.param(
+                "Yesterday", datetime(2024, 3, 12), id="yesterday_should_ignore_case"
+            ),
+            pytest.param(
+                "last monday", datetime(2024, 3, 11), id="last_weekday_should_parse"
+            ),
+            pytest.param(
+                "wednesday",
+                datetime(2024, 3, 6),
+                id="same_weekday_should_return_previous_week",
+            ),
+            pytest.param(
+                "last two weeks",
+                datetime(2024, 2, 28),
+                id="last_n_units_should_parse",
+            ),
+            pytest.param(
+                "last month", datetime(2024, 2, 13), id="last_unit_should_parse"
+            ),
+            pytest.param(
+                "3 days ago", datetime(2024, 3, 10), id="units_ago_should_parse"
+            ),
+            pytest.param("2021", datetime(2021, 1, 1), id="year_should_parse"),
+            pytest.param("Feb 3", datetime(2024, 2, 3), id="month_day_should_parse"),
+            pytest.param(
+                "3rd February, 2021",
+                datetime(2021, 2, 3),
+                id="day_month_year_should_parse",
+            ),
+            pytest.param(
+                "September", datetime(2024, 9, 1), id="month_should_parse_first_day"
+            ),
+            pytest.param("Feb 30", None, id="invalid_date_should_return_none"),
+            pytest.param("2 hours ago", None, id="unsupported_unit_should_return_none"),
+            pytest.param("someday", None, id="unknown_phrase_should_return_none"),
+            pytest.param(
+                "99999999999 days ago", None, id="huge_amount_should_return_none"
+            ),
+            pytest.param(
+                "99999 days ago", datetime(1750, 5, 30), id="max_amount_should_parse"
+            ),
+            pytest.param(
+                "9999 years ago", None, id="shift_before_year_1_should_return_none"
+            ),
+            pytest.param(
+                "99999 months ago",
+                None,
+                id="month_out_of_range_should_return_none",
+            ),
+        ],
+    )
+    def test_parse_date(self, value: str, expected: datetime | None) -> None:
+        # When: 日付表現を解釈する
+        result = parse_date(value, today=TODAY)
+
+        # Then: 当日0時を基準とした日時が返されること
+        assert result == expected
+
+    def test_month_shift_should_clamp_to_month_end(self) -> None:
+        # When: 月末から1か月遡る
+        result = parse_date("1 month ago", today=date(2024, 3, 31))
+
+        # Then: 遡った月の月末になること
+        assert result == datetime(2024, 2, 29)
+
+    def test_relative_phrase_should_follow_current_day(self) -> None:
+        # Given: 同じ表現を異なる日に解釈する
+        first = parse_date("yesterday", today=date(2024, 3, 13))
+
+        # When: 日付が変わってから再度解釈する
+        second = parse_date("yesterday", today=date(2024, 3, 14))
+
+        # Then: キャッシュされた前日の結果は使われないこと
+        assert first == datetime(2024, 3, 12)
+        assert second == datetime(2024, 3, 13)
@@ -0,0 +1,103 @@
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.heading_index import (
+    Heading,
+    HeadingIndex,
+    parse_headings,
+)
+
+NOTE = """---
+title: 設計
+---
+# 設計
+
+## 背景
+
+### 経緯
+
+## TODO
+- 調査
+
+```
+## コード内
+```
+# 付録
+"""
+
+
+class TestParseHeadings:
+    """見出しの解析のテスト"""
+
+    def test_parse_should_return_parents_and_line_ranges(self) -> None:
+        # When: フロントマターとコードブロックを含むノートを解析する
+        result = parse_headings(NOTE)
+
+        # Then: 本文の見出しだけが、親の位置と行の範囲つきで返されること
+        assert result == (
+            Heading(level=1, text="設計", start=3, end=15, parent=-1),
+            Heading(level=2, text="背景", start=5, end=9, parent=0),
+            Heading(level=3, text="経緯", start=7, end=9, parent=1),
+            Heading(level=2, text="TODO", start=9, end=15, parent=0),
+            Heading(level=1, text="付録", start=15, end=16, parent=-1),
+        )
+
+    def test_skipped_levels_should_use_nearest_shallower_parent(self) -> None:
+        # When: h2を飛ばしたh3を含むノートを解析する
+        result = parse_headings("# A\n### B\n## C\n")
+
+        # Then: h3の親はh1になり、後続のh2の親もh1になること
+        assert [h.parent for h in result] == [-1, 0, 0]
+
+
+class TestHeadingIndex:
+    """ノートブック全体の見出しの索引のテスト"""
+
+    @pytest.fixture
+    def index(self) -> HeadingIndex:
+        index = HeadingIndex()
+        index.add(0, parse_headings("# A\n## TODO\n## Todo list\n"))
+        index.add(1, parse_headings("# B\n### my todo\n"))
+        return index
+
+    @pytest.mark.parametrize(
+        "levels,expected",
+        [
+            pytest.param(
+                set(),
+                {(0, 0, 1), (1, 0, 2), (2, 1, 1)},
+                id="all_levels_should_rank_exact_prefix_and_substring",
+            ),
+            pytest.param(
+                {3},
+                {(2, 1, 1)},
+                id="levels_should_filter_headings",
+            ),
+        ],
+    )
+    def test_search(
+        self, index: HeadingIndex, levels: set[int], expected: set[tuple[int, ...]]
+    ) -> None:
+        # When: 大文字小文字の異なるクエリで検索する
+        result = index.search("todo", levels)
+
+        # Then: (順位, 文書ID, 見出しの位置)が返されること
+        assert set(result) == expected
+
+    def test_add_should_replace_outline_of_changed_note(
+        self, index: HeadingIndex
+    ) -> None:
+        # When: ノートの見出しを入れ替える
+        index.add(0, parse_headings("# A\n## Done\n"))
+
+        # Then: 古い見出しでは見つからず、新しい見出しで見つかること
+        assert index.search("todo list", set()) == []
+        assert index.search("done", set()) == [(0, 0, 1)]
+
+    def test_remove_should_drop_outline(self, index: HeadingIndex) -> None:
+        # When: ノートを取り除く
+        index.remove(1)
+
+        # Then: アウトラインと検索結果から消えること
+        assert index.outline(1) == ()
+        assert [doc_id for _, doc_id, _ in index.search("todo", set())] == [0, 0]
+        assert len(index) == 1
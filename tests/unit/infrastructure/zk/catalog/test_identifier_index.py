@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.identifier_index import IdentifierIndex, zk_id
+
+
+class TestZkId:
+    """ファイル名からのzk ID抽出テスト"""
+
+    @pytest.mark.parametrize(
+        "stem,expected",
+        [
+            pytest.param("4h2k", "4h2k", id="random_id_should_be_extracted"),
+            pytest.param("4h2k-meeting-notes", "4h2k", id="id_prefix_should_be_used"),
+            pytest.param("202101011200 日記", "202101011200", id="datetime_id"),
+            pytest.param("meeting-notes", None, id="no_digit_should_not_be_id"),
+        ],
+    )
+    def test_zk_id(self, stem: str, expected: str | None) -> None:
+        # When: IDを抽出する
+        result = zk_id(stem)
+
+        # Then: 期待するIDが返されること
+        assert result == expected
+
+
+class TestIdentifierIndexResolve:
+    """IdentifierIndexの識別子解決テスト"""
+
+    @pytest.fixture
+    def index(self) -> IdentifierIndex:
+        index = IdentifierIndex()
+        index.add(0, Path("journal/4h2k-meeting.md"), "Weekly  Meeting")
+        index.add(1, Path("ideas/zettel.md"), "Zettelkasten")
+        index.add(2, Path("a/index.md"), "Index")
+        index.add(3, Path("b/index.md"), "Index")
+        return index
+
+    @pytest.mark.parametrize(
+        "identifier,expected",
+        [
+            pytest.param("journal/4h2k-meeting.md", 0, id="path_should_resolve"),
+            pytest.param("journal/4h2k-meeting", 0, id="path_without_suffix"),
+            pytest.param("Weekly  Meeting", 0, id="exact_title_should_resolve"),
+            pytest.param("weekly meeting", 0, id="normalized_title_should_resolve"),
+            pytest.param("zettel", 1, id="stem_should_resolve"),
+            pytest.param("4h2k", 0, id="zk_id_should_resolve"),
+            pytest.param("Index", None, id="ambiguous_title_should_not_resolve"),
+            pytest.param("a/index", 2, id="ambiguous_title_path_should_resolve"),
+            pytest.param("unknown", None, id="unknown_should_not_resolve"),
+        ],
+    )
+    def test_resolve(
+        self, index: IdentifierIndex, identifier: str, expected: int | None
+    ) -> None:
+        # When: 識別子を解決する
+        result = index.resolve(identifier)
+
+        # Then: 期待するノートが返されること
+        assert result == expected
+
+    def test_renamed_note_should_update_keys(self, index: IdentifierIndex) -> None:
+        # Given: タイトルを変更して再登録する
+        index.add(1, Path("ideas/zettel.md"), "Slip Box")
+
+        # When: 旧タイトルと新タイトルで解決する
+        old = index.resolve("Zettelkasten")
+        new = index.resolve("slip box")
+
+        # Then: 新しいタイトルで解決されること
+        assert old is None
+        assert new == 1
+
+    def test_removed_duplicate_should_make_title_unique(
+        self, index: IdentifierIndex
+    ) -> None:
+        # Given: 重複タイトルの一方を削除する
+        index.remove(3)
+        index.remove(99)
+
+        # When: タイトルで解決する
+        result = index.resolve("Index")
+
+        # Then: 残ったノートに解決されること
+        assert result == 2
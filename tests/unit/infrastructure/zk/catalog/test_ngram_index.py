@@ -0,0 +1,121 @@
+from typing import Literal
+
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.ngram_index import NgramIndex, has_non_ascii
+
+
+class TestNgramIndexSearch:
+    """NgramIndexの部分文字列検索テスト"""
+
+    @pytest.fixture
+    def index(self) -> NgramIndex:
+        index = NgramIndex(2, gram_filter=has_non_ascii)
+        index.add(0, "日本語の形態素解析について")
+        index.add(1, "Pythonで始める機械学習")
+        index.add(2, "形態素解析器の比較")
+        index.add(3, "English only note")
+        return index
+
+    @pytest.mark.parametrize(
+        "pattern,expected",
+        [
+            pytest.param("形態素", {0, 2}, id="cjk_substring_should_match_all_notes"),
+            pytest.param("態素解析", {0, 2}, id="mid_word_substring_should_match"),
+            pytest.param("python", {1}, id="mixed_pattern_should_ignore_case"),
+            pytest.param("Ｐｙｔｈｏｎ", {1}, id="full_width_should_be_normalized"),
+            pytest.param("機", {1}, id="single_char_should_fall_back_to_scan"),
+            pytest.param("形態素の", set(), id="non_substring_should_not_match"),
+            pytest.param("存在しない", set(), id="unknown_grams_should_not_match"),
+        ],
+    )
+    def test_search(self, index: NgramIndex, pattern: str, expected: set[int]) -> None:
+        # Given: 日本語を含む文書を登録したインデックス
+
+        # When: パターンで検索する
+        result = index.search(pattern)
+
+        # Then: 部分文字列として含む文書だけが返されること
+        assert result == expected
+
+    def test_candidates_should_intersect_postings(self, index: NgramIndex) -> None:
+        # Given: 日本語を含む文書を登録したインデックス
+
+        # When: 候補を取得する
+        candidates = index.candidates("解析器")
+
+        # Then: 全てのbigramを含む文書だけが候補になること
+        assert candidates == {2}
+
+    def test_candidates_for_ascii_pattern_should_return_none(
+        self, index: NgramIndex
+    ) -> None:
+        # Given: ASCIIのn-gramを索引しないインデックス
+
+        # When: ASCIIのみのパターンで候補を取得する
+        candidates = index.candidates("English")
+
+        # Then: 絞り込めないためNoneが返されること
+        assert candidates is None
+        assert index.search("english") == {3}
+
+    @pytest.mark.parametrize(
+        "patterns,match_mode,expected",
+        [
+            pytest.param(
+                ["形態素", "日本語"], "AND", {0}, id="and_mode_should_intersect"
+            ),
+            pytest.param(["日本語", "機械"], "OR", {0, 1}, id="or_mode_should_union"),
+            pytest.param([], "AND", set(), id="no_patterns_should_return_empty"),
+        ],
+    )
+    def test_search_all(
+        self,
+        index: NgramIndex,
+        patterns: list[str],
+        match_mode: Literal["AND", "OR"],
+        expected: set[int],
+    ) -> None:
+        # Given: 日本語を含む文書を登録したインデックス
+
+        # When: 複数パターンで検索する
+        result = index.search_all(patterns, match_mode)
+
+        # Then: モードに応じて結合されること
+        assert result == expected
+
+
+class TestNgramIndexUpdate:
+    """NgramIndexの更新テスト"""
+
+    def test_add_existing_doc_should_replace_text(self) -> None:
+        # Given: 登録済みの文書
+        index = NgramIndex(2)
+        index.add(0, "古いタイトル")
+
+        # When: 同じIDで再登録する
+        index.add(0, "新しいタイトル")
+
+        # Then: 古いテキストでは検索されないこと
+        assert index.search("古い") == set()
+        assert index.search("新しい") == {0}
+        assert len(index) == 1
+
+    def test_remove_should_drop_postings(self) -> None:
+        # Given: 登録済みの文書
+        index = NgramIndex(2)
+        index.add(0, "削除対象")
+        index.add(1, "削除しない")
+
+        # When: 文書を削除する
+        index.remove(0)
+        index.remove(99)
+
+        # Then: 削除した文書は検索されないこと
+        assert index.search("削除") == {1}
+        assert index.candidates("対象") == set()
+
+    def test_invalid_n_should_raise_error(self) -> None:
+        # When & Then: nが0以下の場合はValueErrorが発生すること
+        with pytest.raises(ValueError, match="n must be positive"):
+            NgramIndex(0)
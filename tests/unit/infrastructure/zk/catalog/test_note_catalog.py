@@ -0,0 +1,1039 @@
+import os
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Literal
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.infrastructure.zk import scheduler as scheduler_module
+from zk_utils.infrastructure.zk.catalog import (
+    CatalogConfig,
+    Heading,
+    IndexState,
+    NoteCatalog,
+)
+from zk_utils.infrastructure.zk.catalog.change_detector import ChangeDetector
+from zk_utils.infrastructure.zk.catalog.heading_index import read_headings
+from zk_utils.infrastructure.zk.dao.note import Note
+from zk_utils.infrastructure.zk.scheduler import Lane, Scheduler
+from zk_utils.infrastructure.zk.zk_client import ZkClient
+
+
+def write_note(root: Path, name: str, content: str) -> Note:
+    path = root / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    title = content.splitlines()[0].lstrip("# ")
+    return Note(title=title, path=Path(name), tags=[], content=content)
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("condition was not met")
+        time.sleep(0.01)
+
+
+class TestNoteCatalogRefresh:
+    """NoteCatalogの差分更新テスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(ZkClient)
+
+    @pytest.fixture
+    def catalog(self, mock_client: Mock, tmp_path: Path) -> NoteCatalog:
+        return NoteCatalog(
+            client=mock_client, cwd=tmp_path, config=CatalogConfig(enabled=True)
+        )
+
+    def test_first_refresh_should_load_all_documents(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: ノートブックに2件のノート
+        notes = [
+            write_note(tmp_path, "a.md", "# 形態素解析\n\n本文"),
+            write_note(tmp_path, "dir/b.md", "# 機械学習\n\n形態素"),
+        ]
+        mock_client.get_documents.return_value = notes
+
+        # When: カタログを更新する
+        catalog.refresh()
+
+        # Then: 全件取得され、本文とタイトルで検索できること
+        mock_client.get_documents.assert_called_once_with()
+        assert catalog.match_titles(["形態素"], "AND") == {Path("a.md")}
+        assert catalog.match_contents(["形態素"], "AND") == {
+            Path("a.md"),
+            Path("dir/b.md"),
+        }
+
+    def test_unchanged_notebook_should_not_call_zk(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 一度更新済みのカタログ
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# ノート")
+        ]
+        catalog.refresh()
+
+        # When: ファイルを変更せずに再度更新する
+        catalog.refresh()
+
+        # Then: zkは再実行されないこと
+        assert mock_client.get_documents.call_count == 1
+
+    def test_changed_files_should_be_reloaded_incrementally(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 2件のノートを読み込んだカタログ
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# 古いタイトル"),
+            write_note(tmp_path, "b.md", "# 削除されるノート"),
+        ]
+        catalog.refresh()
+
+        # When: 1件を更新し、1件を削除して更新する
+        updated = write_note(tmp_path, "a.md", "# 新しいタイトルです")
+        (tmp_path / "b.md").unlink()
+        mock_client.get_documents.return_value = [updated]
+        catalog.refresh()
+
+        # Then: 変更されたファイルだけが再取得されること
+        mock_client.get_documents.assert_called_with([Path("a.md")])
+        assert catalog.match_titles(["古い"], "AND") == set()
+        assert catalog.match_titles(["新しい"], "AND") == {Path("a.md")}
+        assert catalog.match_titles(["削除"], "AND") == set()
+
+    def test_hidden_directories_should_be_ignored(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 一度更新済みのカタログ
+        mock_client.get_documents.return_value = []
+        catalog.refresh()
+
+        # When: 隠しディレクトリ内のファイルを変更して更新する
+        write_note(tmp_path, ".zk/templates/default.md", "# テンプレート")
+        catalog.refresh()
+
+        # Then: zkは再実行されないこと
+        assert mock_client.get_documents.call_count == 1
+
+    def test_get_notes_should_sort_by_title(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 複数のノートを読み込んだカタログ
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "b.md", "# B"),
+            write_note(tmp_path, "a.md", "# A"),
+        ]
+        catalog.refresh()
+
+        # When: パスを指定してノートを取得する
+        notes, total = catalog.get_notes(
+            [Path("b.md"), Path("a.md"), Path("missing.md")]
+        )
+
+        # Then: タイトル順で、存在するノートのみ返されること
+        assert [note.title for note in notes] == ["A", "B"]
+        assert total == 2
+        assert all(note.content is None for note in notes)
+
+    def test_get_notes_should_materialize_only_window(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 3件のノートを読み込んだカタログ
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, f"{name}.md", f"# {name}") for name in "CAB"
+        ]
+        catalog.refresh()
+        paths = [Path(f"{name}.md") for name in "ABC"]
+
+        # When: 総数から求めた2件目以降の範囲を取り出す
+        notes, total = catalog.get_notes(paths, lambda total: slice(1, total))
+
+        # Then: 範囲のノートだけが生成され、総数は全件になること
+        assert [note.title for note in notes] == ["B", "C"]
+        assert total == 3
+
+    @pytest.mark.parametrize(
+        "interval,expected",
+        [
+            pytest.param(60.0, 1, id="change_within_interval_should_not_be_scanned"),
+            pytest.param(0.0, 2, id="change_after_interval_should_be_reloaded"),
+        ],
+    )
+    def test_refresh_throttled_should_skip_recent_checks(
+        self,
+        mock_client: Mock,
+        tmp_path: Path,
+        mocker: MockerFixture,
+        interval: float,
+        expected: int,
+    ) -> None:
+        # Given: 一度更新した後に外部で変更されたノート
+        catalog = NoteCatalog(
+            client=mock_client,
+            cwd=tmp_path,
+            config=CatalogConfig(enabled=True, refresh_interval=interval),
+        )
+        mock_client.get_documents.return_value = [write_note(tmp_path, "a.md", "# A")]
+        catalog.refresh_throttled()
+        write_note(tmp_path, "b.md", "# B")
+        scan = mocker.spy(ChangeDetector, "scan")
+
+        # When: 間隔を空けずに再度更新する
+        catalog.refresh_throttled()
+
+        # Then: 間隔内はノートブックを走査せず、zkも実行しないこと
+        assert scan.call_count == expected - 1
+        assert mock_client.get_documents.call_count == expected
+
+    def test_warm_up_should_load_notes_before_first_query(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: ノートブックに2件のノート
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# 形態素解析"),
+            write_note(tmp_path, "b.md", "# 機械学習"),
+        ]
+        assert catalog.note_count() is None
+
+        # When: ウォームアップする
+        catalog.warm_up()
+
+        # Then: 読み込まれたノート数が返され、以降の検索でzkは呼ばれないこと
+        assert catalog.note_count() == 2
+        assert catalog.match_titles(["機械"], "AND") == {Path("b.md")}
+        assert mock_client.get_documents.call_count == 1
+
+    def test_refresh_in_background_should_run_zk_as_interactive(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 実行された時のレーンを記録するzk
+        lanes: list[Lane] = []
+
+        def get_documents(paths: list[Path] | None = None) -> list[Note]:
+            lanes.append(scheduler_module._lane.get())
+            return [write_note(tmp_path, "a.md", "# A")]
+
+        mock_client.get_documents.side_effect = get_documents
+
+        # When: バックグラウンドのレーンからカタログを更新する
+        with scheduler_module.scheduler.lane(Lane.BACKGROUND):
+            catalog.refresh()
+
+        # Then: ロックを持ったままのzkは、中断されない対話的なレーンで実行されること
+        assert lanes == [Lane.INTERACTIVE]
+
+
+class TestNoteCatalogResolvePath:
+    """NoteCatalogの識別子解決テスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(ZkClient)
+
+    @pytest.fixture
+    def catalog(self, mock_client: Mock, tmp_path: Path) -> NoteCatalog:
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "journal/4h2k.md", "# 週次ミーティング")
+        ]
+        return NoteCatalog(
+            client=mock_client, cwd=tmp_path, config=CatalogConfig(enabled=True)
+        )
+
+    def test_note_path_should_be_returned_without_refresh(
+        self, catalog: NoteCatalog, mock_client: Mock
+    ) -> None:
+        # When: ノートのパスを解決する
+        result = catalog.resolve_path(Path("other/note.md"))
+
+        # Then: そのまま返され、zkは実行されないこと
+        assert result == Path("other/note.md")
+        mock_client.get_documents.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "identifier",
+        [
+            pytest.param("週次ミーティング", id="title_should_resolve"),
+            pytest.param("4h2k", id="zk_id_should_resolve"),
+            pytest.param("journal/4h2k", id="path_without_suffix_should_resolve"),
+        ],
+    )
+    def test_identifier_should_resolve_to_path(
+        self, catalog: NoteCatalog, identifier: str
+    ) -> None:
+        # When: 識別子を解決する
+        result = catalog.resolve_path(Path(identifier))
+
+        # Then: ノートのパスが返されること
+        assert result == Path("journal/4h2k.md")
+
+    def test_unknown_identifier_should_be_returned_as_is(
+        self, catalog: NoteCatalog
+    ) -> None:
+        # When: 存在しない識別子を解決する
+        result = catalog.resolve_path(Path("unknown"))
+
+        # Then: そのまま返されること
+        assert result == Path("unknown")
+
+    def test_repeated_resolution_should_not_rescan(
+        self, catalog: NoteCatalog, mocker: MockerFixture
+    ) -> None:
+        # Given: 一度解決して読み込み済みのカタログ
+        catalog.resolve_path(Path("4h2k"))
+        scan = mocker.spy(ChangeDetector, "scan")
+
+        # When: 更新間隔内に続けて解決する
+        result = catalog.resolve_path(Path("週次ミーティング"))
+
+        # Then: ノートブックを走査し直さずに解決されること
+        assert result == Path("journal/4h2k.md")
+        scan.assert_not_called()
+
+    def test_disabled_catalog_should_not_load_notebook(
+        self, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 無効なカタログ（INDEX_BACKEND=zk）
+        catalog = NoteCatalog(client=mock_client, cwd=tmp_path, config=CatalogConfig())
+
+        # When: タイトルを解決する
+        result = catalog.resolve_path(Path("週次ミーティング"))
+
+        # Then: ノートブックを読み込まずにそのまま返されること
+        assert result == Path("週次ミーティング")
+        mock_client.get_documents.assert_not_called()
+
+
+class TestNoteCatalogSample:
+    """NoteCatalogのランダム取得テスト"""
+
+    @pytest.fixture
+    def catalog(self, mocker: MockerFixture, tmp_path: Path) -> NoteCatalog:
+        mock_client = mocker.create_autospec(ZkClient)
+        mock_client.get_documents.return_value = [
+            Note(title=f"Note {i}", path=Path(f"dir{i % 2}/{i}.md"), tags=[f"t{i % 3}"])
+            for i in range(20)
+        ]
+        catalog = NoteCatalog(
+            client=mock_client, cwd=tmp_path, config=CatalogConfig(enabled=True)
+        )
+        catalog.refresh()
+        return catalog
+
+    def test_sample_should_return_distinct_notes(self, catalog: NoteCatalog) -> None:
+        # When: 全件を超える件数を指定してランダムに取得する
+        notes = catalog.sample(30, random.Random(0), [], None, 0)
+
+        # Then: 全ノートが重複なく返されること
+        assert len({note.path for note in notes}) == 20
+
+    def test_same_seed_should_return_same_notes(self, catalog: NoteCatalog) -> None:
+        # When: 同じシードで2回取得する
+        first = catalog.sample(5, random.Random(42), [], None, 0)
+        second = catalog.sample(5, random.Random(42), [], None, 0)
+
+        # Then: 同じノートが同じ順序で返されること
+        assert [note.path for note in first] == [note.path for note in second]
+
+    def test_filters_should_restrict_candidates(self, catalog: NoteCatalog) -> None:
+        # When: タグとディレクトリで絞り込んで取得する
+        notes = catalog.sample(20, random.Random(0), ["t0"], Path("dir0"), 0)
+
+        # Then: 条件を満たすノートのみ返されること（i % 6 == 0）
+        assert sorted(note.title for note in notes) == [
+            "Note 0",
+            "Note 12",
+            "Note 18",
+            "Note 6",
+        ]
+
+    def test_exclude_recent_should_skip_returned_notes(
+        self, catalog: NoteCatalog
+    ) -> None:
+        # Given: 直前に15件取得済み
+        first = catalog.sample(15, random.Random(0), [], None, 0)
+
+        # When: 直近15件を除外して取得する
+        second = catalog.sample(10, random.Random(1), [], None, 15)
+
+        # Then: 残りの5件だけが返されること
+        assert len(second) == 5
+        assert {note.path for note in first}.isdisjoint(note.path for note in second)
+
+    def test_removed_note_should_not_be_sampled(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        # Given: 3件のノートを読み込んだカタログから先頭のノートを削除する
+        mock_client = mocker.create_autospec(ZkClient)
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, name, f"# {name}") for name in ["a.md", "b.md", "c.md"]
+        ]
+        catalog = NoteCatalog(
+            client=mock_client, cwd=tmp_path, config=CatalogConfig(enabled=True)
+        )
+        catalog.refresh()
+        (tmp_path / "a.md").unlink()
+        catalog.refresh()
+
+        # When: ランダムに取得する
+        notes = catalog.sample(5, random.Random(0), [], None, 0)
+
+        # Then: 残ったノートのみ返されること
+        assert sorted(note.path for note in notes) == [Path("b.md"), Path("c.md")]
+
+
+class TestNoteCatalogTaglessNotes:
+    """NoteCatalogのタグなしノート取得テスト"""
+
+    @pytest.fixture
+    def catalog(self, mocker: MockerFixture, tmp_path: Path) -> NoteCatalog:
+        mock_client = mocker.create_autospec(ZkClient)
+        mock_client.get_documents.return_value = [
+            Note(title=title, path=Path(f"{title}.md"), tags=tags)
+            for title, tags in [
+                ("d", []),
+                ("a", []),
+                ("x", ["tagged"]),
+                ("e", []),
+                ("c", []),
+                ("b", []),
+            ]
+        ]
+        catalog = NoteCatalog(
+            client=mock_client, cwd=tmp_path, config=CatalogConfig(enabled=True)
+        )
+        catalog.refresh()
+        return catalog
+
+    @pytest.mark.parametrize(
+        ("page", "after", "expected", "start"),
+        [
+            pytest.param(1, None, ["a", "b"], 0, id="first_page_should_be_sorted"),
+            pytest.param(9, None, ["e"], 4, id="page_after_last_should_be_clamped"),
+            pytest.param(
+                1, ("b", "b.md"), ["c", "d"], 2, id="cursor_should_continue_after_key"
+            ),
+            pytest.param(
+                1, ("bb", "x.md"), ["c", "d"], 2, id="removed_key_should_continue"
+            ),
+        ],
+    )
+    def test_tagless_notes_should_return_window(
+        self,
+        catalog: NoteCatalog,
+        page: int,
+        after: tuple[str, str] | None,
+        expected: list[str],
+        start: int,
+    ) -> None:
+        # When: 2件ずつの範囲を取得する
+        notes, first, total = catalog.tagless_notes(2, page, after)
+
+        # Then: タグの無いノートをタイトル順に並べた範囲が返されること
+        assert [note.title for note in notes] == expected
+        assert first == start
+        assert total == 5
+
+
+class TestNoteCatalogCache:
+    """NoteCatalogのキャッシュからの復元テスト"""
+
+    @pytest.fixture
+    def config(self, tmp_path: Path) -> CatalogConfig:
+        return CatalogConfig(enabled=True, cache_dir=tmp_path / ".cache")
+
+    @pytest.fixture
+    def notes(self, tmp_path: Path) -> list[Note]:
+        return [
+            write_note(tmp_path, "a.md", "# 形態素解析\n\n本文"),
+            write_note(tmp_path, "dir/b.md", "# 機械学習\n\n#ml"),
+        ]
+
+    def create_catalog(
+        self, mocker: MockerFixture, tmp_path: Path, config: CatalogConfig
+    ) -> tuple[NoteCatalog, Mock]:
+        mock_client = mocker.create_autospec(ZkClient)
+        catalog = NoteCatalog(client=mock_client, cwd=tmp_path, config=config)
+        return catalog, mock_client
+
+    def test_restart_should_restore_from_cache_without_zk(
+        self,
+        mocker: MockerFixture,
+        tmp_path: Path,
+        config: CatalogConfig,
+        notes: list[Note],
+    ) -> None:
+        # Given: 一度読み込んでキャッシュを保存したカタログ
+        notes[1].tags.append("ml")
+        first, first_client = self.create_catalog(mocker, tmp_path, config)
+        first_client.get_documents.return_value = notes
+        first.refresh()
+
+        # When: 同じキャッシュディレクトリで新しいカタログを更新する
+        second, second_client = self.create_catalog(mocker, tmp_path, config)
+        second.refresh()
+
+        # Then: zkを呼ばずに、検索とパスの解決ができること
+        second_client.get_documents.assert_not_called()
+        assert second.match_contents(["本文"], "AND") == {Path("a.md")}
+        assert second.match_titles(["機械"], "AND") == {Path("dir/b.md")}
+        assert second.match_tags(["ml"], "AND") == {Path("dir/b.md")}
+        assert second.resolve_path(Path("形態素解析")) == Path("a.md")
+        assert second.tag_counts() == {"ml": 1}
+
+    def test_restart_should_reload_only_changed_files(
+        self,
+        mocker: MockerFixture,
+        tmp_path: Path,
+        config: CatalogConfig,
+        notes: list[Note],
+    ) -> None:
+        # Given: キャッシュの保存後に1件更新、1件削除、1件追加されたノートブック
+        first, first_client = self.create_catalog(mocker, tmp_path, config)
+        first_client.get_documents.return_value = notes
+        first.refresh()
+        changed = write_note(tmp_path, "a.md", "# 新しいタイトル\n\n更新後の本文")
+        added = write_note(tmp_path, "c.md", "# 追加されたノート")
+        (tmp_path / "dir/b.md").unlink()
+
+        # When: 新しいカタログを更新する
+        second, second_client = self.create_catalog(mocker, tmp_path, config)
+        second_client.get_documents.return_value = [changed, added]
+        second.refresh()
+
+        # Then: 変更のあったファイルだけがzkで読み直されること
+        second_client.get_documents.assert_called_once_with(
+            [Path("a.md"), Path("c.md")]
+        )
+        assert [note.title for note in second.get_notes([Path("a.md")])[0]] == [
+            "新しいタイトル"
+        ]
+        assert second.match_contents(["更新後"], "AND") == {Path("a.md")}
+        assert second.match_titles(["機械"], "AND") == set()
+
+    def test_disabled_catalog_should_not_write_cache(
+        self, mocker: MockerFixture, tmp_path: Path, notes: list[Note]
+    ) -> None:
+        # Given: 無効なカタログ
+        config = CatalogConfig(enabled=False, cache_dir=tmp_path / ".cache")
+        catalog, mock_client = self.create_catalog(mocker, tmp_path, config)
+        mock_client.get_documents.return_value = notes
+
+        # When: 更新する
+        catalog.refresh()
+
+        # Then: キャッシュは書き込まれないこと
+        assert not (tmp_path / ".cache").exists()
+
+
+class TestNoteCatalogChangeDetection:
+    """NoteCatalogの内容ハッシュとgitによる変更検出テスト"""
+
+    def touch(self, path: Path) -> None:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def git(self, repo: Path, *args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=t@example.com", *args],
+            cwd=repo,
+            check=True,
+            capture_output=True,
+        )
+
+    def test_hash_should_skip_files_with_same_content(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        # Given: 内容のハッシュで変更を確認するカタログ
+        mock_client = mocker.create_autospec(ZkClient)
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# 同じ内容"),
+            write_note(tmp_path, "b.md", "# 変更前"),
+        ]
+        catalog = NoteCatalog(
+            client=mock_client,
+            cwd=tmp_path,
+            config=CatalogConfig(enabled=True, change_detection="hash"),
+        )
+        catalog.refresh()
+
+        # When: 1件はmtimeだけを、1件は内容を変更して更新する
+        self.touch(tmp_path / "a.md")
+        changed = write_note(tmp_path, "b.md", "# 変更後のタイトル")
+        mock_client.get_documents.return_value = [changed]
+        catalog.refresh()
+
+        # Then: 内容が変わったファイルだけがzkで読み直されること
+        mock_client.get_documents.assert_called_with([Path("b.md")])
+        assert catalog.match_titles(["変更後"], "AND") == {Path("b.md")}
+
+    def test_git_restart_should_reload_only_committed_changes(
+        self, mocker: MockerFixture, tmp_path: Path
+    ) -> None:
+        # Given: gitで変更を検出するカタログのキャッシュを保存したノートブック
+        notebook = tmp_path / "notebook"
+        notes = [
+            write_note(notebook, "a.md", "# ノートA"),
+            write_note(notebook, "b.md", "# ノートB"),
+        ]
+        self.git(notebook, "init", "-q")
+        self.git(notebook, "add", ".")
+        self.git(notebook, "commit", "-q", "-m", "initial")
+        config = CatalogConfig(
+            enabled=True, cache_dir=tmp_path / "cache", change_detection="git"
+        )
+        first_client = mocker.create_autospec(ZkClient)
+        first_client.get_documents.return_value = notes
+        NoteCatalog(client=first_client, cwd=notebook, config=config).refresh()
+
+        # When: 1件をコミットで変更し、もう1件はmtimeだけが変わった状態で再起動する
+        changed = write_note(notebook, "a.md", "# 更新されたノートA")
+        self.git(notebook, "commit", "-q", "-am", "update")
+        self.touch(notebook / "b.md")
+        second_client = mocker.create_autospec(ZkClient)
+        second_client.get_documents.return_value = [changed]
+        catalog = NoteCatalog(client=second_client, cwd=notebook, config=config)
+        catalog.refresh()
+
+        # Then: コミット間の差分にあるノートだけがzkで読み直されること
+        second_client.get_documents.assert_called_once_with([Path("a.md")])
+        assert catalog.match_titles(["更新"], "AND") == {Path("a.md")}
+
+
+class TestNoteCatalogStaleReads:
+    """作り直し中に前の世代のインデックスで応答するNoteCatalogのテスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(ZkClient)
+
+    def make_catalog(
+        self, client: Mock, cwd: Path, consistency: Literal["strict", "stale"]
+    ) -> NoteCatalog:
+        config = CatalogConfig(
+            enabled=True, consistency=consistency, rebuild_threshold=1
+        )
+        return NoteCatalog(client=client, cwd=cwd, config=config)
+
+    def test_large_change_should_be_served_stale_until_swapped(
+        self, mock_client: Mock, tmp_path: Path, mocker: MockerFixture
+    ) -> None:
+        # Given: 2件のノートを読み込み、タイトルのインデックスを組み立てたカタログ
+        catalog = self.make_catalog(mock_client, tmp_path, "stale")
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# 古いノートA"),
+            write_note(tmp_path, "b.md", "# 古いノートB"),
+        ]
+        catalog.refresh()
+        assert catalog.match_titles(["古い"], "AND") == {Path("a.md"), Path("b.md")}
+        assert catalog.index_state() == IndexState(generation=1, stale=False)
+
+        # When: 閾値を超える数のノートを変更し、zkの読み込み中に問い合わせる
+        started = threading.Event()
+        release = threading.Event()
+        updated = [
+            write_note(tmp_path, "a.md", "# 新しいノートA"),
+            write_note(tmp_path, "b.md", "# 新しいノートB"),
+        ]
+
+        def get_documents(paths: list[Path] | None = None) -> list[Note]:
+            started.set()
+            release.wait(10)
+            return updated
+
+        mock_client.get_documents.side_effect = get_documents
+        lane = mocker.spy(Scheduler, "lane")
+        catalog.refresh()
+        assert started.wait(10)
+
+        # Then: 作り直しを待たずに前の世代で応答し、入れ替えた後は新しい世代になること
+        lane.assert_any_call(Lane.BACKGROUND)
+        assert catalog.match_titles(["古い"], "AND") == {Path("a.md"), Path("b.md")}
+        assert catalog.index_state() == IndexState(generation=1, stale=True)
+        catalog.refresh()
+        release.set()
+        wait_for(lambda: not catalog.index_state().stale)
+        assert catalog.index_state() == IndexState(generation=3, stale=False)
+        assert catalog.match_titles(["古い"], "AND") == set()
+        assert catalog.match_titles(["新しい"], "AND") == {
+            Path("a.md"),
+            Path("b.md"),
+        }
+        assert mock_client.get_documents.call_count == 2
+
+    def test_note_written_during_rebuild_should_survive_swap(
+        self, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 閾値を超える変更をバックグラウンドで作り直し中のカタログ
+        catalog = self.make_catalog(mock_client, tmp_path, "stale")
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# 古いノートA"),
+            write_note(tmp_path, "b.md", "# 古いノートB"),
+        ]
+        catalog.refresh()
+        catalog.match_titles(["古い"], "AND")
+        started = threading.Event()
+        release = threading.Event()
+        updated = [
+            write_note(tmp_path, "a.md", "# 新しいノートA"),
+            write_note(tmp_path, "b.md", "# 新しいノートB"),
+        ]
+        created = write_note(tmp_path, "c.md", "# 作成したノートC\n\n#idea")
+
+        def get_documents(paths: list[Path] | None = None) -> list[Note]:
+            started.set()
+            release.wait(10)
+            return updated
+
+        mock_client.get_documents.side_effect = get_documents
+        catalog.refresh()
+        assert started.wait(10)
+
+        # When: 作り直しの間にノートを作成してから入れ替える
+        catalog.add_written([created.model_copy(update={"path": tmp_path / "c.md"})])
+        assert catalog.match_tags(["idea"], "AND") == {Path("c.md")}
+        generation = catalog.index_state().generation
+        release.set()
+        wait_for(lambda: not catalog.index_state().stale)
+
+        # Then: 作成したノートとタグが残り、世代は増え続けること
+        assert catalog.match_titles(["作成"], "AND") == {Path("c.md")}
+        assert catalog.match_tags(["idea"], "AND") == {Path("c.md")}
+        assert catalog.match_titles(["新しい"], "AND") == {
+            Path("a.md"),
+            Path("b.md"),
+        }
+        state = catalog.index_state()
+        assert generation is not None and state.generation is not None
+        assert state.generation > generation
+        # 作り直しで読み込み済みのノートは、更新で読み直されないこと
+        mock_client.get_documents.reset_mock()
+        catalog.refresh()
+        mock_client.get_documents.assert_not_called()
+
+    def test_failed_rebuild_should_be_logged(
+        self, mock_client: Mock, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # Given: 2件のノートを読み込んだカタログ
+        catalog = self.make_catalog(mock_client, tmp_path, "stale")
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# 古いノートA"),
+            write_note(tmp_path, "b.md", "# 古いノートB"),
+        ]
+        catalog.refresh()
+
+        # When: 作り直しの途中でzkの読み込みに失敗する
+        write_note(tmp_path, "a.md", "# 新しいノートA")
+        write_note(tmp_path, "b.md", "# 新しいノートB")
+        mock_client.get_documents.side_effect = RuntimeError("zk failed")
+        catalog.refresh()
+        wait_for(lambda: not catalog.index_state().stale)
+
+        # Then: 前の世代のまま、失敗が記録されること
+        assert catalog.index_state() == IndexState(generation=1, stale=False)
+        assert "Failed to rebuild the note catalog" in caplog.text
+
+    @pytest.mark.parametrize(
+        ("consistency", "names"),
+        [
+            pytest.param("stale", ["a.md"], id="small_change_should_apply_inline"),
+            pytest.param(
+                "strict", ["a.md", "b.md"], id="strict_mode_should_apply_inline"
+            ),
+        ],
+    )
+    def test_refresh_should_apply_changes_before_returning(
+        self,
+        mock_client: Mock,
+        tmp_path: Path,
+        consistency: Literal["strict", "stale"],
+        names: list[str],
+    ) -> None:
+        # Given: 2件のノートを読み込んだカタログ
+        catalog = self.make_catalog(mock_client, tmp_path, consistency)
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# 古いノートA"),
+            write_note(tmp_path, "b.md", "# 古いノートB"),
+        ]
+        catalog.refresh()
+
+        # When: ノートを変更して更新する
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, name, f"# 新しいノート{name}") for name in names
+        ]
+        catalog.refresh()
+
+        # Then: 更新から戻った時点で変更が反映されていること
+        assert catalog.index_state() == IndexState(generation=2, stale=False)
+        assert catalog.match_titles(["新しい"], "AND") == {Path(n) for n in names}
+
+    def test_index_state_should_be_none_when_disabled(
+        self, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 無効なカタログ
+        catalog = NoteCatalog(client=mock_client, cwd=tmp_path, config=CatalogConfig())
+
+        # When & Then: 世代は返されないこと
+        assert catalog.index_state() == IndexState(generation=None, stale=False)
+
+
+class TestNoteCatalogAddCreated:
+    """作成したノートを走査せずに反映するNoteCatalogのテスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(ZkClient)
+
+    @pytest.fixture
+    def catalog(self, mock_client: Mock, tmp_path: Path) -> NoteCatalog:
+        catalog = NoteCatalog(
+            client=mock_client, cwd=tmp_path, config=CatalogConfig(enabled=True)
+        )
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# 既存のノート")
+        ]
+        catalog.refresh()
+        return catalog
+
+    def test_created_note_should_be_searchable_without_zk(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: zk newで作成されたノート
+        mock_client.get_documents.reset_mock()
+        write_note(tmp_path, "dir/new.md", "# 新しいノート\n\n作成直後の本文")
+        created = Note(title="新しいノート", path=tmp_path / "dir/new.md", tags=[])
+
+        # When: カタログに反映して検索する
+        catalog.add_written([created])
+
+        # Then: タイトルと本文で見つかり、zkで読み直されないこと
+        assert catalog.match_titles(["新しい"], "AND") == {Path("dir/new.md")}
+        assert catalog.match_contents(["作成直後"], "AND") == {Path("dir/new.md")}
+        assert catalog.index_state().generation == 2
+        mock_client.get_documents.assert_not_called()
+        mock_client.index.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "change_detection",
+        [
+            pytest.param("stat", id="stat_should_reconcile_written_note"),
+            pytest.param("hash", id="hash_should_reconcile_written_note"),
+        ],
+    )
+    def test_next_refresh_should_reconcile_written_note_through_zk(
+        self,
+        mock_client: Mock,
+        tmp_path: Path,
+        change_detection: Literal["stat", "hash"],
+    ) -> None:
+        # Given: 読み込み済みのカタログと、内容を書き換えて反映したノート
+        catalog = NoteCatalog(
+            client=mock_client,
+            cwd=tmp_path,
+            config=CatalogConfig(enabled=True, change_detection=change_detection),
+        )
+        mock_client.get_documents.return_value = [write_note(tmp_path, "a.md", "# A")]
+        catalog.refresh()
+        edited = write_note(tmp_path, "a.md", "# A\n\n#draft")
+        catalog.add_written([Note(title="", path=tmp_path / "a.md", tags=[])])
+        mock_client.get_documents.return_value = [
+            edited.model_copy(update={"tags": ["draft", "zk"]})
+        ]
+
+        # When: 更新する
+        catalog.refresh()
+
+        # Then: 書き込んだノートがzkで読み直され、zkの解釈に置き換わること
+        mock_client.get_documents.assert_called_with([Path("a.md")])
+        assert catalog.match_tags(["zk"], "AND") == {Path("a.md")}
+
+    def test_written_note_should_take_tags_and_date_from_file(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: フロントマターと本文にタグ、フロントマターに日付のあるノート
+        note = write_note(
+            tmp_path,
+            "new.md",
+            "---\ntags: [draft]\ndate: 2024-01-02\n---\n# 新しいノート\n\n#idea",
+        )
+        mock_client.get_documents.reset_mock()
+
+        # When: 作成したノートを反映する
+        catalog.add_written([note.model_copy(update={"path": tmp_path / "new.md"})])
+
+        # Then: zkを実行せずに、タグと作成日時で見つかること
+        assert catalog.match_tags(["idea", "draft"], "AND") == {Path("new.md")}
+        assert catalog.match_created(datetime(2024, 1, 1), datetime(2024, 1, 3)) == {
+            Path("new.md")
+        }
+        mock_client.get_documents.assert_not_called()
+
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            pytest.param(
+                "# 新しい見出し\n\n本文", "新しい見出し", id="h1_should_be_title"
+            ),
+            pytest.param("本文だけ", "既存のノート", id="no_h1_should_keep_title"),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "path",
+        [
+            pytest.param(Path("./a.md"), id="dot_path"),
+            pytest.param(None, id="absolute_path"),
+        ],
+    )
+    def test_edited_note_should_take_title_from_content(
+        self,
+        catalog: NoteCatalog,
+        tmp_path: Path,
+        content: str,
+        expected: str,
+        path: Path | None,
+    ) -> None:
+        # Given: 索引済みのノートを、正規化されていないパスで編集した内容
+        (tmp_path / "a.md").write_text(content)
+        edited = Note(title="", path=path or tmp_path / "a.md", tags=[])
+
+        # When: 編集したノートを反映する
+        catalog.add_written([edited])
+
+        # Then: 同じノートとして、編集後の内容のタイトルで索引されること
+        assert catalog.note_count() == 1
+        notes, _ = catalog.get_notes([Path("a.md")])
+        assert [note.title for note in notes] == [expected]
+        assert catalog.match_titles([expected], "AND") == {Path("a.md")}
+
+    def test_note_outside_notebook_should_be_ignored(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: ノートブックの外のパス
+        outside = Note(title="外部", path=tmp_path.parent / "outside.md", tags=[])
+
+        # When: 反映する
+        catalog.add_written([outside])
+
+        # Then: カタログは変わらないこと
+        assert catalog.index_state().generation == 1
+        assert catalog.note_count() == 1
+
+
+class TestNoteCatalogHeadings:
+    """NoteCatalogの見出しの索引のテスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(ZkClient)
+
+    @pytest.fixture
+    def catalog(self, mock_client: Mock, tmp_path: Path) -> NoteCatalog:
+        catalog = NoteCatalog(
+            client=mock_client, cwd=tmp_path, config=CatalogConfig(enabled=True)
+        )
+        mock_client.get_documents.return_value = [
+            write_note(tmp_path, "a.md", "# 設計\n\n## TODO\n\n### 調査\n"),
+            write_note(tmp_path, "b.md", "# 日記\n\n## メモ\n"),
+        ]
+        catalog.refresh()
+        return catalog
+
+    @pytest.mark.parametrize(
+        "threshold",
+        [
+            pytest.param(200, id="small_notebook_should_parse_in_thread"),
+            pytest.param(0, id="large_notebook_should_parse_in_process_pool"),
+        ],
+    )
+    def test_search_should_return_heading_with_parents(
+        self,
+        catalog: NoteCatalog,
+        mocker: MockerFixture,
+        threshold: int,
+    ) -> None:
+        # Given: プロセスプールを使うノート数の下限
+        mocker.patch(
+            "zk_utils.infrastructure.zk.catalog.note_catalog."
+            "PARALLEL_OUTLINE_THRESHOLD",
+            threshold,
+        )
+
+        # When: 見出しを検索する
+        results, total = catalog.search_headings("調査", set(), 10)
+
+        # Then: ファイルから解析した見出しが、親の見出しとともに返されること
+        assert total == 1
+        assert results[0].note.path == Path("a.md")
+        assert results[0].heading.start == 4
+        assert results[0].parents == ["設計", "TODO"]
+
+    def test_changed_note_should_be_reparsed_alone(
+        self, catalog: NoteCatalog, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 見出しの索引を組み立てた後に変更されたノート
+        catalog.search_headings("TODO", set(), 10)
+        changed = write_note(tmp_path, "b.md", "# 日記\n\n## TODO\n")
+        os.utime(tmp_path / "b.md", ns=(1, 1))
+        mock_client.get_documents.return_value = [changed]
+
+        # When: 更新してから見出しを検索する
+        catalog.refresh()
+        results, total = catalog.search_headings("todo", {2}, 10)
+
+        # Then: 変更されたノートの見出しだけが入れ替わること
+        mock_client.get_documents.assert_called_with([Path("b.md")])
+        assert total == 2
+        assert [r.note.path for r in results] == [Path("b.md"), Path("a.md")]
+        assert [
+            o.headings[-1].text if o else None
+            for o in catalog.outlines([Path("b.md"), Path("missing.md")])
+        ] == ["TODO", None]
+
+    def test_headings_should_be_built_outside_lock(
+        self,
+        catalog: NoteCatalog,
+        mocker: MockerFixture,
+        tmp_path: Path,
+    ) -> None:
+        # Given: ファイルの読み込みを止めた見出しの索引の組み立て
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_read(root: str, path: str) -> tuple[Heading, ...]:
+            if not started.is_set():
+                started.set()
+                release.wait(10)
+            return read_headings(root, path)
+
+        mocker.patch(
+            "zk_utils.infrastructure.zk.catalog.note_catalog.read_headings",
+            side_effect=blocking_read,
+        )
+        results: list[int] = []
+        thread = threading.Thread(
+            target=lambda: results.append(catalog.search_headings("TODO", set(), 10)[1])
+        )
+        thread.start()
+        assert started.wait(10)
+
+        # When: 組み立て中に問い合わせ、ノートを作成してから読み込みを再開する
+        titles = catalog.match_titles(["設計"], "AND")
+        write_note(tmp_path, "c.md", "# 作業\n\n## TODO\n")
+        catalog.add_written([Note(title="作業", path=tmp_path / "c.md", tags=[])])
+        release.set()
+        thread.join(10)
+
+        # Then: 組み立てを待たずに応答し、作成したノートの見出しも索引されること
+        assert titles == {Path("a.md")}
+        assert results == [2]
+        assert catalog.outlines([Path("c.md")])[0] is not None
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.note_metadata import (
+    NoteMetadata,
+    parse_metadata,
+)
+
+
+class TestParseMetadata:
+    """parse_metadataのテスト"""
+
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            pytest.param(
+                "---\ntags: [a, 'b c']\nkeywords: d\n---\n# T\n",
+                NoteMetadata(title="T", tags=["a", "b", "c", "d"], created=None),
+                id="frontmatter_tags_should_be_split",
+            ),
+            pytest.param(
+                '---\ntags:\n  - a\n  - "b"\ndate: 2024-01-02 03:04\n---\n',
+                NoteMetadata(
+                    title=None, tags=["a", "b"], created=datetime(2024, 1, 2, 3, 4)
+                ),
+                id="block_list_and_date_should_parse",
+            ),
+            pytest.param(
+                "# 見出し\n\n本文 #idea と#not と #123 と #日本語/子\n",
+                NoteMetadata(title="見出し", tags=["idea", "日本語/子"], created=None),
+                id="hashtags_should_follow_whitespace",
+            ),
+            pytest.param(
+                "```\n# code\n```\n#idea\n",
+                NoteMetadata(title=None, tags=["idea"], created=None),
+                id="code_block_should_be_skipped",
+            ),
+            pytest.param(
+                "---\ntitle: 'Front'\n---\n# 見出し\n",
+                NoteMetadata(title="Front", tags=[], created=None),
+                id="frontmatter_title_should_win_over_h1",
+            ),
+            pytest.param(
+                "---\ncreated: someday\n---\n",
+                NoteMetadata(title=None, tags=[], created=None),
+                id="invalid_date_should_be_ignored",
+            ),
+        ],
+    )
+    def test_parse_metadata(self, content: str, expected: NoteMetadata) -> None:
+        # When: ノートの内容を解釈する
+        result = parse_metadata(content)
+
+        # Then: タグと作成日時が読み取られること
+        assert result == expected
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.note_table import NoteTable
+from zk_utils.infrastructure.zk.dao.note import Note
+
+
+class TestNoteTable:
+    """NoteTableのテスト"""
+
+    def test_note_should_restore_columns(self) -> None:
+        # Given: 日時とタグを持つノートを格納したテーブル
+        table = NoteTable()
+        created = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        table.set(
+            3,
+            Note(
+                title="ノート",
+                path=Path("dir/note.md"),
+                tags=["a", "b"],
+                content="本文",
+                created=created,
+            ),
+        )
+
+        # When: ノートを取り出す
+        note = table.note(3)
+
+        # Then: 本文以外の値が復元されること
+        assert note == Note(
+            title="ノート", path=Path("dir/note.md"), tags=["a", "b"], created=created
+        )
+        assert len(table) == 1
+        assert 3 in table
+        assert 0 not in table
+
+    def test_update_should_replace_tags_and_compact(self) -> None:
+        # Given: タグを持つノートを格納したテーブル
+        table = NoteTable()
+        table.set(0, Note(title="A", path=Path("a.md"), tags=["x", "y"]))
+        table.set(1, Note(title="B", path=Path("b.md"), tags=["y"]))
+
+        # When: タグを何度も付け替える
+        for i in range(10):
+            table.set(0, Note(title="A", path=Path("a.md"), tags=[f"t{i}"]))
+
+        # Then: 最新のタグだけが返され、他の行のタグは保たれること
+        assert table.tags(0) == ["t9"]
+        assert table.tags(1) == ["y"]
+
+    def test_deleted_row_should_not_be_readable(self) -> None:
+        # Given: 1件のノートを格納したテーブル
+        table = NoteTable()
+        table.set(0, Note(title="A", path=Path("a.md"), tags=[]))
+
+        # When: 行を削除する
+        table.delete(0)
+        table.delete(5)
+
+        # Then: 取り出せなくなること
+        assert len(table) == 0
+        assert 0 not in table
+        with pytest.raises(KeyError):
+            table.note(0)
+
+    def test_copy_should_not_share_updates(self) -> None:
+        # Given: 1件のノートを格納したテーブルの複製
+        table = NoteTable()
+        table.set(0, Note(title="A", path=Path("a.md"), tags=["x"]))
+        copied = table.copy()
+
+        # When: 複製だけを更新する
+        copied.set(0, Note(title="B", path=Path("a.md"), tags=["y"]))
+        copied.set(1, Note(title="C", path=Path("c.md"), tags=[]))
+
+        # Then: 元のテーブルは変わらないこと
+        assert table.note(0) == Note(title="A", path=Path("a.md"), tags=["x"])
+        assert len(table) == 1
+        assert copied.note(0) == Note(title="B", path=Path("a.md"), tags=["y"])
+        assert len(copied) == 2
@@ -0,0 +1,56 @@
+from zk_utils.infrastructure.zk.catalog.prefix_trie import PrefixTrie
+
+
+class TestPrefixTrie:
+    """PrefixTrieの前方一致検索テスト"""
+
+    def test_search_should_return_shorter_keys_first(self) -> None:
+        # Given: 共通の接頭辞を持つキー
+        trie = PrefixTrie()
+        trie.add(0, "zettelkasten method")
+        trie.add(1, "zettel")
+        trie.add(2, "zk")
+
+        # When: 接頭辞で検索する
+        result = trie.search("zet", 10)
+
+        # Then: 短いキーから順に返されること
+        assert result == [1, 0]
+
+    def test_search_should_respect_limit(self) -> None:
+        # Given: 多数のキー
+        trie = PrefixTrie()
+        for i in range(10):
+            trie.add(i, f"note{i}")
+
+        # When: 件数を制限して検索する
+        result = trie.search("note", 3)
+
+        # Then: 指定件数までしか返されないこと
+        assert len(result) == 3
+
+    def test_remove_should_prune_nodes(self) -> None:
+        # Given: キーを登録したトライ木
+        trie = PrefixTrie()
+        trie.add(0, "日本語")
+        trie.add(1, "日本")
+
+        # When: キーを削除する
+        trie.remove(0)
+        trie.remove(99)
+
+        # Then: 削除したキーは返されず、残りのキーは検索できること
+        assert trie.search("日本語", 10) == []
+        assert trie.search("日", 10) == [1]
+
+    def test_add_existing_doc_should_replace_key(self) -> None:
+        # Given: 登録済みのキー
+        trie = PrefixTrie()
+        trie.add(0, "old title")
+
+        # When: 同じIDで別のキーを登録する
+        trie.add(0, "new title")
+
+        # Then: 新しいキーだけで検索されること
+        assert trie.search("old", 10) == []
+        assert trie.search("new", 10) == [0]
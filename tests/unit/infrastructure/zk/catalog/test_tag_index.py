@@ -0,0 +1,120 @@
+from typing import Literal
+
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.tag_index import TagIndex, iter_bits
+
+
+class TestIterBits:
+    """ビットセットの展開テスト"""
+
+    @pytest.mark.parametrize(
+        "bits,expected",
+        [
+            pytest.param(0, [], id="zero_should_be_empty"),
+            pytest.param(0b1011, [0, 1, 3], id="bits_should_be_ascending"),
+            pytest.param(1 << 100, [100], id="large_bit_should_be_found"),
+        ],
+    )
+    def test_iter_bits(self, bits: int, expected: list[int]) -> None:
+        # When: ビット位置を列挙する
+        result = list(iter_bits(bits))
+
+        # Then: 立っているビットの位置が返されること
+        assert result == expected
+
+
+class TestTagIndexMatch:
+    """TagIndexのAND/OR検索テスト"""
+
+    @pytest.fixture
+    def index(self) -> TagIndex:
+        index = TagIndex()
+        index.add(0, ["python", "book/tech"])
+        index.add(1, ["python"])
+        index.add(2, ["book/novel", "日本語"])
+        index.add(3, [])
+        return index
+
+    @pytest.mark.parametrize(
+        "tags,match_mode,expected",
+        [
+            pytest.param(["python"], "AND", [0, 1], id="single_tag"),
+            pytest.param(["python", "book/tech"], "AND", [0], id="and_intersects"),
+            pytest.param(["python", "日本語"], "OR", [0, 1, 2], id="or_unions"),
+            pytest.param(["book/*"], "AND", [0, 2], id="glob_should_expand"),
+            pytest.param(["-python"], "AND", [2, 3], id="dash_should_negate"),
+            pytest.param(["book/*", "NOT python"], "AND", [2], id="not_negates"),
+            pytest.param(["unknown", "python"], "AND", [], id="unknown_and"),
+            pytest.param([], "AND", [], id="no_tags_should_be_empty"),
+        ],
+    )
+    def test_match(
+        self,
+        index: TagIndex,
+        tags: list[str],
+        match_mode: Literal["AND", "OR"],
+        expected: list[int],
+    ) -> None:
+        # When: タグで検索する
+        result = index.match(tags, match_mode)
+
+        # Then: 条件に合うノートのビットが立っていること
+        assert list(iter_bits(result)) == expected
+
+    def test_counts_should_use_cardinality(self, index: TagIndex) -> None:
+        # When: タグごとのノート数を取得する
+        counts = index.counts()
+
+        # Then: タグ名順でノート数が返されること
+        assert counts == {
+            "book/novel": 1,
+            "book/tech": 1,
+            "python": 2,
+            "日本語": 1,
+        }
+
+
+class TestTagIndexUpdate:
+    """TagIndexの更新テスト"""
+
+    def test_retagged_note_should_move_between_tags(self) -> None:
+        # Given: タグ付きのノート
+        index = TagIndex()
+        index.add(0, ["draft"])
+
+        # When: タグを付け替える
+        index.add(0, ["published"])
+
+        # Then: 古いタグは消え、新しいタグで検索できること
+        assert index.counts() == {"published": 1}
+        assert index.match(["draft"], "AND") == 0
+
+    def test_removed_note_should_clear_bits(self) -> None:
+        # Given: タグ付きのノート
+        index = TagIndex()
+        index.add(0, ["a"])
+        index.add(1, ["a", "b"])
+
+        # When: ノートを削除する
+        index.remove(1)
+        index.remove(99)
+
+        # Then: 削除したノートはどのビットセットにも残らないこと
+        assert index.counts() == {"a": 1}
+        assert index.all == 0b1
+
+    def test_tagless_set_should_follow_updates(self) -> None:
+        # Given: タグの無いノートとタグ付きのノート
+        index = TagIndex()
+        index.add(0, [])
+        index.add(1, ["a"])
+        index.add(2, [])
+
+        # When: タグを付け外しし、ノートを削除する
+        index.add(0, ["b"])
+        index.add(1, [])
+        index.remove(2)
+
+        # Then: タグの無いノートの集合が更新されること
+        assert index.tagless == 0b10
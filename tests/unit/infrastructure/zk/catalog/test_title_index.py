@@ -0,0 +1,114 @@
+import pytest
+
+from zk_utils.infrastructure.zk.catalog.title_index import TitleIndex, edit_distance
+
+
+class TestEditDistance:
+    """編集距離の計算テスト"""
+
+    @pytest.mark.parametrize(
+        "source,target,expected",
+        [
+            pytest.param("kitten", "sitting", 3, id="classic_example_should_be_3"),
+            pytest.param("", "abc", 3, id="empty_source_should_be_target_length"),
+            pytest.param("形態素", "形態素", 0, id="same_string_should_be_0"),
+            pytest.param("形態素", "形態", 1, id="deletion_should_be_1"),
+        ],
+    )
+    def test_edit_distance(self, source: str, target: str, expected: int) -> None:
+        # When: 編集距離を計算する
+        result = edit_distance(source, target)
+
+        # Then: 期待する距離が返されること
+        assert result == expected
+
+
+class TestTitleIndexFind:
+    """TitleIndexのあいまい検索テスト"""
+
+    @pytest.fixture
+    def index(self) -> TitleIndex:
+        index = TitleIndex()
+        index.add(0, "Machine Learning")
+        index.add(1, "Machine Learning Basics")
+        index.add(2, "Deep Learning")
+        index.add(3, "形態素解析入門")
+        index.add(4, "Cooking Recipes")
+        return index
+
+    def test_exact_match_should_rank_first(self, index: TitleIndex) -> None:
+        # When: 完全一致するクエリで検索する
+        result = index.find("machine learning", 10)
+
+        # Then: 完全一致、前方一致、類似の順に並ぶこと
+        assert result[:3] == [0, 1, 2]
+        assert 4 not in result
+
+    def test_prefix_should_autocomplete(self, index: TitleIndex) -> None:
+        # When: タイトルの先頭部分で検索する
+        result = index.find("Mach", 10)
+
+        # Then: 前方一致するタイトルが短い順に返されること
+        assert result[:2] == [0, 1]
+
+    def test_typo_should_match_by_similarity(self, index: TitleIndex) -> None:
+        # When: 誤字を含むクエリで検索する
+        result = index.find("Machne Lerning", 1)
+
+        # Then: 類似したタイトルが返されること
+        assert result == [0]
+
+    def test_cjk_substring_should_match(self, index: TitleIndex) -> None:
+        # When: 日本語の2文字で検索する
+        result = index.find("解析", 10)
+
+        # Then: 部分一致するタイトルが返されること
+        assert result == [3]
+
+    def test_unrelated_query_should_return_empty(self, index: TitleIndex) -> None:
+        # When: どのタイトルとも似ていないクエリで検索する
+        result = index.find("zzzz", 10)
+
+        # Then: 結果が空であること
+        assert result == []
+
+    @pytest.mark.parametrize(
+        "query,limit",
+        [
+            pytest.param("", 10, id="empty_query_should_return_empty"),
+            pytest.param("Machine", 0, id="zero_limit_should_return_empty"),
+        ],
+    )
+    def test_invalid_request_should_return_empty(
+        self, index: TitleIndex, query: str, limit: int
+    ) -> None:
+        # When: 空のクエリまたは0件指定で検索する
+        result = index.find(query, limit)
+
+        # Then: 結果が空であること
+        assert result == []
+
+    def test_renamed_title_should_be_updated(self, index: TitleIndex) -> None:
+        # Given: タイトルを変更する
+        index.add(4, "Machine Translation")
+
+        # When: 旧タイトルと新タイトルで検索する
+        old = index.find("Cooking", 10)
+        new = index.find("Machine Tra", 10)
+
+        # Then: 新しいタイトルで検索されること
+        assert old == []
+        assert new[0] == 4
+
+    def test_removed_title_should_not_match(self, index: TitleIndex) -> None:
+        # Given: タイトルを削除する
+        index.remove(0)
+        index.remove(99)
+
+        # When: 削除したタイトルで検索する
+        result = index.find("Machine Learning", 10)
+
+        # Then: 削除したタイトルは返されないこと
+        assert 0 not in result
+        assert result[0] == 1
+        assert len(index) == 4
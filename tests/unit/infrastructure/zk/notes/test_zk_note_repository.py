@@ -4,11 +4,22 @@ from unittest.mock import Mock
 import pytest
 from pytest_mock import MockerFixture
 
+from zk_utils.domain.models.notes import NoteSource
 from zk_utils.domain.models.notes.note import Note
+from zk_utils.infrastructure.zk.catalog import NoteCatalog
+from zk_utils.infrastructure.zk.dao.note import Note as DaoNote
 from zk_utils.infrastructure.zk.notes.zk_note_repository import ZkNoteRepository
 from zk_utils.infrastructure.zk.zk_client import ZkClient
 
 
+@pytest.fixture
+def mock_catalog(mocker: MockerFixture) -> Mock:
+    mock = mocker.create_autospec(NoteCatalog)
+    mock.enabled = False
+    mock.resolve_path.side_effect = lambda path: path
+    return mock
+
+
 class TestZkNoteRepositoryFindLastModifiedNote:
     """ZkNoteRepositoryの最新変更ノート取得機能テスト"""
 
@@ -17,8 +28,8 @@ class TestZkNoteRepositoryFindLastModifiedNote:
         return mocker.create_autospec(ZkClient)
 
     @pytest.fixture
-    def repository(self, mock_client: Mock) -> ZkNoteRepository:
-        return ZkNoteRepository(client=mock_client)
+    def repository(self, mock_client: Mock, mock_catalog: Mock) -> ZkNoteRepository:
+        return ZkNoteRepository(client=mock_client, catalog=mock_catalog)
 
     def test_find_last_modified_note_success(
         self, repository: ZkNoteRepository, mock_client: Mock
@@ -64,6 +75,86 @@ class TestZkNoteRepositoryFindLastModifiedNote:
 
         mock_client.get_last_modified_note.assert_called_once()
 
+    def test_find_last_modified_note_with_catalog_should_not_call_zk(
+        self, repository: ZkNoteRepository, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: カタログが有効で、最新変更ノートを保持している
+        mock_catalog.enabled = True
+        mock_catalog.recent_notes.return_value = [
+            Note(title="Latest Note", path=Path("latest.md"), tags=["recent"])
+        ]
+
+        # When: 最新変更ノートを取得する
+        result = repository.find_last_modified_note()
+
+        # Then: カタログから返され、zkは実行されないこと
+        mock_catalog.refresh.assert_called_once()
+        mock_catalog.recent_notes.assert_called_once_with(1)
+        mock_client.get_last_modified_note.assert_not_called()
+        assert result.path == Path("latest.md")
+
+    def test_find_last_modified_note_with_empty_catalog_should_raise_error(
+        self, repository: ZkNoteRepository, mock_catalog: Mock
+    ) -> None:
+        # Given: カタログが有効だが、ノートが存在しない
+        mock_catalog.enabled = True
+        mock_catalog.recent_notes.return_value = []
+
+        # When & Then: ValueErrorが発生すること
+        with pytest.raises(ValueError, match="Last modified note not found"):
+            repository.find_last_modified_note()
+
+
+class TestZkNoteRepositoryFindRecentlyModifiedNotes:
+    """ZkNoteRepositoryの最近変更されたノート取得機能テスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(ZkClient)
+
+    @pytest.fixture
+    def repository(self, mock_client: Mock, mock_catalog: Mock) -> ZkNoteRepository:
+        return ZkNoteRepository(client=mock_client, catalog=mock_catalog)
+
+    @pytest.fixture
+    def notes(self) -> list[Note]:
+        return [
+            Note(title="New", path=Path("new.md"), tags=[]),
+            Note(title="Old", path=Path("old.md"), tags=["a"]),
+        ]
+
+    def test_find_recently_modified_notes_should_call_zk(
+        self, repository: ZkNoteRepository, mock_client: Mock, notes: list[Note]
+    ) -> None:
+        # Given: zkが更新日時の新しい順にノートを返す
+        mock_client.get_recently_modified_notes.return_value = notes
+
+        # When: 最近変更されたノートを取得する
+        result = repository.find_recently_modified_notes(2)
+
+        # Then: 件数を指定してzkが呼ばれ、順序が保たれること
+        mock_client.get_recently_modified_notes.assert_called_once_with(2)
+        assert [note.path for note in result] == [Path("new.md"), Path("old.md")]
+
+    def test_find_recently_modified_notes_with_catalog_should_not_call_zk(
+        self,
+        repository: ZkNoteRepository,
+        mock_client: Mock,
+        mock_catalog: Mock,
+        notes: list[Note],
+    ) -> None:
+        # Given: カタログが有効
+        mock_catalog.enabled = True
+        mock_catalog.recent_notes.return_value = notes
+
+        # When: 最近変更されたノートを取得する
+        result = repository.find_recently_modified_notes(2)
+
+        # Then: カタログから返され、zkは実行されないこと
+        mock_catalog.recent_notes.assert_called_once_with(2)
+        mock_client.get_recently_modified_notes.assert_not_called()
+        assert [note.title for note in result] == ["New", "Old"]
+
 
 class TestZkNoteRepositoryFindNoteContent:
     """ZkNoteRepositoryのノートコンテンツ取得機能テスト"""
@@ -73,8 +164,8 @@ class TestZkNoteRepositoryFindNoteContent:
         return mocker.create_autospec(ZkClient)
 
     @pytest.fixture
-    def repository(self, mock_client: Mock) -> ZkNoteRepository:
-        return ZkNoteRepository(client=mock_client)
+    def repository(self, mock_client: Mock, mock_catalog: Mock) -> ZkNoteRepository:
+        return ZkNoteRepository(client=mock_client, catalog=mock_catalog)
 
     def test_find_note_content_success(
         self, repository: ZkNoteRepository, mock_client: Mock
@@ -99,6 +190,25 @@ class TestZkNoteRepositoryFindNoteContent:
         assert result.tags == expected_note.tags
         assert result.content == expected_note.content
 
+    def test_find_note_content_with_title_should_resolve_path(
+        self, repository: ZkNoteRepository, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: タイトルからパスに解決できる
+        path = Path("notes/4h2k.md")
+        mock_catalog.resolve_path.side_effect = None
+        mock_catalog.resolve_path.return_value = path
+        mock_client.get_note.return_value = Note(
+            title="会議メモ", path=path, tags=[], content="本文"
+        )
+
+        # When: タイトルでノートコンテンツを取得する
+        result = repository.find_note_content(Path("会議メモ"))
+
+        # Then: 解決されたパスでZkClientが呼ばれること
+        mock_catalog.resolve_path.assert_called_once_with(Path("会議メモ"))
+        mock_client.get_note.assert_called_once_with(path)
+        assert result.path == path
+
 
 class TestZkNoteRepositoryFindTaglessNotes:
     """ZkNoteRepositoryのタグなしノート取得機能テスト"""
@@ -108,8 +218,8 @@ class TestZkNoteRepositoryFindTaglessNotes:
         return mocker.create_autospec(ZkClient)
 
     @pytest.fixture
-    def repository(self, mock_client: Mock) -> ZkNoteRepository:
-        return ZkNoteRepository(client=mock_client)
+    def repository(self, mock_client: Mock, mock_catalog: Mock) -> ZkNoteRepository:
+        return ZkNoteRepository(client=mock_client, catalog=mock_catalog)
 
     def test_find_tagless_notes_success(
         self, repository: ZkNoteRepository, mock_client: Mock
@@ -130,17 +240,20 @@ class TestZkNoteRepositoryFindTaglessNotes:
         mock_client.get_tagless_notes.return_value = expected_notes
 
         # When: タグなしノートを取得する
-        result = repository.find_tagless_notes()
+        result = repository.find_tagless_notes(10, 1, None)
 
         # Then: ZkClientのメソッドが呼ばれ、Noteオブジェクトのリストが返されること
         mock_client.get_tagless_notes.assert_called_once()
-        assert len(result) == 2
-        assert result[0].title == expected_notes[0].title
-        assert result[0].path == expected_notes[0].path
-        assert result[0].tags == expected_notes[0].tags
-        assert result[1].title == expected_notes[1].title
-        assert result[1].path == expected_notes[1].path
-        assert result[1].tags == expected_notes[1].tags
+        assert result.total == 2
+        assert result.start == 0
+        notes = result.notes
+        assert len(notes) == 2
+        assert notes[0].title == expected_notes[0].title
+        assert notes[0].path == expected_notes[0].path
+        assert notes[0].tags == expected_notes[0].tags
+        assert notes[1].title == expected_notes[1].title
+        assert notes[1].path == expected_notes[1].path
+        assert notes[1].tags == expected_notes[1].tags
 
     def test_find_tagless_notes_empty_result(
         self, repository: ZkNoteRepository, mock_client: Mock
@@ -149,11 +262,12 @@ class TestZkNoteRepositoryFindTaglessNotes:
         mock_client.get_tagless_notes.return_value = []
 
         # When: タグなしノートを取得する
-        result = repository.find_tagless_notes()
+        result = repository.find_tagless_notes(10, 1, None)
 
         # Then: 空のリストが返されること
         mock_client.get_tagless_notes.assert_called_once()
-        assert len(result) == 0
+        assert result.notes == []
+        assert result.total == 0
 
     def test_find_tagless_notes_client_exception_should_propagate(
         self, repository: ZkNoteRepository, mock_client: Mock
@@ -163,10 +277,67 @@ class TestZkNoteRepositoryFindTaglessNotes:
 
         # When & Then: RuntimeErrorが伝播すること
         with pytest.raises(RuntimeError, match="Client error"):
-            repository.find_tagless_notes()
+            repository.find_tagless_notes(10, 1, None)
 
         mock_client.get_tagless_notes.assert_called_once()
 
+    @pytest.mark.parametrize(
+        ("page", "after", "expected", "start"),
+        [
+            pytest.param(2, None, ["c", "d"], 2, id="page_should_return_slice"),
+            pytest.param(9, None, ["e"], 4, id="page_after_last_should_be_clamped"),
+            pytest.param(
+                1, ("b", "b.md"), ["c", "d"], 2, id="cursor_should_continue_after_key"
+            ),
+            pytest.param(
+                1, ("bb", "x.md"), ["c", "d"], 2, id="removed_key_should_continue"
+            ),
+        ],
+    )
+    def test_find_tagless_notes_should_return_window(
+        self,
+        repository: ZkNoteRepository,
+        mock_client: Mock,
+        page: int,
+        after: tuple[str, str] | None,
+        expected: list[str],
+        start: int,
+    ) -> None:
+        # Given: 順不同で返されるタグなしノート
+        mock_client.get_tagless_notes.return_value = [
+            Note(title=title, path=Path(f"{title}.md"), tags=[])
+            for title in ["d", "a", "e", "c", "b"]
+        ]
+
+        # When: 2件ずつの範囲を取得する
+        result = repository.find_tagless_notes(2, page, after)
+
+        # Then: タイトル順に並べた範囲と開始位置、総数が返されること
+        assert [note.title for note in result.notes] == expected
+        assert result.start == start
+        assert result.total == 5
+
+    def test_find_tagless_notes_with_catalog_should_not_call_zk(
+        self, repository: ZkNoteRepository, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: カタログが有効で、タグの無いノートを保持している
+        mock_catalog.enabled = True
+        mock_catalog.tagless_notes.return_value = (
+            [Note(title="Tagless", path=Path("tagless.md"), tags=[])],
+            3,
+            4,
+        )
+
+        # When: カーソルの後ろを取得する
+        result = repository.find_tagless_notes(2, 1, ("T", "t.md"))
+
+        # Then: カタログから範囲ごと返され、zkは実行されないこと
+        mock_catalog.refresh.assert_called_once()
+        mock_catalog.tagless_notes.assert_called_once_with(2, 1, ("T", "t.md"))
+        mock_client.get_tagless_notes.assert_not_called()
+        assert [note.path for note in result.notes] == [Path("tagless.md")]
+        assert (result.start, result.total) == (3, 4)
+
 
 class TestZkNoteRepositoryFindRandomNote:
     """ZkNoteRepositoryのランダムノート取得機能テスト"""
@@ -176,8 +347,8 @@ class TestZkNoteRepositoryFindRandomNote:
         return mocker.create_autospec(ZkClient)
 
     @pytest.fixture
-    def repository(self, mock_client: Mock) -> ZkNoteRepository:
-        return ZkNoteRepository(client=mock_client)
+    def repository(self, mock_client: Mock, mock_catalog: Mock) -> ZkNoteRepository:
+        return ZkNoteRepository(client=mock_client, catalog=mock_catalog)
 
     def test_find_random_note_success(
         self, repository: ZkNoteRepository, mock_client: Mock
@@ -206,7 +377,7 @@ class TestZkNoteRepositoryFindRandomNote:
         mock_client.get_random_note.return_value = None
 
         # When & Then: ValueErrorが発生すること
-        with pytest.raises(ValueError, match="Last modified note not found"):
+        with pytest.raises(ValueError, match="Random note not found"):
             repository.find_random_note()
 
         mock_client.get_random_note.assert_called_once()
@@ -224,6 +395,93 @@ class TestZkNoteRepositoryFindRandomNote:
         mock_client.get_random_note.assert_called_once()
 
 
+class TestZkNoteRepositoryFindRandomNotes:
+    """ZkNoteRepositoryの複数ランダムノート取得機能テスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(ZkClient)
+
+    @pytest.fixture
+    def repository(self, mock_client: Mock, mock_catalog: Mock) -> ZkNoteRepository:
+        return ZkNoteRepository(client=mock_client, catalog=mock_catalog)
+
+    def test_find_random_notes_should_sample_from_catalog(
+        self, repository: ZkNoteRepository, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: カタログが有効で、ランダムに選んだノートを返す
+        mock_catalog.enabled = True
+        mock_catalog.sample.return_value = [
+            Note(title="A", path=Path("dir/a.md"), tags=["t"])
+        ]
+
+        # When: 条件を指定してランダムにノートを取得する
+        result = repository.find_random_notes(
+            count=3, seed=None, tags=["t"], directory=Path("dir"), exclude_recent=5
+        )
+
+        # Then: zkを実行せずにカタログから返されること
+        mock_catalog.refresh_throttled.assert_called_once()
+        args = mock_catalog.sample.call_args[0]
+        assert (args[0], args[2], args[3], args[4]) == (3, ["t"], Path("dir"), 5)
+        mock_client.get_random_note.assert_not_called()
+        assert [note.path for note in result] == [Path("dir/a.md")]
+
+    def test_find_random_notes_without_catalog_should_sample_from_zk(
+        self, repository: ZkNoteRepository, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: カタログが無効で、条件に合うノートがzkから3件返される
+        mock_client.get_notes.return_value = [
+            Note(title=name, path=Path(f"dir/{name}.md"), tags=["t", "u"])
+            for name in ["a", "b", "c"]
+        ]
+        first = repository.find_random_notes(2, 0, ["t", "u"], Path("dir"), 0)
+
+        # When: 直近に返したノートを除いて取得する
+        second = repository.find_random_notes(3, 0, ["t", "u"], Path("dir"), 2)
+
+        # Then: 条件をzkに渡し、カタログを使わずに重複なく選ばれること
+        mock_client.get_notes.assert_called_with(["--tag", "t, u", "dir"])
+        mock_catalog.sample.assert_not_called()
+        mock_catalog.refresh_throttled.assert_not_called()
+        assert len({note.path for note in first}) == 2
+        assert {note.path for note in second} == (
+            {Path("dir/a.md"), Path("dir/b.md"), Path("dir/c.md")}
+            - {note.path for note in first}
+        )
+
+    def test_find_random_notes_with_seed_should_use_seeded_generator(
+        self, repository: ZkNoteRepository, mock_catalog: Mock
+    ) -> None:
+        # Given: カタログは受け取った乱数生成器で値を引く
+        mock_catalog.enabled = True
+        mock_catalog.sample.side_effect = lambda count, rng, *args: [
+            Note(title=str(rng.random()), path=Path("a.md"), tags=[])
+        ]
+
+        # When: 同じシードで2回取得する
+        first = repository.find_random_notes(1, 7, [], None, 0)
+        second = repository.find_random_notes(1, 7, [], None, 0)
+
+        # Then: 同じ結果になること
+        assert first[0].title == second[0].title
+
+    def test_find_random_note_with_catalog_should_not_call_zk(
+        self, repository: ZkNoteRepository, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: カタログが有効
+        mock_catalog.enabled = True
+        mock_catalog.sample.return_value = [Note(title="A", path=Path("a.md"), tags=[])]
+
+        # When: ランダムノートを1件取得する
+        result = repository.find_random_note()
+
+        # Then: カタログから返され、zkは実行されないこと
+        assert mock_catalog.sample.call_args[0][0] == 1
+        mock_client.get_random_note.assert_not_called()
+        assert result.path == Path("a.md")
+
+
 class TestZkNoteRepositoryCreateNote:
     """ZkNoteRepositoryのノート作成機能テスト"""
 
@@ -232,11 +490,11 @@ class TestZkNoteRepositoryCreateNote:
         return mocker.create_autospec(ZkClient)
 
     @pytest.fixture
-    def repository(self, mock_client: Mock) -> ZkNoteRepository:
-        return ZkNoteRepository(client=mock_client)
+    def repository(self, mock_client: Mock, mock_catalog: Mock) -> ZkNoteRepository:
+        return ZkNoteRepository(client=mock_client, catalog=mock_catalog)
 
     def test_create_note_success(
-        self, repository: ZkNoteRepository, mock_client: Mock
+        self, repository: ZkNoteRepository, mock_client: Mock, mock_catalog: Mock
     ) -> None:
         # Given: ノート作成パラメータ
         title = "New Note"
@@ -249,6 +507,63 @@ class TestZkNoteRepositoryCreateNote:
 
         # Then: ZkClientのメソッドが呼ばれ、Noteオブジェクトが返されること
         mock_client.create_note.assert_called_once_with(title, path)
+        mock_catalog.add_written.assert_called_once_with([created_note])
         assert result.title == created_note.title
         assert result.path == created_note.path
         assert result.tags == []
+
+
+class TestZkNoteRepositorySaveNoteSource:
+    """ZkNoteRepositoryのノートの編集内容の保存機能テスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(ZkClient)
+
+    @pytest.fixture
+    def repository(self, mock_client: Mock, mock_catalog: Mock) -> ZkNoteRepository:
+        return ZkNoteRepository(client=mock_client, catalog=mock_catalog)
+
+    def test_find_note_source_should_resolve_and_read_file(
+        self, repository: ZkNoteRepository, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: タイトルから解決されるノート
+        mock_catalog.resolve_path.side_effect = lambda path: Path("dir/note.md")
+        mock_client.read_note_file.return_value = "# Note\n"
+
+        # When: 編集の元にする内容を取得する
+        result = repository.find_note_source(Path("Note"))
+
+        # Then: 解決したパスのファイルの内容が返されること
+        mock_client.read_note_file.assert_called_once_with(Path("dir/note.md"))
+        assert result == NoteSource(path=Path("dir/note.md"), content="# Note\n")
+
+    def test_missing_file_should_raise_error(
+        self, repository: ZkNoteRepository, mock_client: Mock
+    ) -> None:
+        # Given: 存在しないノート
+        mock_client.read_note_file.side_effect = FileNotFoundError
+
+        # When & Then: ValueErrorが発生すること
+        with pytest.raises(ValueError, match="Note not found at path"):
+            repository.find_note_source(Path("missing.md"))
+
+    def test_save_should_reindex_only_edited_note(
+        self, repository: ZkNoteRepository, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: 有効なカタログ
+        mock_catalog.enabled = True
+        source = NoteSource(path=Path("note.md"), content="old")
+
+        # When: 編集した内容を保存する
+        result = repository.save_note_source(source, "new")
+
+        # Then: 読み込んだ内容と比べて置き換え、そのノートだけを反映すること
+        mock_client.replace_note_file.assert_called_once_with(
+            Path("note.md"), "new", "old"
+        )
+        mock_catalog.add_written.assert_called_once_with(
+            [DaoNote(title="", path=Path("note.md"), tags=[])]
+        )
+        mock_client.index.assert_not_called()
+        assert result == NoteSource(path=Path("note.md"), content="new")
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+from zk_utils.infrastructure.zk.dao.note import Note
+from zk_utils.infrastructure.zk.prefetch import ContentCache
+
+
+def write(path: Path, content: str) -> Note:
+    path.write_text(content)
+    return Note(title=path.stem, path=Path(path.name), tags=[], content=content)
+
+
+class TestContentCache:
+    """本文をstat情報とともに保持するContentCacheのテスト"""
+
+    def test_get_should_return_cached_note_while_file_is_unchanged(
+        self, tmp_path: Path
+    ) -> None:
+        # Given: 読み込む前のstat情報とともに格納したノート
+        cache = ContentCache(tmp_path, max_bytes=1024)
+        note = write(tmp_path / "a.md", "body")
+        stat = cache.stat(Path("a.md"))
+        assert stat is not None
+        cache.put(Path("a.md"), stat, note)
+
+        # When: ファイルを変えずに取り出す
+        result = cache.get(Path("a.md"))
+
+        # Then: 格納した本文が返されること
+        assert result is not None
+        assert result.content == "body"
+
+    def test_get_should_discard_note_when_file_changed(self, tmp_path: Path) -> None:
+        # Given: 格納した後に内容と更新日時が変わったファイル
+        cache = ContentCache(tmp_path, max_bytes=1024)
+        note = write(tmp_path / "a.md", "body")
+        stat = cache.stat(Path("a.md"))
+        assert stat is not None
+        cache.put(Path("a.md"), stat, note)
+        write(tmp_path / "a.md", "changed body")
+        os.utime(tmp_path / "a.md", ns=(stat[0] + 10**9, stat[0] + 10**9))
+
+        # When: 取り出す
+        result = cache.get(Path("a.md"))
+
+        # Then: 古い本文は返されず破棄されること
+        assert result is None
+        assert Path("a.md") not in cache
+
+    def test_put_should_evict_least_recently_used_over_max_bytes(
+        self, tmp_path: Path
+    ) -> None:
+        # Given: 本文8文字分までのキャッシュに2つのノートを格納し、1つ目を使う
+        cache = ContentCache(tmp_path, max_bytes=8)
+        for name in ("a", "b"):
+            note = write(tmp_path / f"{name}.md", "1234")
+            stat = cache.stat(Path(f"{name}.md"))
+            assert stat is not None
+            cache.put(Path(f"{name}.md"), stat, note)
+        assert cache.get(Path("a.md")) is not None
+
+        # When: 3つ目を格納する
+        note = write(tmp_path / "c.md", "1234")
+        stat = cache.stat(Path("c.md"))
+        assert stat is not None
+        cache.put(Path("c.md"), stat, note)
+
+        # Then: 最も使われていないノートが捨てられること
+        assert Path("a.md") in cache
+        assert Path("b.md") not in cache
+        assert Path("c.md") in cache
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from zk_utils.application._common.pagination import Pagination
+from zk_utils.application.notes.get_notes import GetNotesInput, GetNotesOutput
+from zk_utils.infrastructure.zk.prefetch import PageCache
+
+
+def make_input(page: int) -> GetNotesInput:
+    return GetNotesInput(page=page, title_patterns=[], search_patterns=[], tags=[])
+
+
+def make_output(page: int) -> GetNotesOutput:
+    pagination = Pagination(
+        page=page,
+        per_page=10,
+        total=30,
+        total_pages=3,
+        has_next=page < 3,
+        has_prev=page > 1,
+    )
+    return GetNotesOutput(pagination=pagination, notes=[])
+
+
+class TestPageCache:
+    """get_notesの結果を一定時間だけ保持するPageCacheのテスト"""
+
+    def test_get_should_return_output_for_same_input(self) -> None:
+        # Given: 2ページ目の結果を格納したキャッシュ
+        cache = PageCache(ttl_seconds=30)
+        cache.put(make_input(2), make_output(2))
+
+        # When & Then: 同じ条件では結果が返され、異なる条件では返されないこと
+        assert cache.get(make_input(2)) == make_output(2)
+        assert cache.get(make_input(3)) is None
+
+    @pytest.mark.parametrize(
+        ("ttl_seconds", "clear"),
+        [
+            pytest.param(0.0, False, id="expired_entry_should_be_dropped"),
+            pytest.param(30.0, True, id="cleared_entry_should_be_dropped"),
+        ],
+    )
+    def test_get_should_not_return_stale_output(
+        self, ttl_seconds: float, clear: bool
+    ) -> None:
+        # Given: 期限切れか破棄された結果
+        cache = PageCache(ttl_seconds=ttl_seconds)
+        cache.put(make_input(2), make_output(2))
+        time.sleep(0.01)
+        if clear:
+            cache.clear()
+
+        # When & Then: 結果が返されないこと
+        assert cache.get(make_input(2)) is None
@@ -0,0 +1,205 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.application._common.note import Note as AppNote
+from zk_utils.application._common.pagination import Pagination
+from zk_utils.application.notes.get_notes import GetNotesInput, GetNotesOutput
+from zk_utils.infrastructure.zk.dao.note import Note
+from zk_utils.infrastructure.zk.prefetch import PrefetchConfig, Prefetcher
+from zk_utils.infrastructure.zk.zk_client import ZkClient
+
+TOTAL_PAGES = 3
+
+
+def make_input(page: int) -> GetNotesInput:
+    return GetNotesInput(
+        page=page, per_page=2, title_patterns=[], search_patterns=[], tags=[]
+    )
+
+
+def query(input_data: GetNotesInput) -> GetNotesOutput:
+    """ページごとに2件ずつ、p<ページ>-<番号>.mdのノートを返す検索"""
+    page = input_data.page
+    pagination = Pagination(
+        page=page,
+        per_page=2,
+        total=TOTAL_PAGES * 2,
+        total_pages=TOTAL_PAGES,
+        has_next=page < TOTAL_PAGES,
+        has_prev=page > 1,
+    )
+    notes = [
+        AppNote(title=f"p{page}-{i}", path=Path(f"p{page}-{i}.md"), tags=[])
+        for i in range(2)
+    ]
+    return GetNotesOutput(pagination=pagination, notes=notes)
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("condition was not met")
+        time.sleep(0.01)
+
+
+class TestPrefetcher:
+    """次のページとノートの本文を先読みするPrefetcherのテスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture, tmp_path: Path) -> Mock:
+        """ノートブックのファイルから本文を読むZkClientのモック"""
+        client = mocker.create_autospec(ZkClient)
+
+        def get_note(path: Path) -> Note:
+            content = (tmp_path / path).read_text()
+            return Note(title=path.stem, path=path, tags=[], content=content)
+
+        client.get_note.side_effect = get_note
+        for page in range(1, TOTAL_PAGES + 1):
+            for i in range(2):
+                (tmp_path / f"p{page}-{i}.md").write_text(f"body {page}-{i}")
+        return client
+
+    def make_prefetcher(
+        self, client: Mock, cwd: Path, top_k: int = 3, budget: float = 0.25
+    ) -> Prefetcher:
+        config = PrefetchConfig(enabled=True, top_k=top_k, budget=budget)
+        return Prefetcher(client=client, cwd=cwd, config=config)
+
+    def test_get_notes_should_serve_next_page_from_prefetch(
+        self, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 1ページ目を問い合わせた後
+        prefetcher = self.make_prefetcher(mock_client, tmp_path, top_k=1)
+        calls: list[int] = []
+
+        def counted(input_data: GetNotesInput) -> GetNotesOutput:
+            calls.append(input_data.page)
+            return query(input_data)
+
+        prefetcher.get_notes(make_input(1), counted)
+        wait_for(lambda: calls == [1, 2])
+
+        # When: 2ページ目を問い合わせる
+        output = prefetcher.get_notes(make_input(2), counted)
+
+        # Then: 先読みした結果が返され、ヒット率に数えられること
+        assert output == query(make_input(2))
+        assert calls[:2] == [1, 2]
+        stats = prefetcher.stats()
+        assert stats is not None
+        assert stats.page_requests == 2
+        assert stats.page_hits == 1
+        assert stats.page_hit_rate == 0.5
+
+    def test_get_note_should_serve_top_k_contents_from_prefetch(
+        self, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 上位1件の本文を先読みする設定で1ページ目を問い合わせた後
+        prefetcher = self.make_prefetcher(mock_client, tmp_path, top_k=1)
+        prefetcher.get_notes(make_input(1), query)
+        wait_for(
+            lambda: (
+                (stats := prefetcher.stats()) is not None
+                and stats.prefetched_pages == 1
+            )
+        )
+        mock_client.get_note.reset_mock()
+
+        # When: 上位のノートと、それ以外のノートの本文を取得する
+        first = prefetcher.get_note(Path("p1-0.md"))
+        second = prefetcher.get_note(Path("p1-1.md"))
+
+        # Then: 上位のノートだけzkを呼ばずに返されること
+        assert first is not None and first.content == "body 1-0"
+        assert second is not None and second.content == "body 1-1"
+        mock_client.get_note.assert_called_once_with(Path("p1-1.md"))
+        stats = prefetcher.stats()
+        assert stats is not None
+        assert stats.prefetched_contents == 1
+        assert stats.content_hit_rate == 0.5
+
+    def test_get_note_should_reload_changed_file(
+        self, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 一度読み込んだ後に書き換えられたノート
+        prefetcher = self.make_prefetcher(mock_client, tmp_path)
+        prefetcher.get_note(Path("p1-0.md"))
+        (tmp_path / "p1-0.md").write_text("updated body, longer than before")
+
+        # When: 本文を取得する
+        note = prefetcher.get_note(Path("p1-0.md"))
+
+        # Then: 書き換えた後の本文が返されること
+        assert note is not None
+        assert note.content == "updated body, longer than before"
+
+    def test_get_notes_should_skip_prefetch_without_budget(
+        self, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 先読みの予算が無い設定
+        prefetcher = self.make_prefetcher(mock_client, tmp_path, budget=0.0)
+        calls: list[int] = []
+
+        def counted(input_data: GetNotesInput) -> GetNotesOutput:
+            calls.append(input_data.page)
+            return query(input_data)
+
+        # When: 1ページ目を問い合わせる
+        prefetcher.get_notes(make_input(1), counted)
+        time.sleep(0.1)
+
+        # Then: 先読みせず、その回数が数えられること
+        assert calls == [1]
+        stats = prefetcher.stats()
+        assert stats is not None
+        assert stats.skipped == 1
+
+    def test_invalidate_should_drop_prefetched_pages(
+        self, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 2ページ目を先読みした後にノートが作成された
+        prefetcher = self.make_prefetcher(mock_client, tmp_path, top_k=0)
+        done = threading.Event()
+        calls: list[int] = []
+
+        def counted(input_data: GetNotesInput) -> GetNotesOutput:
+            calls.append(input_data.page)
+            if input_data.page == 2:
+                done.set()
+            return query(input_data)
+
+        prefetcher.get_notes(make_input(1), counted)
+        assert done.wait(10)
+        wait_for(
+            lambda: (
+                (stats := prefetcher.stats()) is not None
+                and stats.prefetched_pages == 1
+            )
+        )
+        prefetcher.invalidate()
+
+        # When: 2ページ目を問い合わせる
+        prefetcher.get_notes(make_input(2), counted)
+
+        # Then: 改めて問い合わせること
+        assert calls[:3] == [1, 2, 2]
+
+    def test_stats_should_be_none_when_disabled(
+        self, mock_client: Mock, tmp_path: Path
+    ) -> None:
+        # Given: 先読みが無効のPrefetcher
+        prefetcher = Prefetcher(
+            client=mock_client, cwd=tmp_path, config=PrefetchConfig()
+        )
+
+        # When & Then: 統計は返されないこと
+        assert prefetcher.enabled is False
+        assert prefetcher.stats() is None
@@ -0,0 +1,165 @@
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.infrastructure.zk.scheduler import Lane, Scheduler
+
+# 実行を始めたコマンド名の順番と、コマンド名ごとの終了させるイベント
+Started = tuple[list[str], dict[str, threading.Event]]
+
+
+def run_in_thread(scheduler: Scheduler, lane: Lane, command: list[str]) -> None:
+    with scheduler.lane(lane):
+        scheduler.run(command, cwd=Path("."))
+
+
+def start(scheduler: Scheduler, lane: Lane, command: list[str]) -> threading.Thread:
+    thread = threading.Thread(target=run_in_thread, args=(scheduler, lane, command))
+    thread.start()
+    return thread
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("condition was not met")
+        time.sleep(0.01)
+
+
+class TestScheduler:
+    """優先度ごとのレーンでzkのプロセスを実行するSchedulerのテスト"""
+
+    @pytest.fixture
+    def started(self, mocker: MockerFixture) -> Started:
+        """コマンド名ごとのイベントが立つまで終わらないrun_processのモック"""
+        order: list[str] = []
+        release: dict[str, threading.Event] = {}
+
+        def run_process(
+            command: list[str], cwd: Path, input: str | None = None
+        ) -> subprocess.CompletedProcess[str]:
+            order.append(command[0])
+            release.setdefault(command[0], threading.Event()).wait(10)
+            return subprocess.CompletedProcess(command, 0, "", "")
+
+        mocker.patch(
+            "zk_utils.infrastructure.zk.scheduler.run_process", side_effect=run_process
+        )
+        return order, release
+
+    def test_lane_limit_should_bound_concurrency(self, started: Started) -> None:
+        # Given: 先読みのレーンを1つに制限したスケジューラー
+        order, release = started
+        scheduler = Scheduler({Lane.PREFETCH: 1})
+        release["second"] = threading.Event()
+
+        # When: 先読みのコマンドを2つ同時に実行する
+        first = start(scheduler, Lane.PREFETCH, ["first"])
+        wait_for(lambda: order == ["first"])
+        second = start(scheduler, Lane.PREFETCH, ["second"])
+        time.sleep(0.1)
+
+        # Then: 1つ目が終わるまで2つ目は始まらないこと
+        assert order == ["first"]
+        release.setdefault("first", threading.Event()).set()
+        release["second"].set()
+        first.join()
+        second.join()
+        assert order == ["first", "second"]
+
+    def test_lower_lane_should_wait_for_waiting_higher_lane(
+        self, started: Started
+    ) -> None:
+        # Given: 対話的なレーンが上限まで使われ、もう1つ待っている状態
+        order, release = started
+        scheduler = Scheduler({Lane.INTERACTIVE: 1})
+        for name in ("busy", "waiting", "prefetch"):
+            release[name] = threading.Event()
+        busy = start(scheduler, Lane.INTERACTIVE, ["busy"])
+        wait_for(lambda: order == ["busy"])
+        waiting = start(scheduler, Lane.INTERACTIVE, ["waiting"])
+        wait_for(lambda: scheduler._waiting[Lane.INTERACTIVE] == 1)
+
+        # When: 先読みのコマンドを実行する
+        prefetch = start(scheduler, Lane.PREFETCH, ["prefetch"])
+        time.sleep(0.1)
+
+        # Then: 待っている対話的な処理が始まるまで先読みは始まらないこと
+        assert order == ["busy"]
+        release["busy"].set()
+        wait_for(lambda: "prefetch" in order)
+        assert order == ["busy", "waiting", "prefetch"]
+        release["waiting"].set()
+        release["prefetch"].set()
+        for thread in (busy, waiting, prefetch):
+            thread.join()
+
+    def test_background_should_wait_until_interactive_is_quiet(
+        self, started: Started
+    ) -> None:
+        # Given: 対話的な処理を実行中のスケジューラー
+        order, release = started
+        scheduler = Scheduler(quiet_seconds=0.2)
+        release["interactive"] = threading.Event()
+        release["background"] = threading.Event()
+        release["background"].set()
+        interactive = start(scheduler, Lane.INTERACTIVE, ["interactive"])
+        wait_for(lambda: order == ["interactive"])
+
+        # When: バックグラウンドのコマンドを実行する
+        background = start(scheduler, Lane.BACKGROUND, ["background"])
+        time.sleep(0.1)
+        assert order == ["interactive"]
+        release["interactive"].set()
+        finished = time.monotonic()
+        background.join()
+        interactive.join()
+
+        # Then: 対話的な処理が終わり、落ち着いてから始まること
+        assert order == ["interactive", "background"]
+        assert time.monotonic() - finished >= 0.2
+
+    def test_interactive_should_preempt_background_process(
+        self, tmp_path: Path
+    ) -> None:
+        # Given: 1回目は終わらないバックグラウンドのコマンド
+        log = tmp_path / "attempts"
+        command = [
+            "sh",
+            "-c",
+            f"echo x >> {log}; [ $(wc -l < {log}) -ge 2 ] || exec sleep 30",
+        ]
+        scheduler = Scheduler(quiet_seconds=0.1)
+        background = start(scheduler, Lane.BACKGROUND, command)
+        wait_for(lambda: log.exists())
+
+        # When: 対話的なコマンドを実行する
+        started = time.monotonic()
+        scheduler.run(["true"], cwd=tmp_path)
+        background.join(timeout=10)
+
+        # Then: バックグラウンドのプロセスは終了させられ、後で実行し直されること
+        assert not background.is_alive()
+        assert time.monotonic() - started < 10
+        assert log.read_text() == "x\nx\n"
+
+    def test_checkpoint_should_only_block_background(
+        self, mocker: MockerFixture
+    ) -> None:
+        # Given: 対話的な処理を実行中のスケジューラー
+        scheduler = Scheduler()
+        scheduler._running[Lane.INTERACTIVE] = 1
+        wait = mocker.patch.object(scheduler._condition, "wait", Mock())
+
+        # When: 対話的なレーンで区切りを呼ぶ
+        scheduler.checkpoint()
+
+        # Then: 待たないこと
+        wait.assert_not_called()
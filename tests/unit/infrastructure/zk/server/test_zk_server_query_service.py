@@ -0,0 +1,129 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.application.server.get_server_stats import GetServerStatsInput
+from zk_utils.application.server.warm_up import WarmUpInput
+from zk_utils.infrastructure.zk.catalog import IndexState, NoteCatalog
+from zk_utils.infrastructure.zk.server.zk_server_query_service import (
+    ZkServerQueryService,
+)
+from zk_utils.infrastructure.zk.zk_client import ZkClient
+
+
+class TestZkServerQueryService:
+    """ZkServerQueryServiceのウォームアップと進捗報告のテスト"""
+
+    @pytest.fixture
+    def mock_client(self, mocker: MockerFixture) -> Mock:
+        return mocker.create_autospec(ZkClient)
+
+    @pytest.fixture
+    def mock_catalog(self, mocker: MockerFixture) -> Mock:
+        mock = mocker.create_autospec(NoteCatalog)
+        mock.enabled = True
+        mock.note_count.return_value = None
+        mock.index_state.return_value = IndexState(generation=0, stale=False)
+        return mock
+
+    @pytest.fixture
+    def service(self, mock_client: Mock, mock_catalog: Mock) -> ZkServerQueryService:
+        return ZkServerQueryService(client=mock_client, catalog=mock_catalog)
+
+    def test_stats_before_warm_up_should_be_idle_and_ready(
+        self, service: ZkServerQueryService
+    ) -> None:
+        # When: ウォームアップ前に状態を取得する
+        stats = service.get_server_stats(GetServerStatsInput())
+
+        # Then: 待機中で、問い合わせを処理できる状態であること
+        assert stats.ready is True
+        assert stats.warm_up == "idle"
+        assert stats.steps == []
+
+    def test_warm_up_should_run_all_steps(
+        self, service: ZkServerQueryService, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: ウォームアップ後にノート数を返すカタログ
+        mock_catalog.note_count.return_value = 3
+
+        # When: ウォームアップを実行する
+        result = service.warm_up(WarmUpInput())
+        stats = service.get_server_stats(GetServerStatsInput())
+
+        # Then: zkのインデックス更新とカタログの構築が行われ、完了が報告されること
+        mock_client.index.assert_called_once_with()
+        mock_catalog.warm_up.assert_called_once_with()
+        mock_catalog.warm_up_headings.assert_called_once_with()
+        assert result.status == "done"
+        assert stats.ready is True
+        assert stats.catalog_notes == 3
+        assert [(step.name, step.status) for step in stats.steps] == [
+            ("zk_index", "done"),
+            ("catalog", "done"),
+            ("markdown_parser", "done"),
+            ("headings", "done"),
+        ]
+
+    def test_disabled_catalog_should_be_skipped(
+        self, service: ZkServerQueryService, mock_catalog: Mock
+    ) -> None:
+        # Given: 無効なカタログ
+        mock_catalog.enabled = False
+
+        # When: ウォームアップを実行する
+        service.warm_up(WarmUpInput())
+
+        # Then: カタログの構築は省略されること
+        mock_catalog.warm_up.assert_not_called()
+        mock_catalog.warm_up_headings.assert_not_called()
+        stats = service.get_server_stats(GetServerStatsInput())
+        assert stats.steps[1].status == "skipped"
+        assert stats.steps[3].status == "skipped"
+
+    def test_failed_step_should_be_reported_and_others_continue(
+        self, service: ZkServerQueryService, mock_client: Mock, mock_catalog: Mock
+    ) -> None:
+        # Given: zkのインデックス更新が失敗する
+        mock_client.index.side_effect = RuntimeError("zk not found")
+
+        # When: ウォームアップを実行する
+        result = service.warm_up(WarmUpInput())
+
+        # Then: 失敗が報告され、残りの手順は実行されること
+        stats = service.get_server_stats(GetServerStatsInput())
+        assert result.status == "failed"
+        assert stats.error == "zk_index: zk not found"
+        assert stats.steps[0].status == "failed"
+        mock_catalog.warm_up.assert_called_once_with()
+
+    def test_stats_during_warm_up_should_not_be_ready(
+        self, service: ZkServerQueryService, mock_catalog: Mock
+    ) -> None:
+        # Given: カタログの構築中に止まるウォームアップ
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait(timeout=5)
+
+        mock_catalog.warm_up.side_effect = block
+        thread = threading.Thread(target=service.warm_up, args=(WarmUpInput(),))
+        thread.start()
+        started.wait(timeout=5)
+
+        # When: 実行中に状態を取得し、再度ウォームアップを要求する
+        stats = service.get_server_stats(GetServerStatsInput())
+        again = service.warm_up(WarmUpInput())
+        release.set()
+        thread.join(timeout=5)
+
+        # Then: 実行中で準備ができていないことが報告され、二重には実行されないこと
+        assert stats.ready is False
+        assert stats.warm_up == "running"
+        assert stats.steps[1].status == "running"
+        assert again.status == "running"
+        mock_catalog.warm_up.assert_called_once_with()
@@ -19,20 +19,19 @@ class TestZkClientCreateNote:
         # Given: モックされたsubprocess実行
         mock_run = mocker.patch("subprocess.run")
         mock_result = Mock()
-        mock_result.stdout = "/created/note.md"
+        mock_result.stdout = "/created/note.md\n"
         mock_run.return_value = mock_result
 
         # When: ノートを作成する
         note = client.create_note("New Note", Path("notes/"))
 
-        # Then: @with_indexデコレータにより2回の呼び出し
-        assert mock_run.call_count == 2
-
-        # 最後の呼び出しで適切なコマンドが実行されること
-        mock_run.assert_called_with(
+        # Then: zk indexは実行せず、zk newだけが適切なコマンドで実行されること
+        mock_run.assert_called_once_with(
             ["zk", "new", "--print-path", "--title", "New Note", "notes"],
+            input="",
             capture_output=True,
             text=True,
+            encoding="utf-8",
             cwd=Path("/test"),
             check=True,
         )
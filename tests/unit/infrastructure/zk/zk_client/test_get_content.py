@@ -42,6 +42,7 @@ class TestZkClientGetContent:
             ],
             capture_output=True,
             text=True,
+            encoding="utf-8",
             cwd=Path("/test"),
             check=True,
         )
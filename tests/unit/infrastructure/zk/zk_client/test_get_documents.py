@@ -0,0 +1,83 @@
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.infrastructure.zk.zk_client import ZkClient
+
+
+class TestZkClientGetDocuments:
+    """ZkClientの本文付きノート取得機能テスト"""
+
+    @pytest.fixture
+    def client(self) -> ZkClient:
+        return ZkClient(cwd=Path("/test"))
+
+    def test_get_documents_success(
+        self, client: ZkClient, mocker: MockerFixture
+    ) -> None:
+        # Given: jsonl形式のzk出力
+        mock_run = mocker.patch("subprocess.run")
+        mock_result = Mock()
+        mock_result.stdout = "\n".join(
+            [
+                json.dumps(
+                    {
+                        "path": "日本語.md",
+                        "title": "日本語ノート",
+                        "tags": ["tag1"],
+                        "rawContent": "# 日本語ノート\n\n本文",
+                        "created": "2024-01-02T03:04:05Z",
+                        "modified": "2024-02-03T04:05:06.789+09:00",
+                    },
+                    ensure_ascii=False,
+                ),
+                json.dumps({"path": "empty.md", "title": "Empty", "tags": None}),
+            ]
+        )
+        mock_run.return_value = mock_result
+
+        # When: 本文付きノートを取得する
+        notes = client.get_documents([Path("日本語.md"), Path("empty.md")])
+
+        # Then: jsonl形式で取得され、本文とタグが復元されること
+        assert mock_run.call_count == 2
+        command = mock_run.call_args[0][0]
+        assert command[-4:] == ["--format", "jsonl", "日本語.md", "empty.md"]
+        assert len(notes) == 2
+        assert notes[0].title == "日本語ノート"
+        assert notes[0].path == Path("日本語.md")
+        assert notes[0].tags == ["tag1"]
+        assert notes[0].content == "# 日本語ノート\n\n本文"
+        assert notes[0].created == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        assert notes[0].modified is not None
+        assert notes[0].modified.isoformat() == "2024-02-03T04:05:06.789000+09:00"
+        assert notes[1].tags == []
+        assert notes[1].content is None
+        assert notes[1].created is None
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            pytest.param("not json", id="invalid_json_should_be_skipped"),
+            pytest.param('["list"]', id="non_object_should_be_skipped"),
+            pytest.param('{"title": "No Path"}', id="missing_path_should_be_skipped"),
+        ],
+    )
+    def test_get_documents_with_invalid_line_should_skip(
+        self, client: ZkClient, mocker: MockerFixture, line: str
+    ) -> None:
+        # Given: 不正な行を含むzk出力
+        mock_run = mocker.patch("subprocess.run")
+        mock_result = Mock()
+        mock_result.stdout = line
+        mock_run.return_value = mock_result
+
+        # When: 本文付きノートを取得する
+        notes = client.get_documents()
+
+        # Then: 不正な行は無視されること
+        assert notes == []
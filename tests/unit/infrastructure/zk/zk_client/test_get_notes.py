@@ -42,6 +42,7 @@ class TestZkClientGetNotes:
             ],
             capture_output=True,
             text=True,
+            encoding="utf-8",
             cwd=Path("/test"),
             check=True,
         )
@@ -85,6 +86,7 @@ class TestZkClientGetNotes:
             ],
             capture_output=True,
             text=True,
+            encoding="utf-8",
             cwd=Path("/test"),
             check=True,
         )
@@ -163,6 +165,7 @@ class TestZkClientGetTaglessNotes:
             ],
             capture_output=True,
             text=True,
+            encoding="utf-8",
             cwd=Path("/test"),
             check=True,
         )
@@ -46,6 +46,7 @@ class TestZkClientGetRandomNote:
             ],
             capture_output=True,
             text=True,
+            encoding="utf-8",
             cwd=Path("/test"),
             check=True,
         )
@@ -0,0 +1,51 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from zk_utils.infrastructure.zk.zk_client import ZkClient
+
+
+class TestZkClientGetRecentlyModifiedNotes:
+    """ZkClientの最近変更されたノート取得機能テスト"""
+
+    @pytest.fixture
+    def client(self) -> ZkClient:
+        return ZkClient(cwd=Path("/test"))
+
+    def test_get_recently_modified_notes_success(
+        self, client: ZkClient, mocker: MockerFixture
+    ) -> None:
+        # Given: 更新日時の新しい順のzk出力
+        mock_run = mocker.patch("subprocess.run")
+        mock_result = Mock()
+        mock_result.stdout = "new.md|New|a,b\nold.md|Old|\n"
+        mock_run.return_value = mock_result
+
+        # When: 最近変更されたノートを3件取得する
+        notes = client.get_recently_modified_notes(3)
+
+        # Then: 件数と並び順を指定したコマンドが実行されること
+        assert mock_run.call_count == 2
+        mock_run.assert_called_with(
+            [
+                "zk",
+                "list",
+                "--quiet",
+                "--no-pager",
+                "--limit",
+                "3",
+                "--sort",
+                "modified-",
+                "--format",
+                '{{path}}|{{title}}|{{join tags ","}}',
+            ],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            cwd=Path("/test"),
+            check=True,
+        )
+        assert [note.path for note in notes] == [Path("new.md"), Path("old.md")]
+        assert notes[0].tags == ["a", "b"]
@@ -41,6 +41,7 @@ class TestZkClientGetTags:
             ],
             capture_output=True,
             text=True,
+            encoding="utf-8",
             cwd=Path("/test"),
             check=True,
         )
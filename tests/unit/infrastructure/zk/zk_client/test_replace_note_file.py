@@ -0,0 +1,99 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from zk_utils.infrastructure.zk.zk_client import ZkClient
+
+
+class TestZkClientReplaceNoteFile:
+    """ZkClientのノートのファイルの置き換えのテスト"""
+
+    @pytest.fixture
+    def client(self, tmp_path: Path) -> ZkClient:
+        return ZkClient(cwd=tmp_path)
+
+    def test_replace_should_keep_newlines_and_mode(
+        self, client: ZkClient, tmp_path: Path
+    ) -> None:
+        # Given: CRLFの改行を含むノート
+        note = tmp_path / "note.md"
+        note.write_bytes(b"# Note\r\n\r\nold\r\n")
+        os.chmod(note, 0o640)
+        original = client.read_note_file(Path("note.md"))
+
+        # When: 内容を置き換える
+        client.replace_note_file(Path("note.md"), "# Note\r\n\r\nnew\r\n", original)
+
+        # Then: 改行コードと権限を保ち、一時ファイルが残らないこと
+        assert original == "# Note\r\n\r\nold\r\n"
+        assert note.read_bytes() == b"# Note\r\n\r\nnew\r\n"
+        assert note.stat().st_mode & 0o777 == 0o640
+        assert [p.name for p in tmp_path.iterdir()] == ["note.md"]
+
+    def test_modified_note_should_not_be_replaced(
+        self, client: ZkClient, tmp_path: Path
+    ) -> None:
+        # Given: 読み込んだ後に他から変更されたノート
+        note = tmp_path / "note.md"
+        note.write_text("old")
+        original = client.read_note_file(Path("note.md"))
+        note.write_text("changed elsewhere")
+
+        # When/Then: 置き換えずにエラーになること
+        with pytest.raises(ValueError, match="Note was modified during the edit"):
+            client.replace_note_file(Path("note.md"), "new", original)
+        assert note.read_text() == "changed elsewhere"
+
+
+class TestZkClientNoteFilePath:
+    """ノートブックの外のファイルを読み書きさせないことのテスト"""
+
+    @pytest.fixture
+    def notebook(self, tmp_path: Path) -> Path:
+        notebook = tmp_path / "notebook"
+        (notebook / ".zk").mkdir(parents=True)
+        (notebook / "note.md").write_text("# Note\n")
+        (notebook / ".zk" / "hidden.md").write_text("hidden")
+        (notebook / "plain.txt").write_text("plain")
+        (tmp_path / "victim.md").write_text("victim")
+        (notebook / "link.md").symlink_to(tmp_path / "victim.md")
+        return notebook
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            pytest.param(Path("../victim.md"), id="parent_dir_should_be_rejected"),
+            pytest.param(None, id="absolute_path_should_be_rejected"),
+            pytest.param(Path("link.md"), id="symlink_outside_should_be_rejected"),
+            pytest.param(Path("plain.txt"), id="non_note_file_should_be_rejected"),
+            pytest.param(Path(".zk/hidden.md"), id="hidden_dir_should_be_rejected"),
+        ],
+    )
+    def test_file_outside_notebook_should_not_be_read_or_replaced(
+        self, notebook: Path, path: Path | None
+    ) -> None:
+        # Given: ノートブックのノートではないファイルの指定
+        client = ZkClient(cwd=notebook)
+        target = path or notebook.parent / "victim.md"
+
+        # When/Then: 読み込みも置き換えもできず、ファイルは変更されないこと
+        with pytest.raises(ValueError, match="Not a note in the notebook"):
+            client.read_note_file(target)
+        with pytest.raises(ValueError, match="Not a note in the notebook"):
+            client.replace_note_file(target, "## pwn\n\ninjected", "victim")
+        assert (notebook.parent / "victim.md").read_text() == "victim"
+
+    def test_symlink_inside_notebook_should_replace_target_note(
+        self, notebook: Path
+    ) -> None:
+        # Given: ノートブック内のノートへのシンボリックリンク
+        (notebook / "alias.md").symlink_to(notebook / "note.md")
+        client = ZkClient(cwd=notebook)
+
+        # When: リンクを指定して置き換える
+        client.replace_note_file(Path("alias.md"), "# New\n", "# Note\n")
+
+        # Then: リンクを残したまま、リンク先のノートが置き換えられること
+        assert (notebook / "alias.md").is_symlink()
+        assert (notebook / "note.md").read_text() == "# New\n"